@@ -3,16 +3,25 @@ import {snakeCase} from "snake-case";
 const camelcaseKeys = require('camelcase-keys');
 const snakecaseKeys = require('snakecase-keys');
 
+const RELEASE_POLL_INTERVAL_MS = 2000
+
 
 export default {
     generateRelease(analysisPlanId) {
+        // The release is computed by a Celery task, poll the job status until it's done
         return wrappedSession.post('/api/release/',
             {object_id: analysisPlanId})
+            .then(resp => this.waitForRelease(resp.data.data.job_id))
+    },
+    waitForRelease(jobId) {
+        return wrappedSession.get(`/api/release/job-status/${jobId}/`)
             .then(resp => {
-                camelcaseKeys(resp.data, {deep: true})
+                if (resp.data.data.status === 'complete') {
+                    return camelcaseKeys(resp.data.data.release_info, {deep: true})
+                }
+                return new Promise(resolve => setTimeout(resolve, RELEASE_POLL_INTERVAL_MS))
+                    .then(() => this.waitForRelease(jobId))
             })
-
-
     },
     validate(analysisPlanId, dpStatistics) {
         if (dpStatistics && dpStatistics.length > 0) {
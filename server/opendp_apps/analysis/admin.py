@@ -2,6 +2,7 @@ from django.contrib import admin
 
 from .models import \
     (AnalysisPlan,
+     EpsilonBudget,
      ReleaseEmailRecord,
      ReleaseInfo,
      AuxiliaryFileDepositRecord)
@@ -92,7 +93,24 @@ class ReleaseEmailRecordAdmin(admin.ModelAdmin):
                        'created', 'updated',)
 
 
+class EpsilonBudgetAdmin(admin.ModelAdmin):
+    save_on_top = True
+    search_fields = ('dataset__name',)
+    list_display = ('dataset',
+                    'allotted_epsilon',
+                    'reconciled',
+                    'updated',
+                    'created',)
+    readonly_fields = ('id',
+                       'object_id',
+                       'dataset',
+                       'allotted_epsilon',
+                       'reconciled',
+                       'created', 'updated',)
+
+
 admin.site.register(AnalysisPlan, AnalysisPlanAdmin)
+admin.site.register(EpsilonBudget, EpsilonBudgetAdmin)
 admin.site.register(ReleaseInfo, ReleaseInfoAdmin)
 admin.site.register(AuxiliaryFileDepositRecord, AuxiliaryFileDepositRecordAdmin)
 admin.site.register(ReleaseEmailRecord, ReleaseEmailRecordAdmin)
@@ -1,10 +1,11 @@
 from datetime import datetime
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils.timezone import make_aware
 
 from opendp_apps.analysis import static_vals as astatic
-from opendp_apps.analysis.exceptions import EpsilonNotSetException, AllottedEpsilonExceedsLimit
+from opendp_apps.analysis.epsilon_budget_ledger import EpsilonBudgetLedger
 from opendp_apps.analysis.models import AnalysisPlan
 from opendp_apps.dataset.depositor_setup_helpers import get_selected_variable_info
 from opendp_apps.dataset.models import DatasetInfo
@@ -135,58 +136,43 @@ class AnalysisPlanCreator(BasicErrCheck):
                 astatic.ERR_MSG_PLAN_INFO_EXPIRATION_DATE_INVALID.format(expiration_date=new_expiration_date_str))
             return
 
-        # Is there remaining epsilon for this dataset?
-        available_epsilon = self.get_available_epsilon(self.dataset_info)
-        if available_epsilon == 0:
-            self.add_err_msg(astatic.ERR_MSG_NO_EPSILON_AVAILABLE)
-            return
-
-        # Is there enough epsilon for this new AnalysisPlan?
-        if available_epsilon - self.new_epsilon < 0:
-            user_msg = astatic.ERR_MSG_NOT_ENOUGH_EPSILON_AVAILABLE.format(available_epsilon=available_epsilon,
-                                                                           requested_epsilon=self.new_epsilon)
-            self.add_err_msg(user_msg)
-            return
-
     def create_plan(self):
         """Create the AnalysisPlan object!"""
         if self.has_error():
             return
 
-        var_info_resp = get_selected_variable_info(self.dataset_info.depositor_setup_info.variable_info)
-        if not var_info_resp.success:
-            self.add_err_msg(var_info_resp.message)
-            return
+        # The dataset's EpsilonBudget is locked from the epsilon check until the plan is saved
+        #
+        with transaction.atomic():
+            # Is there enough epsilon for this new AnalysisPlan?
+            reserve_resp = EpsilonBudgetLedger.reserve_epsilon(self.dataset_info, self.new_epsilon)
+            if not reserve_resp.success:
+                self.add_err_msg(reserve_resp.message)
+                return
+            self.available_epsilon = reserve_resp.data
+
+            var_info_resp = get_selected_variable_info(self.dataset_info.depositor_setup_info.variable_info)
+            if not var_info_resp.success:
+                self.add_err_msg(var_info_resp.message)
+                return
 
-        params = dict(analyst=self.analyst_user_obj,
-                      dataset=self.dataset_info,
-                      variable_info=var_info_resp.data,
-                      confidence_level=self.dataset_info.depositor_setup_info.confidence_level,
-                      name=self.new_name,
-                      description=self.new_description,
-                      epsilon=self.new_epsilon,
-                      expiration_date=self.new_expiration_date,
-                      user_step=AnalysisPlan.AnalystSteps.STEP_0000_INITIALIZED)
+            params = dict(analyst=self.analyst_user_obj,
+                          dataset=self.dataset_info,
+                          variable_info=var_info_resp.data,
+                          confidence_level=self.dataset_info.depositor_setup_info.confidence_level,
+                          name=self.new_name,
+                          description=self.new_description,
+                          epsilon=self.new_epsilon,
+                          expiration_date=self.new_expiration_date,
+                          user_step=AnalysisPlan.AnalystSteps.STEP_0000_INITIALIZED)
 
-        self.analysis_plan = AnalysisPlan(**params)
+            self.analysis_plan = AnalysisPlan(**params)
 
-        self.analysis_plan.save()
+            self.analysis_plan.save()
 
     @staticmethod
     def get_available_epsilon(dataset: DatasetInfo) -> float:
         """
-        Get the available epsilon for a dataset by totaling epsilon allotted to AnalysisPlans
+        Get the available epsilon for a dataset, using the epsilon allotted to its AnalysisPlans
         """
-        allotted_epsilon = 0
-        for plan in AnalysisPlan.objects.filter(dataset=dataset):
-            if not plan.epsilon:
-                raise EpsilonNotSetException((f'AnalysisPlan object has no epsilon value. (analysis plan:'
-                                              f' {plan.object_id})'))
-            allotted_epsilon += plan.epsilon
-
-        available_epsilon = dataset.depositor_setup_info.epsilon - allotted_epsilon
-        if available_epsilon < 0:
-            raise AllottedEpsilonExceedsLimit((f'Available epsilon is less than zero.'
-                                               f' (dataset: {dataset.object_id})'))
-
-        return available_epsilon
+        return EpsilonBudgetLedger.get_available_epsilon(dataset)
@@ -0,0 +1,131 @@
+"""
+Track the epsilon allotted to each dataset's AnalysisPlans
+
+- Each DatasetInfo has one EpsilonBudget row with the total epsilon of its AnalysisPlans.
+  Checking the budget is one query, not a loop over the plans
+- A new AnalysisPlan locks the row (SELECT ... FOR UPDATE) while the budget is checked,
+  so two requests can't both spend the last of the budget
+- The total is updated by the AnalysisPlan post_save/post_delete signals. If the row
+  doesn't exist yet, it's created from Sum() over the plans
+- reconcile() recalculates the totals, e.g. after plans were edited outside the app.
+  See the "reconcile_epsilon_budgets" management command
+"""
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from opendp_apps.analysis import static_vals as astatic
+from opendp_apps.analysis.exceptions import EpsilonNotSetException, AllottedEpsilonExceedsLimit
+from opendp_apps.analysis.models import AnalysisPlan, EpsilonBudget
+from opendp_apps.dataset.models import DatasetInfo
+from opendp_apps.model_helpers.basic_response import ok_resp, err_resp, BasicResponse
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+
+class EpsilonBudgetLedger:
+    """Check and reserve a dataset's epsilon using its EpsilonBudget"""
+
+    @staticmethod
+    def get_allotted_epsilon_sum(dataset: DatasetInfo) -> float:
+        """Total the epsilon of the dataset's AnalysisPlans"""
+        plans = AnalysisPlan.objects.filter(dataset=dataset)
+
+        plan_without_epsilon = plans.exclude(epsilon__gt=0).values_list('object_id', flat=True).first()
+        if plan_without_epsilon:
+            raise EpsilonNotSetException((f'AnalysisPlan object has no epsilon value. (analysis plan:'
+                                          f' {plan_without_epsilon})'))
+
+        return plans.aggregate(allotted_epsilon=Sum('epsilon'))['allotted_epsilon'] or 0.0
+
+    @staticmethod
+    def get_budget(dataset: DatasetInfo, for_update=False) -> EpsilonBudget:
+        """
+        Return the dataset's EpsilonBudget, creating it from the AnalysisPlans if needed.
+        :param for_update: lock the row until the end of the transaction
+        """
+        budgets = EpsilonBudget.objects.filter(dataset=dataset)
+        if for_update:
+            budgets = budgets.select_for_update()
+
+        budget = budgets.first()
+        if budget is not None:
+            return budget
+
+        try:
+            with transaction.atomic():
+                EpsilonBudget.objects.create(
+                    dataset=dataset,
+                    allotted_epsilon=EpsilonBudgetLedger.get_allotted_epsilon_sum(dataset),
+                    reconciled=timezone.now())
+        except IntegrityError:
+            # Created by another request
+            pass
+
+        return budgets.get()
+
+    @staticmethod
+    def get_available_epsilon(dataset: DatasetInfo) -> float:
+        """Get the available epsilon for a dataset"""
+        budget = EpsilonBudgetLedger.get_budget(dataset)
+
+        available_epsilon = dataset.depositor_setup_info.epsilon - budget.allotted_epsilon
+        if available_epsilon < 0:
+            raise AllottedEpsilonExceedsLimit((f'Available epsilon is less than zero.'
+                                               f' (dataset: {dataset.object_id})'))
+
+        return available_epsilon
+
+    @staticmethod
+    def reserve_epsilon(dataset: DatasetInfo, epsilon: float) -> BasicResponse:
+        """
+        Check that the dataset has enough epsilon for a new AnalysisPlan.
+        Call within transaction.atomic() and save the AnalysisPlan in the same
+        transaction: the EpsilonBudget stays locked until it's saved.
+        """
+        budget = EpsilonBudgetLedger.get_budget(dataset, for_update=True)
+
+        available_epsilon = dataset.depositor_setup_info.epsilon - budget.allotted_epsilon
+        if available_epsilon <= 0:
+            return err_resp(astatic.ERR_MSG_NO_EPSILON_AVAILABLE)
+
+        if available_epsilon - epsilon < 0:
+            user_msg = astatic.ERR_MSG_NOT_ENOUGH_EPSILON_AVAILABLE.format(available_epsilon=available_epsilon,
+                                                                           requested_epsilon=epsilon)
+            return err_resp(user_msg)
+
+        return ok_resp(available_epsilon)
+
+    @staticmethod
+    def reconcile(dataset: DatasetInfo) -> EpsilonBudget:
+        """Recalculate the dataset's allotted epsilon from its AnalysisPlans"""
+        with transaction.atomic():
+            budget = EpsilonBudgetLedger.get_budget(dataset, for_update=True)
+            allotted_epsilon = EpsilonBudgetLedger.get_allotted_epsilon_sum(dataset)
+            if allotted_epsilon != budget.allotted_epsilon:
+                logger.warning(f'Epsilon budget for dataset {dataset.object_id} was {budget.allotted_epsilon},'
+                               f' the AnalysisPlans total {allotted_epsilon}')
+            budget.allotted_epsilon = allotted_epsilon
+            budget.reconciled = timezone.now()
+            budget.save()
+
+        return budget
+
+    @staticmethod
+    def reconcile_all() -> int:
+        """Reconcile the EpsilonBudget of each dataset with AnalysisPlans. Returns the number reconciled"""
+        dataset_ids = AnalysisPlan.objects.values_list('dataset_id', flat=True).distinct()
+
+        cnt = 0
+        for dataset in DatasetInfo.objects.filter(id__in=dataset_ids).order_by('id'):
+            try:
+                EpsilonBudgetLedger.reconcile(dataset)
+            except EpsilonNotSetException as ex_obj:
+                logger.error(f'Epsilon budget not reconciled: {ex_obj}')
+                continue
+            cnt += 1
+
+        return cnt
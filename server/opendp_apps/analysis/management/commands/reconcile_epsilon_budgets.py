@@ -0,0 +1,16 @@
+"""
+Recalculate each dataset's EpsilonBudget from its AnalysisPlans
+"""
+from django.core.management.base import BaseCommand
+
+from opendp_apps.analysis.epsilon_budget_ledger import EpsilonBudgetLedger
+
+
+class Command(BaseCommand):
+    help = "Recalculate the epsilon allotted to each dataset from its AnalysisPlans"
+
+    def handle(self, *args, **options):
+        """Reconcile the EpsilonBudget of each dataset with AnalysisPlans"""
+        cnt = EpsilonBudgetLedger.reconcile_all()
+
+        self.stdout.write(self.style.SUCCESS(f'>> Epsilon budgets reconciled: {cnt}'))
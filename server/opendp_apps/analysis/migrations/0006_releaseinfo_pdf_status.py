@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:42
+
+from django.db import migrations, models
+
+
+def set_existing_pdf_status(apps, schema_editor):
+    """Releases made before the PDF task already have a PDF file or never will"""
+    ReleaseInfo = apps.get_model('analysis', 'ReleaseInfo')
+    ReleaseInfo.objects.exclude(dp_release_pdf_file='').exclude(dp_release_pdf_file__isnull=True)\
+        .update(pdf_status='complete')
+    ReleaseInfo.objects.filter(pdf_status='pending').update(pdf_status='not_created')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0005_alter_analysisplan_release_info_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='releaseinfo',
+            name='pdf_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('complete', 'Complete'), ('failed', 'Failed'), ('not_created', 'Not Created')], default='pending', help_text='The PDF is created after the release JSON file is saved', max_length=32),
+        ),
+        migrations.RunPython(set_existing_pdf_status, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dataset', '0005_datasetinfo_source_file_hash'),
+        ('analysis', '0006_releaseinfo_pdf_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EpsilonBudget',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('object_id', models.UUIDField(default=uuid.uuid4, editable=False)),
+                ('allotted_epsilon', models.FloatField(default=0.0, help_text="Total epsilon of the dataset's AnalysisPlans")),
+                ('reconciled', models.DateTimeField(blank=True, help_text='Last time the total was recalculated from the AnalysisPlans', null=True)),
+                ('dataset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='epsilon_budget', to='dataset.datasetinfo')),
+            ],
+            options={
+                'verbose_name': 'Epsilon Budget',
+                'verbose_name_plural': 'Epsilon Budgets',
+            },
+        ),
+    ]
@@ -6,6 +6,10 @@ from django.conf import settings
 from django.core.files.storage import FileSystemStorage
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.safestring import mark_safe
 from django.utils.timezone import make_aware
 from rest_framework import status
@@ -14,7 +18,7 @@ from rest_framework.reverse import reverse as drf_reverse
 from opendp_apps.analysis import static_vals as astatic
 from opendp_apps.dataset import static_vals as dstatic
 from opendp_apps.dataverses import static_vals as dv_static
-from opendp_apps.model_helpers.models import TimestampedModelWithUUID
+from opendp_apps.model_helpers.models import LargeJSONQuerySet, TimestampedModelWithUUID
 from opendp_apps.utils.extra_validators import validate_not_negative, validate_epsilon_or_none
 from opendp_apps.utils.variable_info_formatter import format_variable_info
 
@@ -25,6 +29,17 @@ class ReleaseInfo(TimestampedModelWithUUID):
     """
     Release of differentially private result from an AnalysisPlan
     """
+
+    class PDFStatus(models.TextChoices):
+        """
+        Status of the PDF release file, created by dp_reports.tasks.run_pdf_report_maker
+        """
+        PDF_PENDING = 'pending', 'Pending'
+        PDF_IN_PROGRESS = 'in_progress', 'In Progress'
+        PDF_COMPLETE = 'complete', 'Complete'
+        PDF_FAILED = 'failed', 'Failed'
+        PDF_NOT_CREATED = 'not_created', 'Not Created'
+
     dataset = models.ForeignKey('dataset.DatasetInfo',
                                 on_delete=models.CASCADE)
 
@@ -43,6 +58,11 @@ class ReleaseInfo(TimestampedModelWithUUID):
         upload_to='release-files/%Y/%m/%d/',
         blank=True, null=True)
 
+    pdf_status = models.CharField(max_length=32,
+                                  choices=PDFStatus.choices,
+                                  default=PDFStatus.PDF_PENDING,
+                                  help_text='The PDF is created after the release JSON file is saved')
+
     dataverse_deposit_info = models.JSONField(blank=True,
                                               null=True,
                                               help_text='Only applies to Dataverse files')
@@ -55,6 +75,11 @@ class ReleaseInfo(TimestampedModelWithUUID):
         default=False,
         help_text='Only applies to Dataverse datasets')
 
+    # Deferred by ReleaseInfo.objects.without_large_json()
+    LARGE_JSON_FIELDS = ('dp_release', 'dataverse_deposit_info')
+
+    objects = LargeJSONQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Release Information'
         verbose_name_plural = 'Release Information'
@@ -299,6 +324,11 @@ class AnalysisPlan(TimestampedModelWithUUID):
     expiration_date = models.DateTimeField(null=True, blank=True,
                                            help_text='The date the analysis plan expires')
 
+    # Deferred by AnalysisPlan.objects.without_large_json()
+    LARGE_JSON_FIELDS = ('variable_info', 'dp_statistics')
+
+    objects = LargeJSONQuerySet.as_manager()
+
     class Meta:
         ordering = ['dataset', 'name', '-created']
 
@@ -338,3 +368,45 @@ class AnalysisPlan(TimestampedModelWithUUID):
             return f'<pre>{info_str}</pre>'
         except Exception as ex_obj:
             return f'Failed to convert to JSON string {ex_obj}'
+
+
+class EpsilonBudget(TimestampedModelWithUUID):
+    """
+    Running total of the epsilon allotted to a dataset's AnalysisPlans.
+    The row is locked while a new AnalysisPlan is checked against the budget.
+    See epsilon_budget_ledger.py
+    """
+    dataset = models.OneToOneField('dataset.DatasetInfo',
+                                   on_delete=models.CASCADE,
+                                   related_name='epsilon_budget')
+
+    allotted_epsilon = models.FloatField(default=0.0,
+                                         help_text='Total epsilon of the dataset\'s AnalysisPlans')
+
+    reconciled = models.DateTimeField(null=True, blank=True,
+                                      help_text='Last time the total was recalculated from the AnalysisPlans')
+
+    class Meta:
+        verbose_name = 'Epsilon Budget'
+        verbose_name_plural = 'Epsilon Budgets'
+
+    def __str__(self):
+        return f'{self.dataset} ({self.allotted_epsilon})'
+
+
+# ----------------------------------------------------------------------
+# Keep the EpsilonBudget total in step with the AnalysisPlans.
+#   If there's no EpsilonBudget yet, it's created from the AnalysisPlans when first used
+# ----------------------------------------------------------------------
+@receiver(post_save, sender=AnalysisPlan)
+def post_save_add_plan_epsilon(sender, instance, created, *args, **kwargs):
+    if created and instance.epsilon:
+        EpsilonBudget.objects.filter(dataset_id=instance.dataset_id).update(
+            allotted_epsilon=F('allotted_epsilon') + instance.epsilon)
+
+
+@receiver(post_delete, sender=AnalysisPlan)
+def post_delete_remove_plan_epsilon(sender, instance, *args, **kwargs):
+    if instance.epsilon:
+        EpsilonBudget.objects.filter(dataset_id=instance.dataset_id).update(
+            allotted_epsilon=Greatest(F('allotted_epsilon') - instance.epsilon, 0.0))
@@ -0,0 +1,52 @@
+"""
+Claim on an AnalysisPlan while its release is computed
+
+A release is started by queuing the run_release task. Without a claim,
+a double-click or a retried request would queue a 2nd task which creates
+another ReleaseInfo--and uses the epsilon again.
+
+- The claim is a cache key added with cache.add(), which only succeeds if the
+  key doesn't exist. The cache is shared by the web server and Celery workers
+- The claim holds the job id of the run_release task. It's made before
+  the task is queued, checked again when the task starts, and released
+  when the task ends
+- The claim expires after RELEASE_CLAIM_TIMEOUT seconds, e.g. if a worker is lost
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+from opendp_apps.analysis import static_vals as astatic
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+
+def get_release_claim_key(analysis_plan_id) -> str:
+    return f'{astatic.RELEASE_CLAIM_KEY_PREFIX}:{analysis_plan_id}'
+
+
+def claim_release(analysis_plan_id, job_id: str) -> bool:
+    """
+    Claim the AnalysisPlan for the release job.
+    Returns True if the claim was made or is already held by this job
+    """
+    release_claims = caches[astatic.RELEASE_CLAIM_CACHE]
+    claim_key = get_release_claim_key(analysis_plan_id)
+
+    if release_claims.add(claim_key, job_id):
+        return True
+
+    return release_claims.get(claim_key) == job_id
+
+
+def release_claim(analysis_plan_id, job_id: str):
+    """Remove the claim, if it's held by the release job"""
+    release_claims = caches[astatic.RELEASE_CLAIM_CACHE]
+    claim_key = get_release_claim_key(analysis_plan_id)
+    try:
+        if release_claims.get(claim_key) == job_id:
+            release_claims.delete(claim_key)
+    except Exception as ex_obj:
+        # The claim expires
+        logger.error(f'release_claim: {ex_obj}')
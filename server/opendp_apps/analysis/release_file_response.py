@@ -0,0 +1,110 @@
+"""
+Responses for downloading release files (JSON and PDF)
+
+Release files don't change once created, so:
+- Each response has a strong ETag made from the ReleaseInfo object_id and a hash of the file.
+  A request with a matching "If-None-Match" gets a 304, without the file being read
+- The Cache-Control header lets the browser keep the file. Downloads require a login,
+  so shared caches (proxies, CDNs) aren't allowed to store it
+- If settings.RELEASE_DOWNLOAD_SENDFILE_HEADER is set, the web server sends the file:
+  Django only returns the "X-Accel-Redirect" or "X-Sendfile" header
+"""
+import hashlib
+import logging
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.fields.files import FieldFile
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from opendp_apps.analysis.models import ReleaseInfo
+from opendp_apps.model_helpers.basic_response import ok_resp, err_resp, BasicResponse
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def get_file_hash(field_file: FieldFile) -> str:
+    """
+    Return the sha256 hash of a release file. The file doesn't change, so the hash
+    is kept in the cache under the file's name
+    """
+    cache_key = f'release_file_hash:{field_file.name}'
+    file_hash = cache.get(cache_key)
+    if file_hash is not None:
+        return file_hash
+
+    hash_obj = hashlib.sha256()
+    with field_file.storage.open(field_file.name, 'rb') as file_handle:
+        for chunk in iter(lambda: file_handle.read(HASH_CHUNK_SIZE), b''):
+            hash_obj.update(chunk)
+
+    file_hash = hash_obj.hexdigest()
+    cache.set(cache_key, file_hash, timeout=None)
+    return file_hash
+
+
+def get_release_file_etag(release_info: ReleaseInfo, field_file: FieldFile) -> str:
+    """Return the strong ETag of a release file, e.g. '"{object_id}-{file hash}"'"""
+    return f'"{release_info.object_id}-{get_file_hash(field_file)}"'
+
+
+def set_cache_headers(response, etag):
+    """Add the ETag and Cache-Control headers"""
+    response['ETag'] = etag
+    patch_cache_control(response,
+                        private=True,
+                        max_age=settings.RELEASE_DOWNLOAD_MAX_AGE,
+                        immutable=True)
+    return response
+
+
+def get_sendfile_response(field_file: FieldFile, content_type: str):
+    """Return an empty response with the header for the web server to send the file"""
+    response = HttpResponse(content_type=content_type)
+
+    if settings.RELEASE_DOWNLOAD_SENDFILE_HEADER == 'X-Accel-Redirect':
+        response['X-Accel-Redirect'] = settings.RELEASE_DOWNLOAD_ACCEL_REDIRECT_PREFIX + quote(field_file.name)
+    else:
+        response['X-Sendfile'] = field_file.path
+
+    return response
+
+
+def get_release_file_response(request, release_info: ReleaseInfo, field_file: FieldFile,
+                              content_type: str, file_label: str) -> BasicResponse:
+    """
+    Return the download response for a release file, or a 304 if the client has the file.
+    :param field_file: ReleaseInfo.dp_release_json_file or .dp_release_pdf_file
+    :param file_label: used in error messages, e.g. "JSON"
+    """
+    try:
+        etag = get_release_file_etag(release_info, field_file)
+    except (ValueError, OSError) as err_obj:
+        return err_resp(f'Not able to read the {file_label} Release file. (1) ({err_obj})')
+
+    # Conditional GET: "If-None-Match"
+    not_modified_response = get_conditional_response(request, etag=etag)
+    if not_modified_response is not None:
+        return ok_resp(set_cache_headers(not_modified_response, etag))
+
+    download_fname = f'release_{release_info.object_id}.{file_label.lower()}'
+
+    if settings.RELEASE_DOWNLOAD_SENDFILE_HEADER:
+        response = get_sendfile_response(field_file, content_type)
+    else:
+        # get an open file handle
+        try:
+            file_handle = field_file.open()
+        except Exception as err_obj:
+            return err_resp(f'Not able to read the {file_label} Release file. (2) ({err_obj})')
+
+        response = FileResponse(file_handle, content_type=content_type)
+        response['Content-Length'] = field_file.size
+
+    response['Content-Disposition'] = f'attachment; filename="{download_fname}"'
+
+    return ok_resp(set_cache_headers(response, etag))
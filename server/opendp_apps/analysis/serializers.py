@@ -53,9 +53,7 @@ class AnalysisPlanObjectIdSerializer(serializers.Serializer):
         """
         Check that the object_id belongs to an existing AnalysisPlan object
         """
-        try:
-            _plan = AnalysisPlan.objects.get(object_id=value)
-        except AnalysisPlan.DoesNotExist:
+        if not AnalysisPlan.objects.filter(object_id=value).exists():
             raise serializers.ValidationError(astatic.ERR_MSG_NO_ANALYSIS_PLAN)
 
         return value
@@ -182,6 +180,22 @@ class DPStatisticSerializer(serializers.Serializer):
     histogram_bin_edges = serializers.ListField(child=serializers.IntegerField(), required=False)
 
 
+class ChangedStatisticSerializer(serializers.Serializer):
+    """A statistic replacing the one at "index" in the last validated list"""
+    index = serializers.IntegerField(min_value=0)
+    statistic = DPStatisticSerializer()
+
+
+class StatisticsDiffSerializer(serializers.Serializer):
+    """
+    Changes to the statistics list from the last validation of the AnalysisPlan.
+    Indices refer to the last validated list. See ValidationState.apply_statistics_diff
+    """
+    added = serializers.ListField(child=DPStatisticSerializer(), required=False, default=list)
+    changed = serializers.ListField(child=ChangedStatisticSerializer(), required=False, default=list)
+    removed = serializers.ListField(child=serializers.IntegerField(min_value=0), required=False, default=list)
+
+
 class AnalysisPlanPKRelatedField(PrimaryKeyRelatedField):
 
     def __init__(self, **kwargs):
@@ -200,14 +214,24 @@ class ReleaseValidationSerializer(serializers.ModelSerializer):
     The purpose of this serializer is to validate individual statistic specifications--with
     each specification described by the DPStatisticSerializer
     """
-    dp_statistics = serializers.ListField(child=DPStatisticSerializer())
+    dp_statistics = serializers.ListField(child=DPStatisticSerializer(), required=False)
+    statistics_diff = StatisticsDiffSerializer(required=False)
     analysis_plan_id = serializers.UUIDField()
 
     class Meta:
         model = ReleaseInfo
-        fields = ('dp_statistics', 'analysis_plan_id',)
+        fields = ('dp_statistics', 'statistics_diff', 'analysis_plan_id',)
         # read_only_fields = ('dp_release', )
 
+    def validate(self, data):
+        """
+        Either the full "dp_statistics" list or the "statistics_diff" is sent
+        """
+        if ('dp_statistics' in data) == ('statistics_diff' in data):
+            raise serializers.ValidationError(astatic.ERR_MSG_VALIDATION_STATS_OR_DIFF)
+
+        return data
+
     def save(self, **kwargs):
         """
         Validate each release request and return any errors that arise.
@@ -240,6 +264,15 @@ class ReleaseValidationSerializer(serializers.ModelSerializer):
                  }
             ]
          }
+        Or, to validate changes to the last validated "dp_statistics":
+        {
+            "analysis_plan_id": abcd-1234,
+            "statistics_diff": {
+                "changed": [{"index": 0, "statistic": { ...dp statistic... }}],
+                "removed": [1],
+                "added": [{ ...dp statistic... }]
+            }
+        }
         :param kwargs:
         :return:
         """
@@ -250,9 +283,11 @@ class ReleaseValidationSerializer(serializers.ModelSerializer):
 
         analysis_plan_id = self.validated_data['analysis_plan_id']
 
-        dp_statistics = self.validated_data['dp_statistics']
+        dp_statistics = self.validated_data.get('dp_statistics')
+        statistics_diff = self.validated_data.get('statistics_diff')
 
-        validate_util = ValidateReleaseUtil.validate_mode(opendp_user, analysis_plan_id, dp_statistics)
+        validate_util = ValidateReleaseUtil.validate_mode(opendp_user, analysis_plan_id,
+                                                          dp_statistics, statistics_diff)
 
         if validate_util.has_error():
             # This is a big error, check for it before evaluating individual statistics
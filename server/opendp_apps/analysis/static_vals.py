@@ -11,6 +11,28 @@ When checking max_epsilon, offset it by 10**-14 to avoid
 """
 MAX_EPSILON_OFFSET = 10 ** -14
 
+# Number of calibrated noise scales kept in memory, see analysis/tools/scale_cache.py
+SCALE_CACHE_MAX_SIZE = 2048
+
+# The scale calculated as sensitivity/epsilon is increased by this fraction so it
+# passes OpenDP's conservatively rounded privacy check. See StatSpec.find_scale()
+CLOSED_FORM_SCALE_MARGIN = 1e-12
+
+# Steps sent to the progress_callback of ValidateReleaseUtil.compute_mode
+RELEASE_STEP_VALIDATED = 'validated'
+RELEASE_STEP_STATISTIC = 'statistic'
+RELEASE_STEP_RELEASE_FILES = 'release_files'
+
+# Claim on an AnalysisPlan while its release is computed, see analysis/release_claim.py
+RELEASE_CLAIM_CACHE = 'release_claims'
+RELEASE_CLAIM_KEY_PREFIX = 'release_claim'
+
+# Validation results saved between /api/validation/ calls, see analysis/validation_state.py
+VALIDATION_STATE_CACHE = 'validation'
+VALIDATION_STATE_KEY_PREFIX = 'validation_state'
+# Statistic fields which are not used for validation
+VALIDATION_STATE_IGNORED_FIELDS = ('error', 'label', 'locked')
+
 # ---------------------------------
 # Confidence level static values
 # ---------------------------------
@@ -253,7 +275,15 @@ ERR_MSG_PLAN_INFO_EXPIRATION_DATE_INVALID = ('"expiration_date" is required to c
                                                         ' format "YYYY-MM-DD". (found: "{expiration_date}")')
 
 ERR_MSG_RELEASES_EXISTS = 'A Release has been created from this AnalysisPlan. Changes are not allowed.'
+ERR_MSG_RELEASE_ALREADY_CREATED = 'A Release has already been created from this AnalysisPlan.'
+ERR_MSG_RELEASE_IN_PROGRESS = 'A Release is already being computed for this AnalysisPlan.'
 ERR_MSG_ANALYSIS_PLAN_EXPIRED = 'This AnalysisPlan has expired.'
 ERR_MSG_NO_FIELDS_TO_UPDATE = "There are no fields to update."
 
-ERR_MSG_VARIABLE_NOT_FOUND_IN_ANALYSIS_PLAN = 'Variable "{var_name}" was not found in the AnalysisPlan'
\ No newline at end of file
+ERR_MSG_VARIABLE_NOT_FOUND_IN_ANALYSIS_PLAN = 'Variable "{var_name}" was not found in the AnalysisPlan'
+
+ERR_MSG_VALIDATION_STATE_NOT_FOUND = ('There are no earlier validation results for this AnalysisPlan.'
+                                      ' Please send the full "dp_statistics" list.')
+ERR_MSG_VALIDATION_DIFF_BAD_INDEX = ('The statistic indices {indices} are not valid.'
+                                     ' The last validated list has {num_stats} statistic(s).')
+ERR_MSG_VALIDATION_STATS_OR_DIFF = 'Please send either "dp_statistics" or "statistics_diff".'
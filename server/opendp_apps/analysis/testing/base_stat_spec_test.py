@@ -89,6 +89,16 @@ class StatSpecTestCase(TestCase):
 
         return analysis_plan
 
+    def get_release_job_status(self, response):
+        """
+        Convenience method to retrieve the job status of a release started via the API.
+        Tests run Celery tasks eagerly, so the job has finished.
+        """
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['data']['job_id']
+
+        return self.client.get(f'{self.API_RELEASE_PREFIX}job-status/{job_id}/')
+
     @override_settings(SKIP_PDF_CREATION_FOR_TESTS=True)
     def get_release_info(self):
         """Convenience method to create a ReleaseInfo object"""
@@ -109,10 +119,13 @@ class StatSpecTestCase(TestCase):
                                     json.dumps(params),
                                     content_type='application/json')
 
-        self.assertEqual(response.status_code, 201)
-        self.assertTrue('object_id' in response.json())
+        response = self.get_release_job_status(response)
+
+        self.assertEqual(response.status_code, 200)
+        release_info = response.json()['data']['release_info']
+        self.assertTrue('object_id' in release_info)
 
-        new_release = ReleaseInfo.objects.get(object_id=response.json()['object_id'])
+        new_release = ReleaseInfo.objects.get(object_id=release_info['object_id'])
         self.assertEqual(new_release.get_analysis_plan_or_none().object_id,
                          analysis_plan.object_id)
 
@@ -0,0 +1,102 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from opendp_apps.analysis import static_vals as astatic
+from opendp_apps.analysis.analysis_plan_creator import AnalysisPlanCreator
+from opendp_apps.analysis.epsilon_budget_ledger import EpsilonBudgetLedger
+from opendp_apps.analysis.exceptions import EpsilonNotSetException
+from opendp_apps.analysis.models import AnalysisPlan, EpsilonBudget
+from opendp_apps.analysis.testing.base_analysis_plan_test import BaseAnalysisPlanTest
+from opendp_apps.model_helpers.msg_util import msgt
+
+
+class EpsilonBudgetLedgerTest(BaseAnalysisPlanTest):
+    fixtures = ['test_analysis_002.json']
+
+    def create_plan(self, name, epsilon):
+        plan_info = self.working_plan_info.copy()
+        plan_info['name'] = name
+        plan_info['epsilon'] = epsilon
+        return AnalysisPlanCreator(self.user_obj, plan_info)
+
+    def test_10_budget_follows_plans(self):
+        """(10) The EpsilonBudget is updated as AnalysisPlans are created and deleted"""
+        msgt(self.test_10_budget_follows_plans.__doc__)
+
+        self.assertFalse(EpsilonBudget.objects.filter(dataset=self.dataset_info).exists())
+
+        plan_util = self.create_plan('Plan 1', 0.25)
+        self.assertFalse(plan_util.has_error())
+        self.assertEqual(plan_util.available_epsilon, 1.0)
+
+        plan_util2 = self.create_plan('Plan 2', 0.5)
+        self.assertFalse(plan_util2.has_error())
+        self.assertEqual(plan_util2.available_epsilon, 0.75)
+
+        budget = EpsilonBudget.objects.get(dataset=self.dataset_info)
+        self.assertEqual(budget.allotted_epsilon, 0.75)
+        self.assertEqual(AnalysisPlanCreator.get_available_epsilon(self.dataset_info), 0.25)
+
+        # Deleting a plan returns its epsilon
+        plan_util.analysis_plan.delete()
+        budget.refresh_from_db()
+        self.assertEqual(budget.allotted_epsilon, 0.5)
+        self.assertEqual(AnalysisPlanCreator.get_available_epsilon(self.dataset_info), 0.5)
+
+    def test_20_not_enough_epsilon(self):
+        """(20) A plan over the budget isn't created and the budget is unchanged"""
+        msgt(self.test_20_not_enough_epsilon.__doc__)
+
+        self.assertFalse(self.create_plan('Plan 1', 0.75).has_error())
+
+        plan_util = self.create_plan('Plan 2', 0.5)
+        self.assertTrue(plan_util.has_error())
+        expected_msg = astatic.ERR_MSG_NOT_ENOUGH_EPSILON_AVAILABLE.format(available_epsilon=0.25,
+                                                                           requested_epsilon=0.5)
+        self.assertEqual(plan_util.get_err_msg(), expected_msg)
+        self.assertEqual(AnalysisPlan.objects.filter(dataset=self.dataset_info).count(), 1)
+        self.assertEqual(EpsilonBudget.objects.get(dataset=self.dataset_info).allotted_epsilon, 0.75)
+
+        self.assertFalse(self.create_plan('Plan 3', 0.25).has_error())
+        plan_util = self.create_plan('Plan 4', 0.1)
+        self.assertTrue(plan_util.has_error())
+        self.assertEqual(plan_util.get_err_msg(), astatic.ERR_MSG_NO_EPSILON_AVAILABLE)
+
+    def test_30_budget_check_query_count(self):
+        """(30) Checking the budget doesn't depend on the number of AnalysisPlans"""
+        msgt(self.test_30_budget_check_query_count.__doc__)
+
+        for idx in range(5):
+            self.assertFalse(self.create_plan(f'Plan {idx}', 0.1).has_error())
+
+        self.dataset_info.refresh_from_db()
+        _depositor_info = self.dataset_info.depositor_setup_info
+        with self.assertNumQueries(1):
+            available_epsilon = AnalysisPlanCreator.get_available_epsilon(self.dataset_info)
+        self.assertAlmostEqual(available_epsilon, 0.5)
+
+    def test_40_reconcile(self):
+        """(40) Plans changed outside of AnalysisPlanCreator are picked up by reconciling"""
+        msgt(self.test_40_reconcile.__doc__)
+
+        plan_util = self.create_plan('Plan 1', 0.25)
+        self.assertFalse(plan_util.has_error())
+
+        # Change the epsilon directly
+        AnalysisPlan.objects.filter(id=plan_util.analysis_plan.id).update(epsilon=0.5)
+        self.assertEqual(AnalysisPlanCreator.get_available_epsilon(self.dataset_info), 0.75)
+
+        out = StringIO()
+        call_command('reconcile_epsilon_budgets', stdout=out)
+        self.assertIn('Epsilon budgets reconciled: 1', out.getvalue())
+
+        budget = EpsilonBudget.objects.get(dataset=self.dataset_info)
+        self.assertEqual(budget.allotted_epsilon, 0.5)
+        self.assertIsNotNone(budget.reconciled)
+        self.assertEqual(AnalysisPlanCreator.get_available_epsilon(self.dataset_info), 0.5)
+
+        # A plan without epsilon can't be totaled
+        AnalysisPlan.objects.filter(id=plan_util.analysis_plan.id).update(epsilon=None)
+        with self.assertRaises(EpsilonNotSetException):
+            EpsilonBudgetLedger.reconcile(self.dataset_info)
@@ -0,0 +1,122 @@
+from os.path import abspath, dirname, isfile, join
+
+from django.test import TestCase
+
+from opendp_apps.analysis import static_vals as astatic
+from opendp_apps.analysis.tools.dp_count_spec import DPCountSpec
+from opendp_apps.analysis.tools.dp_histogram_categorical_spec import DPHistogramCategoricalSpec
+from opendp_apps.analysis.tools.dp_mean_spec import DPMeanSpec
+from opendp_apps.analysis.tools.multi_stat_runner import MultiStatRunner
+from opendp_apps.model_helpers.msg_util import msgt
+from opendp_apps.profiler import static_vals as pstatic
+
+CURRENT_DIR = dirname(abspath(__file__))
+TEST_DATA_DIR = join(dirname(dirname(dirname(CURRENT_DIR))), 'test_data')
+
+
+class MultiStatRunnerTest(TestCase):
+    """Test running several StatSpecs against a single parse of the data file"""
+
+    def setUp(self):
+        """Build valid specs for the eye-typing (Fatigue) data"""
+        self.eye_fatigue_filepath = join(TEST_DATA_DIR, 'Fatigue_data.tab')
+        self.assertTrue(isfile(self.eye_fatigue_filepath))
+
+        # We know this data has 24 columns
+        self.col_indexes = [idx for idx in range(0, 24)]
+
+        self.mean_props = {'variable': 'EyeHeight',
+                           'col_index': 19,
+                           'statistic': astatic.DP_MEAN,
+                           'dataset_size': 183,
+                           'epsilon': 1.0,
+                           'delta': 0.0,
+                           'cl': astatic.CL_95,
+                           'missing_values_handling': astatic.MISSING_VAL_INSERT_FIXED,
+                           'fixed_value': '5',
+                           'variable_info': {'min': -8,
+                                             'max': 5,
+                                             'type': pstatic.VAR_TYPE_FLOAT}}
+
+        self.count_props = {'variable': 'TypingSpeed',
+                            'col_index': 5,
+                            'statistic': astatic.DP_COUNT,
+                            'epsilon': 1.0,
+                            'cl': astatic.CL_99,
+                            'variable_info': {'type': pstatic.VAR_TYPE_FLOAT}}
+
+        self.hist_props = {'variable': 'Subject',
+                           'col_index': 0,
+                           'statistic': astatic.DP_HISTOGRAM,
+                           'dataset_size': 183,
+                           'epsilon': 1.0,
+                           'delta': 0.0,
+                           'cl': astatic.CL_95,
+                           'missing_values_handling': astatic.MISSING_VAL_INSERT_FIXED,
+                           'fixed_value': 'ac',
+                           'variable_info': {'categories': ['ac', 'kj', 'ys', 'bh1', 'bh2', 'jm', 'mh', 'cw',
+                                                            'jp', 'rh', 'aq', 'ph', 'le', 'mn', 'ls2', 'no',
+                                                            'af'],
+                                             'type': pstatic.VAR_TYPE_CATEGORICAL}}
+
+    def get_valid_specs(self):
+        """Return a list of validated StatSpecs"""
+        stat_specs = [DPMeanSpec(self.mean_props),
+                      DPCountSpec(self.count_props),
+                      DPHistogramCategoricalSpec(self.hist_props)]
+        for stat_spec in stat_specs:
+            self.assertTrue(stat_spec.is_chain_valid())
+
+        return stat_specs
+
+    def test_10_run_several_stats(self):
+        """(10) Compute a mean, count, and histogram from one parse of the file"""
+        msgt(self.test_10_run_several_stats.__doc__)
+
+        dp_mean, dp_count, dp_hist = stat_specs = self.get_valid_specs()
+
+        with open(self.eye_fatigue_filepath, 'r') as file_obj:
+            runner = MultiStatRunner(stat_specs, self.col_indexes, file_obj, sep_char="\t")
+
+        self.assertFalse(runner.has_error())
+        for stat_spec in stat_specs:
+            self.assertFalse(stat_spec.has_error())
+
+        # The mean is clamped to the bounds
+        self.assertTrue(-8 <= dp_mean.value <= 5)
+
+        # 183 rows + the header row
+        self.assertTrue(dp_count.value > 170)
+
+        # Histogram values are paired with the categories
+        self.assertIn('uncategorized', dp_hist.value['categories'])
+        self.assertEqual(len(dp_hist.value['categories']), len(dp_hist.value['values']))
+        self.assertEqual(len(dp_hist.value['category_value_pairs']), 18)
+
+        self.assertIn('description', dp_hist.get_release_dict())
+
+    def test_20_only_needed_columns_are_split(self):
+        """(20) Only split the columns up to the highest column index used"""
+        msgt(self.test_20_only_needed_columns_are_split.__doc__)
+
+        stat_specs = self.get_valid_specs()
+
+        with open(self.eye_fatigue_filepath, 'r') as file_obj:
+            runner = MultiStatRunner(stat_specs, self.col_indexes, file_obj, sep_char="\t")
+
+        self.assertFalse(runner.has_error())
+        self.assertEqual(runner.get_split_column_names(), list(range(0, 20)))
+
+    def test_30_spec_with_error(self):
+        """(30) A StatSpec with an error stops the run"""
+        msgt(self.test_30_spec_with_error.__doc__)
+
+        stat_specs = self.get_valid_specs()
+        stat_specs[1].add_err_msg('Something went wrong')
+
+        with open(self.eye_fatigue_filepath, 'r') as file_obj:
+            runner = MultiStatRunner(stat_specs, self.col_indexes, file_obj, sep_char="\t")
+
+        self.assertTrue(runner.has_error())
+        self.assertIn('Something went wrong', runner.get_err_msg())
+        self.assertIsNone(stat_specs[0].value)
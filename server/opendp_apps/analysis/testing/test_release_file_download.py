@@ -0,0 +1,85 @@
+import hashlib
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from opendp_apps.analysis.models import ReleaseInfo
+from opendp_apps.dataset.models import DatasetInfo
+from opendp_apps.model_helpers.msg_util import msgt
+
+
+class ReleaseFileDownloadTest(TestCase):
+    fixtures = ['test_analysis_002.json']
+
+    def setUp(self):
+        self.user_obj, _created = get_user_model().objects.get_or_create(username='dp_analyst')
+        self.client = APIClient()
+        self.client.force_login(self.user_obj)
+
+        self.json_content = json.dumps({'name': 'Teacher survey release'}).encode()
+        self.release_info = ReleaseInfo.objects.create(dataset=DatasetInfo.objects.get(id=2),
+                                                       epsilon_used=0.5,
+                                                       dp_release={'name': 'Teacher survey release'})
+        self.release_info.dp_release_json_file.save('release.json', ContentFile(self.json_content))
+
+        self.json_url = f'/api/release-download/{self.release_info.object_id}/json/'
+        self.expected_etag = (f'"{self.release_info.object_id}-'
+                              f'{hashlib.sha256(self.json_content).hexdigest()}"')
+
+    def tearDown(self):
+        self.release_info.dp_release_json_file.delete()
+
+    def test_10_etag_and_cache_control(self):
+        """(10) The download has a strong ETag and may be kept by the browser"""
+        msgt(self.test_10_etag_and_cache_control.__doc__)
+
+        response = self.client.get(self.json_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), self.json_content)
+        self.assertEqual(response['ETag'], self.expected_etag)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+        self.assertEqual(response['Content-Disposition'],
+                         f'attachment; filename="release_{self.release_info.object_id}.json"')
+
+    def test_20_not_modified(self):
+        """(20) A matching If-None-Match gets a 304, other ETags get the file"""
+        msgt(self.test_20_not_modified.__doc__)
+
+        response = self.client.get(self.json_url, HTTP_IF_NONE_MATCH=self.expected_etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], self.expected_etag)
+        self.assertEqual(response.content, b'')
+
+        response = self.client.get(self.json_url, HTTP_IF_NONE_MATCH='"some-other-etag"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Login is still required
+        response = APIClient().get(self.json_url, HTTP_IF_NONE_MATCH=self.expected_etag)
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    @override_settings(RELEASE_DOWNLOAD_SENDFILE_HEADER='X-Accel-Redirect',
+                       RELEASE_DOWNLOAD_ACCEL_REDIRECT_PREFIX='/protected-release-files/')
+    def test_30_accel_redirect(self):
+        """(30) With X-Accel-Redirect, the web server sends the file"""
+        msgt(self.test_30_accel_redirect.__doc__)
+
+        response = self.client.get(self.json_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['X-Accel-Redirect'],
+                         '/protected-release-files/' + self.release_info.dp_release_json_file.name)
+        self.assertEqual(response['ETag'], self.expected_etag)
+
+    @override_settings(RELEASE_DOWNLOAD_SENDFILE_HEADER='X-Sendfile')
+    def test_40_sendfile(self):
+        """(40) With X-Sendfile, the header has the file path"""
+        msgt(self.test_40_sendfile.__doc__)
+
+        response = self.client.get(self.json_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Sendfile'], self.release_info.dp_release_json_file.path)
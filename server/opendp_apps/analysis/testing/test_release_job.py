@@ -0,0 +1,166 @@
+import json
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from opendp_apps.analysis import static_vals as astatic
+from opendp_apps.analysis.models import AnalysisPlan
+from opendp_apps.analysis.release_claim import claim_release, get_release_claim_key
+from opendp_apps.analysis.testing.base_stat_spec_test import StatSpecTestCase
+from opendp_apps.analysis.validate_release_util import ValidateReleaseUtil
+from opendp_apps.async_messages import static_vals as async_static
+from opendp_apps.model_helpers.msg_util import msgt
+
+
+class TestReleaseJob(StatSpecTestCase):
+    """Test computing a release via the run_release Celery task"""
+
+    def setUp(self):
+        super().setUp()
+
+        self.client = APIClient()
+        self.client.force_login(self.user_obj)
+
+        self.analysis_plan = self.retrieve_new_plan()
+        self.analysis_plan.variable_info['EyeHeight']['min'] = -8
+        self.analysis_plan.variable_info['EyeHeight']['max'] = 5
+        self.analysis_plan.variable_info['TypingSpeed']['min'] = 3
+        self.analysis_plan.variable_info['TypingSpeed']['max'] = 30
+        self.analysis_plan.dp_statistics = [
+            {"statistic": astatic.DP_MEAN,
+             "variable": "EyeHeight",
+             "epsilon": 0.25,
+             "delta": 0,
+             "cl": astatic.CL_95,
+             "error": "",
+             "missing_values_handling": astatic.MISSING_VAL_INSERT_FIXED,
+             "handle_as_fixed": False,
+             "fixed_value": "1",
+             "locked": False,
+             "label": "EyeHeight"},
+            {"statistic": astatic.DP_MEAN,
+             "variable": "TypingSpeed",
+             "epsilon": 0.25,
+             "delta": 0,
+             "cl": astatic.CL_99,
+             "error": "",
+             "missing_values_handling": astatic.MISSING_VAL_INSERT_FIXED,
+             "handle_as_fixed": False,
+             "fixed_value": "9",
+             "locked": False,
+             "label": "TypingSpeed"},
+        ]
+        self.analysis_plan.save()
+
+    def start_release(self):
+        """Start the release via the API"""
+        params = dict(object_id=str(self.analysis_plan.object_id))
+        return self.client.post(self.API_RELEASE_PREFIX,
+                                json.dumps(params),
+                                content_type='application/json')
+
+    @override_settings(SKIP_PDF_CREATION_FOR_TESTS=True)
+    def test_10_progress_sent(self):
+        """(10) Progress is sent after validation, for each statistic, and before the release files"""
+        msgt(self.test_10_progress_sent.__doc__)
+
+        progress_list = []
+
+        def progress_callback(user_msg, **progress):
+            progress_list.append(dict(progress, message=user_msg))
+
+        release_util = ValidateReleaseUtil.compute_mode(self.user_obj,
+                                                        self.analysis_plan.object_id,
+                                                        progress_callback=progress_callback)
+        self.assertFalse(release_util.has_error())
+
+        self.assertEqual([x['step'] for x in progress_list],
+                         [astatic.RELEASE_STEP_VALIDATED,
+                          astatic.RELEASE_STEP_STATISTIC,
+                          astatic.RELEASE_STEP_STATISTIC,
+                          astatic.RELEASE_STEP_RELEASE_FILES])
+        self.assertEqual(progress_list[0]['num_stats'], 2)
+        self.assertEqual(progress_list[2]['stat_num'], 2)
+        self.assertEqual(progress_list[2]['variable'], 'TypingSpeed')
+
+    @override_settings(SKIP_PDF_CREATION_FOR_TESTS=True)
+    def test_20_job_status(self):
+        """(20) The release returns a job_id and the job status has the ReleaseInfo"""
+        msgt(self.test_20_job_status.__doc__)
+
+        response = self.start_release()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(response.json()['success'])
+
+        response = self.get_release_job_status(response)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        jresp = response.json()
+        self.assertEqual(jresp['data']['status'], async_static.RELEASE_JOB_STATUS_COMPLETE)
+        self.assertEqual(len(jresp['data']['release_info']['dp_release']['statistics']), 2)
+
+    @override_settings(SKIP_PDF_CREATION_FOR_TESTS=True)
+    def test_30_job_status_another_user(self):
+        """(30) Another user can't see the job status"""
+        msgt(self.test_30_job_status_another_user.__doc__)
+
+        response = self.start_release()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_id = response.json()['data']['job_id']
+
+        other_user, _created = get_user_model().objects.get_or_create(username='other_user')
+        self.client.force_login(other_user)
+
+        response = self.client.get(f'{self.API_RELEASE_PREFIX}job-status/{job_id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json()['message'], async_static.ERR_MSG_RELEASE_JOB_NOT_FOUND)
+
+    def test_40_unknown_job_pending(self):
+        """(40) An unknown job_id is reported as pending and a bad plan isn't started"""
+        msgt(self.test_40_unknown_job_pending.__doc__)
+
+        response = self.client.get(f'{self.API_RELEASE_PREFIX}job-status/{uuid.uuid4()}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['status'], async_static.RELEASE_JOB_STATUS_PENDING)
+
+        params = dict(object_id=str(uuid.uuid4()))
+        response = self.client.post(self.API_RELEASE_PREFIX,
+                                    json.dumps(params),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(SKIP_PDF_CREATION_FOR_TESTS=True)
+    def test_50_single_release(self):
+        """(50) A release isn't started if the plan has a release or one is being computed"""
+        msgt(self.test_50_single_release.__doc__)
+
+        # Another job holds the claim
+        self.assertTrue(claim_release(self.analysis_plan.object_id, 'other-job-id'))
+        response = self.start_release()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()['message'], astatic.ERR_MSG_RELEASE_IN_PROGRESS)
+        self.assertIsNone(AnalysisPlan.objects.get(id=self.analysis_plan.id).release_info)
+
+        # The claim is released at the end of the job
+        caches[astatic.RELEASE_CLAIM_CACHE].delete(get_release_claim_key(self.analysis_plan.object_id))
+        response = self.start_release()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIsNone(caches[astatic.RELEASE_CLAIM_CACHE].get(
+                                get_release_claim_key(self.analysis_plan.object_id)))
+        release_info = AnalysisPlan.objects.get(id=self.analysis_plan.id).release_info
+        self.assertIsNotNone(release_info)
+
+        # A 2nd request, e.g. a double-click
+        response = self.start_release()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()['message'], astatic.ERR_MSG_RELEASE_ALREADY_CREATED)
+
+        # The task checks again
+        release_util = ValidateReleaseUtil.compute_mode(self.user_obj, self.analysis_plan.object_id)
+        self.assertTrue(release_util.has_error())
+        self.assertEqual(release_util.get_err_msg(), astatic.ERR_MSG_RELEASE_ALREADY_CREATED)
+        self.assertEqual(release_info.id, AnalysisPlan.objects.get(id=self.analysis_plan.id).release_info.id)
@@ -194,6 +194,7 @@ class TestRunRelease(StatSpecTestCase):
         response = self.client.post(self.API_RELEASE_PREFIX,
                                     json.dumps(params),
                                     content_type='application/json')
+        response = self.get_release_job_status(response)
 
         jresp = response.json()
         # print('jresp', jresp)
@@ -220,6 +221,7 @@ class TestRunRelease(StatSpecTestCase):
         response = self.client.post(self.API_RELEASE_PREFIX,
                                     json.dumps(params),
                                     content_type='application/json')
+        response = self.get_release_job_status(response)
 
         jresp = response.json()
         print('jresp', jresp)
@@ -251,10 +253,11 @@ class TestRunRelease(StatSpecTestCase):
         response = self.client.post(self.API_RELEASE_PREFIX,
                                     json.dumps(params),
                                     content_type='application/json')
+        response = self.get_release_job_status(response)
 
-        jresp = response.json()
+        jresp = response.json()['data']['release_info']
         # print('jresp', json.dumps(jresp, indent=4))
-        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIsNotNone(jresp['dp_release'])
         self.assertIsNotNone(jresp['object_id'])
 
@@ -298,10 +301,11 @@ class TestRunRelease(StatSpecTestCase):
         response = self.client.post(self.API_RELEASE_PREFIX,
                                     json.dumps(params),
                                     content_type='application/json')
+        response = self.get_release_job_status(response)
 
-        jresp = response.json()
+        jresp = response.json()['data']['release_info']
         # print('jresp', jresp)
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         updated_plan = AnalysisPlan.objects.get(object_id=analysis_plan.object_id)
 
@@ -366,9 +370,10 @@ class TestRunRelease(StatSpecTestCase):
         response = self.client.post(self.API_RELEASE_PREFIX,
                                     json.dumps(params),
                                     content_type='application/json')
+        response = self.get_release_job_status(response)
 
-        jresp = response.json()
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        jresp = response.json()['data']['release_info']
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIsNotNone(jresp['dp_release'])
         self.assertIsNotNone(jresp['object_id'])
 
@@ -546,10 +551,11 @@ class TestRunRelease(StatSpecTestCase):
         response = self.client.post(self.API_RELEASE_PREFIX,
                                     json.dumps(params),
                                     content_type='application/json')
+        response = self.get_release_job_status(response)
 
-        jresp = response.json()
+        jresp = response.json()['data']['release_info']
         # print('jresp', jresp)
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         self.assertIsNotNone(jresp['dp_release'])
         self.assertIsNotNone(jresp['object_id'])
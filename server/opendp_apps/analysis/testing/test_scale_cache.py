@@ -0,0 +1,107 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from opendp.mod import binary_search
+
+from opendp_apps.analysis import static_vals as astatic
+from opendp_apps.analysis.tools import scale_cache
+from opendp_apps.analysis.tools.dp_mean_spec import DPMeanSpec
+from opendp_apps.model_helpers.msg_util import msgt
+from opendp_apps.profiler import static_vals as pstatic
+
+
+class ScaleCacheTest(TestCase):
+    """Test re-using calibrated noise scales"""
+
+    def setUp(self):
+        """Clear the cache and set up DP Mean properties"""
+        scale_cache.clear_scale_cache()
+
+        self.mean_props = {'variable': 'EyeHeight',
+                           'col_index': 19,
+                           'statistic': astatic.DP_MEAN,
+                           'dataset_size': 183,
+                           'epsilon': 1.0,
+                           'delta': 0.0,
+                           'cl': astatic.CL_95,
+                           'missing_values_handling': astatic.MISSING_VAL_INSERT_FIXED,
+                           'fixed_value': '5',
+                           'variable_info': {'min': -8,
+                                             'max': 5,
+                                             'type': pstatic.VAR_TYPE_FLOAT}}
+
+    def test_10_scale_reused(self):
+        """(10) The scale is calculated once for the same chain parameters"""
+        msgt(self.test_10_scale_reused.__doc__)
+
+        with patch.object(DPMeanSpec, 'find_scale', autospec=True,
+                          side_effect=DPMeanSpec.find_scale) as mock_search:
+            dp_mean1 = DPMeanSpec(self.mean_props)
+            self.assertTrue(dp_mean1.is_chain_valid())
+            self.assertEqual(mock_search.call_count, 1)
+
+            dp_mean2 = DPMeanSpec(self.mean_props)
+            self.assertTrue(dp_mean2.is_chain_valid())
+            self.assertEqual(mock_search.call_count, 1)
+            self.assertEqual(dp_mean1.scale, dp_mean2.scale)
+            self.assertEqual(dp_mean1.accuracy_val, dp_mean2.accuracy_val)
+
+            # A new epsilon needs a new scale
+            self.mean_props['epsilon'] = 0.5
+            dp_mean3 = DPMeanSpec(self.mean_props)
+            self.assertTrue(dp_mean3.is_chain_valid())
+            self.assertEqual(mock_search.call_count, 2)
+            self.assertNotEqual(dp_mean1.scale, dp_mean3.scale)
+
+        self.assertEqual(scale_cache.get_scale_cache_size(), 2)
+
+    def test_15_closed_form_scale(self):
+        """(15) The scale is sensitivity/epsilon, the binary search isn't needed"""
+        msgt(self.test_15_closed_form_scale.__doc__)
+
+        with patch('opendp_apps.analysis.tools.stat_spec.binary_search',
+                   wraps=binary_search) as mock_search:
+            dp_mean = DPMeanSpec(self.mean_props)
+            self.assertTrue(dp_mean.is_chain_valid())
+            self.assertEqual(mock_search.call_count, 0)
+
+        # Sensitivity of the mean: (max - min) / dataset_size
+        self.assertAlmostEqual(dp_mean.scale, (5 - -8) / 183 / 1.0, places=9)
+
+    def test_17_binary_search_fallback(self):
+        """(17) Outside of the search bounds, the binary search gives the same error as before"""
+        msgt(self.test_17_binary_search_fallback.__doc__)
+
+        self.mean_props['variable_info']['max'] = 1_000_000
+        self.mean_props['epsilon'] = 0.01
+        dp_mean = DPMeanSpec(self.mean_props)
+        self.assertFalse(dp_mean.is_chain_valid())
+        self.assertIn('decision boundary', dp_mean.get_err_msgs()[0])
+
+    def test_20_least_recently_used_removed(self):
+        """(20) The least recently used scale is removed when the cache is full"""
+        msgt(self.test_20_least_recently_used_removed.__doc__)
+
+        with patch.object(scale_cache, 'SCALE_CACHE_MAX_SIZE', 2):
+            scale_cache.get_calibrated_scale(('a',), lambda: 1.0)
+            scale_cache.get_calibrated_scale(('b',), lambda: 2.0)
+            self.assertEqual(scale_cache.get_calibrated_scale(('a',), lambda: -1), 1.0)
+
+            scale_cache.get_calibrated_scale(('c',), lambda: 3.0)
+            self.assertEqual(scale_cache.get_scale_cache_size(), 2)
+
+            # 'b' was removed, 'a' was kept
+            self.assertEqual(scale_cache.get_calibrated_scale(('a',), lambda: -1), 1.0)
+            self.assertEqual(scale_cache.get_calibrated_scale(('b',), lambda: -1), -1)
+
+    def test_30_failed_calibration_not_cached(self):
+        """(30) Errors from the calibration are passed on and not cached"""
+        msgt(self.test_30_failed_calibration_not_cached.__doc__)
+
+        def bad_calibration():
+            raise AssertionError('bounds are too broad')
+
+        with self.assertRaises(AssertionError):
+            scale_cache.get_calibrated_scale(('bad',), bad_calibration)
+
+        self.assertEqual(scale_cache.get_scale_cache_size(), 0)
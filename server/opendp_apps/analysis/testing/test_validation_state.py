@@ -0,0 +1,152 @@
+from unittest.mock import patch
+
+from django.core.cache import caches
+
+from opendp_apps.analysis import static_vals as astatic
+from opendp_apps.analysis.serializers import ReleaseValidationSerializer
+from opendp_apps.analysis.testing.base_stat_spec_test import StatSpecTestCase
+from opendp_apps.analysis.tools.stat_spec import StatSpec
+from opendp_apps.model_helpers.msg_util import msgt
+
+
+class TestValidationState(StatSpecTestCase):
+    """Test re-validating statistics using the saved ValidationState"""
+
+    def setUp(self):
+        super().setUp()
+        caches[astatic.VALIDATION_STATE_CACHE].clear()
+
+        self.analysis_plan = self.retrieve_new_plan()
+        self.analysis_plan.variable_info['EyeHeight']['min'] = -8
+        self.analysis_plan.variable_info['EyeHeight']['max'] = 5
+        self.analysis_plan.variable_info['TypingSpeed']['min'] = 3
+        self.analysis_plan.variable_info['TypingSpeed']['max'] = 30
+        self.analysis_plan.save()
+
+        self.stat_specs = [
+            {"statistic": astatic.DP_MEAN,
+             "variable": "EyeHeight",
+             "epsilon": 0.25,
+             "delta": 0,
+             "cl": astatic.CL_95,
+             "error": "",
+             "missing_values_handling": astatic.MISSING_VAL_INSERT_FIXED,
+             "handle_as_fixed": False,
+             "fixed_value": "1",
+             "locked": False,
+             "label": "EyeHeight"},
+            {"statistic": astatic.DP_MEAN,
+             "variable": "TypingSpeed",
+             "epsilon": 0.25,
+             "delta": 0,
+             "cl": astatic.CL_99,
+             "error": "",
+             "missing_values_handling": astatic.MISSING_VAL_INSERT_FIXED,
+             "handle_as_fixed": False,
+             "fixed_value": "9",
+             "locked": False,
+             "label": "TypingSpeed"},
+        ]
+
+    def run_validation(self, **params):
+        """Validate "dp_statistics" or a "statistics_diff" using the ReleaseValidationSerializer"""
+        request_plan = dict(analysis_plan_id=self.analysis_plan.object_id, **params)
+
+        serializer = ReleaseValidationSerializer(data=request_plan)
+        self.assertTrue(serializer.is_valid())
+
+        return serializer.save(**dict(opendp_user=self.user_obj))
+
+    def test_10_unchanged_stats_not_rebuilt(self):
+        """(10) Validating the same statistics again re-uses the chain validation results"""
+        msgt(self.test_10_unchanged_stats_not_rebuilt.__doc__)
+
+        with patch.object(StatSpec, 'is_chain_valid', autospec=True,
+                          side_effect=StatSpec.is_chain_valid) as mock_valid:
+            stats_info = self.run_validation(dp_statistics=self.stat_specs)
+            self.assertTrue(stats_info.success)
+            self.assertEqual(mock_valid.call_count, 2)
+
+            # Only the label changed, nothing is rebuilt
+            self.stat_specs[1]['label'] = 'Typing Speed'
+            stats_info2 = self.run_validation(dp_statistics=self.stat_specs)
+            self.assertTrue(stats_info2.success)
+            self.assertEqual(mock_valid.call_count, 2)
+
+            # New epsilon, the changed statistic is rebuilt
+            self.stat_specs[1]['epsilon'] = 0.5
+            stats_info3 = self.run_validation(dp_statistics=self.stat_specs)
+            self.assertTrue(stats_info3.success)
+            self.assertEqual(mock_valid.call_count, 3)
+
+        self.assertEqual(stats_info.data, stats_info2.data)
+        self.assertTrue(all(x['valid'] for x in stats_info3.data))
+        self.assertNotEqual(stats_info.data[1]['accuracy'], stats_info3.data[1]['accuracy'])
+
+    def test_20_statistics_diff(self):
+        """(20) A statistics_diff gives the same results as the full statistics list"""
+        msgt(self.test_20_statistics_diff.__doc__)
+
+        stats_info = self.run_validation(dp_statistics=self.stat_specs)
+        self.assertTrue(stats_info.success)
+
+        # Use more than the plan's epsilon (1.0)
+        changed_stat = dict(self.stat_specs[0], epsilon=0.6)
+        added_stat = dict(self.stat_specs[1], epsilon=0.3)
+
+        with patch.object(StatSpec, 'is_chain_valid', autospec=True,
+                          side_effect=StatSpec.is_chain_valid) as mock_valid:
+            diff_info = self.run_validation(statistics_diff=dict(changed=[dict(index=0, statistic=changed_stat)],
+                                                                 added=[added_stat]))
+            self.assertTrue(diff_info.success)
+            self.assertEqual(mock_valid.call_count, 2)
+
+        self.assertEqual(len(diff_info.data), 3)
+        self.assertTrue(diff_info.data[0]['valid'])
+        self.assertTrue(diff_info.data[1]['valid'])
+        self.assertFalse(diff_info.data[2]['valid'])
+        self.assertIn('exceeds the max epsilon', diff_info.data[2]['message'])
+
+        # Same as sending the full list
+        caches[astatic.VALIDATION_STATE_CACHE].clear()
+        full_info = self.run_validation(dp_statistics=[changed_stat, self.stat_specs[1], added_stat])
+        self.assertEqual(diff_info.data, full_info.data)
+
+        # Remove the first statistic, the running epsilon is within the budget again
+        diff_info2 = self.run_validation(statistics_diff=dict(removed=[0]))
+        self.assertTrue(diff_info2.success)
+        self.assertEqual(len(diff_info2.data), 2)
+        self.assertTrue(all(x['valid'] for x in diff_info2.data))
+
+    def test_30_statistics_diff_errors(self):
+        """(30) A statistics_diff needs a saved state and valid indices"""
+        msgt(self.test_30_statistics_diff_errors.__doc__)
+
+        diff_info = self.run_validation(statistics_diff=dict(removed=[0]))
+        self.assertFalse(diff_info.success)
+        self.assertEqual(diff_info.message, astatic.ERR_MSG_VALIDATION_STATE_NOT_FOUND)
+
+        self.assertTrue(self.run_validation(dp_statistics=self.stat_specs).success)
+
+        diff_info2 = self.run_validation(statistics_diff=dict(removed=[1, 5]))
+        self.assertFalse(diff_info2.success)
+        self.assertEqual(diff_info2.message,
+                         astatic.ERR_MSG_VALIDATION_DIFF_BAD_INDEX.format(indices=[5], num_stats=2))
+
+        # A plan change drops the saved state
+        self.analysis_plan.variable_info['EyeHeight']['max'] = 6
+        self.analysis_plan.save()
+        diff_info3 = self.run_validation(statistics_diff=dict(removed=[1]))
+        self.assertFalse(diff_info3.success)
+        self.assertEqual(diff_info3.message, astatic.ERR_MSG_VALIDATION_STATE_NOT_FOUND)
+
+    def test_40_stats_or_diff_required(self):
+        """(40) Send either dp_statistics or statistics_diff"""
+        msgt(self.test_40_stats_or_diff_required.__doc__)
+
+        for params in [dict(),
+                       dict(dp_statistics=self.stat_specs, statistics_diff=dict(removed=[0]))]:
+            serializer = ReleaseValidationSerializer(data=dict(analysis_plan_id=self.analysis_plan.object_id,
+                                                               **params))
+            self.assertFalse(serializer.is_valid())
+            self.assertIn(astatic.ERR_MSG_VALIDATION_STATS_OR_DIFF, str(serializer.errors))
@@ -7,7 +7,7 @@ from django.conf import settings
 from opendp.accuracy import laplacian_scale_to_accuracy
 from opendp.measurements import make_base_geometric
 from opendp.mod import OpenDPException
-from opendp.mod import binary_search, enable_features
+from opendp.mod import enable_features
 from opendp.transformations import \
     (make_cast,
      make_count,
@@ -98,8 +98,7 @@ class DPCountSpec(StatSpec):
                 make_count(TIA=str)
         )
 
-        self.scale = binary_search(lambda s: self.check_scale(s, preprocessor, self.max_influence, self.epsilon),
-                                   bounds=(0.0, 1000.0))
+        self.scale = self.get_calibrated_scale(lambda: self.find_scale(preprocessor, bounds=(0.0, 1000.0)))
 
         preprocessor = preprocessor >> make_base_geometric(self.scale)
 
@@ -156,8 +156,9 @@ class DPHistogramBooleanSpec(StatSpec):
                 make_count_by_categories(categories=self.categories, MO=L1Distance[int], TIA=str)
         )
 
-        self.scale = binary_search_param(
-            lambda s: self.check_scale(s, preprocessor), d_in=self.max_influence, d_out=self.epsilon)
+        self.scale = self.get_calibrated_scale(
+            lambda: binary_search_param(
+                lambda s: self.check_scale(s, preprocessor), d_in=self.max_influence, d_out=self.epsilon))
         preprocessor = preprocessor >> make_base_geometric(scale=self.scale, D=VectorDomain[AllDomain[int]])
 
         # keep a pointer to the preprocessor in case it's re-used
@@ -226,7 +227,7 @@ class DPHistogramBooleanSpec(StatSpec):
 
             computation_chain = parse_dataframe >> self.preprocessor
 
-            self.value = computation_chain(file_obj.read())
+            chain_output = computation_chain(file_obj.read())
 
         except OpenDPException as ex_obj:
             logger.exception(ex_obj)
@@ -239,20 +240,29 @@ class DPHistogramBooleanSpec(StatSpec):
                 self.add_err_msg(f'{ex_obj} (Exception)')
             return False
 
+        return self.set_release_value(chain_output)
+
+    def set_release_value(self, chain_output) -> bool:
+        """
+        Pair the DP counts from the computation chain with the categories
+        and save the result to .value
+        """
+        self.value = chain_output
+
         # Remove double quotes from the categories as well as fixed value
         #
         fmt_categories = self.get_unformatted_boolean_categories() + ['uncategorized']
 
         # Show warning if category count doesn't match values count
         if len(fmt_categories) > len(self.value):
-            user_msg = (f'Warning. There are more categories (n={len(self.fmt_categories)})'
+            user_msg = (f'Warning. There are more categories (n={len(fmt_categories)})'
                         f' than values (n={len(self.value)})')
             self.add_err_msg(user_msg)
 
             logger.warning(user_msg)
             logger.warning(f'Categories (n={len(self.categories)}): {self.categories}')
             logger.warning(f'Values (n={len(self.value)}): {self.value}')
-            return
+            return False
 
         self.value = dict(categories=fmt_categories,
                           values=self.value,
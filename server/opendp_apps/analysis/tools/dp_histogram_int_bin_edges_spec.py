@@ -200,10 +200,11 @@ class DPHistogramIntBinEdgesSpec(StatSpec):
                    make_base_discrete_laplace(
                        scale, D=VectorDomain[AllDomain[int]])
 
-        self.scale = binary_search_param(
-            make_histogram,
-            d_in=self.max_influence,
-            d_out=self.epsilon)
+        self.scale = self.get_calibrated_scale(
+            lambda: binary_search_param(
+                make_histogram,
+                d_in=self.max_influence,
+                d_out=self.epsilon))
 
         preprocessor = make_histogram(self.scale)
 
@@ -284,7 +285,7 @@ class DPHistogramIntBinEdgesSpec(StatSpec):
 
             computation_chain = parse_dataframe >> self.preprocessor
 
-            self.value = computation_chain(file_obj.read())
+            chain_output = computation_chain(file_obj.read())
 
         except OpenDPException as ex_obj:
             logger.exception(ex_obj)
@@ -297,6 +298,15 @@ class DPHistogramIntBinEdgesSpec(StatSpec):
                 self.add_err_msg(f'{ex_obj} (Exception)')
             return False
 
+        return self.set_release_value(chain_output)
+
+    def set_release_value(self, chain_output) -> bool:
+        """
+        Pair the DP counts from the computation chain with the categories
+        and save the result to .value
+        """
+        self.value = chain_output
+
         # print(f'histogram_bin_edges: {self.histogram_bin_edges}; No. edges: {len(self.histogram_bin_edges)}')
         # print(f'categories: {self.categories}; No. cats: {len(self.categories)}')
         # print(f'values: {self.value}; No. values: {len(self.value)}')
@@ -310,7 +320,7 @@ class DPHistogramIntBinEdgesSpec(StatSpec):
             logger.warning(user_msg)
             logger.warning(f'Categories (n={len(self.categories)}): {self.categories}')
             logger.warning(f'Values (n={len(self.value)}): {self.value}')
-            return
+            return False
 
         self.value = dict(categories=self.categories,
                           histogram_bin_edges=self.histogram_bin_edges,
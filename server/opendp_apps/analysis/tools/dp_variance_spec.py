@@ -6,7 +6,7 @@ Wrapper class for DP Variance functionality
 from opendp.accuracy import laplacian_scale_to_accuracy
 from opendp.measurements import make_base_laplace
 from opendp.mod import OpenDPException
-from opendp.mod import binary_search, enable_features
+from opendp.mod import enable_features
 from opendp.transformations import \
     (make_bounded_resize,
      make_cast,
@@ -129,7 +129,7 @@ class DPVarianceSpec(StatSpec):
             make_sized_bounded_variance(self.dataset_size, self.get_bounds())
         )
 
-        self.scale = binary_search(lambda s: self.check_scale(s, preprocessor, self.max_influence, self.epsilon), bounds=(0.0, 100000.0))
+        self.scale = self.get_calibrated_scale(lambda: self.find_scale(preprocessor, bounds=(0.0, 100000.0)))
         preprocessor = preprocessor >> make_base_laplace(self.scale)
 
         # keep a pointer to the preprocessor to re-use for .run_chain(...)
@@ -0,0 +1,123 @@
+"""
+Run the computation chains for several StatSpecs using a single
+read and parse of the data file.
+
+Each StatSpec.run_chain(...) reads the file and splits it with
+"make_split_dataframe". For a plan with many statistics, the same file
+was parsed once per statistic.
+
+Here, the preprocessors of the StatSpecs are combined with
+"make_basic_composition" so the file is read and split once and
+the parsed dataframe is shared by every statistic.
+
+Example:
+    ```
+    runner = MultiStatRunner(stat_spec_list, [0, 1, 2, 3], file_obj, sep_char="\t")
+    if runner.has_error():
+        print(runner.get_err_msg())
+    # Check each StatSpec for errors/results
+    ```
+"""
+import io
+import logging
+
+from django.conf import settings
+from opendp.combinators import make_basic_composition
+from opendp.mod import OpenDPException, enable_features
+from opendp.transformations import make_split_dataframe
+
+from opendp_apps.analysis.tools.stat_spec import StatSpec
+from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
+
+enable_features("floating-point", "contrib")
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+
+class MultiStatRunner(BasicErrCheck):
+
+    def __init__(self, stat_spec_list: list, column_names: list, file_obj, sep_char=","):
+        """
+        :param stat_spec_list - StatSpec objects where "is_chain_valid()" has been called
+        :param column_names - zero-based index of columns. e.g. [0, 1, 2, 3]
+        :param file_obj - file like object to read data from
+        :param sep_char - separator from the object, default is "," for a .csv, etc
+
+        After the run, results (or errors) are available on each StatSpec
+        """
+        self.stat_spec_list = stat_spec_list
+        self.column_names = column_names
+        self.file_obj = file_obj
+        self.sep_char = sep_char
+
+        self.run_chains()
+
+    def get_split_column_names(self) -> list:
+        """
+        "make_split_dataframe" assigns column names by position so only
+        the columns up to the last index used by a StatSpec are kept
+        """
+        max_col_index = max(stat_spec.col_index for stat_spec in self.stat_spec_list)
+
+        return self.column_names[:max_col_index + 1]
+
+    def run_chains(self):
+        """
+        Read/split the file once and compute every statistic
+        """
+        if self.has_error():
+            return
+
+        if not self.stat_spec_list:
+            self.add_err_msg('MultiStatRunner: There are no statistics to compute.')
+            return
+
+        for stat_spec in self.stat_spec_list:
+            assert isinstance(stat_spec, StatSpec), \
+                "stat_spec must be an instance of StatSpec"
+            if stat_spec.has_error():
+                self.add_err_msg(f'MultiStatRunner: Statistic "{stat_spec.statistic}" for'
+                                 f' variable "{stat_spec.variable}" has an error:'
+                                 f' {stat_spec.get_single_err_msg()}')
+                return
+            if not stat_spec.preprocessor:
+                assert False, 'Please call is_chain_valid() on each StatSpec before using MultiStatRunner'
+
+        if not isinstance(self.column_names, list):
+            self.add_err_msg(f'MultiStatRunner: column_names must be a list. Found: ({type(self.column_names)})')
+            return
+
+        data_text = self.file_obj.read()
+
+        try:
+            parse_dataframe = make_split_dataframe(separator=self.sep_char,
+                                                   col_names=self.get_split_column_names())
+
+            composed_chain = parse_dataframe >> \
+                make_basic_composition([stat_spec.preprocessor for stat_spec in self.stat_spec_list])
+
+            chain_outputs = composed_chain(data_text)
+
+        except OpenDPException as ex_obj:
+            logger.exception(ex_obj)
+            self.run_chains_individually(data_text)
+            return
+        except Exception as ex_obj:
+            logger.exception(ex_obj)
+            self.run_chains_individually(data_text)
+            return
+
+        for stat_spec, chain_output in zip(self.stat_spec_list, chain_outputs):
+            stat_spec.value = None
+            stat_spec.set_release_value(chain_output)
+
+    def run_chains_individually(self, data_text: str):
+        """
+        The composed chain failed. Run each StatSpec on its own so
+        that the error is attached to the statistic that caused it.
+        """
+        logger.warning('MultiStatRunner: composed chain failed, running each statistic separately')
+        for stat_spec in self.stat_spec_list:
+            stat_spec.run_chain(self.column_names, io.StringIO(data_text), sep_char=self.sep_char)
+            if stat_spec.has_error():
+                return
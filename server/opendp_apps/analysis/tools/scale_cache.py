@@ -0,0 +1,59 @@
+"""
+In-memory LRU cache of calibrated noise scales
+
+Finding a scale runs a binary search that builds and checks the OpenDP
+chain many times. The statistics form is validated on each change so
+the same parameters are calibrated over and over. The scale only depends
+on the parameters used to build the chain--see StatSpec.get_scale_cache_key()
+--so it is calculated once per process and then re-used.
+"""
+import threading
+from collections import OrderedDict
+from importlib.metadata import version
+
+from opendp_apps.analysis.static_vals import SCALE_CACHE_MAX_SIZE
+
+OPENDP_VERSION = version('opendp')
+
+_scale_cache = OrderedDict()  # cache key -> scale, least recently used first
+_scale_cache_lock = threading.Lock()
+
+
+def get_calibrated_scale(cache_key: tuple, calibrate_func):
+    """
+    Return the scale for the cache key. If it's not in the cache, call
+    calibrate_func() and save the result. Exceptions from calibrate_func()
+    are passed on and nothing is cached.
+    """
+    cache_key = (OPENDP_VERSION,) + cache_key
+    try:
+        hash(cache_key)
+    except TypeError:
+        # e.g. the parameters include a dict
+        return calibrate_func()
+
+    with _scale_cache_lock:
+        if cache_key in _scale_cache:
+            _scale_cache.move_to_end(cache_key)
+            return _scale_cache[cache_key]
+
+    scale = calibrate_func()
+
+    with _scale_cache_lock:
+        _scale_cache[cache_key] = scale
+        _scale_cache.move_to_end(cache_key)
+        while len(_scale_cache) > SCALE_CACHE_MAX_SIZE:
+            _scale_cache.popitem(last=False)
+
+    return scale
+
+
+def get_scale_cache_size() -> int:
+    """Return the number of cached scales"""
+    return len(_scale_cache)
+
+
+def clear_scale_cache():
+    """Remove all cached scales"""
+    with _scale_cache_lock:
+        _scale_cache.clear()
@@ -19,10 +19,11 @@ from typing import Union
 from django.core.exceptions import ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
 from django.template.loader import render_to_string
-from opendp.mod import OpenDPException
+from opendp.mod import OpenDPException, binary_search
 
 from opendp_apps.analysis import static_vals as astatic
 from opendp_apps.analysis.stat_valid_info import StatValidInfo
+from opendp_apps.analysis.tools import scale_cache
 from opendp_apps.profiler import static_vals as pstatic
 from opendp_apps.utils.extra_validators import \
     (validate_confidence_level,
@@ -194,6 +195,57 @@ class StatSpec:
         """
         raise NotImplementedError('check_scale')
 
+    def find_scale(self, preprocessor, bounds: tuple):
+        """
+        Return the smallest noise scale that passes "check_scale" for the preprocessor.
+          - For a scalar statistic (mean, sum, count, variance), the scale is the
+            sensitivity, "preprocessor.map(d_in)", divided by epsilon. This is
+            confirmed with a single check
+          - If the check fails, or the scale is outside the bounds, use a
+            binary search within the bounds
+        :param preprocessor: chain without the measurement
+        :param bounds: (min, max) scale for the binary search
+        """
+        try:
+            sensitivity = preprocessor.map(self.max_influence)
+            scale = sensitivity / self.epsilon * (1 + astatic.CLOSED_FORM_SCALE_MARGIN)
+            if bounds[0] < scale <= bounds[1] and \
+                    self.check_scale(scale, preprocessor, self.max_influence, self.epsilon):
+                return scale
+        except (OpenDPException, TypeError, ZeroDivisionError):
+            # e.g. the sensitivity isn't a number
+            pass
+
+        return binary_search(lambda s: self.check_scale(s, preprocessor, self.max_influence, self.epsilon),
+                             bounds=bounds)
+
+    def get_scale_cache_key(self) -> tuple:
+        """
+        Return the parameters used to build the computation chain. Statistics
+        with the same key have the same noise scale.
+        """
+        def as_tuple(values):
+            return tuple(values) if isinstance(values, list) else values
+
+        return (self.__class__.__name__,
+                self.var_type,
+                self.get_bounds(),
+                self.dataset_size,
+                self.epsilon,
+                self.max_influence,
+                self.fixed_value,
+                as_tuple(self.categories),
+                self.histogram_bin_type,
+                self.histogram_number_of_bins,
+                as_tuple(self.histogram_bin_edges))
+
+    def get_calibrated_scale(self, calibrate_func):
+        """
+        Return the noise scale, calling calibrate_func() (e.g. a binary search)
+        only if the scale for the same chain parameters isn't already cached
+        """
+        return scale_cache.get_calibrated_scale(self.get_scale_cache_key(), calibrate_func)
+
     @abc.abstractmethod
     def get_preprocessor(self):
         """
@@ -240,6 +292,19 @@ class StatSpec:
         """
         raise NotImplementedError('run_chain')
 
+    def set_release_value(self, chain_output) -> bool:
+        """
+        Save the output of the computation chain to .value
+          - Used by "run_chain()" and by the MultiStatRunner which computes
+            all statistics from a single parse of the data file
+          - Override if the output needs formatting. e.g. histograms pair
+            the counts with their categories
+
+        :return bool - False: error messages are available through .get_err_msgs()
+        """
+        self.value = chain_output
+        return True
+
     @abc.abstractmethod
     def set_accuracy(self):
         """
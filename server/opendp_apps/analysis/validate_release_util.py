@@ -24,15 +24,19 @@ from opendp_apps.analysis.analysis_plan_util import AnalysisPlanUtil
 from opendp_apps.analysis.models import AnalysisPlan, ReleaseInfo
 from opendp_apps.analysis.release_email_util import ReleaseEmailUtil
 from opendp_apps.analysis.release_info_formatter import ReleaseInfoFormatter
+from opendp_apps.analysis.stat_valid_info import StatValidInfo
 from opendp_apps.analysis.tools.dp_count_spec import DPCountSpec
 from opendp_apps.analysis.tools.dp_mean_spec import DPMeanSpec
 from opendp_apps.analysis.tools.dp_spec_error import DPSpecError
 from opendp_apps.analysis.tools.dp_sum_spec import DPSumSpec
 from opendp_apps.analysis.tools.dp_variance_spec import DPVarianceSpec
 from opendp_apps.analysis.tools.histogram_util import get_histogram_stat_spec
+from opendp_apps.analysis.tools.multi_stat_runner import MultiStatRunner
 from opendp_apps.analysis.tools.stat_spec import StatSpec
+from opendp_apps.analysis.validation_state import ValidationState
 # from opendp_apps.dataverses.dataverse_deposit_util import DataverseDepositUtil
-from opendp_apps.dp_reports.pdf_report_maker import PDFReportMaker
+from opendp_apps.dataset.columnar_cache import ColumnarCache
+from opendp_apps.dp_reports.tasks import run_pdf_report_maker
 from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
 from opendp_apps.profiler.static_vals_mime_types import get_data_file_separator
 from opendp_apps.user.models import OpenDPUser
@@ -61,8 +65,14 @@ class ValidateReleaseUtil(BasicErrCheck):
         self.dp_statistics = dp_statistics  # User defined
         self.compute_mode = compute_mode
 
+        # validate mode: changes to the last validated dp_statistics. See ValidationState.apply_statistics_diff
+        self.statistics_diff = kwargs.get('statistics_diff')
+
         self.run_dataverse_deposit = kwargs.get('run_dataverse_deposit', False)
 
+        # compute mode: called with a user message and progress info, e.g. to update a Celery task
+        self.progress_callback = kwargs.get('progress_callback')
+
         self.max_epsilon = None  # from analysis_plan
         self.max_delta = None  # from analysis_plan
         self.dataset_size = None  # from analysis_plan.dataset
@@ -82,23 +92,33 @@ class ValidateReleaseUtil(BasicErrCheck):
 
     @staticmethod
     def validate_mode(opendp_user: OpenDPUser, analysis_plan_id: int,
-                      dp_statistics: list = None):
+                      dp_statistics: list = None, statistics_diff: dict = None):
         """
         Use this method to return a ValidateReleaseUtil validates the dp_statistics
+          - Instead of dp_statistics, statistics_diff may contain the changes to the
+            statistics from the last validation of this AnalysisPlan
         """
-        return ValidateReleaseUtil(opendp_user, analysis_plan_id, dp_statistics)
+        return ValidateReleaseUtil(opendp_user, analysis_plan_id, dp_statistics,
+                                   **dict(statistics_diff=statistics_diff))
 
     @staticmethod
     def compute_mode(opendp_user: OpenDPUser, analysis_plan_id: int,
-                     run_dataverse_deposit: bool = False):
+                     run_dataverse_deposit: bool = False, progress_callback=None):
         """
         Use this method to return a ValidateReleaseUtil which runs the dp_statistics
+          - progress_callback: optional, called as progress_callback(user_msg, **progress)
         """
         return ValidateReleaseUtil(opendp_user,
                                    analysis_plan_id,
                                    dp_statistics=None,
                                    compute_mode=True,
-                                   **dict(run_dataverse_deposit=run_dataverse_deposit))
+                                   **dict(run_dataverse_deposit=run_dataverse_deposit,
+                                          progress_callback=progress_callback))
+
+    def send_progress(self, user_msg: str, **progress):
+        """Send a progress update, if a progress_callback is set"""
+        if self.progress_callback:
+            self.progress_callback(user_msg, **progress)
 
     def add_stat_spec(self, stat_spec: StatSpec):
         """Add a StatSpec subclass to a list"""
@@ -140,6 +160,11 @@ class ValidateReleaseUtil(BasicErrCheck):
                 self.add_err_msg(user_msg)
                 return
 
+        num_stats = len(self.stat_spec_list)
+        self.send_progress(f'{num_stats} statistic(s) validated. Computing the release.',
+                           step=astatic.RELEASE_STEP_VALIDATED,
+                           num_stats=num_stats)
+
         # -----------------------------------
         # Get the column indices--necessary for "run_chain(...)"
         # -----------------------------------
@@ -148,35 +173,51 @@ class ValidateReleaseUtil(BasicErrCheck):
             return
 
         # -----------------------------------
-        # Get the file/dataset pointer -- needs adjusting for blob/S3 type objects
+        # Run the chains! The data is read and split once
+        #   and shared by all of the statistics
         # -----------------------------------
-        try:
-            filepath = self.analysis_plan.dataset.source_file.path
-        except ValueError as err_obj:
-            user_msg = (f'Failed to calculate statistics. Unable to access the data file. '
-                        f' ({err_obj})')
-            self.add_err_msg(user_msg)
-            return
+        runner = self.run_chains_from_columnar_cache()
+        if runner is None:
+            # -----------------------------------
+            # Get the file/dataset pointer -- needs adjusting for blob/S3 type objects
+            # -----------------------------------
+            try:
+                filepath = self.analysis_plan.dataset.source_file.path
+            except ValueError as err_obj:
+                user_msg = (f'Failed to calculate statistics. Unable to access the data file. '
+                            f' ({err_obj})')
+                self.add_err_msg(user_msg)
+                return
 
-        sep_char = get_data_file_separator(filepath)
+            sep_char = get_data_file_separator(filepath)
+
+            with open(filepath, 'r') as file_handle:
+                runner = MultiStatRunner(self.stat_spec_list, col_indices, file_handle, sep_char=sep_char)
+
+        if runner.has_error():
+            logger.error(f'ValidateReleaseUtil.run_release_process: {runner.get_err_msg()}')
+            self.add_err_msg(runner.get_err_msg())
+            return
 
         # -----------------------------------
         # Iterate through the stats!
         # -----------------------------------
         self.release_stats = []
         epsilon_used = 0.0
-        for stat_spec in self.stat_spec_list:
-
-            # Okay! -> run_chain(...)!
-            file_handle = open(filepath, 'r')
-            stat_spec.run_chain(col_indices, file_handle, sep_char=sep_char)
-            file_handle.close()
+        for stat_num, stat_spec in enumerate(self.stat_spec_list, start=1):
 
             # Any errors?
             if not stat_spec.has_error():
                 # Looks good! Save the stat
                 self.release_stats.append(stat_spec.get_release_dict())
                 epsilon_used += stat_spec.epsilon
+                self.send_progress(f'Computed {stat_spec.statistic} for "{stat_spec.variable}"'
+                                   f' ({stat_num} of {num_stats}).',
+                                   step=astatic.RELEASE_STEP_STATISTIC,
+                                   stat_num=stat_num,
+                                   num_stats=num_stats,
+                                   variable=stat_spec.variable,
+                                   statistic=stat_spec.statistic)
             else:
                 user_msg = (f'Validation error found for {stat_spec.statistic}:'
                             f' {stat_spec.get_single_err_msg()}')
@@ -203,6 +244,28 @@ class ValidateReleaseUtil(BasicErrCheck):
         if not self.has_error():
             self.deposit_to_dataverse()
 
+    def run_chains_from_columnar_cache(self):
+        """
+        Run the chains using only the columns needed by the statistics, read from the ColumnarCache.
+        Returns the MultiStatRunner or None if the cache isn't available
+        """
+        if not ColumnarCache.is_enabled():
+            return None
+
+        used_col_indices = sorted(set(stat_spec.col_index for stat_spec in self.stat_spec_list))
+
+        columnar_cache = ColumnarCache(self.analysis_plan.dataset)
+        data_info = columnar_cache.get_data_file(used_col_indices)
+        if not data_info.success:
+            logger.error(f'ValidateReleaseUtil.run_chains_from_columnar_cache: {data_info.message}')
+            return None
+
+        # "make_split_dataframe" names the columns using used_col_indices,
+        #   matching the col_index of each StatSpec
+        with data_info.data as data_file:
+            return MultiStatRunner(self.stat_spec_list, used_col_indices,
+                                   data_file, sep_char=columnar_cache.sep_char)
+
     def deposit_to_dataverse(self):
         """
         Using the ReleaseInfo object, deposit any release files to Dataverse
@@ -252,10 +315,15 @@ class ValidateReleaseUtil(BasicErrCheck):
             del self.release_stats
             return False
 
+        self.send_progress('Creating the release files.',
+                           step=astatic.RELEASE_STEP_RELEASE_FILES)
+
         # (3) Save the ReleaseInfo object
         params = dict(dataset=self.analysis_plan.dataset,
                       epsilon_used=epsilon_used,
                       dp_release=formatted_release)
+        if settings.SKIP_PDF_CREATION_FOR_TESTS:
+            params['pdf_status'] = ReleaseInfo.PDFStatus.PDF_NOT_CREATED
 
         self.release_info = ReleaseInfo(**params)
         self.release_info.save()
@@ -268,20 +336,6 @@ class ValidateReleaseUtil(BasicErrCheck):
         self.release_info.dp_release_json_file.save(json_filename, django_file)
         self.release_info.save()
 
-        # -------------------------------
-        # (4a) Save Release PDF
-        # -------------------------------
-        # Make Async! create the release PDF
-        # -------------------------------
-        logger.info(f'SKIP_PDF_CREATION_FOR_TESTS: {settings.SKIP_PDF_CREATION_FOR_TESTS}')
-        if settings.SKIP_PDF_CREATION_FOR_TESTS:
-            # Skip PDF creation during tests to save time
-            pass
-        else:
-            report_maker = PDFReportMaker(self.release_info.dp_release, self.release_info.object_id)
-            if not report_maker.has_error():
-                report_maker.save_pdf_to_release_obj(self.release_info)
-
         # (5) Attach the ReleaseInfo to the AnalysisPlan, AnalysisPlan.release_info
         self.analysis_plan.release_info = self.release_info
         self.analysis_plan.is_complete = True
@@ -295,12 +349,22 @@ class ValidateReleaseUtil(BasicErrCheck):
         #    self.add_err_msg(delete_result.message)
         #    return False
 
-        # (7) Send release email to the user
-        #   (On error, continue the process)
-        if settings.SKIP_EMAIL_RELEASE_FOR_TESTS:
-            pass
+        # -------------------------------
+        # (7) Create the release PDF on the PDF render queue.
+        #   The release is usable without it, see ReleaseInfo.pdf_status.
+        #   The release email is sent once the PDF is done
+        # -------------------------------
+        logger.info(f'SKIP_PDF_CREATION_FOR_TESTS: {settings.SKIP_PDF_CREATION_FOR_TESTS}')
+        if settings.SKIP_PDF_CREATION_FOR_TESTS:
+            # Skip PDF creation during tests to save time
+
+            # (7a) Send release email to the user
+            #   (On error, continue the process)
+            if not settings.SKIP_EMAIL_RELEASE_FOR_TESTS:
+                _email_util = ReleaseEmailUtil(self.release_info)
         else:
-            _email_util = ReleaseEmailUtil(self.release_info)
+            run_pdf_report_maker.delay(str(self.release_info.object_id),
+                                       send_release_email=not settings.SKIP_EMAIL_RELEASE_FOR_TESTS)
 
         return True
 
@@ -332,7 +396,12 @@ class ValidateReleaseUtil(BasicErrCheck):
         return self.release_stats
 
     def run_validation_process(self):
-        """Run the validation"""
+        """
+        Run the validation
+          - validate mode: re-use the chain validation results of statistics
+            which haven't changed since the last validation. See ValidationState
+          - compute mode: build and validate each statistic
+        """
         if not self.run_preliminary_steps():
             return
 
@@ -342,51 +411,98 @@ class ValidateReleaseUtil(BasicErrCheck):
             # error set in ^ get_variable_indices()
             return
 
-        self.build_stat_specs()
+        validation_state = None
+        if not self.compute_mode:
+            validation_state = ValidationState(self.analysis_plan,
+                                               self.dataset_size,
+                                               self.analysis_plan.dataset.get_variable_order().data,
+                                               self.opendp_version)
+            if self.statistics_diff is not None:
+                stats_info = validation_state.apply_statistics_diff(self.statistics_diff)
+                if not stats_info.success:
+                    self.add_err_msg(stats_info.message)
+                    return
+                self.dp_statistics = stats_info.data
+                if not self.dp_statistics:
+                    self.add_err_msg('There are no statistics to validate')
+                    return
+
+        # Validate the chain of each new or changed stat spec
+        #
+        self.stat_spec_list = []
+        stat_results = []  # [(validation result dict, StatSpec or None if the result was saved earlier), ...]
+        for dp_stat in self.dp_statistics:
+            stat_result = validation_state.get_stat_result(dp_stat) if validation_state else None
+            if stat_result is not None:
+                stat_results.append((stat_result, None))
+                continue
+
+            stat_spec = self.build_stat_spec(dp_stat)
+            if stat_spec is None:
+                continue
+            self.add_stat_spec(stat_spec)
+
+            stat_result = self.get_chain_validation_result(stat_spec)
+            if validation_state:
+                validation_state.set_stat_result(dp_stat, stat_result)
+            stat_results.append((stat_result, stat_spec))
 
-        # print('\n\n>>> stat_spec_list', self.stat_spec_list)
-        # for x in self.stat_spec_list:
-        #    if x.has_error():
-        #        print(x, x.get_single_err_msg())
+        if validation_state:
+            validation_state.save(self.dp_statistics)
 
-        if not self.stat_spec_list:
+        if not stat_results:
             logger.error('ValidateReleaseUtil.run_validation_process: No statistics were built!')
             self.add_err_msg('No statistics were built!')
             return
 
-        # Iterate through the stat specs and validate them!
+        # Check single stat epsilon and cumulative epsilon
         #
         self.validation_info = []  # reset validation info
         running_epsilon = 0.0
-        item_cnt = 0
-        for stat_spec in self.stat_spec_list:
-            item_cnt += 1
-            # Check each stat_spec
-            if not stat_spec.is_chain_valid():
+        for stat_result, stat_spec in stat_results:
+            if not stat_result['chain_valid']:
                 # Nope: invalid!
-                self.validation_info.append(stat_spec.get_error_msg_dict())
-            else:
-                # Looks good but check single stat epsilon and cumulative epsilon
-                running_epsilon += stat_spec.epsilon
+                self.validation_info.append(stat_result['msg_dict'])
+                continue
 
-                if stat_spec.epsilon > self.max_epsilon:
-                    # Error one stat uses more than all the epsilon!
-                    user_msg = (f'The epsilon ({stat_spec.epsilon}) exceeds'
-                                f' max epsilon ({self.max_epsilon})')
-                    stat_spec.add_err_msg(user_msg)
-                    logger.error(f'ValidateReleaseUtil.run_validation_process: {user_msg}')
-                    self.validation_info.append(stat_spec.get_error_msg_dict())
+            # Looks good but check single stat epsilon and cumulative epsilon
+            running_epsilon += stat_result['epsilon']
+
+            user_msg = None
+            if stat_result['epsilon'] > self.max_epsilon:
+                # Error one stat uses more than all the epsilon!
+                user_msg = (f'The epsilon ({stat_result["epsilon"]}) exceeds'
+                            f' max epsilon ({self.max_epsilon})')
 
-                elif (running_epsilon - astatic.MAX_EPSILON_OFFSET) > self.max_epsilon:
-                    # Error: Too much epsilon used!
-                    user_msg = (f'The running epsilon ({running_epsilon}) exceeds'
-                                f' the max epsilon ({self.max_epsilon})')
+            elif (running_epsilon - astatic.MAX_EPSILON_OFFSET) > self.max_epsilon:
+                # Error: Too much epsilon used!
+                user_msg = (f'The running epsilon ({running_epsilon}) exceeds'
+                            f' the max epsilon ({self.max_epsilon})')
+
+            if user_msg:
+                if stat_spec:
                     stat_spec.add_err_msg(user_msg)
-                    logger.error(f'ValidateReleaseUtil.run_validation_process: {user_msg}')
-                    self.validation_info.append(stat_spec.get_error_msg_dict())
-                else:
-                    # Looks good!
-                    self.validation_info.append(stat_spec.get_success_msg_dict())
+                logger.error(f'ValidateReleaseUtil.run_validation_process: {user_msg}')
+                self.validation_info.append(StatValidInfo.get_error_msg_dict(stat_result['variable'],
+                                                                             stat_result['statistic'],
+                                                                             user_msg))
+            else:
+                # Looks good!
+                self.validation_info.append(stat_result['msg_dict'])
+
+    @staticmethod
+    def get_chain_validation_result(stat_spec: StatSpec) -> dict:
+        """
+        Build and validate the chain. Return a dict with the result,
+        used for the epsilon checks and saved by the ValidationState
+        """
+        chain_valid = stat_spec.is_chain_valid()
+
+        return dict(chain_valid=chain_valid,
+                    variable=stat_spec.variable,
+                    statistic=stat_spec.statistic,
+                    epsilon=stat_spec.epsilon,
+                    msg_dict=stat_spec.get_success_msg_dict() if chain_valid else stat_spec.get_error_msg_dict())
 
     def get_variable_indices(self):
         """
@@ -409,115 +525,115 @@ class ValidateReleaseUtil(BasicErrCheck):
         """
         # Iterate through the stats!
         self.stat_spec_list = []
-        stat_num = 0
         for dp_stat in self.dp_statistics:
-            stat_num += 1  # not used yet...
-            # print(f'\n\n20 (b-{stat_num})', dict(dp_stat))
-            """
-            We're putting together lots of properties to pass to
-            statistic specific classes such as DPMeanSpec.
-
-            These classes take care of most error checking and validation.
-
-            - Some sample input from the UI--e.g. contents of "dp_stat:
-                {
-                    "statistic": astatic.DP_MEAN,
-                    "variable_key": "eye_height"
-                    "epsilon": 1,
-                    "delta": 0,
-                    "error": "",
-                    "missing_values_handling": astatic.MISSING_VAL_INSERT_FIXED,
-                    "handle_as_fixed": False,
-                    "fixed_value": "5.0",
-                    "locked": False,
-                    "label": "EyeHeight"},
-            """
-            # -------------------------------------
-            # (1) Begin building the property dict
-            # -------------------------------------
-            props = copy.deepcopy(dp_stat)  # start with what is in dp_stat--the UI input
-            props['dataset_size'] = self.dataset_size  # add dataset size
-
-            #  Some high-level error checks, before making the StatSpec
-            variable = props.get('variable')
-            statistic = props.get('statistic', 'shrug?')
-            # epsilon = props.get('epsilon')
-            # var_type = None
-
-            # (1) Is variable defined?
-            if not props.get('variable'):
-                props['error_message'] = (f'"variable" is missing from this'
-                                          f'DP Stat specification.')
-                self.add_stat_spec(DPSpecError(props))
-                continue  # to the next dp_stat specification
-
-            # (2) Is this a known statistic? If not stop here.
-            if statistic not in astatic.DP_STATS_CHOICES:
-                props['error_message'] = f'Statistic "{statistic}" is not supported'
-                self.add_stat_spec(DPSpecError(props))
-                logger.error(f'ValidateReleaseUtil.build_stat_specs: Statistic "{statistic}" is not supported')
-                continue  # to the next dp_stat specification
-
-            # (3) Add variable_info which has min/max/categories, variable type, etc.
-            variable_info = self.analysis_plan.variable_info.get(variable)
-
-            if variable_info:
-                props['variable_info'] = variable_info
-                # print('>>make statSpec: variable_info', variable_info)
-                var_type = variable_info.get('type')
-                props['var_type'] = var_type
-            else:
-                user_err_msg = astatic.ERR_MSG_VARIABLE_NOT_FOUND_IN_ANALYSIS_PLAN.format(var_name=variable)
-                props['error_message'] = user_err_msg
-                self.add_stat_spec(DPSpecError(props))
-                logger.error(f'ValidateReleaseUtil.build_stat_specs: {user_err_msg}')
-                continue  # to the next dp_stat specification
-
-            # (4) Retrieve the column index
-            col_idx_info = self.analysis_plan.dataset.get_variable_index(variable_info['name'])
-            if col_idx_info.success:
-                props['col_index'] = col_idx_info.data
-            else:
-                props['error_message'] = col_idx_info.message
-                self.add_stat_spec(DPSpecError(props))
-                logger.error(f'ValidateReleaseUtil.build_stat_specs: {col_idx_info.message}')
-                continue  # to the next dp_stat specification
-
-            # Okay, "props" are built! Let's see if they work!
-            if statistic == astatic.DP_COUNT:
-                # DP Count!
-                self.add_stat_spec(DPCountSpec(props))
-
-            elif statistic in astatic.DP_HISTOGRAM:
-                # DP Histogram
-                # - Use function from HistogramUtil to determine correct StatSpec
-                #
-                hist_stat_spec = get_histogram_stat_spec(props)
-                self.add_stat_spec(hist_stat_spec)
-
-            elif statistic == astatic.DP_MEAN:
-                # DP Mean!
-                self.add_stat_spec(DPMeanSpec(props))
-
-            elif statistic == astatic.DP_SUM:
-                # DP Mean!
-                self.add_stat_spec(DPSumSpec(props))
-
-            elif statistic == astatic.DP_VARIANCE:
-                self.add_stat_spec(DPVarianceSpec(props))
-
-            elif statistic in astatic.DP_STATS_CHOICES:
-                # Stat not yet available or an error
-                props['error_message'] = (f'Statistic "{statistic}" will be supported'
-                                          f' soon!')
-                logger.error(('ValidateReleaseUtil.build_stat_specs: Statistic'
-                              ' "{statistic}" will be supported soon!'))
-                self.add_stat_spec(DPSpecError(props))
-            else:
-                logger.error(('ValidateReleaseUtil.build_stat_specs: Shouldn\'t reach'
-                              ' here, unknown stats are captured up above'))
-                # Shouldn't reach here, unknown stats are captured up above
-                pass
+            stat_spec = self.build_stat_spec(dp_stat)
+            if stat_spec is not None:
+                self.add_stat_spec(stat_spec)
+
+    def build_stat_spec(self, dp_stat: dict):
+        """
+        Build a StatSpec subclass for a single dp_stat from the UI.
+        If there isn't enough information for the statistic, a DPSpecError is returned.
+
+        We're putting together lots of properties to pass to
+        statistic specific classes such as DPMeanSpec.
+
+        These classes take care of most error checking and validation.
+
+        - Some sample input from the UI--e.g. contents of "dp_stat:
+            {
+                "statistic": astatic.DP_MEAN,
+                "variable_key": "eye_height"
+                "epsilon": 1,
+                "delta": 0,
+                "error": "",
+                "missing_values_handling": astatic.MISSING_VAL_INSERT_FIXED,
+                "handle_as_fixed": False,
+                "fixed_value": "5.0",
+                "locked": False,
+                "label": "EyeHeight"},
+        """
+        # -------------------------------------
+        # (1) Begin building the property dict
+        # -------------------------------------
+        props = copy.deepcopy(dp_stat)  # start with what is in dp_stat--the UI input
+        props['dataset_size'] = self.dataset_size  # add dataset size
+
+        #  Some high-level error checks, before making the StatSpec
+        variable = props.get('variable')
+        statistic = props.get('statistic', 'shrug?')
+        # epsilon = props.get('epsilon')
+        # var_type = None
+
+        # (1) Is variable defined?
+        if not props.get('variable'):
+            props['error_message'] = (f'"variable" is missing from this'
+                                      f'DP Stat specification.')
+            return DPSpecError(props)
+
+        # (2) Is this a known statistic? If not stop here.
+        if statistic not in astatic.DP_STATS_CHOICES:
+            props['error_message'] = f'Statistic "{statistic}" is not supported'
+            logger.error(f'ValidateReleaseUtil.build_stat_specs: Statistic "{statistic}" is not supported')
+            return DPSpecError(props)
+
+        # (3) Add variable_info which has min/max/categories, variable type, etc.
+        variable_info = self.analysis_plan.variable_info.get(variable)
+
+        if variable_info:
+            props['variable_info'] = variable_info
+            # print('>>make statSpec: variable_info', variable_info)
+            var_type = variable_info.get('type')
+            props['var_type'] = var_type
+        else:
+            user_err_msg = astatic.ERR_MSG_VARIABLE_NOT_FOUND_IN_ANALYSIS_PLAN.format(var_name=variable)
+            props['error_message'] = user_err_msg
+            logger.error(f'ValidateReleaseUtil.build_stat_specs: {user_err_msg}')
+            return DPSpecError(props)
+
+        # (4) Retrieve the column index
+        col_idx_info = self.analysis_plan.dataset.get_variable_index(variable_info['name'])
+        if col_idx_info.success:
+            props['col_index'] = col_idx_info.data
+        else:
+            props['error_message'] = col_idx_info.message
+            logger.error(f'ValidateReleaseUtil.build_stat_specs: {col_idx_info.message}')
+            return DPSpecError(props)
+
+        # Okay, "props" are built! Let's see if they work!
+        if statistic == astatic.DP_COUNT:
+            # DP Count!
+            return DPCountSpec(props)
+
+        elif statistic in astatic.DP_HISTOGRAM:
+            # DP Histogram
+            # - Use function from HistogramUtil to determine correct StatSpec
+            #
+            return get_histogram_stat_spec(props)
+
+        elif statistic == astatic.DP_MEAN:
+            # DP Mean!
+            return DPMeanSpec(props)
+
+        elif statistic == astatic.DP_SUM:
+            # DP Mean!
+            return DPSumSpec(props)
+
+        elif statistic == astatic.DP_VARIANCE:
+            return DPVarianceSpec(props)
+
+        elif statistic in astatic.DP_STATS_CHOICES:
+            # Stat not yet available or an error
+            props['error_message'] = (f'Statistic "{statistic}" will be supported'
+                                      f' soon!')
+            logger.error(('ValidateReleaseUtil.build_stat_specs: Statistic'
+                          ' "{statistic}" will be supported soon!'))
+            return DPSpecError(props)
+        else:
+            logger.error(('ValidateReleaseUtil.build_stat_specs: Shouldn\'t reach'
+                          ' here, unknown stats are captured up above'))
+            # Shouldn't reach here, unknown stats are captured up above
+            return None
 
     def run_preliminary_steps(self):
         """Run preliminary steps before validation"""
@@ -533,6 +649,13 @@ class ValidateReleaseUtil(BasicErrCheck):
 
         # Check the dp_statistics spec
         if self.compute_mode:
+            # Only one release per AnalysisPlan
+            if self.analysis_plan.release_info_id:
+                user_msg = astatic.ERR_MSG_RELEASE_ALREADY_CREATED
+                self.add_err_msg(user_msg)
+                logger.error(f'ValidateReleaseUtil.run_preliminary_steps: {user_msg}')
+                return False
+
             # In compute mode, run the stats saved in the plan!
             self.dp_statistics = self.analysis_plan.dp_statistics
             if not self.dp_statistics:
@@ -540,7 +663,7 @@ class ValidateReleaseUtil(BasicErrCheck):
                 self.add_err_msg(user_msg)
                 logger.error(f'ValidateReleaseUtil.run_preliminary_steps: {user_msg}')
                 return False
-        elif not self.dp_statistics:
+        elif not self.dp_statistics and self.statistics_diff is None:
             user_msg = 'There are no statistics to validate'
             self.add_err_msg(user_msg)
             logger.error(f'ValidateReleaseUtil.run_preliminary_steps: {user_msg}')
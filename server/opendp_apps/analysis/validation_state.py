@@ -0,0 +1,136 @@
+"""
+Validation results for an AnalysisPlan, kept between calls to /api/validation/
+
+The statistics form is validated on each change. Usually one statistic
+changes and the rest are the same as the last call. The result of each
+statistic's chain validation is saved using a fingerprint of the statistic
+so only new or changed statistics need their chains built.
+
+- The running epsilon check depends on all of the statistics and is
+  always recalculated. See ValidateReleaseUtil.run_validation_process()
+- Results are dropped if anything else used for validation changes: the
+  plan's variable_info, epsilon, delta, the dataset size and variable
+  order, or the OpenDP version
+- The client may also send only the changes to the last validated list,
+  see ValidationState.apply_statistics_diff()
+"""
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+from opendp_apps.analysis import static_vals as astatic
+from opendp_apps.analysis.models import AnalysisPlan
+from opendp_apps.model_helpers.basic_response import BasicResponse, ok_resp, err_resp
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+
+def get_fingerprint(value) -> str:
+    """Return a SHA-256 hash of a JSON-serializable value"""
+    value_str = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(value_str.encode()).hexdigest()
+
+
+def get_stat_fingerprint(dp_stat: dict) -> str:
+    """Return a hash of the statistic fields used for validation"""
+    return get_fingerprint({key: val for key, val in dp_stat.items()
+                            if key not in astatic.VALIDATION_STATE_IGNORED_FIELDS})
+
+
+class ValidationState:
+    """Validation results for the statistics of a single AnalysisPlan"""
+
+    def __init__(self, analysis_plan: AnalysisPlan, dataset_size: int, variable_order: list, opendp_version: str):
+        """
+        Load the saved state, if any, for the AnalysisPlan
+        :param variable_order: the dataset's variableOrder, used for the column indices
+        """
+        self.cache_key = f'{astatic.VALIDATION_STATE_KEY_PREFIX}:{analysis_plan.object_id}'
+        self.plan_fingerprint = get_fingerprint([analysis_plan.variable_info,
+                                                 analysis_plan.epsilon,
+                                                 analysis_plan.delta,
+                                                 dataset_size,
+                                                 variable_order,
+                                                 opendp_version])
+
+        self.dp_statistics = None  # the last list of statistics validated
+        self.stat_results = {}  # statistic fingerprint -> validation result dict
+
+        self.load()
+
+    @staticmethod
+    def get_cache():
+        return caches[astatic.VALIDATION_STATE_CACHE]
+
+    def load(self):
+        """Load the saved state. If the plan has changed since it was saved, don't use it"""
+        try:
+            saved_state = self.get_cache().get(self.cache_key)
+        except Exception as ex_obj:
+            logger.error(f'ValidationState.load: {ex_obj}')
+            return
+
+        if not saved_state or saved_state.get('plan_fingerprint') != self.plan_fingerprint:
+            return
+
+        self.dp_statistics = saved_state['dp_statistics']
+        self.stat_results = saved_state['stat_results']
+
+    def save(self, dp_statistics: list):
+        """Save the statistics list and the results for those statistics"""
+        stat_fingerprints = set(get_stat_fingerprint(dp_stat) for dp_stat in dp_statistics)
+
+        self.dp_statistics = [dict(dp_stat) for dp_stat in dp_statistics]
+        self.stat_results = {fingerprint: result for fingerprint, result in self.stat_results.items()
+                             if fingerprint in stat_fingerprints}
+        saved_state = dict(plan_fingerprint=self.plan_fingerprint,
+                           dp_statistics=self.dp_statistics,
+                           stat_results=self.stat_results)
+        try:
+            self.get_cache().set(self.cache_key, saved_state, settings.VALIDATION_STATE_TIMEOUT)
+        except Exception as ex_obj:
+            logger.error(f'ValidationState.save: {ex_obj}')
+
+    def get_stat_result(self, dp_stat: dict):
+        """Return the saved validation result for the statistic or None"""
+        return self.stat_results.get(get_stat_fingerprint(dp_stat))
+
+    def set_stat_result(self, dp_stat: dict, stat_result: dict):
+        """Set the validation result for the statistic. Saved with .save()"""
+        self.stat_results[get_stat_fingerprint(dp_stat)] = stat_result
+
+    def apply_statistics_diff(self, statistics_diff: dict) -> BasicResponse:
+        """
+        Apply changes to the last validated list of statistics. Indices refer to that list.
+            {
+                "changed": [{"index": 0, "statistic": {...}}],  # replace these statistics
+                "removed": [2, 3],                              # remove these statistics
+                "added": [{...}, {...}]                         # add these to the end of the list
+            }
+        Returns the new list of statistics as BasicResponse.data
+        """
+        if self.dp_statistics is None:
+            return err_resp(astatic.ERR_MSG_VALIDATION_STATE_NOT_FOUND)
+
+        dp_statistics = list(self.dp_statistics)
+        num_stats = len(dp_statistics)
+
+        changed = statistics_diff.get('changed', [])
+        removed = statistics_diff.get('removed', [])
+        bad_indices = [idx for idx in [x['index'] for x in changed] + removed if idx >= num_stats]
+        if bad_indices:
+            return err_resp(astatic.ERR_MSG_VALIDATION_DIFF_BAD_INDEX.format(indices=bad_indices,
+                                                                              num_stats=num_stats))
+
+        for changed_stat in changed:
+            dp_statistics[changed_stat['index']] = changed_stat['statistic']
+
+        for idx in sorted(set(removed), reverse=True):
+            del dp_statistics[idx]
+
+        dp_statistics.extend(statistics_diff.get('added', []))
+
+        return ok_resp(dp_statistics)
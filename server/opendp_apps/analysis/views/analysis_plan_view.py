@@ -12,12 +12,14 @@ from opendp_apps.analysis.models import AnalysisPlan
 from opendp_apps.analysis.serializers import \
     AnalysisPlanSerializer, AnalysisPlanListSerializer
 from opendp_apps.dataset.serializers import DatasetObjectIdSerializer
+from opendp_apps.utils.pagination import ListingPaginationMixin
 from opendp_apps.utils.view_helper import get_json_error
 from opendp_project.views import BaseModelViewSet
 
 logger = logging.getLogger(settings.DEFAULT_LOGGER)
 
-class AnalysisPlanListViewSet(BaseModelViewSet):
+
+class AnalysisPlanListViewSet(ListingPaginationMixin, BaseModelViewSet):
     """
     API endpoint to list AnalysisPlans, but w/o information such as variable_info and dp_statistics.
     This listing is used to populate tables that include AnalysisPlans with published ReleaseInfo object where the logged in user is not the analyst or dataset creator.
@@ -30,14 +32,14 @@ class AnalysisPlanListViewSet(BaseModelViewSet):
         """
         AnalysisPlans for the currently authenticated user.
         """
-        return AnalysisPlan.objects.select_related('dataset'
-                    ).filter(Q(analyst__username=self.request.user) | \
-                             Q(dataset__creator__username=self.request.user) | \
+        return AnalysisPlan.objects.without_large_json(
+                    ).select_related('analyst', 'dataset__creator', 'release_info'
+                    ).filter(Q(analyst=self.request.user) | \
+                             Q(dataset__creator=self.request.user) | \
                              Q(release_info__isnull=False, release_info__dp_release__isnull=False))
 
 
-
-class AnalysisPlanViewSet(BaseModelViewSet):
+class AnalysisPlanViewSet(ListingPaginationMixin, BaseModelViewSet):
     """Publicly available listing of registered Dataverses"""
     serializer_classes = {
         'list': AnalysisPlanSerializer,
@@ -62,9 +64,9 @@ class AnalysisPlanViewSet(BaseModelViewSet):
         #                                           ).filter(Q(analyst=self.request.user) |
         #                                                    Q(dataset__creator=self.request.user))
 
-        return AnalysisPlan.objects.select_related('dataset'
-                    ).filter(Q(analyst__username=self.request.user) | \
-                             Q(dataset__creator__username=self.request.user))
+        return AnalysisPlan.objects.select_related('analyst', 'dataset__creator', 'release_info'
+                    ).filter(Q(analyst=self.request.user) | \
+                             Q(dataset__creator=self.request.user))
 
 
     @csrf_exempt
@@ -1,21 +1,28 @@
 import logging
+import uuid
 
 from django.conf import settings
-from django.http import FileResponse
 from rest_framework import permissions, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
+from opendp_apps.analysis.analysis_plan_util import AnalysisPlanUtil
+from opendp_apps.analysis import static_vals as astatic
 from opendp_apps.analysis.models import AnalysisPlan, ReleaseInfo
+from opendp_apps.analysis.release_claim import claim_release, release_claim
+from opendp_apps.analysis.release_file_response import get_release_file_response
 from opendp_apps.analysis.serializers import \
     (AnalysisPlanObjectIdSerializer,
      AnalysisPlanSerializer,
      ReleaseInfoFileDownloadSerializer,
      ReleaseInfoSerializer,
      ReleaseValidationSerializer)
-from opendp_apps.analysis.validate_release_util import ValidateReleaseUtil
-from opendp_apps.utils.view_helper import get_json_error
+from opendp_apps.async_messages import static_vals as async_static
+from opendp_apps.async_messages.tasks import run_release
+from opendp_apps.async_messages.utils import get_websocket_id
+from opendp_apps.utils.view_helper import get_json_error, get_json_success
+from opendp_project.celery import celery_app
 
 logger = logging.getLogger(settings.DEFAULT_LOGGER)
 
@@ -24,9 +31,10 @@ class ReleaseFileDownloadView(viewsets.ReadOnlyModelViewSet):
     """
     Download **PUBLIC** JSON and PDF Release Files
     - View ONLY used for PUBLIC files
+    - Supports conditional GET (ETag/If-None-Match), see release_file_response.py
     """
     serializer_class = ReleaseInfoFileDownloadSerializer
-    queryset = ReleaseInfo.objects.all()
+    queryset = ReleaseInfo.objects.without_large_json()
     permission_classes = [permissions.IsAuthenticated]
     http_method_names = ['get']
 
@@ -37,7 +45,7 @@ class ReleaseFileDownloadView(viewsets.ReadOnlyModelViewSet):
         Note: URL linked to code in opendp_apps/analysis/models.py ->  download_pdf_url()
         Example: http://127.0.0.1:8000/api/release-download/18bc23da-cdbf-420e-a6aa-3d9ecdb10c20/pdf/
         """
-        release_info = get_object_or_404(ReleaseInfo, object_id=pk)
+        release_info = get_object_or_404(ReleaseInfo.objects.without_large_json(), object_id=pk)
 
         if not release_info.dp_release_pdf_file:
             user_msg = 'The Release does not include a PDF file.'
@@ -45,27 +53,15 @@ class ReleaseFileDownloadView(viewsets.ReadOnlyModelViewSet):
             return Response(get_json_error(user_msg),
                             status=status.HTTP_400_BAD_REQUEST)
 
-        # get an open file handle
-        try:
-            file_handle = release_info.dp_release_pdf_file.open()
-        except ValueError as err_obj:
-            user_msg = f'Not able to read the PDF Release file. (1) ({err_obj})'
-            logger.error(user_msg + ' ReleaseInfo: ' + release_info.object_id)
-            return Response(get_json_error(user_msg),
-                            status=status.HTTP_400_BAD_REQUEST)
-        except Exception as err_obj:
-            user_msg = f'Not able to read the PDF Release file. (2) ({err_obj})'
-            logger.error(user_msg + ' ReleaseInfo: ' + release_info.object_id)
-            return Response(get_json_error(user_msg),
+        # Send the file, or a 304 if the client has it
+        file_resp = get_release_file_response(request, release_info, release_info.dp_release_pdf_file,
+                                              'application/pdf', 'PDF')
+        if not file_resp.success:
+            logger.error(file_resp.message + ' ReleaseInfo: ' + str(release_info.object_id))
+            return Response(get_json_error(file_resp.message),
                             status=status.HTTP_400_BAD_REQUEST)
 
-        # send file
-        response = FileResponse(file_handle, content_type='application/pdf')
-        response['Content-Length'] = release_info.dp_release_pdf_file.size
-        download_fname = f'release_{release_info.object_id}.pdf'
-        response['Content-Disposition'] = f'attachment; filename="{download_fname}"'
-
-        return response
+        return file_resp.data
 
     @action(detail=True, methods=['GET'], url_path='json')
     def json(self, request, pk=None):
@@ -82,7 +78,7 @@ class ReleaseFileDownloadView(viewsets.ReadOnlyModelViewSet):
         Download the JSON release file using the ReleaseInfo object_id
         Example: http://127.0.0.1:8000/api/release-download/18bc23da-cdbf-420e-a6aa-3d9ecdb10c20/
         """
-        release_info = get_object_or_404(ReleaseInfo, object_id=pk)
+        release_info = get_object_or_404(ReleaseInfo.objects.without_large_json(), object_id=pk)
 
         if not release_info.dp_release_json_file:
             user_msg = 'The Release does not include a JSON file.'
@@ -90,27 +86,15 @@ class ReleaseFileDownloadView(viewsets.ReadOnlyModelViewSet):
             return Response(get_json_error(user_msg),
                             status=status.HTTP_400_BAD_REQUEST)
 
-        # get an open file handle
-        try:
-            file_handle = release_info.dp_release_json_file.open()
-        except ValueError as err_obj:
-            user_msg = f'Not able to read the JSON Release file. (1) ({err_obj})'
-            logger.error(user_msg + ' ReleaseInfo: ' + release_info.object_id)
-            return Response(get_json_error(user_msg),
-                            status=status.HTTP_400_BAD_REQUEST)
-        except Exception as err_obj:
-            user_msg = f'Not able to read the JSON Release file. (2) ({err_obj})'
-            logger.error(user_msg + ' ReleaseInfo: ' + release_info.object_id)
-            return Response(get_json_error(user_msg),
+        # Send the file, or a 304 if the client has it
+        file_resp = get_release_file_response(request, release_info, release_info.dp_release_json_file,
+                                              'application/json', 'JSON')
+        if not file_resp.success:
+            logger.error(file_resp.message + ' ReleaseInfo: ' + str(release_info.object_id))
+            return Response(get_json_error(file_resp.message),
                             status=status.HTTP_400_BAD_REQUEST)
 
-        # send file
-        response = FileResponse(file_handle, content_type='application/json')
-        response['Content-Length'] = release_info.dp_release_json_file.size
-        download_fname = f'release_{release_info.object_id}.json'
-        response['Content-Disposition'] = f'attachment; filename="{download_fname}"'
-
-        return response
+        return file_resp.data
 
 
 class ReleaseView(viewsets.ViewSet):
@@ -146,13 +130,40 @@ class ReleaseView(viewsets.ViewSet):
         logger.info("Getting ReleaseInfo with request %s", request.__dict__)
         return Response(data=serializer.data)
 
+    @action(detail=True, methods=['GET'], url_path='pdf-status')
+    def pdf_status(self, request, pk=None):
+        """
+        Check on the PDF file of a ReleaseInfo. The PDF is created after the release JSON file
+
+        endpoint: /api/release/{object_id}/pdf-status/
+
+        Example output:
+            Status code: 200
+            {
+                "success": true,
+                "message": "PDF status: Complete",
+                "data": {"object_id": "...", "pdf_status": "complete",
+                         "download_pdf_url": "http://127.0.0.1:8000/api/release-download/.../pdf/"}
+            }
+        """
+        release_info = get_object_or_404(ReleaseInfo.objects.without_large_json(), object_id=pk)
+
+        serializer = ReleaseInfoSerializer(context={'request': request})
+        return Response(get_json_success(f'PDF status: {release_info.get_pdf_status_display()}',
+                                         data=dict(object_id=str(release_info.object_id),
+                                                   pdf_status=release_info.pdf_status,
+                                                   download_pdf_url=serializer.get_download_pdf_url(release_info))))
+
     def create(self, request, *args, **kwargs):
         """
-        Override create to create a release based on a saved/pre-validated AnalysisPlan.dp_statistics
+        Override create to start a release based on a saved/pre-validated AnalysisPlan.dp_statistics
+          - The release is computed by a Celery task. The response includes a "job_id" used to
+            check the release status: /api/release/job-status/{job_id}/
+          - Progress is also sent via websocket messages of type "RELEASE_MESSAGE"
 
         endpoint: /api/release/
 
-        Example POST input: `{"analysis_plan_id": "616b5167-4ce8-4def-85dc-6f0d8de2316c"}`
+        Example POST input: `{"object_id": "616b5167-4ce8-4def-85dc-6f0d8de2316c"}`
 
        -- Example outputs --
 
@@ -160,22 +171,21 @@ class ReleaseView(viewsets.ViewSet):
             Status code: 400
                 {
                     "success": false,
-                    "message": "The statistic 'EyeHeight' had error xyz!"
+                    "message": "AnalysisPlan not found"
                 }
 
-        (2) Release success
-            Status code: 201
+            - Also returned if the AnalysisPlan already has a release or one is being computed
+
+        (2) Release started
+            Status code: 202
             {
                     "success": true,
-                    "message": "release worked!",
-                    "data":
-                       (see: opendp_apps.release_info_formatter.get_release_data())
-
+                    "message": "The release process has started.",
+                    "data": {"job_id": "7d2f3f46-5b0b-4d0e-a7b0-1e6b2b3e4a55"}
+            }
         """
         # Get the AnalysisPlan object_id
         #   - Bit redundant in the serializer re: retrieving plan but only using object_id--but okay!
-        #     - e.g. Passing along the object_id only will lead to later running chain
-        #       in a separate process and responding by websocket/lambda, etc.
         #
         serializer = AnalysisPlanObjectIdSerializer(data=request.data)
         if not serializer.is_valid():
@@ -187,28 +197,110 @@ class ReleaseView(viewsets.ViewSet):
             return Response(get_json_error(user_msg),
                             status=status.HTTP_400_BAD_REQUEST)
 
-        # We have a good object_id!
+        # We have a good object_id! Check that it belongs to the user before starting
         #
         analysis_plan_id = serializer.get_object_id()
+        plan_info = AnalysisPlanUtil.retrieve_analysis(analysis_plan_id, request.user)
+        if not plan_info.success:
+            logger.error(f'release_view.create(...) user_msg: {plan_info.message}')
+            return Response(get_json_error(plan_info.message),
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Only one release per AnalysisPlan: e.g. a double-click shouldn't use the epsilon twice
+        #
+        if plan_info.data.release_info_id:
+            logger.error(f'release_view.create(...) user_msg: {astatic.ERR_MSG_RELEASE_ALREADY_CREATED}')
+            return Response(get_json_error(astatic.ERR_MSG_RELEASE_ALREADY_CREATED),
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        job_id = str(uuid.uuid4())
+        if not claim_release(analysis_plan_id, job_id):
+            logger.error(f'release_view.create(...) user_msg: {astatic.ERR_MSG_RELEASE_IN_PROGRESS}')
+            return Response(get_json_error(astatic.ERR_MSG_RELEASE_IN_PROGRESS),
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        websocket_id = get_websocket_id(request)
+        try:
+            async_result = run_release.apply_async((str(analysis_plan_id), request.user.id),
+                                                   dict(websocket_id=websocket_id),
+                                                   task_id=job_id)
+        except Exception:
+            release_claim(analysis_plan_id, job_id)
+            raise
+
+        user_msg = ('The release process has started. Responses will be sent via'
+                    f' messages to websocket: {websocket_id}')
+        logger.info(f'Started release job {async_result.id} for AnalysisPlan {analysis_plan_id}')
+        return Response(get_json_success(user_msg, data=dict(job_id=async_result.id)),
+                        status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['GET'], url_path=r'job-status/(?P<job_id>[0-9a-f-]+)')
+    def job_status(self, request, job_id=None):
+        """
+        Check on a release started via create(...)
+
+        endpoint: /api/release/job-status/{job_id}/
+
+        -- Example outputs --
 
-        # For longer releases, Async this!!
-        # Async: the validate_util process!
-        validate_util = ValidateReleaseUtil.compute_mode(request.user,
-                                                         analysis_plan_id,
-                                                         run_dataverse_deposit=True)
-        if validate_util.has_error():
-            # This is a big error, check for it before evaluating individual statistics
-            #
-            user_msg = validate_util.get_err_msg()
-            logger.error(f'release_view.create(...) user_msg: {user_msg}')
-
-            # Can you return a 400 / raise an Exception here with the error message?
-            # How should this be used?
-            return Response(get_json_error(user_msg), status=status.HTTP_400_BAD_REQUEST)
-
-        # It worked! Return the release!
-        release_info_obj = validate_util.get_new_release_info_object()
-        serializer = ReleaseInfoSerializer(release_info_obj, context={'request': request})
-        logger.info(f"Created ReleaseInfo {release_info_obj.object_id} with request %s", request.__dict__)
-        return Response(data=serializer.data,
-                        status=status.HTTP_201_CREATED)
+        (1) Not yet started or running
+            Status code: 200
+            {
+                "success": true,
+                "message": "Computed mean for \"EyeHeight\" (1 of 2).",
+                "data": {"job_id": "...", "status": "running",
+                         "progress": {"step": "statistic", "stat_num": 1, "num_stats": 2, ...}}
+            }
+
+        (2) Release complete
+            Status code: 200
+            {
+                "success": true,
+                "message": "Release complete!",
+                "data": {"job_id": "...", "status": "complete",
+                         "release_info": (see: ReleaseInfoSerializer)}
+            }
+
+        (3) Release failed
+            Status code: 400
+            {
+                "success": false,
+                "message": "The epsilon (3.2) exceeds max epsilon (1.0)"
+            }
+        """
+        async_result = celery_app.AsyncResult(job_id)
+        job_state = async_result.state
+        job_info = async_result.info if isinstance(async_result.info, dict) else {}
+
+        # Only the user who started the release may see its status
+        if job_info and job_info.get('opendp_user_id') != request.user.id:
+            return Response(get_json_error(async_static.ERR_MSG_RELEASE_JOB_NOT_FOUND),
+                            status=status.HTTP_404_NOT_FOUND)
+
+        if job_state == 'PENDING':
+            # Waiting for a worker, or an unknown job_id
+            return Response(get_json_success('The release is waiting to start.',
+                                             data=dict(job_id=job_id,
+                                                       status=async_static.RELEASE_JOB_STATUS_PENDING)))
+
+        if job_state in ('STARTED', async_static.RELEASE_JOB_STATE_PROGRESS):
+            return Response(get_json_success(job_info.get('message', 'The release is in progress.'),
+                                             data=dict(job_id=job_id,
+                                                       status=async_static.RELEASE_JOB_STATUS_RUNNING,
+                                                       progress=job_info.get('progress'))))
+
+        if job_state != 'SUCCESS' or not job_info:
+            logger.error(f'release_view.job_status(...) job {job_id}: {job_state} {async_result.info}')
+            return Response(get_json_error(async_static.ERR_MSG_RELEASE_JOB_FAILED),
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if not job_info.get('success'):
+            return Response(get_json_error(job_info.get('message')),
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        release_info = get_object_or_404(ReleaseInfo, object_id=job_info['release_info_id'])
+        serializer = ReleaseInfoSerializer(release_info, context={'request': request})
+        return Response(get_json_success(job_info['message'],
+                                         data=dict(job_id=job_id,
+                                                   status=async_static.RELEASE_JOB_STATUS_COMPLETE,
+                                                   release_info=serializer.data)))
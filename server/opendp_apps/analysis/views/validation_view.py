@@ -43,6 +43,20 @@ class ValidationView(viewsets.ViewSet):
                 ]
             }
 
+        Example POST input with changes to the last validated "dp_statistics".
+        Indices refer to the last validated list; "added" statistics go at the end:
+            {
+                "analysis_plan_id": "616b5167-4ce8-4def-85dc-6f0d8de2316c",
+                "statistics_diff": {
+                    "changed": [
+                        {"index": 0,
+                         "statistic": {"statistic": "mean", "variable": "EyeHeight", "epsilon": 0.3, ...}}
+                    ],
+                    "removed": [],
+                    "added": []
+                }
+            }
+
         -- Example outputs --
 
         (1) Overall error
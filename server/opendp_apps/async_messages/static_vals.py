@@ -1,3 +1,14 @@
 MESSAGE_TYPE = 'chat_message'
 
 WS_MSG_TYPE_PROFILER = 'PROFILER_MESSAGE'
+WS_MSG_TYPE_RELEASE = 'RELEASE_MESSAGE'
+
+# Release jobs, see tasks.run_release
+RELEASE_JOB_STATE_PROGRESS = 'PROGRESS'  # Celery task state used while the release is computed
+
+RELEASE_JOB_STATUS_PENDING = 'pending'
+RELEASE_JOB_STATUS_RUNNING = 'running'
+RELEASE_JOB_STATUS_COMPLETE = 'complete'
+
+ERR_MSG_RELEASE_JOB_NOT_FOUND = 'Release job not found.'
+ERR_MSG_RELEASE_JOB_FAILED = 'The release failed to complete.'
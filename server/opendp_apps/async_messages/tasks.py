@@ -1,11 +1,16 @@
 import json
 import logging
+import uuid
 from datetime import datetime
 from os.path import abspath, dirname, join
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.core.serializers.json import DjangoJSONEncoder
 
+from opendp_apps.analysis import static_vals as astatic
+from opendp_apps.analysis.release_claim import claim_release, release_claim
+from opendp_apps.analysis.validate_release_util import ValidateReleaseUtil
 from opendp_apps.async_messages import static_vals as async_static
 from opendp_apps.async_messages.websocket_message import WebsocketMessage
 from opendp_apps.dataset.models import DatasetInfo
@@ -72,6 +77,83 @@ def profile_dataset_info(dataset_object_id: DatasetInfo.object_id, websocket_id=
     return ok_resp(dp_util)
 
 
+def send_websocket_release_msg(user_msg, websocket_id, success=True, data=None):
+    """Send a websocket message of type WS_MSG_TYPE_RELEASE"""
+    logger.info(f'Sending websocket release message: {user_msg}')
+    if success:
+        ws_msg = WebsocketMessage.get_success_message(async_static.WS_MSG_TYPE_RELEASE,
+                                                      user_msg,
+                                                      data=data)
+    else:
+        ws_msg = WebsocketMessage.get_fail_message_with_data(async_static.WS_MSG_TYPE_RELEASE,
+                                                             user_msg,
+                                                             data=data)
+    ws_msg.send_message(websocket_id)
+
+
+@celery_app.task(bind=True)
+def run_release(self, analysis_plan_id: str, opendp_user_id: int, websocket_id=None) -> dict:
+    """
+    Compute the release for an AnalysisPlan.
+    Progress is saved as the task state, using the task id as the job id. If the
+    "websocket_id" is defined, progress is also sent as websocket messages.
+
+    Returns a dict:
+        {'success': True/False, 'message': "A user message", 'release_info_id': "..." or None, ...}
+    """
+    job_id = self.request.id
+    job_info = dict(job_id=job_id,
+                    analysis_plan_id=str(analysis_plan_id),
+                    opendp_user_id=opendp_user_id)
+
+    def send_progress(user_msg, **progress):
+        """Used as the ValidateReleaseUtil progress_callback"""
+        if job_id:
+            self.update_state(state=async_static.RELEASE_JOB_STATE_PROGRESS,
+                              meta=dict(job_info, message=user_msg, progress=progress))
+        if websocket_id:
+            send_websocket_release_msg(user_msg, websocket_id, data=dict(job_id=job_id, **progress))
+
+    def send_result(success, user_msg, release_info_id=None):
+        """Send the final websocket message and return the task result"""
+        if websocket_id:
+            send_websocket_release_msg(user_msg, websocket_id, success=success,
+                                       data=dict(job_id=job_id, release_info_id=release_info_id))
+        return dict(job_info, success=success, message=user_msg, release_info_id=release_info_id)
+
+    # Checked again here: the task may be retried or started without the API
+    claim_id = job_id or str(uuid.uuid4())
+    if not claim_release(analysis_plan_id, claim_id):
+        logger.error(f'run_release: {astatic.ERR_MSG_RELEASE_IN_PROGRESS}')
+        return send_result(False, astatic.ERR_MSG_RELEASE_IN_PROGRESS)
+
+    logger.info(f'Release in progress. analysis_plan_id: {analysis_plan_id} job_id: {job_id}')
+    try:
+        opendp_user = get_user_model().objects.get(id=opendp_user_id)
+    except get_user_model().DoesNotExist:
+        release_claim(analysis_plan_id, claim_id)
+        return send_result(False, 'User not found')
+
+    try:
+        # Fails if the AnalysisPlan already has a ReleaseInfo
+        validate_util = ValidateReleaseUtil.compute_mode(opendp_user,
+                                                         analysis_plan_id,
+                                                         run_dataverse_deposit=True,
+                                                         progress_callback=send_progress)
+    finally:
+        release_claim(analysis_plan_id, claim_id)
+
+    if validate_util.has_error():
+        user_msg = validate_util.get_err_msg()
+        logger.error(f'run_release: {user_msg}')
+        return send_result(False, user_msg)
+
+    release_info_id = str(validate_util.get_new_release_info_object().object_id)
+    logger.info(f'Release complete. analysis_plan_id: {analysis_plan_id} release_info_id: {release_info_id}')
+
+    return send_result(True, 'Release complete!', release_info_id=release_info_id)
+
+
 @celery_app.task
 def send_test_msg(websocket_id):
     filepath = join(TEST_DATA_DIR, 'fearonLaitin.csv')
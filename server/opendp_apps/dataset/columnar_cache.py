@@ -0,0 +1,297 @@
+"""
+Column by column copy of a DatasetInfo's source_file, used when computing releases.
+
+Each release reads the whole source file and OpenDP's "make_split_dataframe"
+splits every line, including columns not used by any statistic. Here, the
+file is split once and each column is saved to its own files.
+For a release, only the columns used by the statistics are memory-mapped
+and written, a chunk of rows at a time, to a temporary file for the computation chains.
+
+- Values are split the same way as "make_split_dataframe": lines split on the
+  separator and trimmed, missing values set to "". Casting is left to the chains.
+- Each column is stored as variable-length values:
+    - "col_<index>.data": the UTF-8 encoded values, one after another
+    - "col_<index>.ends": int64 byte offset of the end of each value
+  The source file is read a chunk of rows at a time and each chunk is
+  appended to the column files, so the file is never held in memory.
+- The cache is rebuilt if the source_file changes and removed
+  by DatasetInfo.delete_source_file()
+
+Example:
+    ```
+    columnar_cache = ColumnarCache(dataset_info)
+    data_info = columnar_cache.get_data_file([0, 3, 19])
+    if data_info.success:
+        # text with columns 0, 3, and 19. Use with make_split_dataframe(col_names=[0, 3, 19])
+        with data_info.data as data_file:
+            data_text = data_file.read()
+    ```
+"""
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+from os.path import isdir, isfile, join
+
+import numpy as np
+from django.conf import settings
+
+from opendp_apps.dataset import static_vals as dstatic
+from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
+from opendp_apps.model_helpers.basic_response import BasicResponse, ok_resp, err_resp
+from opendp_apps.profiler.static_vals_mime_types import get_data_file_separator
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+
+class ColumnarCache(BasicErrCheck):
+    """Columns of a DatasetInfo's source_file, saved as memory-mapped NumPy arrays"""
+
+    MANIFEST_FILENAME = 'manifest.json'
+    DATA_ENCODING = 'utf-8'
+    VALUE_ENDS_DTYPE = np.dtype('<i8')
+
+    def __init__(self, dataset_info):
+        """
+        :param dataset_info: DatasetInfo object with a source_file
+        """
+        self.dataset_info = dataset_info
+        self.cache_dir = join(settings.COLUMNAR_CACHE_ROOT, str(dataset_info.object_id))
+
+        self.sep_char = None
+        self.manifest = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.COLUMNAR_CACHE_ENABLED
+
+    @staticmethod
+    def get_column_filenames(col_index: int) -> tuple:
+        """Return the (values, value ends) filenames of a column"""
+        return f'col_{col_index}.data', f'col_{col_index}.ends'
+
+    def get_source_file_info(self):
+        """
+        Return a dict describing the source_file. If it changes, the cache is rebuilt.
+        Returns None if the source_file isn't available
+        """
+        if not self.dataset_info.source_file:
+            return None
+        try:
+            filepath = self.dataset_info.source_file.path
+            file_stats = os.stat(filepath)
+        except (ValueError, OSError) as ex_obj:
+            logger.error(f'ColumnarCache.get_source_file_info: {ex_obj}')
+            return None
+
+        return dict(version=dstatic.COLUMNAR_CACHE_VERSION,
+                    name=self.dataset_info.source_file.name,
+                    size=file_stats.st_size,
+                    mtime_ns=file_stats.st_mtime_ns,
+                    sep_char=get_data_file_separator(filepath))
+
+    def is_current(self) -> bool:
+        """Is there a cache for the current source_file?"""
+        source_file_info = self.get_source_file_info()
+        if source_file_info is None:
+            return False
+
+        manifest_path = join(self.cache_dir, self.MANIFEST_FILENAME)
+        if not isfile(manifest_path):
+            return False
+        try:
+            with open(manifest_path, 'r') as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError) as ex_obj:
+            logger.error(f'ColumnarCache.is_current: {ex_obj}')
+            return False
+
+        if manifest.get('source_file') != source_file_info:
+            return False
+
+        self.manifest = manifest
+        self.sep_char = source_file_info['sep_char']
+        return True
+
+    def build(self) -> bool:
+        """
+        Split the source_file and save each column. Replaces any existing cache
+        """
+        if self.has_error():
+            return False
+
+        source_file_info = self.get_source_file_info()
+        if source_file_info is None:
+            self.add_err_msg(dstatic.ERR_MSG_COLUMNAR_CACHE_NO_SOURCE_FILE)
+            return False
+
+        sep_char = source_file_info['sep_char']
+
+        os.makedirs(settings.COLUMNAR_CACHE_ROOT, exist_ok=True)
+        build_dir = tempfile.mkdtemp(dir=settings.COLUMNAR_CACHE_ROOT)
+        try:
+            num_columns, num_rows = self.split_source_file(build_dir, sep_char)
+
+            manifest = dict(source_file=source_file_info,
+                            num_columns=num_columns,
+                            num_rows=num_rows)
+            with open(join(build_dir, self.MANIFEST_FILENAME), 'w') as manifest_file:
+                json.dump(manifest, manifest_file)
+
+            self.delete()
+            os.rename(build_dir, self.cache_dir)
+        except (OSError, UnicodeDecodeError, ValueError) as ex_obj:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            user_msg = f'{dstatic.ERR_MSG_COLUMNAR_CACHE_BUILD_FAILED} ({ex_obj})'
+            logger.error(f'ColumnarCache.build: {user_msg}')
+            self.add_err_msg(user_msg)
+            return False
+
+        self.manifest = manifest
+        self.sep_char = sep_char
+        return True
+
+    def split_source_file(self, build_dir: str, sep_char: str) -> tuple:
+        """
+        Split the source file into columns saved in build_dir. The file is read, and
+        appended to each column's files, in chunks of rows to limit memory use
+        Returns (number of columns, number of rows)
+        """
+        column_sizes = []  # bytes in each column's values file
+        num_rows_read = 0
+
+        def add_rows(rows):
+            """Append the rows to each column"""
+            num_columns = max(len(row) for row in rows)
+            while len(column_sizes) < num_columns:
+                # New column, earlier rows didn't have a value
+                self.add_empty_column(build_dir, len(column_sizes), num_rows_read)
+                column_sizes.append(0)
+            for col_index, col_size in enumerate(column_sizes):
+                values = [row[col_index].encode(self.DATA_ENCODING) if col_index < len(row) else b''
+                          for row in rows]
+                column_sizes[col_index] = self.append_column_values(build_dir, col_index, values, col_size)
+
+        rows = []
+        with open(self.dataset_info.source_file.path, 'r') as file_handle:
+            for line in file_handle:
+                rows.append([val.strip() for val in line.rstrip('\n').split(sep_char)])
+                if len(rows) == settings.COLUMNAR_CACHE_CHUNK_ROWS:
+                    add_rows(rows)
+                    num_rows_read += len(rows)
+                    rows = []
+        if rows:
+            add_rows(rows)
+            num_rows_read += len(rows)
+
+        return len(column_sizes), num_rows_read
+
+    def add_empty_column(self, build_dir: str, col_index: int, num_rows: int):
+        """Create the files for a column with num_rows empty values"""
+        data_filename, ends_filename = self.get_column_filenames(col_index)
+        open(join(build_dir, data_filename), 'wb').close()
+        with open(join(build_dir, ends_filename), 'wb') as ends_file:
+            # Extended with zeros: each value ends at byte 0
+            ends_file.truncate(num_rows * self.VALUE_ENDS_DTYPE.itemsize)
+
+    def append_column_values(self, build_dir: str, col_index: int, values: list, col_size: int) -> int:
+        """
+        Append encoded values to a column's files.
+        Returns the new size, in bytes, of the column's values file
+        """
+        data_filename, ends_filename = self.get_column_filenames(col_index)
+        value_ends = np.cumsum([len(val) for val in values], dtype=self.VALUE_ENDS_DTYPE) + col_size
+
+        with open(join(build_dir, data_filename), 'ab') as data_file:
+            data_file.write(b''.join(values))
+        with open(join(build_dir, ends_filename), 'ab') as ends_file:
+            ends_file.write(value_ends.tobytes())
+
+        return int(value_ends[-1]) if len(value_ends) else col_size
+
+    @staticmethod
+    def load_array(filepath: str, dtype) -> np.ndarray:
+        """Memory-map a file as an array. (An empty file can't be memory-mapped)"""
+        if os.path.getsize(filepath) == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(filepath, dtype=dtype, mode='r')
+
+    def get_columns(self, col_indices: list) -> BasicResponse:
+        """
+        Return the memory-mapped columns as a list of (values, value ends), in the order of col_indices.
+        The cache is built if it doesn't exist or the source_file has changed
+        """
+        if not self.is_current() and not self.build():
+            return err_resp(self.get_err_msg())
+
+        columns = []
+        for col_index in col_indices:
+            if col_index >= self.manifest['num_columns']:
+                # No values in the file for this column
+                columns.append((np.zeros(0, dtype=np.uint8),
+                                np.zeros(self.manifest['num_rows'], dtype=self.VALUE_ENDS_DTYPE)))
+                continue
+            data_filename, ends_filename = self.get_column_filenames(col_index)
+            try:
+                columns.append((self.load_array(join(self.cache_dir, data_filename), np.uint8),
+                                self.load_array(join(self.cache_dir, ends_filename), self.VALUE_ENDS_DTYPE)))
+            except (OSError, ValueError) as ex_obj:
+                user_msg = f'{dstatic.ERR_MSG_COLUMNAR_CACHE_READ_FAILED} ({ex_obj})'
+                logger.error(f'ColumnarCache.get_columns: {user_msg}')
+                return err_resp(user_msg)
+
+        return ok_resp(columns)
+
+    @staticmethod
+    def get_column_values(column: tuple, start_row: int, stop_row: int) -> list:
+        """Return the encoded values of a column, from start_row up to stop_row"""
+        data, value_ends = column
+        start_byte = int(value_ends[start_row - 1]) if start_row > 0 else 0
+        row_ends = value_ends[start_row:stop_row]
+        if len(row_ends) == 0:
+            return []
+
+        chunk_data = data[start_byte:int(row_ends[-1])].tobytes()
+        row_ends = (row_ends - start_byte).tolist()
+
+        return [chunk_data[start:end] for start, end in zip([0] + row_ends[:-1], row_ends)]
+
+    def get_data_file(self, col_indices: list) -> BasicResponse:
+        """
+        Return a temporary text file with only the columns in col_indices, in that order, for
+        "make_split_dataframe". Each line ends with the separator so rows without values aren't dropped.
+        The file is written a chunk of rows at a time and is removed when closed.
+        """
+        columns_info = self.get_columns(col_indices)
+        if not columns_info.success:
+            return columns_info
+
+        sep_bytes = self.sep_char.encode(self.DATA_ENCODING)
+        chunk_rows = settings.COLUMNAR_CACHE_CHUNK_ROWS
+        data_file = None
+        try:
+            data_file = tempfile.TemporaryFile(dir=settings.COLUMNAR_CACHE_ROOT)
+            for start_row in range(0, self.manifest['num_rows'], chunk_rows):
+                column_values = [self.get_column_values(column, start_row, start_row + chunk_rows)
+                                 for column in columns_info.data]
+                if start_row > 0:
+                    data_file.write(b'\n')
+                data_file.write(b'\n'.join(sep_bytes.join(row) + sep_bytes
+                                           for row in zip(*column_values)))
+            data_file.seek(0)
+        except OSError as ex_obj:
+            if data_file is not None:
+                data_file.close()
+            user_msg = f'{dstatic.ERR_MSG_COLUMNAR_CACHE_READ_FAILED} ({ex_obj})'
+            logger.error(f'ColumnarCache.get_data_file: {user_msg}')
+            return err_resp(user_msg)
+
+        return ok_resp(io.TextIOWrapper(data_file, encoding=self.DATA_ENCODING))
+
+    def delete(self):
+        """Remove the cache for this DatasetInfo, if it exists"""
+        if isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.manifest = None
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dataset', '0004_alter_datasetinfo_source_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetinfo',
+            name='source_file_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 hash of the source_file. Used to find cached profiles', max_length=64, null=True),
+        ),
+    ]
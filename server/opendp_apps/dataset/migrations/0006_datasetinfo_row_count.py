@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dataset', '0005_datasetinfo_source_file_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetinfo',
+            name='row_count',
+            field=models.IntegerField(blank=True, help_text='Number of data rows, for internal profiling only. Not a public dataset size, see get_dataset_size()', null=True),
+        ),
+    ]
@@ -16,6 +16,7 @@ from polymorphic.models import PolymorphicModel
 
 from opendp_apps.analysis import static_vals as astatic
 from opendp_apps.dataset import static_vals as dstatic
+from opendp_apps.dataset.columnar_cache import ColumnarCache
 from opendp_apps.dataset.dataset_question_validators import \
     (validate_dataset_questions,
      validate_epsilon_questions)
@@ -25,7 +26,7 @@ from opendp_apps.dataset.depositor_setup_helpers import \
 from opendp_apps.dataverses.models import RegisteredDataverse
 from opendp_apps.model_helpers.basic_response import ok_resp, err_resp, BasicResponse
 from opendp_apps.model_helpers.models import \
-    (TimestampedModelWithUUID, )
+    (LargeJSONQuerySet, TimestampedModelWithUUID, )
 from opendp_apps.profiler.static_vals_mime_types import get_mime_type
 # Temp workaround!!! See Issue #300
 # https://github.com/opendp/dpcreator/issues/300
@@ -127,6 +128,11 @@ class DepositorSetupInfo(TimestampedModelWithUUID):
                                    default=dstatic.WIZARD_STEP_DEFAULT_VAL,
                                    help_text='Used by the UI to track the wizard step')
 
+    # Deferred by DepositorSetupInfo.objects.without_large_json()
+    LARGE_JSON_FIELDS = ('data_profile', 'variable_info')
+
+    objects = LargeJSONQuerySet.as_manager()
+
     @property
     def dataset_size(self):
         """Return the dataset_size from the DatasetInfo.variable_info"""
@@ -182,7 +188,10 @@ class DepositorSetupInfo(TimestampedModelWithUUID):
         # Workaround for https://github.com/opendp/dpcreator/issues/257
         """
         if hasattr(self, 'ds_info'):
-            if hasattr(self.ds_info, 'uploadfileinfo'):
+            # Already the subclass, e.g. from a polymorphic DatasetInfo query
+            if isinstance(self.ds_info, (UploadFileInfo, DataverseFileInfo)):
+                return self.ds_info
+            elif hasattr(self.ds_info, 'uploadfileinfo'):
                 return self.ds_info.uploadfileinfo
             elif hasattr(self.ds_info, 'dataversefileinfo'):
                 return self.ds_info.dataversefileinfo
@@ -313,6 +322,13 @@ class DatasetInfo(TimestampedModelWithUUID, PolymorphicModel):
                                    upload_to='source-file/%Y/%m/%d/',
                                    blank=True, null=True)
 
+    source_file_hash = models.CharField(max_length=64, blank=True, null=True,
+                                        help_text='SHA-256 hash of the source_file. Used to find cached profiles')
+
+    row_count = models.IntegerField(blank=True, null=True,
+                                    help_text=('Number of data rows, for internal profiling only. Not'
+                                               ' a public dataset size, see get_dataset_size()'))
+
     depositor_setup_info = models.OneToOneField(DepositorSetupInfo,
                                                 related_name='ds_info',
                                                 null=True,
@@ -333,7 +349,10 @@ class DatasetInfo(TimestampedModelWithUUID, PolymorphicModel):
         Delete the source_file, if it exists
         - Returns a BasicResponse object with success = True if file is deleted
            or not set to start with
+        - The ColumnarCache of the file is also removed
         """
+        ColumnarCache(dataset_info).delete()
+
         if not dataset_info.source_file:
             # No source file
             return ok_resp(True)
@@ -341,6 +360,7 @@ class DatasetInfo(TimestampedModelWithUUID, PolymorphicModel):
         # source_file found, delete it
         try:
             dataset_info.source_file.delete()
+            dataset_info.source_file_hash = None
             dataset_info.save()
             return ok_resp(True)
         except OSError as err_obj:
@@ -423,24 +443,53 @@ class DatasetInfo(TimestampedModelWithUUID, PolymorphicModel):
 
         return isinstance(self.get_real_instance(), UploadFileInfo)
 
-    def get_dataset_size(self) -> BasicResponse:
-        """Retrieve the rowCount index from the variable_info -- not always available"""
-        if (not self.depositor_setup_info) or (not self.depositor_setup_info.data_profile):
-            return err_resp('depositor_setup_info.data_profile info not available')
+    def get_profile_dataset_info(self) -> BasicResponse:
+        """
+        Retrieve the "dataset" section of depositor_setup_info.data_profile, e.g.
+          {"rowCount": 6610, "variableCount": 20, "variableOrder": [[0, "ccode"], ...]}
 
-        data_profile = self.depositor_setup_info.data_profile
+        The rest of the profile, with the variable information, may be large. Unless the
+        DepositorSetupInfo is already loaded with its data_profile, only the "dataset"
+        section is read, using a JSON path lookup
+        """
+        if not self.depositor_setup_info_id:
+            return err_resp('Data profile not available')
 
-        if 'dataset' not in data_profile:
+        if DatasetInfo.depositor_setup_info.is_cached(self) and \
+                'data_profile' not in self.depositor_setup_info.get_deferred_fields():
+            data_profile = self.depositor_setup_info.data_profile
+            if not data_profile:
+                return err_resp('Data profile not available')
+            if 'dataset' not in data_profile:
+                return err_resp('Dataset information not available in profile')
+            return ok_resp(data_profile['dataset'])
+
+        profile_dataset_info = DepositorSetupInfo.objects.filter(id=self.depositor_setup_info_id
+                                    ).values_list('data_profile__dataset', flat=True).first()
+        if not profile_dataset_info:
             return err_resp('Dataset information not available in profile')
 
-        if 'rowCount' not in data_profile['dataset']:
+        return ok_resp(profile_dataset_info)
+
+    def get_dataset_size(self) -> BasicResponse:
+        """
+        Retrieve the rowCount index from the data_profile -- not always available
+          - If the row count may not be published, the profile's rowCount is None.
+            The private DatasetInfo.row_count is never returned as it would be
+            used as a public dataset size in releases
+        """
+        profile_info = self.get_profile_dataset_info()
+        if not profile_info.success:
+            return profile_info
+
+        if 'rowCount' not in profile_info.data:
             return err_resp('"rowCount" information not available in profile.')
 
-        row_count = data_profile['dataset']['rowCount']
+        row_count = profile_info.data['rowCount']
         if row_count is None:
             return err_resp('"rowCount" information not available in profile (id:2')
 
-        return ok_resp(data_profile['dataset']['rowCount'])
+        return ok_resp(row_count)
 
     def get_variable_order(self, as_indices=False) -> BasicResponse:
         """
@@ -460,18 +509,14 @@ class DatasetInfo(TimestampedModelWithUUID, PolymorphicModel):
 
         :param as_indices, if True, return [0, 1, 2], etc.
         """
-        if not self.depositor_setup_info or not self.depositor_setup_info.data_profile:
-            return err_resp('Profile not available. (data_profile:1)')
-
-        data_profile = self.depositor_setup_info.data_profile
+        profile_info = self.get_profile_dataset_info()
+        if not profile_info.success:
+            return profile_info
 
-        if 'dataset' not in data_profile:
-            return err_resp('Dataset information not available in profile. (variable_info:2)')
-
-        if 'variableOrder' not in data_profile['dataset']:
+        if 'variableOrder' not in profile_info.data:
             return err_resp('"variableOrder" information not available in profile (variable_info:3')
 
-        variable_order = data_profile['dataset']['variableOrder']
+        variable_order = profile_info.data['variableOrder']
 
         if as_indices:
             try:
@@ -484,7 +529,7 @@ class DatasetInfo(TimestampedModelWithUUID, PolymorphicModel):
         return ok_resp(variable_order)
 
     def get_variable_index(self, var_name: str) -> BasicResponse:
-        """Retrieve the variable index from the variable_info for a specific variable name
+        """Retrieve the variable index from the data_profile for a specific variable name
          Example data structure:
           {"dataset":{
               "rowCount":6610,
@@ -500,23 +545,19 @@ class DatasetInfo(TimestampedModelWithUUID, PolymorphicModel):
 
         :param var_name - variable name, e.g. "cname" would return 1
         """
-        if not self.depositor_setup_info or not self.depositor_setup_info.data_profile:
-            return err_resp('Data profile not available')
-
-        data_profile = self.depositor_setup_info.data_profile
-
-        if 'dataset' not in data_profile:
-            return err_resp('Dataset information not available in profile')
+        profile_info = self.get_profile_dataset_info()
+        if not profile_info.success:
+            return profile_info
 
-        if 'variableOrder' not in data_profile['dataset']:
+        if 'variableOrder' not in profile_info.data:
             return err_resp('"variableOrder" information not available in profile (id:2')
 
-        variable_order = data_profile['dataset']['variableOrder']
+        variable_order = profile_info.data['variableOrder']
         if not variable_order:
             return err_resp('Bad "variableOrder" information in profile.')
 
         try:
-            for idx, feature in data_profile['dataset']['variableOrder']:
+            for idx, feature in variable_order:
                 if feature == var_name:
                     return ok_resp(idx)
                 elif feature == camel_to_snake(var_name):  # Temp workaround!!!
@@ -12,12 +12,17 @@ class RedisClient(object):
 
     def __init__(self):
         self.r = redis.Redis(
-            host=os.environ.get('REDIS_HOST'),
-            port=os.environ.get('REDIS_PORT'),
+            host=os.environ.get('REDIS_HOST', 'localhost'),
+            port=os.environ.get('REDIS_PORT', 6379),
             password=os.environ.get('REDIS_PASSWORD'))
 
-    def set(self, key, value):
-        return self.r.set(key, value)
+    def set(self, key, value, ex=None):
+        """Set a value. "ex" is an optional expiration time, in seconds"""
+        return self.r.set(key, value, ex=ex)
 
     def get(self, key):
         return self.r.get(key)
+
+    def expire(self, key, seconds):
+        """Reset the expiration time of a key"""
+        return self.r.expire(key, seconds)
@@ -11,6 +11,7 @@ from opendp_apps.dataset.models import DepositorSetupInfo, DatasetInfo, Datavers
 from opendp_apps.dataverses.models import RegisteredDataverse
 from opendp_apps.model_helpers.basic_response import BasicResponse, ok_resp, err_resp
 from opendp_apps.user.models import OpenDPUser
+from opendp_apps.utils.file_hash import get_file_sha256
 
 
 class DatasetObjectIdSerializer(serializers.Serializer):
@@ -59,6 +60,17 @@ class DatasetObjectIdSerializer(serializers.Serializer):
         return ok_resp(dsi)
 
 
+class ProbeColumnsSerializer(DatasetObjectIdSerializer):
+    """A DatasetInfo object_id and the names of the columns to profile"""
+    columns = serializers.ListField(child=serializers.CharField(), min_length=1)
+
+    def get_columns(self) -> list:
+        """Return the column names"""
+        assert self.is_valid(), "Do not call this method before checking \".is_valid()\""
+
+        return self.validated_data.get('columns')
+
+
 class DatasetInfoSerializer(serializers.ModelSerializer):
     creator = serializers.SlugRelatedField(queryset=OpenDPUser.objects.all(),
                                            slug_field='username',
@@ -184,7 +196,7 @@ class DataverseFileInfoSerializer(DatasetInfoSerializer):
                   'file_schema_info',
                   'depositor_setup_info',
                   'analysis_plans']
-        readonly_fields = ['depositor_setup_info',]
+        read_only_fields = ['depositor_setup_info', ]
         extra_kwargs = {
             'url': {'view_name': 'dataset-info-list'},
         }
@@ -250,6 +262,11 @@ class UploadFileInfoCreationSerializer(serializers.ModelSerializer):
         model = UploadFileInfo
         fields = ['object_id', 'name', 'source_file', 'creator', ]
 
+    def create(self, validated_data):
+        """Add the hash of the uploaded file, used to find a cached profile"""
+        validated_data['source_file_hash'] = get_file_sha256(validated_data['source_file'])
+        return super().create(validated_data)
+
     def save(self, **kwargs):
         return super().save(**kwargs)
 
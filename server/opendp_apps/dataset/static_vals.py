@@ -13,6 +13,12 @@ ERR_MSG_NO_VARIABLES_SELECTED = 'None of the variables in this "variable_info" w
 
 MSG_VAL_NOT_SPECIFIED = '(not specified)'
 
+# Increment if the ColumnarCache file layout changes
+COLUMNAR_CACHE_VERSION = 2
+ERR_MSG_COLUMNAR_CACHE_NO_SOURCE_FILE = 'The source file is not available to build the columnar cache.'
+ERR_MSG_COLUMNAR_CACHE_BUILD_FAILED = 'Failed to build the columnar cache.'
+ERR_MSG_COLUMNAR_CACHE_READ_FAILED = 'Failed to read from the columnar cache.'
+
 KEY_WIZARD_STEP = 'wizard_step'
 WIZARD_STEP_DEFAULT_VAL = 'step_100'
 
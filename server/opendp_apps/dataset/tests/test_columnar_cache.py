@@ -0,0 +1,140 @@
+import shutil
+import tempfile
+from os.path import isdir, join
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from opendp.mod import enable_features
+from opendp.transformations import make_select_column, make_split_dataframe
+
+from opendp_apps.analysis import static_vals as astatic
+from opendp_apps.analysis.models import AnalysisPlan
+from opendp_apps.analysis.testing.base_stat_spec_test import StatSpecTestCase
+from opendp_apps.analysis.tools.multi_stat_runner import MultiStatRunner
+from opendp_apps.analysis.validate_release_util import ValidateReleaseUtil
+from opendp_apps.dataset.columnar_cache import ColumnarCache
+from opendp_apps.dataset.models import DatasetInfo
+from opendp_apps.model_helpers.msg_util import msgt
+
+enable_features("contrib")
+
+
+class ColumnarCacheTest(StatSpecTestCase):
+    """Test the ColumnarCache of a DatasetInfo's source file"""
+
+    def setUp(self):
+        super().setUp()
+        self.cache_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(COLUMNAR_CACHE_ENABLED=True,
+                                                   COLUMNAR_CACHE_ROOT=self.cache_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.cache_root, ignore_errors=True)
+
+    @staticmethod
+    def get_opendp_column(data_text: str, sep_char: str, col_names: list, col_name):
+        """Split the text with OpenDP and return a single column"""
+        column_chain = make_split_dataframe(separator=sep_char, col_names=col_names) >> \
+            make_select_column(key=col_name, TOA=str)
+        return column_chain(data_text)
+
+    def test_10_columns_match_opendp(self):
+        """(10) Columns from the cache match the columns split by OpenDP"""
+        msgt(self.test_10_columns_match_opendp.__doc__)
+
+        columnar_cache = ColumnarCache(self.eye_typing_dataset)
+        self.assertFalse(columnar_cache.is_current())
+        self.assertTrue(columnar_cache.build())
+        self.assertTrue(columnar_cache.is_current())
+        self.assertEqual(columnar_cache.sep_char, '\t')
+
+        with open(self.eye_typing_dataset.source_file.path, 'r') as file_handle:
+            file_text = file_handle.read()
+        col_names = list(range(columnar_cache.manifest['num_columns']))
+
+        # Columns in a different order than the file
+        col_indices = [19, 0, 5]
+        data_info = columnar_cache.get_data_file(col_indices)
+        self.assertTrue(data_info.success)
+        with data_info.data as data_file:
+            data_text = data_file.read()
+
+        for col_index in col_indices:
+            self.assertEqual(self.get_opendp_column(data_text, '\t', col_indices, col_index),
+                             self.get_opendp_column(file_text, '\t', col_names, col_index))
+
+    def test_20_edge_cases(self):
+        """(20) Blank lines, short rows, trailing blank values, and non-ASCII values are kept"""
+        msgt(self.test_20_edge_cases.__doc__)
+
+        file_text = 'a,b,c\n 1 , 2\n\n4,5,6,7\r\n8,,\nl\u00e9,\u00fc,\n'
+        self.eye_typing_dataset.source_file.save('edge_cases.csv', ContentFile(file_text.encode()))
+
+        # Chunks of 2 rows: the 4th column starts in the 2nd chunk
+        columnar_cache = ColumnarCache(self.eye_typing_dataset)
+        with override_settings(COLUMNAR_CACHE_CHUNK_ROWS=2):
+            for col_index in range(5):
+                data_info = columnar_cache.get_data_file([col_index])
+                self.assertTrue(data_info.success)
+                with data_info.data as data_file:
+                    data_text = data_file.read()
+                self.assertEqual(self.get_opendp_column(data_text, ',', [col_index], col_index),
+                                 self.get_opendp_column(file_text, ',', [0, 1, 2, 3, 4], col_index))
+        self.assertEqual(columnar_cache.manifest['num_rows'], 6)
+        self.assertEqual(columnar_cache.manifest['num_columns'], 4)
+
+    @override_settings(SKIP_PDF_CREATION_FOR_TESTS=True)
+    def test_30_release_uses_cache(self):
+        """(30) The release is computed from the columns in the cache"""
+        msgt(self.test_30_release_uses_cache.__doc__)
+
+        analysis_plan = self.retrieve_new_plan()
+        analysis_plan.variable_info['EyeHeight']['min'] = -8
+        analysis_plan.variable_info['EyeHeight']['max'] = 5
+        analysis_plan.dp_statistics = [{"statistic": astatic.DP_MEAN,
+                                        "variable": "EyeHeight",
+                                        "epsilon": 0.5,
+                                        "delta": 0,
+                                        "cl": astatic.CL_95,
+                                        "error": "",
+                                        "missing_values_handling": astatic.MISSING_VAL_INSERT_FIXED,
+                                        "handle_as_fixed": False,
+                                        "fixed_value": "1",
+                                        "locked": False,
+                                        "label": "EyeHeight"}]
+        analysis_plan.save()
+
+        with patch('opendp_apps.analysis.validate_release_util.MultiStatRunner',
+                   wraps=MultiStatRunner) as mock_runner:
+            release_util = ValidateReleaseUtil.compute_mode(self.user_obj, analysis_plan.object_id,
+                                                            run_dataverse_deposit=False)
+            self.assertFalse(release_util.has_error())
+
+        # Only the EyeHeight column is sent to the chains
+        eye_height_index = release_util.stat_spec_list[0].col_index
+        self.assertEqual(mock_runner.call_args.args[1], [eye_height_index])
+        self.assertTrue(ColumnarCache(AnalysisPlan.objects.get(object_id=analysis_plan.object_id).dataset)
+                        .is_current())
+        self.assertTrue(isinstance(release_util.release_stats[0]['result']['value'], float))
+
+    def test_40_rebuilt_and_deleted(self):
+        """(40) A new source file rebuilds the cache, deleting the source file removes it"""
+        msgt(self.test_40_rebuilt_and_deleted.__doc__)
+
+        columnar_cache = ColumnarCache(self.eye_typing_dataset)
+        self.assertTrue(columnar_cache.build())
+        self.assertGreater(columnar_cache.manifest['num_columns'], 20)
+
+        self.eye_typing_dataset.source_file.save('new_file.csv', ContentFile(b'x,y\n1,2\n'))
+        columnar_cache = ColumnarCache(self.eye_typing_dataset)
+        self.assertFalse(columnar_cache.is_current())
+        self.assertTrue(columnar_cache.get_columns([0, 1]).success)
+        self.assertEqual(columnar_cache.manifest['num_columns'], 2)
+        self.assertEqual(columnar_cache.sep_char, ',')
+
+        self.assertTrue(isdir(columnar_cache.cache_dir))
+        self.assertTrue(DatasetInfo.delete_source_file(self.eye_typing_dataset).success)
+        self.assertFalse(isdir(join(self.cache_root, str(self.eye_typing_dataset.object_id))))
@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from opendp_apps.analysis.models import AnalysisPlan, ReleaseInfo
+from opendp_apps.dataset.models import DatasetInfo, DepositorSetupInfo
+from opendp_apps.model_helpers.msg_util import msgt
+
+
+class LargeJSONFieldsTest(TestCase):
+    """Deferred JSON fields and reading the profile's "dataset" section"""
+
+    fixtures = ['test_analysis_002.json']
+
+    def setUp(self):
+        self.dataset_info = DatasetInfo.objects.get(id=2)
+
+    def test_10_without_large_json(self):
+        """(10) without_large_json() defers the fields, which load on access"""
+        msgt(self.test_10_without_large_json.__doc__)
+
+        dsi = DepositorSetupInfo.objects.without_large_json().get(id=self.dataset_info.depositor_setup_info_id)
+        self.assertEqual(dsi.get_deferred_fields(), {'data_profile', 'variable_info'})
+
+        with self.assertNumQueries(1):
+            self.assertEqual(dsi.data_profile['dataset']['rowCount'], 7000)
+
+        deferred_names, is_deferred = AnalysisPlan.objects.without_large_json().query.deferred_loading
+        self.assertTrue(is_deferred)
+        self.assertEqual(deferred_names, {'variable_info', 'dp_statistics'})
+
+        release_info = ReleaseInfo.objects.create(dataset=self.dataset_info,
+                                                  epsilon_used=0.1,
+                                                  dp_release={'name': 'release'})
+        release_info = ReleaseInfo.objects.without_large_json().get(id=release_info.id)
+        self.assertIn('dp_release', release_info.get_deferred_fields())
+
+        # Only loaded fields are saved
+        release_info.epsilon_used = 0.2
+        release_info.save()
+        release_info = ReleaseInfo.objects.get(id=release_info.id)
+        self.assertEqual(release_info.epsilon_used, 0.2)
+        self.assertEqual(release_info.dp_release, {'name': 'release'})
+
+    def test_20_profile_dataset_info(self):
+        """(20) Profile helpers read the "dataset" section with a JSON path lookup"""
+        msgt(self.test_20_profile_dataset_info.__doc__)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.dataset_info.get_dataset_size().data, 7000)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.dataset_info.get_variable_index('maritalstatus').data, 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.dataset_info.get_variable_order(as_indices=True).data, list(range(10)))
+
+        # The DepositorSetupInfo wasn't loaded
+        self.assertFalse(DatasetInfo.depositor_setup_info.is_cached(self.dataset_info))
+
+        # Already loaded, no queries
+        self.assertTrue(self.dataset_info.depositor_setup_info.data_profile)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.dataset_info.get_dataset_size().data, 7000)
+            self.assertEqual(self.dataset_info.get_variable_index('maritalstatus').data, 2)
+
+        # Loaded w/o the data_profile, the JSON path lookup is used
+        self.dataset_info.depositor_setup_info = DepositorSetupInfo.objects.without_large_json().get(
+                                                    id=self.dataset_info.depositor_setup_info_id)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.dataset_info.get_dataset_size().data, 7000)
+        self.assertIn('data_profile', self.dataset_info.depositor_setup_info.get_deferred_fields())
+
+    def test_30_profile_not_available(self):
+        """(30) Errors if there isn't a profile"""
+        msgt(self.test_30_profile_not_available.__doc__)
+
+        DepositorSetupInfo.objects.filter(id=self.dataset_info.depositor_setup_info_id).update(data_profile=None)
+
+        dataset_info = DatasetInfo.objects.get(id=2)
+        self.assertFalse(dataset_info.get_dataset_size().success)
+        self.assertFalse(dataset_info.get_variable_index('maritalstatus').success)
+
+        dsi = DepositorSetupInfo.objects.create(creator=get_user_model().objects.first(),
+                                                data_profile={'variables': {}})
+        dataset_info.depositor_setup_info = dsi
+        dataset_info.save()
+
+        dataset_info = DatasetInfo.objects.get(id=2)
+        size_info = dataset_info.get_dataset_size()
+        self.assertFalse(size_info.success)
+        self.assertEqual(size_info.message, 'Dataset information not available in profile')
@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from django.utils import timezone
+
+from opendp_apps.analysis.models import AnalysisPlan, ReleaseInfo
+from opendp_apps.dataset.models import DatasetInfo, DataverseFileInfo, UploadFileInfo
+from opendp_apps.dataverses.models import RegisteredDataverse
+from opendp_apps.model_helpers.msg_util import msgt
+from opendp_apps.model_helpers.query_budget import QueryBudgetTestMixin
+
+
+class ListingQueryBudgetTest(QueryBudgetTestMixin, TestCase):
+    """The number of queries for a listing doesn't depend on the number of results"""
+
+    fixtures = ['test_dataverses_01.json']
+
+    API_DATASET_INFO = '/api/dataset-info/'
+    API_ANALYSIS_PLAN = '/api/analysis-plan/'
+    API_ANALYSIS_LIST_VIEW = '/api/analysis-plan-list-view/'
+
+    def setUp(self):
+        self.user_obj, _created = get_user_model().objects.get_or_create(username='dp_depositor')
+        self.client.force_login(self.user_obj)
+
+        # 3 DataverseFileInfo and 3 UploadFileInfo objects
+        for idx, dv_installation in enumerate(RegisteredDataverse.objects.all()[:3]):
+            DataverseFileInfo.objects.create(creator=self.user_obj,
+                                             dv_installation=dv_installation,
+                                             dataverse_file_id=1000 + idx,
+                                             dataset_doi=f'doi:10.7910/DVN/TEST{idx}')
+            UploadFileInfo.objects.create(name=f'Upload {idx}',
+                                          creator=self.user_obj,
+                                          source_file=ContentFile(b'a,b\n1,2\n', name=f'upload_{idx}.csv'))
+
+        # 2 AnalysisPlans per dataset, one with a ReleaseInfo
+        for dataset_info in DatasetInfo.objects.all():
+            for plan_num in range(2):
+                release_info = None
+                if plan_num == 0:
+                    release_info = ReleaseInfo.objects.create(dataset=dataset_info,
+                                                              epsilon_used=0.1,
+                                                              dp_release={'name': dataset_info.name})
+                AnalysisPlan.objects.create(name=f'{dataset_info.name} plan {plan_num}',
+                                            analyst=self.user_obj,
+                                            dataset=dataset_info,
+                                            epsilon=0.1,
+                                            release_info=release_info,
+                                            expiration_date=timezone.now())
+
+    def tearDown(self):
+        for upload_info in UploadFileInfo.objects.all():
+            upload_info.source_file.delete()
+
+    def test_10_dataset_info_listing(self):
+        """(10) DatasetInfo listing, both DatasetInfo types with nested AnalysisPlans"""
+        msgt(self.test_10_dataset_info_listing.__doc__)
+
+        listing = self.assertListingQueryBudget(self.API_DATASET_INFO, 8)
+        self.assertEqual(listing['count'], 6)
+        self.assertEqual(len(listing['results']), 6)
+        for dataset_info in listing['results']:
+            self.assertEqual(len(dataset_info['analysis_plans']), 2)
+
+    def test_20_analysis_plan_listing(self):
+        """(20) AnalysisPlan listing with the dataset creator and ReleaseInfo"""
+        msgt(self.test_20_analysis_plan_listing.__doc__)
+
+        listing = self.assertListingQueryBudget(self.API_ANALYSIS_PLAN, 4)
+        self.assertEqual(listing['count'], 12)
+        self.assertEqual(len(listing['results']), 12)
+
+    def test_30_analysis_plan_list_view(self):
+        """(30) AnalysisPlan table listing, w/o variable_info and dp_statistics"""
+        msgt(self.test_30_analysis_plan_list_view.__doc__)
+
+        listing = self.assertListingQueryBudget(self.API_ANALYSIS_LIST_VIEW, 4)
+        self.assertEqual(listing['count'], 12)
+        self.assertEqual(len([x for x in listing['results'] if x['release_info']]), 6)
+        self.assertNotIn('variable_info', listing['results'][0])
+
+    def test_40_cursor_pagination(self):
+        """(40) With "?pagination=cursor", no count and the same query budget"""
+        msgt(self.test_40_cursor_pagination.__doc__)
+
+        listing = self.assertListingQueryBudget(self.API_DATASET_INFO, 8,
+                                                page_sizes=(5,), pagination='cursor')
+        self.assertNotIn('count', listing)
+        self.assertEqual(len(listing['results']), 5)
+        self.assertIn('pagination=cursor', listing['next'])
+
+        # The next page has the last result
+        response = self.client.get(listing['next'])
+        next_listing = response.json()
+        self.assertEqual(len(next_listing['results']), 1)
+        self.assertIsNone(next_listing['next'])
+        all_ids = [x['object_id'] for x in listing['results'] + next_listing['results']]
+        self.assertEqual(len(set(all_ids)), 6)
+
+        listing = self.assertListingQueryBudget(self.API_ANALYSIS_LIST_VIEW, 4,
+                                                page_sizes=(5,), pagination='cursor')
+        self.assertNotIn('count', listing)
+        self.assertEqual(len(listing['results']), 5)
@@ -1,13 +1,31 @@
 from os.path import abspath, dirname, join
+from unittest import mock
 
+import billiard
+import numpy as np
 import pandas as pd
 from django.test import TestCase
 
+from opendp_apps.profiler.chunked_variable_info import ChunkedVariableInfoHandler
+from opendp_apps.profiler.column_type_inference import \
+    (ColumnSlicePool, ColumnTypeInference, count_distinct_values)
+from opendp_apps.profiler.static_vals import KEY_NUM_WORKERS
 from opendp_apps.profiler.variable_info import VariableInfoHandler
 
 CURRENT_DIR = dirname(abspath(__file__))
 TEST_DATA_DIR = join(dirname(dirname(dirname(CURRENT_DIR))), 'test_data')
 
+# Split the test file's 183 rows x 24 columns across workers
+TEST_PARALLEL_MIN_CELLS = 1000
+
+
+def infer_types_in_daemon(dataframe, result_queue):
+    """Run the type inference in a daemonic process, as in a Celery prefork worker"""
+    with mock.patch('opendp_apps.profiler.column_type_inference.PROFILER_PARALLEL_MIN_CELLS',
+                    TEST_PARALLEL_MIN_CELLS):
+        type_inference = ColumnTypeInference(dataframe, num_workers=2)
+    result_queue.put((type_inference.num_slices, dict(type_inference.var_types)))
+
 
 class TestVariableInfoHandler(TestCase):
     maxDiff = None
@@ -41,3 +59,73 @@ class TestVariableInfoHandler(TestCase):
                                                                'categories': [],
                                                                'type': 'Boolean'
                                                                })
+
+    def test_integer_column_with_missing_values(self):
+        """Integer columns with missing values are read as floats but profiled as Integer"""
+        print(self.test_integer_column_with_missing_values.__doc__)
+        df = pd.DataFrame({'age': [21, None, 35, 40, 18],
+                           'height': [1.5, None, 1.75, 1.8, 1.6],
+                           'empty': [float('nan')] * 5,
+                           'flag': ['y', 'n', 'y', 'y', 'n']})
+        variable_info_handler = VariableInfoHandler(df)
+        profile = variable_info_handler.run_profile_process()
+
+        self.assertEqual(profile['variables']['age']['type'], 'Integer')
+        self.assertEqual(profile['variables']['height']['type'], 'Float')
+        self.assertEqual(profile['variables']['empty']['type'], 'Float')
+        self.assertEqual(profile['variables']['flag']['type'], 'Boolean')
+
+        # Each column is timed
+        self.assertEqual(list(variable_info_handler.column_timings.keys()), ['age', 'height', 'empty', 'flag'])
+
+    def test_count_distinct_values_stops_early(self):
+        """Distinct value counting stops at the limit"""
+        print(self.test_count_distinct_values_stops_early.__doc__)
+        self.assertEqual(count_distinct_values(list(range(100_000))), 3)
+        self.assertEqual(count_distinct_values([1] * 5000 + [None] * 5000), 2)
+        self.assertEqual(count_distinct_values(['a'] * 10_000), 1)
+
+    def test_profile_columns_in_parallel(self):
+        """Large files are profiled across worker processes with the same result"""
+        print(self.test_profile_columns_in_parallel.__doc__)
+        profile = VariableInfoHandler(self.df, **{KEY_NUM_WORKERS: 1}).run_profile_process()
+
+        with mock.patch('opendp_apps.profiler.column_type_inference.PROFILER_PARALLEL_MIN_CELLS',
+                        TEST_PARALLEL_MIN_CELLS):
+            self.assertEqual(len(ColumnSlicePool(2).get_column_slices(self.df)), 2)
+            type_inference = ColumnTypeInference(self.df, num_workers=2)
+            self.assertEqual(type_inference.num_slices, 2)
+
+            parallel_profile = VariableInfoHandler(self.df, **{KEY_NUM_WORKERS: 2}).run_profile_process()
+
+        self.assertEqual(profile, parallel_profile)
+        self.assertEqual(list(parallel_profile['variables'].keys()), list(self.df.columns))
+
+        # Too few values to split
+        self.assertEqual(len(ColumnSlicePool(4).get_column_slices(self.df)), 1)
+
+    def test_profile_columns_in_daemon_process(self):
+        """Worker processes are used within a daemonic process, e.g. a Celery prefork worker"""
+        print(self.test_profile_columns_in_daemon_process.__doc__)
+        result_queue = billiard.Queue()
+        daemon_process = billiard.Process(target=infer_types_in_daemon,
+                                          args=(self.df, result_queue),
+                                          daemon=True)
+        daemon_process.start()
+        num_slices, var_types = result_queue.get(timeout=60)
+        daemon_process.join()
+
+        self.assertEqual(num_slices, 2)
+        self.assertEqual(var_types, dict(ColumnTypeInference(self.df).var_types))
+
+    def test_profile_chunks_in_parallel(self):
+        """Chunks of large files are profiled across worker processes with the same result"""
+        print(self.test_profile_chunks_in_parallel.__doc__)
+        chunks = np.array_split(self.df, 4)
+
+        profile = ChunkedVariableInfoHandler(chunks, **{KEY_NUM_WORKERS: 1}).run_profile_process()
+        with mock.patch('opendp_apps.profiler.column_type_inference.PROFILER_PARALLEL_MIN_CELLS', 500):
+            parallel_profile = ChunkedVariableInfoHandler(chunks, **{KEY_NUM_WORKERS: 2}).run_profile_process()
+
+        self.assertEqual(profile, parallel_profile)
+        self.assertEqual(profile, VariableInfoHandler(self.df).run_profile_process())
@@ -2,26 +2,28 @@ import logging
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import permissions, status
 from rest_framework.response import Response
 
 from opendp_apps.analysis.models import AnalysisPlan, ReleaseInfo
 from opendp_apps.dataset import static_vals as dstatic
-from opendp_apps.dataset.models import DepositorSetupInfo, DatasetInfo, UploadFileInfo
+from opendp_apps.dataset.models import DepositorSetupInfo, DatasetInfo, DataverseFileInfo, UploadFileInfo
 from opendp_apps.dataset.permissions import IsOwnerOrBlocked
 from opendp_apps.dataset.serializers import \
     (DatasetInfoPolymorphicSerializer,
      DepositorSetupInfoSerializer,
      UploadFileInfoSerializer,
      UploadFileInfoCreationSerializer)
+from opendp_apps.utils.pagination import ListingPaginationMixin
 from opendp_apps.utils.view_helper import get_json_error
 from opendp_project.views import BaseModelViewSet
 
 logger = logging.getLogger(settings.DEFAULT_LOGGER)
 
 
-class DatasetInfoViewSet(BaseModelViewSet):
+class DatasetInfoViewSet(ListingPaginationMixin, BaseModelViewSet):
     """This class may be used for retrieving and updating DepositorSetupInfo, but NOT creating it"""
     queryset = DatasetInfo.objects.all().order_by('-created')
     serializer_class = DatasetInfoPolymorphicSerializer
@@ -34,7 +36,25 @@ class DatasetInfoViewSet(BaseModelViewSet):
         This restricts the view to show only the DatasetInfo for the OpenDPUser
         """
         logger.info(f"Getting DatasetInfo for user {self.request.user.object_id}")
-        return self.queryset.filter(creator=self.request.user)
+
+        # Related objects used by the serializers, fetched with the page instead of per row.
+        #   Note: The plan's "dataset" is set by the prefetch
+        analysis_plans = AnalysisPlan.objects.select_related('analyst', 'release_info')
+
+        return self.queryset.filter(creator=self.request.user
+                    ).select_related('creator', 'depositor_setup_info__creator'
+                    ).prefetch_related(Prefetch('analysisplan_set', queryset=analysis_plans))
+
+    def paginate_queryset(self, queryset):
+        """
+        "dv_installation" is only on DataverseFileInfo, so it is fetched for the page
+        after the polymorphic query returns the subclass objects
+        """
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            prefetch_related_objects([x for x in page if isinstance(x, DataverseFileInfo)],
+                                     'dv_installation')
+        return page
 
     def delete(self, request, *args, **kwargs):
         # We currently have on_delete set to protect, so we need to explicitly delete
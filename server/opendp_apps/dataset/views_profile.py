@@ -10,8 +10,10 @@ from rest_framework.response import Response
 
 from opendp_apps.async_messages.tasks import profile_dataset_info
 from opendp_apps.async_messages.utils import get_websocket_id
-from opendp_apps.dataset.serializers import DatasetObjectIdSerializer
+from opendp_apps.dataset.serializers import DatasetObjectIdSerializer, ProbeColumnsSerializer
 from opendp_apps.dataverses.download_and_profile_util import DownloadAndProfileUtil
+from opendp_apps.profiler import static_vals as pstatic
+from opendp_apps.profiler.tasks import run_profile_by_filefield
 from opendp_apps.utils.view_helper import get_json_error, get_json_success
 
 logger = logging.getLogger(settings.DEFAULT_LOGGER)
@@ -198,6 +200,48 @@ class ProfilingViewSet(viewsets.ViewSet):
                                          data=dp_util.get_data_profile()),
                         status=status.HTTP_200_OK)
 
+    @action(methods=['post'], detail=False, url_path='probe-columns')
+    def probe_columns(self, request, *args, **kwargs):
+        """Profile selected columns of a DatasetInfo object's file, without reading the whole file
+        - Input: DatasetInfo.object_id (UUID in string format) and "columns", a list of column names
+        - Output: Data profile of the columns in JSON format
+        NOTES:
+        - The logged in user must match the DatasetInfo.creator
+        - The column types are detected using the first rows of the file
+        - The profile isn't saved to the DatasetInfo and the depositor step isn't changed
+        """
+        # Is this a object_id a valid UUID? Are there column names?
+        #
+        pcs = ProbeColumnsSerializer(data=request.data)
+        if not pcs.is_valid():
+            logger.error(pcs.errors)
+            if 'object_id' in pcs.errors:
+                user_msg = '"object_id" error: %s' % (pcs.errors['object_id'][0])
+            elif 'columns' in pcs.errors:
+                user_msg = '"columns" error: %s' % (pcs.errors['columns'][0])
+            else:
+                user_msg = 'Not a valid "object_id"'
+            return Response(get_json_error(user_msg),
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Is there a related DatasetInfo where the logged in user is the
+        #   DatasetInfo creator?
+        #
+        dsi_info = pcs.get_dataset_info_with_user_check(request.user)
+        if not dsi_info.success:
+            return Response(get_json_error(dsi_info.message),
+                            status=status.HTTP_404_NOT_FOUND)
+
+        prunner = run_profile_by_filefield(pcs.get_object_id(),
+                                           **{pstatic.KEY_PROFILE_COLUMNS: pcs.get_columns()})
+        if prunner.has_error():
+            return Response(get_json_error(prunner.get_err_msg()),
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(get_json_success('Column profile complete',
+                                         data=prunner.data_profile),
+                        status=status.HTTP_200_OK)
+
 
 """
 curl http://127.0.0.1:8000/api/profile/retrieve-profile/
@@ -0,0 +1,77 @@
+"""
+Run independent Dataverse API calls concurrently, e.g. the user info and schema.org
+calls made during a Dataverse handoff. The total wait is that of the slowest call
+rather than the sum of the calls.
+
+- Each call runs in a thread of a ThreadPoolExecutor, using the shared Dataverse sessions
+- Each call has a time limit, settings.DATAVERSE_API_CALL_TIMEOUT
+- Failed calls are reported together: .get_err_msg() combines the messages
+  and .err_msgs has the message of each failed call
+
+Usage:
+    api_calls = DataverseApiCalls({'user_info': mparams.get_user_info,
+                                   'schema_org': mparams.get_schema_org})
+    if api_calls.run():
+        user_info = api_calls.results['user_info']
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+
+from django.conf import settings
+
+from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+
+class DataverseApiCalls(BasicErrCheck):
+    """Run Dataverse API calls in threads and collect their results"""
+
+    def __init__(self, api_calls: dict, timeout=None):
+        """
+        :param api_calls: { name: function with no arguments, ... }
+        :param timeout: seconds to wait for each call. Defaults to settings.DATAVERSE_API_CALL_TIMEOUT
+        """
+        self.api_calls = api_calls
+        self.timeout = timeout if timeout is not None else settings.DATAVERSE_API_CALL_TIMEOUT
+
+        self.results = {}  # { name: result of the call, ... }
+        self.err_msgs = {}  # { name: error message, ... }
+
+    def run(self) -> bool:
+        """Run the calls. Returns True if every call finished without an exception"""
+        if not self.api_calls:
+            return True
+
+        executor = ThreadPoolExecutor(max_workers=len(self.api_calls),
+                                      thread_name_prefix='dataverse_api_call')
+        futures = {}
+        try:
+            for name, api_call in self.api_calls.items():
+                futures[name] = executor.submit(api_call)
+
+            # The calls started together, so each one is timed from the start
+            start_time = time.monotonic()
+            for name, future in futures.items():
+                time_left = max(self.timeout - (time.monotonic() - start_time), 0)
+                try:
+                    self.results[name] = future.result(timeout=time_left)
+                except FuturesTimeoutError:
+                    self.err_msgs[name] = (f'The Dataverse API call "{name}" did not finish'
+                                           f' within {self.timeout} seconds.')
+                except Exception as ex_obj:
+                    self.err_msgs[name] = f'The Dataverse API call "{name}" failed. {ex_obj}'
+        finally:
+            # Don't wait for calls that timed out. (shutdown's "cancel_futures" requires Python 3.9)
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        if self.err_msgs:
+            user_msg = ' '.join(self.err_msgs.values())
+            logger.error(user_msg)
+            self.add_err_msg(user_msg)
+            return False
+
+        return True
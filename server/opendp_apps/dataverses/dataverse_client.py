@@ -2,29 +2,58 @@ import json
 from pprint import pprint
 
 import lxml.etree as etree
-import requests
 from pyDataverse.api import Api, DataAccessApi, NativeApi
+from pyDataverse.exceptions import ApiAuthorizationError, OperationFailedError
 from requests.exceptions import ConnectionError
 
 from opendp_apps.dataverses import static_vals as dv_static
+from opendp_apps.dataverses.dataverse_metadata_cache import DataverseMetadataCache
+from opendp_apps.dataverses.dataverse_session import get_dataverse_session
 from opendp_apps.dataverses.models import RegisteredDataverse
 from opendp_apps.model_helpers.basic_response import ok_resp, err_resp
 
 
+class SessionNativeApi(NativeApi):
+    """pyDataverse NativeApi which makes GET requests with the shared Dataverse session"""
+
+    def get_request(self, url, params=None, auth=False, headers=None):
+        """Same as pyDataverse's Api.get_request, using the session's kept-alive connections"""
+        params = {}
+        params["User-Agent"] = "pydataverse"
+        if self.api_token:
+            params["key"] = str(self.api_token)
+
+        try:
+            resp = get_dataverse_session(url).get(url, params=params, headers=headers)
+            if resp.status_code == 401:
+                error_msg = resp.json()["message"]
+                raise ApiAuthorizationError(
+                    "ERROR: GET - Authorization invalid {0}. MSG: {1}.".format(url, error_msg))
+            elif resp.status_code >= 300:
+                if resp.text:
+                    error_msg = resp.text
+                    raise OperationFailedError(
+                        "ERROR: GET HTTP {0} - {1}. MSG: {2}".format(resp.status_code, url, error_msg))
+            return resp
+        except ConnectionError:
+            raise ConnectionError(
+                "ERROR: GET - Could not establish connection to api {0}.".format(url))
+
+
 class DataverseClient(object):
 
     def __init__(self, host, api_token=None):
         self._host = host
         self.api_token = api_token
         self.api = Api(host, api_token=api_token)
-        self.native_api = NativeApi(host, api_token=api_token)
+        self.native_api = SessionNativeApi(host, api_token=api_token)
         self.data_access_api = DataAccessApi(host, api_token=api_token)
 
     def get_ddi(self, doi, format=dv_static.EXPORTER_FORMAT_DDI):
         """
         Get DDI metadata file
         """
-        response = self.native_api.get_dataset_export(doi, format)
+        response = self.get_dataset_export_json(doi, format)
         return DDI(response.content)
 
     def get_user_info(self, user_api_token=None):
@@ -41,7 +70,7 @@ class DataverseClient(object):
         # make the request
         headers = {'X-Dataverse-key': api_token}
         try:
-            response = requests.get(dv_url, headers=headers)
+            response = get_dataverse_session(dv_url).get(dv_url, headers=headers)
         except ConnectionError as err_obj:
             return err_resp(f'Failed to connect. {err_obj}')
 
@@ -79,13 +108,19 @@ class DataverseClient(object):
 
     def get_dataset_export_json(self, doi, format_type):
         """
-        Get dataset export
+        Get dataset export. If a copy is cached, Dataverse is asked whether it has changed.
+        A successful export is returned as a DataverseExportResponse
         """
+        metadata_cache = DataverseMetadataCache(self._host, doi, format_type)
+
+        # Same url as pyDataverse's NativeApi.get_dataset_export
+        url = f'{self.native_api.base_url_api_native}/datasets/export?exporter={format_type}&persistentId={doi}'
         try:
-            response = self.native_api.get_dataset_export(doi, format_type)
+            response = self.native_api.get_request(url, headers=metadata_cache.get_revalidation_headers())
         except ConnectionError as err_obj:
             return err_resp(f'Failed to connect. {err_obj}')
-        return response
+
+        return metadata_cache.get_export_response(response)
 
 
 class DDI(object):
@@ -1,30 +1,66 @@
 """
 Convenience class for handling Dataverse file transfers
 """
+import json
+import logging
+import os
 import pathlib
-from os.path import basename
-from tempfile import TemporaryFile
+import re
+import time
+from os.path import basename, dirname, isfile, join
 from urllib.parse import urlsplit
 
 import requests
+from django.conf import settings
 from django.core.files import File
 
 from opendp_apps.dataset.models import DepositorSetupInfo
 from opendp_apps.dataset.models import DataverseFileInfo
 from opendp_apps.dataverses import static_vals as dv_static
+from opendp_apps.dataverses.dataverse_session import get_dataverse_session
 from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
+from opendp_apps.utils.file_hash import FILE_HASH_CHUNK_SIZE, get_sha256_hasher
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+# e.g. "bytes 2048-4095/8192" or "bytes 2048-4095/*"
+CONTENT_RANGE_PATTERN = re.compile(r'^bytes\s+(\d+)-(\d+)/(\d+|\*)$')
+
+
+class DownloadedFile(File):
+    """
+    A completed download. As with Django's TemporaryUploadedFile, the
+    FileSystemStorage moves the file to its new location instead of copying it
+    """
+
+    def temporary_file_path(self):
+        """Return the full path of the downloaded file"""
+        return self.file.name
 
 
 class DataverseDownloadHandler(BasicErrCheck):
     """Using DataverseFileInfo, download the Dataverse file"""
 
-    def __init__(self, dv_file_info: DataverseFileInfo):
-        """Download the Dataverse file"""
+    def __init__(self, dv_file_info: DataverseFileInfo, progress_callback=None, stream_writer=None):
+        """
+        Download the Dataverse file
+          - progress_callback: optional, called as progress_callback(num_bytes_downloaded, total_bytes)
+            total_bytes is None if the file size is unknown
+          - stream_writer: optional, e.g. a StreamProfiler. Each chunk of the file is passed
+            to stream_writer.write(chunk), in order. stream_writer.reset() is called if
+            the download starts over
+        """
         self.dv_file_info = dv_file_info
+        self.progress_callback = progress_callback
+        self.stream_writer = stream_writer
         self.content_url = None
         self.new_file_name = None
         self.dv_user = None
 
+        self.num_bytes_downloaded = 0
+        self.total_bytes = None
+        self.last_progress_percent = None
+
         self.run_download_process()
 
     def get_source_file(self):
@@ -66,28 +102,255 @@ class DataverseDownloadHandler(BasicErrCheck):
             # Yes! All Done!
             return
 
-        # Download to a TemporaryFile
-        with TemporaryFile() as tf:
+        # Download to a partial file, resuming an earlier attempt if one was interrupted
+        #
+        partial_filepath = self.get_partial_filepath()
+        file_hash = self.download_to_partial_file(partial_filepath)
+        if not file_hash:
+            return
 
-            headers = {'X-Dataverse-key': self.dv_user.dv_general_token}
+        # Hash of the file, used to find a cached profile
+        self.dv_file_info.source_file_hash = file_hash
+
+        # Save the file to the DataverseFileInfo object
+        #   - With the FileSystemStorage, the partial file is moved into place, not copied
+        #   - note: self.new_file_name determined in "run_basic_checks_setup()"
+        with open(partial_filepath, 'rb') as partial_file:
+            self.dv_file_info.source_file.save(self.new_file_name, DownloadedFile(partial_file))
+
+        # Other storage backends copy the file
+        if isfile(partial_filepath):
+            os.remove(partial_filepath)
+
+    def get_partial_filepath(self) -> str:
+        """
+        Return the path of the partial file for this download. The name stays the same
+        across attempts so that a failed download may be resumed.
+        If the storage is on the local filesystem, the partial file is placed there,
+        allowing it to be moved into place when complete.
+        """
+        partial_filename = f'{self.dv_file_info.object_id}{dv_static.DOWNLOAD_PARTIAL_FILE_EXT}'
+        try:
+            partial_filepath = self.dv_file_info.source_file.storage.path(
+                join(dv_static.DOWNLOAD_PARTIAL_FILE_DIR, partial_filename))
+        except NotImplementedError:
+            # Not a local storage, e.g. S3, Azure, etc.
+            partial_filepath = join(settings.FILE_UPLOAD_TEMP_DIR,
+                                    dv_static.DOWNLOAD_PARTIAL_FILE_DIR,
+                                    partial_filename)
+
+        os.makedirs(dirname(partial_filepath), exist_ok=True)
+        return partial_filepath
+
+    def download_to_partial_file(self, partial_filepath: str):
+        """
+        Stream the Dataverse file to the partial file, hashing it as it's written.
+        After a dropped connection, the download resumes from the last byte received.
+          - The resumed request has an "If-Range" header with the file's ETag or Last-Modified,
+            so a file changed since the download began is sent in full
+          - The "Content-Range" of a resumed response must start at the next byte and
+            have the same total size; otherwise the download starts over
+        Returns the SHA-256 hash of the file or None if there's an error
+        """
+        hasher = get_sha256_hasher()
+        validator_filepath = partial_filepath + dv_static.DOWNLOAD_VALIDATOR_FILE_EXT
+        download_validator = {}
+
+        # Any bytes from an earlier attempt?
+        if isfile(partial_filepath):
+            download_validator = self.load_download_validator(validator_filepath)
+            if self.get_if_range(download_validator):
+                with open(partial_filepath, 'rb') as partial_file:
+                    for chunk in iter(lambda: partial_file.read(FILE_HASH_CHUNK_SIZE), b''):
+                        hasher.update(chunk)
+                        self.write_to_stream(chunk)
+                self.num_bytes_downloaded = os.path.getsize(partial_filepath)
+                self.total_bytes = download_validator.get('total_bytes')
+            else:
+                # Can't check that the file is unchanged, start over
+                logger.warning(f'Dataverse download could not be resumed, restarting: {self.content_url}')
+                os.remove(partial_filepath)
+
+        num_retries = 0
+        while True:
+            headers = {dv_static.HEADER_KEY_DATAVERSE: self.dv_user.dv_general_token}
+            if self.num_bytes_downloaded > 0:
+                # Resume from the last byte received, if the file hasn't changed
+                headers['Range'] = f'bytes={self.num_bytes_downloaded}-'
+                if_range = self.get_if_range(download_validator)
+                if if_range:
+                    headers['If-Range'] = if_range
+            try:
+                with get_dataverse_session(self.content_url).get(self.content_url, headers=headers, stream=True,
+                                                                 timeout=settings.DATAVERSE_DOWNLOAD_TIMEOUT) as r:
+                    if r.status_code == 416 and self.is_partial_file_complete(r):
+                        break
+
+                    if r.status_code not in (200, 206):
+                        user_msg = (f'Dataset download attempt failed with'
+                                    f' HTTP status code "{r.status_code}"')
+                        self.add_err_msg(user_msg)
+                        self.remove_partial_files(partial_filepath, validator_filepath)
+                        return None
+
+                    if r.status_code == 206:
+                        range_start, range_total = self.get_content_range(r)
+                        if range_start != self.num_bytes_downloaded or \
+                                (range_total and self.total_bytes and range_total != self.total_bytes):
+                            # Not the expected part of the file, start over
+                            logger.warning((f'Dataverse download sent an unexpected Content-Range'
+                                            f' "{r.headers.get("Content-Range")}", restarting: {self.content_url}'))
+                            hasher = self.restart_download(partial_filepath, validator_filepath)
+                            download_validator = {}
+                            continue
+                        if range_total:
+                            self.total_bytes = range_total
+                    else:
+                        if self.num_bytes_downloaded > 0:
+                            # The Range header wasn't used or the file changed, start over
+                            logger.warning(f'Dataverse download could not be resumed, restarting: {self.content_url}')
+                            hasher = self.restart_download(partial_filepath, validator_filepath)
+
+                        content_length = r.headers.get('Content-Length')
+                        self.total_bytes = int(content_length) if content_length else None
+
+                        download_validator = dict(etag=r.headers.get('ETag'),
+                                                  last_modified=r.headers.get('Last-Modified'),
+                                                  total_bytes=self.total_bytes)
+                        self.save_download_validator(validator_filepath, download_validator)
+
+                    with open(partial_filepath, 'ab' if self.num_bytes_downloaded > 0 else 'wb') as partial_file:
+                        for chunk in r.iter_content(chunk_size=settings.DATAVERSE_DOWNLOAD_CHUNK_SIZE):
+                            partial_file.write(chunk)
+                            hasher.update(chunk)
+                            self.write_to_stream(chunk)
+                            self.num_bytes_downloaded += len(chunk)
+                            self.send_progress()
+
+                    if self.total_bytes and self.num_bytes_downloaded < self.total_bytes:
+                        raise requests.exceptions.ChunkedEncodingError(
+                            f'Connection closed after {self.num_bytes_downloaded} of {self.total_bytes} bytes')
+                break
+
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.Timeout) as ex_obj:
+                num_retries += 1
+                if num_retries > settings.DATAVERSE_DOWNLOAD_MAX_RETRIES:
+                    # The partial file is kept so that the next attempt may resume
+                    user_msg = (f'Dataset download attempt failed after {num_retries} tries.'
+                                f' ({ex_obj}) (code: dv_download_090)')
+                    self.add_err_msg(user_msg)
+                    return None
+
+                logger.warning((f'Dataverse download interrupted after {self.num_bytes_downloaded} bytes.'
+                                f' Retry {num_retries}. ({ex_obj})'))
+                time.sleep(settings.DATAVERSE_DOWNLOAD_RETRY_WAIT * num_retries)
+
+        if isfile(validator_filepath):
+            os.remove(validator_filepath)
+
+        return hasher.hexdigest()
+
+    def restart_download(self, partial_filepath: str, validator_filepath: str):
+        """Remove the bytes downloaded so far. Returns a new hasher"""
+        self.remove_partial_files(partial_filepath, validator_filepath)
+        self.num_bytes_downloaded = 0
+        self.total_bytes = None
+        if self.stream_writer:
+            self.stream_writer.reset()
+
+        return get_sha256_hasher()
+
+    @staticmethod
+    def remove_partial_files(partial_filepath: str, validator_filepath: str):
+        """Remove the partial file and its validator"""
+        for filepath in (partial_filepath, validator_filepath):
+            if isfile(filepath):
+                os.remove(filepath)
+
+    @staticmethod
+    def load_download_validator(validator_filepath: str) -> dict:
+        """Return the saved ETag, Last-Modified, and size of the file being downloaded"""
+        if not isfile(validator_filepath):
+            return {}
+        try:
+            with open(validator_filepath, 'r') as validator_file:
+                return json.load(validator_file)
+        except (OSError, ValueError) as ex_obj:
+            logger.error(f'DataverseDownloadHandler.load_download_validator: {ex_obj}')
+            return {}
+
+    @staticmethod
+    def save_download_validator(validator_filepath: str, download_validator: dict):
+        """Save the ETag, Last-Modified, and size, so a later attempt can resume"""
+        with open(validator_filepath, 'w') as validator_file:
+            json.dump(download_validator, validator_file)
+
+    @staticmethod
+    def get_if_range(download_validator: dict):
+        """
+        Return the "If-Range" header value: the ETag or Last-Modified date.
+        A weak ETag, e.g. 'W/"abc"', may not be used with If-Range
+        """
+        etag = download_validator.get('etag')
+        if etag and not etag.startswith('W/'):
+            return etag
+
+        return download_validator.get('last_modified')
+
+    @staticmethod
+    def get_content_range(r: requests.Response) -> tuple:
+        """
+        For an HTTP 206 (Partial Content) response, return the (first byte, total size)
+        from the "Content-Range" header, e.g. "bytes 2048-4095/8192" -> (2048, 8192)
+        The total size is None if it's unknown, the first byte is None if the header isn't valid
+        """
+        match = CONTENT_RANGE_PATTERN.match(r.headers.get('Content-Range', '').strip())
+        if not match:
+            return None, None
+
+        range_total = match.group(3)
+        return int(match.group(1)), None if range_total == '*' else int(range_total)
+
+    def is_partial_file_complete(self, r: requests.Response) -> bool:
+        """
+        For an HTTP 416 (Range Not Satisfiable) response, check the "Content-Range"
+        header, e.g. "bytes */2048". Is the partial file the full size?
+        """
+        content_range = r.headers.get('Content-Range', '')
+        if not content_range.startswith('bytes */'):
+            return False
 
-            r = requests.get(self.content_url, headers=headers, stream=True)
-            if r.status_code != 200:
-                user_msg = (f'Dataset download attempt failed with'
-                            f' HTTP status code "{r.status_code}"')
-                self.add_err_msg(user_msg)
-                return
+        try:
+            self.total_bytes = int(content_range.split('/')[-1])
+        except ValueError:
+            return False
+
+        return self.total_bytes == self.num_bytes_downloaded
 
-            for chunk in r.iter_content(chunk_size=4096):
-                tf.write(chunk)
+    def write_to_stream(self, chunk: bytes):
+        """Pass the chunk to the stream_writer, if there is one"""
+        if self.stream_writer:
+            self.stream_writer.write(chunk)
 
-            # Rewind to beginning of the TemporaryFile
-            tf.seek(0)
+    def send_progress(self):
+        """
+        Call the progress_callback each time another DOWNLOAD_PROGRESS_STEP_PERCENT
+        of the file is received. If the file size is unknown, call it for each chunk.
+        """
+        if not self.progress_callback:
+            return
+
+        if self.total_bytes:
+            percent_complete = int(100 * self.num_bytes_downloaded / self.total_bytes)
+            if self.last_progress_percent is not None and \
+                    percent_complete - self.last_progress_percent < dv_static.DOWNLOAD_PROGRESS_STEP_PERCENT and \
+                    self.num_bytes_downloaded < self.total_bytes:
+                return
+            self.last_progress_percent = percent_complete
 
-            # Save the file to the DataverseFileInfo object
-            # note: self.new_file_name determined in "run_basic_checks_setup()"
-            django_file_obj = File(tf)
-            self.dv_file_info.source_file.save(self.new_file_name, django_file_obj)
+        self.progress_callback(self.num_bytes_downloaded, self.total_bytes)
 
     def run_basic_checks_setup(self):
         """Run basic pre-download checks and create a new file name"""
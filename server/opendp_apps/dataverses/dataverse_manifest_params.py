@@ -6,6 +6,7 @@ from django.http import QueryDict
 
 from opendp_apps.dataverses import static_vals as dv_static
 from opendp_apps.dataverses.dataverse_client import DataverseClient
+from opendp_apps.dataverses.dataverse_metadata_cache import get_schema_file_index
 from opendp_apps.dataverses.models import RegisteredDataverse
 from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
 from opendp_apps.model_helpers.basic_response import ok_resp, err_resp
@@ -102,14 +103,17 @@ class DataverseManifestParams(BasicErrCheck):
 
         return user_info
 
-    def retrieve_file_specific_info(self, schema_info):
+    def retrieve_file_specific_info(self, schema_info, file_index=None):
         """Retrieve file specific info from the Dataverse dataset JSON-LD schema """
-        return DataverseManifestParams.get_file_specific_schema_info(schema_info, self.fileId, self.filePid)
+        return DataverseManifestParams.get_file_specific_schema_info(schema_info, self.fileId, self.filePid,
+                                                                     file_index=file_index)
 
     @staticmethod
-    def get_file_specific_schema_info(full_schema_info, file_id=None, file_persistent_id=None):
+    def get_file_specific_schema_info(full_schema_info, file_id=None, file_persistent_id=None, file_index=None):
         """
         Navigate the JSON-LD schema.org info to retrieve file specific info
+          - file_index: optional, from get_schema_file_index(). e.g. a cached index,
+            from DataverseExportResponse.get_file_index()
        "distribution":[
           {
              "@type":"DataDownload",
@@ -131,27 +135,24 @@ class DataverseManifestParams(BasicErrCheck):
         if dv_static.SCHEMA_KEY_DISTRIBUTION not in full_schema_info:
             return err_resp(f'"{dv_static.SCHEMA_KEY_DISTRIBUTION}" not found in the schema')
 
-        url_ending_1 = f'/{file_id}'
         file_doi = file_persistent_id.split(':')[-1] if file_persistent_id else None
 
-        for file_info in full_schema_info[dv_static.SCHEMA_KEY_DISTRIBUTION]:
-
-            # Try to match the the /{fileId} id to the end of the contentURL
-            #   example "contentUrl": https://dataverse.harvard.edu/api/access/datafile/101646"
-            #
-            if dv_static.SCHEMA_KEY_CONTENTURL in file_info:
-                content_url = file_info[dv_static.SCHEMA_KEY_CONTENTURL]
-                if content_url and content_url.endswith(url_ending_1):
-                    return ok_resp(file_info)
-
-            # If there's there's a file DOI, try to match it with the identifier
-            #
-            #   example "identifier": "https://doi.org/10.7910/DVN/B7DHBK/BSNYLQ"
-            #
-            if file_doi and dv_static.SCHEMA_KEY_IDENTIFIER in file_info:
-                identifier = file_info[dv_static.SCHEMA_KEY_IDENTIFIER]
-                if identifier and identifier.endswith(file_doi):
-                    return ok_resp(file_info)
+        if file_index is None:
+            file_index = get_schema_file_index(full_schema_info)
+
+        # Match the fileId to the end of the contentURL
+        #   example "contentUrl": https://dataverse.harvard.edu/api/access/datafile/101646"
+        #
+        # If there's there's a file DOI, match it with the identifier
+        #   example "identifier": "https://doi.org/10.7910/DVN/B7DHBK/BSNYLQ"
+        #
+        # If both match, use the first entry, as the file id and DOI may be for different files
+        #
+        positions = [file_index[dv_static.FILE_INDEX_KEY_FILE_IDS].get(str(file_id)) if file_id else None,
+                     file_index[dv_static.FILE_INDEX_KEY_FILE_DOIS].get(file_doi) if file_doi else None]
+        positions = [x for x in positions if x is not None]
+        if positions:
+            return ok_resp(full_schema_info[dv_static.SCHEMA_KEY_DISTRIBUTION][min(positions)])
 
         if file_id:
             user_msg = f'Did not find fileId "{file_id}"'
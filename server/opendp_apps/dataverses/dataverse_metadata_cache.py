@@ -0,0 +1,171 @@
+"""
+Cache Dataverse dataset exports, e.g. the schema.org JSON-LD and DDI metadata
+
+For datasets with many files, the schema.org export may be megabytes. Each handoff
+asks Dataverse for the export again, sending the ETag/Last-Modified of the cached
+copy. If Dataverse answers "304 Not Modified", the cached copy is used.
+- Keys are the Dataverse host, export format, and dataset persistent id. The export
+  API always returns the latest published version, so the version is checked by
+  the revalidation rather than being part of the key. The version is kept in the entry
+- Exports without an ETag or Last-Modified header can't be revalidated and aren't cached
+- The schema.org entries include a file index: the file id and file DOI of each
+  "distribution" entry, used by DataverseManifestParams.get_file_specific_schema_info
+- The cache is optional: if it's unavailable, the export is retrieved as usual
+"""
+import hashlib
+import json
+import logging
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import caches
+
+from opendp_apps.dataverses import static_vals as dv_static
+from opendp_apps.dataverses.dataverse_session import get_dataverse_host
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+
+def get_schema_file_index(schema_info: dict) -> dict:
+    """
+    Index the "distribution" entries of the schema.org JSON-LD by file id and file DOI
+    Returns {'file_ids': {'101646': 0, ...}, 'file_dois': {'10.7910/DVN/OLD7MB/PZPDJF': 0, ...}}
+      - file id: the end of the "contentUrl", e.g. https://dataverse.harvard.edu/api/access/datafile/101646
+      - file DOI: the path of the "identifier", e.g. https://doi.org/10.7910/DVN/OLD7MB/PZPDJF
+    The values are positions in the "distribution" list. The first entry is kept for duplicates.
+    """
+    file_index = {dv_static.FILE_INDEX_KEY_FILE_IDS: {},
+                  dv_static.FILE_INDEX_KEY_FILE_DOIS: {}}
+
+    for idx, file_info in enumerate(schema_info.get(dv_static.SCHEMA_KEY_DISTRIBUTION) or []):
+        content_url = file_info.get(dv_static.SCHEMA_KEY_CONTENTURL)
+        if content_url:
+            file_id = content_url.rstrip('/').split('/')[-1]
+            file_index[dv_static.FILE_INDEX_KEY_FILE_IDS].setdefault(file_id, idx)
+
+        identifier = file_info.get(dv_static.SCHEMA_KEY_IDENTIFIER)
+        if identifier:
+            file_doi = urlsplit(identifier).path.strip('/')
+            file_index[dv_static.FILE_INDEX_KEY_FILE_DOIS].setdefault(file_doi, idx)
+
+    return file_index
+
+
+class DataverseExportResponse:
+    """A successful dataset export, from the Dataverse API or the cache"""
+
+    status_code = 200
+
+    def __init__(self, content: bytes, file_index=None, from_cache=False):
+        self.content = content
+        self.file_index = file_index
+        self.from_cache = from_cache
+        self._json = None
+
+    def json(self):
+        """Return the export as a dict. The content is only parsed once"""
+        if self._json is None:
+            self._json = json.loads(self.content)
+        return self._json
+
+    def get_file_index(self) -> dict:
+        """Return the schema.org file index, see get_schema_file_index()"""
+        if self.file_index is None:
+            self.file_index = get_schema_file_index(self.json())
+        return self.file_index
+
+
+class DataverseMetadataCache:
+    """Get/save a dataset export, revalidated with ETag/Last-Modified"""
+
+    def __init__(self, site_url: str, dataset_pid: str, export_format: str):
+        """
+        :param site_url: the Dataverse url, e.g. https://dataverse.harvard.edu
+        :param dataset_pid: e.g. doi:10.7910/DVN/OLD7MB
+        :param export_format: e.g. dv_static.EXPORTER_FORMAT_SCHEMA_ORG
+        """
+        self.site_url = site_url
+        self.dataset_pid = dataset_pid
+        self.export_format = export_format
+
+        self.cached_entry = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.DATAVERSE_METADATA_CACHE_ENABLED
+
+    def get_cache_key(self) -> str:
+        key_info = json.dumps([get_dataverse_host(self.site_url), self.export_format, self.dataset_pid])
+        return f'{dv_static.DV_METADATA_CACHE_KEY_PREFIX}:{hashlib.sha256(key_info.encode()).hexdigest()}'
+
+    def get_cached_entry(self):
+        """Return the cached entry as a dict or None"""
+        if not self.is_enabled():
+            return None
+
+        if self.cached_entry is None:
+            try:
+                self.cached_entry = caches[dv_static.DV_METADATA_CACHE].get(self.get_cache_key())
+            except Exception as ex_obj:
+                logger.error(f'Failed to retrieve the cached Dataverse metadata: {ex_obj}')
+
+        return self.cached_entry
+
+    def get_revalidation_headers(self) -> dict:
+        """Return the "If-None-Match"/"If-Modified-Since" headers for the cached entry, if any"""
+        cached_entry = self.get_cached_entry()
+        if not cached_entry:
+            return {}
+
+        headers = {}
+        if cached_entry.get('etag'):
+            headers['If-None-Match'] = cached_entry['etag']
+        if cached_entry.get('last_modified'):
+            headers['If-Modified-Since'] = cached_entry['last_modified']
+
+        return headers
+
+    def get_export_response(self, response):
+        """
+        Using the Dataverse API response:
+          - 304 Not Modified: return the cached export as a DataverseExportResponse
+          - 200: cache the export and return it as a DataverseExportResponse
+          - otherwise, return the response as is
+        """
+        if response.status_code == 304 and self.get_cached_entry():
+            logger.info(f'Dataverse metadata not modified, using the cached copy: {self.dataset_pid}')
+            return DataverseExportResponse(self.cached_entry['content'],
+                                           file_index=self.cached_entry.get('file_index'),
+                                           from_cache=True)
+
+        if response.status_code != 200:
+            return response
+
+        export_response = DataverseExportResponse(response.content)
+        self.save_entry(export_response,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified'))
+
+        return export_response
+
+    def save_entry(self, export_response: DataverseExportResponse, etag=None, last_modified=None) -> bool:
+        """Save the export to the cache. Return True if successful"""
+        if not self.is_enabled() or not (etag or last_modified):
+            return False
+
+        entry = dict(etag=etag,
+                     last_modified=last_modified,
+                     content=export_response.content,
+                     file_index=None,
+                     version=None)
+        try:
+            if self.export_format == dv_static.EXPORTER_FORMAT_SCHEMA_ORG:
+                entry['file_index'] = export_response.get_file_index()
+                entry['version'] = export_response.json().get('version')
+
+            caches[dv_static.DV_METADATA_CACHE].set(self.get_cache_key(), entry,
+                                                    settings.DATAVERSE_METADATA_CACHE_TIMEOUT)
+            return True
+        except Exception as ex_obj:
+            logger.error(f'Failed to cache the Dataverse metadata {self.dataset_pid}: {ex_obj}')
+            return False
@@ -7,6 +7,7 @@ Completes the following steps:
 100 - Checks for correct Dataverse params
 200 - Retrieves user info via the API
 300 - Retrieves dataset schema info via the API (JSON LD)
+    - Steps 200 and 300 run concurrently
 400 - Update user info
 500 - Check if file exists in OpenDP App
     - Yes
@@ -23,9 +24,10 @@ Completes the following steps:
 
 from opendp_apps.dataset.models import DataverseFileInfo
 from opendp_apps.dataverses import static_vals as dv_static
+from opendp_apps.dataverses.dataverse_api_calls import DataverseApiCalls
 from opendp_apps.dataverses.dataverse_manifest_params import DataverseManifestParams
-# from opendp_apps.model_helpers.basic_response import ok_resp, err_resp
 from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
+from opendp_apps.model_helpers.basic_response import ok_resp, err_resp
 from opendp_apps.user.models import DataverseUser, OpenDPUser
 
 
@@ -68,10 +70,7 @@ class DataverseRequestHandler(BasicErrCheck):
 
         # Retrieve minimal data to do work
         #
-        if not self.retrieve_user_info():
-            return
-
-        if not self.retrieve_schema_org_info():
+        if not self.retrieve_dataverse_info():
             return
 
         # DDI...
@@ -84,54 +83,71 @@ class DataverseRequestHandler(BasicErrCheck):
         if not self.update_dataverse_file_info():
             return
 
-    def retrieve_user_info(self):
+    def retrieve_dataverse_info(self):
         """
-        User the DV API to retrieve user info
+        Use the DV API to retrieve the user info and schema.org info.
+        The calls are independent, so they are made concurrently
         """
         if self.has_error():
             return False
 
-        user_info = self.mparams.get_user_info()
-        if not user_info.success:
-            self.add_err_msg(user_info.message)
+        api_calls = DataverseApiCalls({dv_static.DV_API_CALL_USER_INFO: self.mparams.get_user_info,
+                                       dv_static.DV_API_CALL_SCHEMA_ORG: self.mparams.get_schema_org})
+        if not api_calls.run():
+            self.add_err_msg(api_calls.get_err_msg())
             return False
 
+        # Report the problems with both responses, not only the first
+        #
+        err_msgs = []
+        for info_resp in [self.process_user_info(api_calls.results[dv_static.DV_API_CALL_USER_INFO]),
+                          self.process_schema_org_info(api_calls.results[dv_static.DV_API_CALL_SCHEMA_ORG])]:
+            if not info_resp.success:
+                err_msgs.append(info_resp.message)
+
+        if err_msgs:
+            self.add_err_msg(' '.join(err_msgs))
+            return False
+
+        return True
+
+    def process_user_info(self, user_info):
+        """
+        Set the user info using the DV API response
+        """
+        if not user_info.success:
+            return err_resp(user_info.message)
+
         if isinstance(user_info.data, dict):
             if 'data' in user_info.data:
                 self.user_info = user_info.data.get('data')
-                return True
+                return ok_resp(self.user_info)
             else:
                 user_msg = '"data" key not found in user information from Dataverse API'
         else:
             user_msg = 'user_info.data must be a Python dict'
 
-        self.add_err_msg(user_msg)
-        return False
+        return err_resp(user_msg)
 
-    def retrieve_schema_org_info(self):
+    def process_schema_org_info(self, schema_info):
         """
-        User the DV API to retrieve schema.org info about the dataset
+        Set the schema.org info, and the file specific info, using the DV API response
         """
-        if self.has_error():
-            return False
-
         # (1) Retrieve the JSON LD info
         #
-        schema_info = self.mparams.get_schema_org()
         if schema_info.status_code >= 400:
-            self.add_err_msg(schema_info.message)
-            return False
+            return err_resp(schema_info.message)
         self.schema_info = schema_info.json()
 
         # (2) Retrieve the file specific info from the JSON-LD
         #
-        file_info = self.mparams.retrieve_file_specific_info(self.schema_info)
+        file_info = self.mparams.retrieve_file_specific_info(self.schema_info,
+                                                             file_index=schema_info.get_file_index())
         if not file_info.success:
-            self.add_err_msg(file_info.message)
-            return False
+            return err_resp(file_info.message)
 
         self.schema_info_for_file = file_info.data
-        return True
+        return ok_resp(self.schema_info_for_file)
 
     def update_dataverse_user_info(self):
         """
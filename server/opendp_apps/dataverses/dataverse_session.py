@@ -0,0 +1,103 @@
+"""
+Shared HTTP sessions for calls to the Dataverse API
+
+Each process keeps one requests.Session per Dataverse host (scheme + host + port).
+Connections are kept alive and re-used, e.g. the user info, schema.org, and
+download calls made during a Dataverse handoff share the same TLS connection.
+
+Each session has:
+  - a bounded connection pool, settings.DATAVERSE_HTTP_POOL_MAXSIZE
+  - a default timeout, settings.DATAVERSE_HTTP_TIMEOUT
+  - retries with backoff for failed connections and 502/503/504 responses.
+    Only idempotent requests, e.g. GET, are retried
+
+Usage:
+    response = get_dataverse_session(dv_url).get(dv_url, headers=headers)
+"""
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from opendp_apps.dataverses import static_vals as dv_static
+
+# { 'https://dataverse.harvard.edu': DataverseSession, ... }
+DATAVERSE_SESSIONS = {}
+DATAVERSE_SESSIONS_LOCK = threading.Lock()
+
+
+class DataverseSession(requests.Session):
+    """requests.Session with a default timeout"""
+
+    def __init__(self, timeout=None):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        """Use the default timeout unless one is specified"""
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def get_dataverse_host(url: str) -> str:
+    """Return the scheme and host of the url, e.g. "https://dataverse.harvard.edu" """
+    url_parts = urlsplit(url)
+    return f'{url_parts.scheme}://{url_parts.netloc}'.lower()
+
+
+def make_dataverse_session() -> DataverseSession:
+    """Make a new DataverseSession, using the settings for the pool size, timeout, and retries"""
+    session = DataverseSession(timeout=settings.DATAVERSE_HTTP_TIMEOUT)
+
+    retry = Retry(total=settings.DATAVERSE_HTTP_MAX_RETRIES,
+                  backoff_factor=settings.DATAVERSE_HTTP_RETRY_BACKOFF,
+                  status_forcelist=dv_static.DV_HTTP_RETRY_STATUS_CODES,
+                  allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                  raise_on_status=False)
+
+    # One host per session, so one pool
+    adapter = HTTPAdapter(pool_connections=1,
+                          pool_maxsize=settings.DATAVERSE_HTTP_POOL_MAXSIZE,
+                          max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+
+def get_dataverse_session(url: str) -> DataverseSession:
+    """Return the shared session for the url's Dataverse host, creating it if needed"""
+    dv_host = get_dataverse_host(url)
+
+    with DATAVERSE_SESSIONS_LOCK:
+        session = DATAVERSE_SESSIONS.get(dv_host)
+        if session is None:
+            session = make_dataverse_session()
+            DATAVERSE_SESSIONS[dv_host] = session
+
+    return session
+
+
+def close_dataverse_sessions():
+    """Close the sessions and their connections"""
+    with DATAVERSE_SESSIONS_LOCK:
+        for session in DATAVERSE_SESSIONS.values():
+            session.close()
+        DATAVERSE_SESSIONS.clear()
+
+
+def clear_dataverse_sessions_after_fork():
+    """
+    A forked process, e.g. a Celery pool process, must not share the parent's
+    connections. Drop the inherited sessions without closing their sockets.
+    """
+    global DATAVERSE_SESSIONS_LOCK
+    DATAVERSE_SESSIONS_LOCK = threading.Lock()
+    DATAVERSE_SESSIONS.clear()
+
+
+os.register_at_fork(after_in_child=clear_dataverse_sessions_after_fork)
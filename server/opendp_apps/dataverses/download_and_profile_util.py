@@ -4,6 +4,7 @@ Combine the functionality of these objects:
     - ProfileHandler (profiler.profile_handler.ProfileHandler)
 
 Basic workflow:
+    - A Dataverse file is profiled while it's downloaded, see profiler/stream_profiler.py
     - input:
         - DatasetFileInfo
         - websocket_id (optional)
@@ -17,12 +18,15 @@ import logging
 from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.serializers.json import DjangoJSONEncoder
+from django.template.defaultfilters import filesizeformat
 
 from opendp_apps.async_messages import static_vals as async_static
 from opendp_apps.async_messages.websocket_message import WebsocketMessage
 from opendp_apps.dataset.models import DatasetInfo
 from opendp_apps.dataverses.dataverse_download_handler import DataverseDownloadHandler
 from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
+from opendp_apps.profiler import static_vals as pstatic
+from opendp_apps.profiler.stream_profiler import StreamProfiler
 from opendp_apps.profiler.tasks import run_profile_by_filefield
 
 logger = logging.getLogger(settings.DEFAULT_LOGGER)
@@ -39,6 +43,7 @@ class DownloadAndProfileUtil(BasicErrCheck):
         self.dataset_info = None  # DatasetInfo object
         self.data_profile = None  # Profiler output; saved to DatasetInfo object
         self.profile_variables = None  # Formatted profiler output; saved to DatasetInfo object
+        self.streamed_data_profile = None  # Profile made during the Dataverse download, if available
 
         # Run
         self.run_process()
@@ -82,6 +87,26 @@ class DownloadAndProfileUtil(BasicErrCheck):
 
         ws_msg.send_message(self.websocket_id)
 
+    def send_websocket_download_progress_msg(self, num_bytes_downloaded, total_bytes=None):
+        """Send a websocket message of type WS_MSG_TYPE_PROFILER with the bytes downloaded.
+        Used as the DataverseDownloadHandler progress_callback"""
+        if not self.websocket_id:
+            return
+
+        if total_bytes:
+            user_msg = (f'Copying the Dataverse file: {filesizeformat(num_bytes_downloaded)}'
+                        f' of {filesizeformat(total_bytes)}')
+        else:
+            user_msg = f'Copying the Dataverse file: {filesizeformat(num_bytes_downloaded)}'
+
+        ws_msg = WebsocketMessage.get_success_message(
+            async_static.WS_MSG_TYPE_PROFILER,
+            user_msg,
+            data=dict(num_bytes_downloaded=num_bytes_downloaded,
+                      total_bytes=total_bytes))
+
+        ws_msg.send_message(self.websocket_id)
+
     def run_process(self):
         """Run the download/profile process"""
         if self.has_error():
@@ -145,14 +170,39 @@ class DownloadAndProfileUtil(BasicErrCheck):
         # ------------------------------------------------
         self.send_websocket_success_msg('Copying the Dataverse file to DP Creator.')
 
-        dhandler = DataverseDownloadHandler(self.dataset_info)
+        # Profile the file while it's downloaded
+        stream_profiler = None
+        if settings.PROFILER_STREAM_DOWNLOADS:
+            stream_profiler = StreamProfiler(max_num_features=settings.PROFILER_COLUMN_LIMIT)
+            stream_profiler.start()
+
+        try:
+            dhandler = DataverseDownloadHandler(self.dataset_info,
+                                                progress_callback=self.send_websocket_download_progress_msg,
+                                                stream_writer=stream_profiler)
+        except Exception:
+            # Don't leave the profile thread waiting for more bytes
+            if stream_profiler:
+                stream_profiler.cancel('The file download did not finish.')
+            raise
+
         if dhandler.has_error():
+            if stream_profiler:
+                stream_profiler.cancel('The file download did not finish.')
             user_msg = dhandler.get_err_msg()
             self.add_err_msg(user_msg)
             self.send_websocket_profiler_err_msg(user_msg)
             return False
 
         self.send_websocket_success_msg('The Dataverse file has been copied.')
+
+        # Wait for the last rows to be profiled. On an error, the file is profiled after the download
+        if stream_profiler:
+            if stream_profiler.finish():
+                self.streamed_data_profile = stream_profiler.data_profile
+            else:
+                logger.info(f'Stream profile not used: {stream_profiler.get_err_msg()}')
+
         return True
 
     def profile_file(self):
@@ -167,7 +217,8 @@ class DownloadAndProfileUtil(BasicErrCheck):
             return
 
         prunner = run_profile_by_filefield(self.dataset_info.object_id,
-                                           max_num_features=settings.PROFILER_COLUMN_LIMIT)
+                                           max_num_features=settings.PROFILER_COLUMN_LIMIT,
+                                           **{pstatic.KEY_STREAMED_DATA_PROFILE: self.streamed_data_profile})
 
         if prunner.has_error():
             user_msg = prunner.get_err_msg()
@@ -23,6 +23,19 @@ EXPORTER_FORMAT_DDI = 'ddi'
 EXPORTER_FORMAT_SCHEMA_ORG = 'schema.org'
 EXPORTER_FORMATS = [EXPORTER_FORMAT_SCHEMA_ORG]  # [EXPORTER_FORMAT_DDI, EXPORTER_FORMAT_SCHEMA_ORG]
 
+# Names of the concurrent Dataverse API calls, see dataverse_api_calls.py
+DV_API_CALL_USER_INFO = 'user_info'
+DV_API_CALL_SCHEMA_ORG = 'schema_org'
+
+# Cached dataset exports, see dataverse_metadata_cache.py
+DV_METADATA_CACHE = 'dataverse_metadata'
+DV_METADATA_CACHE_KEY_PREFIX = 'dv_metadata'
+FILE_INDEX_KEY_FILE_IDS = 'file_ids'
+FILE_INDEX_KEY_FILE_DOIS = 'file_dois'
+
+# Responses retried by the Dataverse session, see dataverse_session.py
+DV_HTTP_RETRY_STATUS_CODES = (502, 503, 504)
+
 # -----------------------------
 # Keys for accessing data within
 # Dataverse API responses
@@ -54,6 +67,19 @@ DV_DEPOSIT_TYPE_DP_PDF = 'dpPDF'
 DV_DEPOSIT_TYPES = [DV_DEPOSIT_TYPE_DP_JSON, DV_DEPOSIT_TYPE_DP_PDF]
 DV_DEPOSIT_CHOICES = [(x, x) for x in DV_DEPOSIT_TYPES]
 
+# ----------------------------------
+# Dataverse file download
+# ----------------------------------
+# Partial downloads are written to this directory, within the source file storage.
+#   If a download fails, the next attempt resumes from the partial file
+DOWNLOAD_PARTIAL_FILE_DIR = 'partial-download'
+DOWNLOAD_PARTIAL_FILE_EXT = '.part'
+# Saved next to the partial file: the ETag/Last-Modified and size of the file being downloaded.
+#   Sent as the "If-Range" header when resuming so a changed file is downloaded again
+DOWNLOAD_VALIDATOR_FILE_EXT = '.validator.json'
+# Download progress is reported each time another 10% of the file is received
+DOWNLOAD_PROGRESS_STEP_PERCENT = 10
+
 # ----------------------------------
 # Error messages
 # ----------------------------------
@@ -0,0 +1,79 @@
+import time
+
+import requests_mock
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from opendp_apps.dataverses import static_vals as dv_static
+from opendp_apps.dataverses.dataverse_api_calls import DataverseApiCalls
+from opendp_apps.dataverses.dataverse_request_handler import DataverseRequestHandler
+from opendp_apps.dataverses.models import ManifestTestParams
+from opendp_apps.model_helpers.basic_response import ok_resp
+from opendp_apps.model_helpers.msg_util import msgt
+
+
+class DataverseApiCallsTest(TestCase):
+    """Test running Dataverse API calls concurrently"""
+
+    fixtures = ['test_dataverses_01.json',
+                'test_manifest_params_04.json']
+
+    def test_10_calls_run_concurrently(self):
+        """(10) The calls wait for the slowest call, not the sum of the calls"""
+        msgt(self.test_10_calls_run_concurrently.__doc__)
+
+        def slow_call(result):
+            time.sleep(0.5)
+            return ok_resp(result)
+
+        start_time = time.monotonic()
+        api_calls = DataverseApiCalls({'first': lambda: slow_call(1),
+                                       'second': lambda: slow_call(2),
+                                       'third': lambda: slow_call(3)})
+        self.assertTrue(api_calls.run())
+        self.assertLess(time.monotonic() - start_time, 1.0)
+
+        self.assertFalse(api_calls.has_error())
+        self.assertEqual([api_calls.results[x].data for x in ['first', 'second', 'third']], [1, 2, 3])
+
+    def test_20_errors_combined(self):
+        """(20) Timeouts and exceptions are reported together"""
+        msgt(self.test_20_errors_combined.__doc__)
+
+        def bad_call():
+            raise ValueError('No connection adapters were found')
+
+        api_calls = DataverseApiCalls({'slow': lambda: time.sleep(2),
+                                       'bad': bad_call,
+                                       'good': lambda: ok_resp(True)},
+                                      timeout=0.2)
+        start_time = time.monotonic()
+        self.assertFalse(api_calls.run())
+        self.assertLess(time.monotonic() - start_time, 1.0)
+
+        self.assertTrue(api_calls.has_error())
+        self.assertEqual(set(api_calls.err_msgs.keys()), {'slow', 'bad'})
+        self.assertIn('"slow" did not finish within 0.2 seconds', api_calls.get_err_msg())
+        self.assertIn('No connection adapters were found', api_calls.get_err_msg())
+        self.assertTrue(api_calls.results['good'].success)
+
+    @requests_mock.Mocker()
+    def test_30_handoff_errors_combined(self, req_mocker):
+        """(30) DataverseRequestHandler reports user info and schema.org errors together"""
+        msgt(self.test_30_handoff_errors_combined.__doc__)
+
+        user_obj, _created = get_user_model().objects.get_or_create(username='dv_depositor')
+        mock_params = ManifestTestParams.objects.filter(use_mock_dv_api=True).first()
+
+        req_mocker.get('http://127.0.0.1:8000/dv-mock-api/api/v1/users/:me',
+                       json={dv_static.DV_KEY_STATUS: dv_static.STATUS_VAL_ERROR,
+                             dv_static.DV_KEY_MESSAGE: 'Bad api key'})
+        req_mocker.get('http://127.0.0.1:8000/dv-mock-api/api/v1/datasets/export',
+                       json={'name': 'Dataset without files'})
+
+        dv_handler = DataverseRequestHandler(mock_params.as_dict(), user_obj)
+
+        self.assertTrue(dv_handler.has_error())
+        self.assertIn('Bad api key', dv_handler.get_err_msg())
+        self.assertIn(f'"{dv_static.SCHEMA_KEY_DISTRIBUTION}" not found in the schema', dv_handler.get_err_msg())
+        self.assertEqual(len(req_mocker.request_history), 2)
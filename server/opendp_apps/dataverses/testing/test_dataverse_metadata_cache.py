@@ -0,0 +1,115 @@
+import json
+
+import requests_mock
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from opendp_apps.dataverses import static_vals as dv_static
+from opendp_apps.dataverses.dataverse_client import DataverseClient
+from opendp_apps.dataverses.dataverse_manifest_params import DataverseManifestParams
+from opendp_apps.dataverses.dataverse_metadata_cache import get_schema_file_index
+from opendp_apps.dataverses.testing import schema_test_data
+from opendp_apps.model_helpers.msg_util import msgt
+
+
+class DataverseMetadataCacheTest(TestCase):
+    """Test caching the Dataverse dataset exports"""
+
+    site_url = 'https://dataverse.harvard.edu'
+    dataset_pid = 'doi:10.7910/DVN/OLD7MB'
+
+    def setUp(self):
+        caches[dv_static.DV_METADATA_CACHE].clear()
+        self.client = DataverseClient(self.site_url, 'shoefly-dont-bother-m3')
+        self.export_url = f'{self.site_url}/api/v1/datasets/export'
+
+    def tearDown(self):
+        caches[dv_static.DV_METADATA_CACHE].clear()
+
+    def test_10_not_modified_uses_cache(self):
+        """(10) The export is cached with its ETag and used after a 304 Not Modified"""
+        msgt(self.test_10_not_modified_uses_cache.__doc__)
+
+        with requests_mock.Mocker() as req_mocker:
+            req_mocker.get(self.export_url,
+                           [dict(json=schema_test_data.schema_info_02, headers={'ETag': '"v-101"'}),
+                            dict(status_code=304)])
+
+            schema_org_resp = self.client.get_schema_org(self.dataset_pid)
+            self.assertEqual(schema_org_resp.status_code, 200)
+            self.assertFalse(schema_org_resp.from_cache)
+            self.assertNotIn('If-None-Match', req_mocker.request_history[0].headers)
+
+            schema_org_resp = self.client.get_schema_org(self.dataset_pid)
+            self.assertEqual(req_mocker.request_history[1].headers['If-None-Match'], '"v-101"')
+
+        self.assertEqual(schema_org_resp.status_code, 200)
+        self.assertTrue(schema_org_resp.from_cache)
+        self.assertEqual(schema_org_resp.json(), json.loads(json.dumps(schema_test_data.schema_info_02)))
+
+        # The cached file index finds the file
+        file_resp = DataverseManifestParams.get_file_specific_schema_info(
+            schema_org_resp.json(),
+            file_persistent_id=schema_test_data.schema_info_02_file_pid,
+            file_index=schema_org_resp.get_file_index())
+        self.assertTrue(file_resp.success)
+        self.assertTrue(file_resp.data['identifier'].endswith(schema_test_data.schema_info_02_file_pid))
+
+    def test_20_modified_export(self):
+        """(20) A changed export replaces the cached copy. Exports without validators aren't cached"""
+        msgt(self.test_20_modified_export.__doc__)
+
+        with requests_mock.Mocker() as req_mocker:
+            req_mocker.get(self.export_url,
+                           [dict(json={'version': 1},
+                                 headers={'Last-Modified': 'Wed, 21 Oct 2026 07:28:00 GMT'}),
+                            dict(json={'version': 2}),
+                            dict(json={'version': 3})])
+
+            self.assertEqual(self.client.get_schema_org(self.dataset_pid).json(), {'version': 1})
+
+            # The new version has no validator, so the next call isn't revalidated
+            self.assertEqual(self.client.get_schema_org(self.dataset_pid).json(), {'version': 2})
+            self.assertEqual(self.client.get_schema_org(self.dataset_pid).json(), {'version': 3})
+
+            self.assertEqual(req_mocker.request_history[1].headers['If-Modified-Since'],
+                             'Wed, 21 Oct 2026 07:28:00 GMT')
+
+    @override_settings(DATAVERSE_METADATA_CACHE_ENABLED=False)
+    def test_30_cache_disabled(self):
+        """(30) With the cache disabled, the export is always retrieved"""
+        msgt(self.test_30_cache_disabled.__doc__)
+
+        with requests_mock.Mocker() as req_mocker:
+            req_mocker.get(self.export_url, json={'version': 1}, headers={'ETag': '"v-1"'})
+            self.client.get_schema_org(self.dataset_pid)
+            schema_org_resp = self.client.get_schema_org(self.dataset_pid)
+
+        self.assertFalse(schema_org_resp.from_cache)
+        self.assertNotIn('If-None-Match', req_mocker.request_history[1].headers)
+
+    def test_40_file_index(self):
+        """(40) The file index finds the same entries as a search of the "distribution" list"""
+        msgt(self.test_40_file_index.__doc__)
+
+        file_index = get_schema_file_index(schema_test_data.schema_info_01)
+        self.assertEqual(file_index[dv_static.FILE_INDEX_KEY_FILE_IDS][str(schema_test_data.schema_info_01_file_id)],
+                         0)
+
+        file_index = get_schema_file_index(schema_test_data.schema_info_02)
+        self.assertIn('10.7910/DVN/OLD7MB/PZPDJF', file_index[dv_static.FILE_INDEX_KEY_FILE_DOIS])
+        self.assertIn('101646', file_index[dv_static.FILE_INDEX_KEY_FILE_IDS])
+
+        for file_info in schema_test_data.schema_info_02[dv_static.SCHEMA_KEY_DISTRIBUTION]:
+            if dv_static.SCHEMA_KEY_CONTENTURL not in file_info:
+                continue
+            file_id = file_info[dv_static.SCHEMA_KEY_CONTENTURL].split('/')[-1]
+            file_resp = DataverseManifestParams.get_file_specific_schema_info(
+                schema_test_data.schema_info_02, file_id, file_index=file_index)
+            self.assertTrue(file_resp.success)
+            self.assertEqual(file_resp.data, file_info)
+
+        file_resp = DataverseManifestParams.get_file_specific_schema_info(
+            schema_test_data.schema_info_02, schema_test_data.schema_info_02_file_id, file_index=file_index)
+        self.assertFalse(file_resp.success)
+        self.assertIn(f'Did not find fileId "{schema_test_data.schema_info_02_file_id}"', file_resp.message)
@@ -0,0 +1,81 @@
+import requests_mock
+from django.test import TestCase, override_settings
+
+from opendp_apps.dataverses import dataverse_session
+from opendp_apps.dataverses import static_vals as dv_static
+from opendp_apps.dataverses.dataverse_client import DataverseClient
+from opendp_apps.dataverses.dataverse_session import get_dataverse_session
+from opendp_apps.model_helpers.msg_util import msgt
+
+
+class DataverseSessionTest(TestCase):
+    """Test the shared sessions used for Dataverse API calls"""
+
+    def setUp(self):
+        dataverse_session.close_dataverse_sessions()
+
+    def tearDown(self):
+        dataverse_session.close_dataverse_sessions()
+
+    def test_10_session_per_host(self):
+        """(10) One session per Dataverse host"""
+        msgt(self.test_10_session_per_host.__doc__)
+
+        session = get_dataverse_session('https://dataverse.harvard.edu/api/v1/users/:me')
+        self.assertIs(session, get_dataverse_session('https://Dataverse.Harvard.edu/api/access/datafile/101649'))
+        self.assertIsNot(session, get_dataverse_session('https://demo.dataverse.org/api/v1/users/:me'))
+        self.assertIsNot(session, get_dataverse_session('http://dataverse.harvard.edu/api/v1/users/:me'))
+
+        self.assertEqual(len(dataverse_session.DATAVERSE_SESSIONS), 3)
+
+        # A forked process starts without sessions
+        dataverse_session.clear_dataverse_sessions_after_fork()
+        self.assertEqual(len(dataverse_session.DATAVERSE_SESSIONS), 0)
+
+    @override_settings(DATAVERSE_HTTP_POOL_MAXSIZE=4,
+                       DATAVERSE_HTTP_TIMEOUT=12,
+                       DATAVERSE_HTTP_MAX_RETRIES=2)
+    def test_20_session_settings(self):
+        """(20) The pool size, retries, and default timeout are set"""
+        msgt(self.test_20_session_settings.__doc__)
+
+        session = get_dataverse_session('https://dataverse.harvard.edu')
+        adapter = session.get_adapter('https://dataverse.harvard.edu/api/v1/users/:me')
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertEqual(tuple(adapter.max_retries.status_forcelist), dv_static.DV_HTTP_RETRY_STATUS_CODES)
+        self.assertNotIn('POST', adapter.max_retries.allowed_methods)
+
+        with requests_mock.Mocker() as req_mocker:
+            req_mocker.get('https://dataverse.harvard.edu/api/v1/users/:me', json={})
+            session.get('https://dataverse.harvard.edu/api/v1/users/:me')
+            session.get('https://dataverse.harvard.edu/api/v1/users/:me', timeout=3)
+
+        self.assertEqual([x.timeout for x in req_mocker.request_history], [12, 3])
+
+    def test_30_client_calls_share_session(self):
+        """(30) The DataverseClient user info and schema.org calls use the same session"""
+        msgt(self.test_30_client_calls_share_session.__doc__)
+
+        site_url = 'https://dataverse.harvard.edu'
+        client = DataverseClient(site_url, 'shoefly-dont-bother-m3')
+
+        with requests_mock.Mocker() as req_mocker:
+            req_mocker.get(f'{site_url}/api/v1/users/:me',
+                           json={dv_static.DV_KEY_STATUS: dv_static.STATUS_VAL_OK,
+                                 'data': {dv_static.DV_EMAIL: 'dv_user@mock.edu'}})
+            req_mocker.get(f'{site_url}/api/v1/datasets/export',
+                           json={'name': 'Replication Data'})
+
+            user_info = client.get_user_info()
+            self.assertTrue(user_info.success)
+
+            schema_org_resp = client.get_schema_org('doi:10.7910/DVN/PUXVDH')
+            self.assertEqual(schema_org_resp.status_code, 200)
+            self.assertEqual(schema_org_resp.json(), {'name': 'Replication Data'})
+
+            # The pyDataverse query parameters are unchanged
+            self.assertEqual(req_mocker.request_history[1].qs['key'], ['shoefly-dont-bother-m3'])
+            self.assertEqual(req_mocker.request_history[1].qs['exporter'], ['schema.org'])
+
+        self.assertEqual(list(dataverse_session.DATAVERSE_SESSIONS.keys()), [site_url])
@@ -0,0 +1,253 @@
+import json
+from os.path import abspath, dirname, isfile, join
+from unittest.mock import Mock, patch
+
+import requests
+from django.test import TestCase, override_settings
+
+from opendp_apps.dataset.models import DataverseFileInfo, DepositorSetupInfo
+from opendp_apps.dataverses import static_vals as dv_static
+from opendp_apps.dataverses.dataverse_download_handler import DataverseDownloadHandler
+from opendp_apps.dataverses.download_and_profile_util import DownloadAndProfileUtil
+from opendp_apps.model_helpers.msg_util import msgt
+from opendp_apps.user.models import DataverseUser
+from opendp_apps.utils.file_hash import get_filepath_sha256
+
+CURRENT_DIR = dirname(abspath(__file__))
+TEST_DATA_DIR = join(dirname(CURRENT_DIR), 'test_files')
+
+CHUNK_SIZE = 64 * 1024
+ETAG = '"crisis-tab-v1"'
+
+
+class MockDownloadResponse:
+    """Streamed response which may drop the connection after "fail_after" bytes"""
+
+    def __init__(self, content, status_code=200, headers=None, fail_after=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers if headers is not None else {'Content-Length': str(len(content)),
+                                                            'ETag': ETAG}
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise requests.exceptions.ChunkedEncodingError('Connection broken')
+            yield self.content[start:start + chunk_size]
+
+
+@override_settings(DATAVERSE_DOWNLOAD_CHUNK_SIZE=CHUNK_SIZE,
+                   DATAVERSE_DOWNLOAD_MAX_RETRIES=2,
+                   DATAVERSE_DOWNLOAD_RETRY_WAIT=0)
+class DownloadResumeTests(TestCase):
+    fixtures = ['test_dataverses_01.json',
+                'test_opendp_users_01.json']
+
+    def setUp(self):
+        dv_user = DataverseUser.objects.get(pk=1)
+        dv_user.dv_general_token = 'shoefly-dont-bother-m3'
+        dv_user.save()
+
+        self.dfi = DataverseFileInfo.objects.create(
+            creator=dv_user.user,
+            dv_installation=dv_user.dv_installation,
+            dataverse_file_id=101649,
+            dataset_doi='doi:10.7910/DVN/OLD7MB',
+            file_schema_info={dv_static.SCHEMA_KEY_NAME: 'crisis.tab',
+                              dv_static.SCHEMA_KEY_CONTENTURL:
+                                  'https://dataverse.harvard.edu/api/access/datafile/101649'})
+        self.assertTrue(not self.dfi.source_file)
+
+        self.crisis_filepath = join(TEST_DATA_DIR, 'crisis.tab')
+        with open(self.crisis_filepath, 'rb') as crisis_file:
+            self.content = crisis_file.read()
+        self.content_hash = get_filepath_sha256(self.crisis_filepath)
+
+    def tearDown(self):
+        if self.dfi.source_file:
+            self.dfi.source_file.delete()
+
+    def range_response(self, start, total=None, **kwargs):
+        """Return an HTTP 206 response, starting at byte "start" """
+        total = len(self.content) if total is None else total
+        headers = {'Content-Length': str(len(self.content) - start),
+                   'Content-Range': f'bytes {start}-{len(self.content) - 1}/{total}'}
+        return MockDownloadResponse(self.content[start:], status_code=206, headers=headers, **kwargs)
+
+    def check_downloaded_file(self, dhandler):
+        """The downloaded file and hash match the original file"""
+        self.assertFalse(dhandler.has_error())
+        self.assertTrue(self.dfi.source_file)
+        self.assertEqual(self.dfi.source_file.read(), self.content)
+        self.dfi.source_file.close()
+        self.assertEqual(DataverseFileInfo.objects.get(pk=self.dfi.pk).source_file_hash, self.content_hash)
+
+        # The partial file was moved into place
+        self.assertFalse(isfile(dhandler.get_partial_filepath()))
+
+    def test_10_download_in_chunks(self):
+        """(10) Download in chunks, with the file hash and progress"""
+        msgt(self.test_10_download_in_chunks.__doc__)
+
+        progress = []
+        with patch('opendp_apps.dataverses.dataverse_session.DataverseSession.get',
+                   return_value=MockDownloadResponse(self.content)) as mock_get:
+            dhandler = DataverseDownloadHandler(self.dfi,
+                                                progress_callback=lambda *args: progress.append(args))
+
+        self.check_downloaded_file(dhandler)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertNotIn('Range', mock_get.call_args.kwargs['headers'])
+
+        # Reported about every 10%, ending with the full file
+        self.assertEqual(progress[-1], (len(self.content), len(self.content)))
+        self.assertTrue(1 < len(progress) <= 11)
+
+    def test_20_resume_after_dropped_connection(self):
+        """(20) After dropped connections, the download resumes with a Range request"""
+        msgt(self.test_20_resume_after_dropped_connection.__doc__)
+
+        responses = [MockDownloadResponse(self.content, fail_after=CHUNK_SIZE),
+                     self.range_response(CHUNK_SIZE, fail_after=CHUNK_SIZE),
+                     self.range_response(2 * CHUNK_SIZE)]
+        with patch('opendp_apps.dataverses.dataverse_session.DataverseSession.get',
+                   side_effect=responses) as mock_get:
+            dhandler = DataverseDownloadHandler(self.dfi)
+
+        self.check_downloaded_file(dhandler)
+
+        # No byte is downloaded twice
+        range_headers = [call.kwargs['headers'].get('Range') for call in mock_get.call_args_list]
+        self.assertEqual(range_headers, [None, f'bytes={CHUNK_SIZE}-', f'bytes={2 * CHUNK_SIZE}-'])
+        if_range_headers = [call.kwargs['headers'].get('If-Range') for call in mock_get.call_args_list]
+        self.assertEqual(if_range_headers, [None, ETAG, ETAG])
+
+    def test_30_range_not_supported(self):
+        """(30) If the server ignores the Range request, the download starts over"""
+        msgt(self.test_30_range_not_supported.__doc__)
+
+        responses = [MockDownloadResponse(self.content, fail_after=CHUNK_SIZE),
+                     MockDownloadResponse(self.content)]
+        with patch('opendp_apps.dataverses.dataverse_session.DataverseSession.get',
+                   side_effect=responses):
+            dhandler = DataverseDownloadHandler(self.dfi)
+
+        self.check_downloaded_file(dhandler)
+
+    def test_40_resume_next_attempt(self):
+        """(40) When the retries are used up, the next download attempt resumes from the partial file"""
+        msgt(self.test_40_resume_next_attempt.__doc__)
+
+        responses = [MockDownloadResponse(self.content, fail_after=CHUNK_SIZE),
+                     self.range_response(CHUNK_SIZE, fail_after=0),
+                     self.range_response(CHUNK_SIZE, fail_after=0)]
+        with patch('opendp_apps.dataverses.dataverse_session.DataverseSession.get',
+                   side_effect=responses):
+            dhandler = DataverseDownloadHandler(self.dfi)
+
+        self.assertTrue(dhandler.has_error())
+        self.assertIn('dv_download_090', dhandler.get_err_msg())
+        self.assertFalse(self.dfi.source_file)
+        self.assertEqual(DataverseFileInfo.objects.get(pk=self.dfi.pk).depositor_setup_info.user_step,
+                         DepositorSetupInfo.DepositorSteps.STEP_9200_DATAVERSE_DOWNLOAD_FAILED)
+
+        # The partial file is kept
+        partial_filepath = dhandler.get_partial_filepath()
+        self.assertTrue(isfile(partial_filepath))
+
+        with patch('opendp_apps.dataverses.dataverse_session.DataverseSession.get',
+                   return_value=self.range_response(CHUNK_SIZE)) as mock_get:
+            dhandler2 = DataverseDownloadHandler(self.dfi)
+
+        self.check_downloaded_file(dhandler2)
+        self.assertEqual(mock_get.call_args.kwargs['headers']['Range'], f'bytes={CHUNK_SIZE}-')
+        self.assertEqual(mock_get.call_args.kwargs['headers']['If-Range'], ETAG)
+        self.assertFalse(isfile(partial_filepath + dv_static.DOWNLOAD_VALIDATOR_FILE_EXT))
+
+    def test_45_resume_without_validator(self):
+        """(45) A partial file from an earlier attempt, without an ETag or Last-Modified, isn't resumed"""
+        msgt(self.test_45_resume_without_validator.__doc__)
+
+        responses = [MockDownloadResponse(self.content, fail_after=CHUNK_SIZE,
+                                          headers={'Content-Length': str(len(self.content))}),
+                     self.range_response(CHUNK_SIZE, fail_after=0),
+                     self.range_response(CHUNK_SIZE, fail_after=0)]
+        with patch('opendp_apps.dataverses.dataverse_session.DataverseSession.get',
+                   side_effect=responses):
+            dhandler = DataverseDownloadHandler(self.dfi)
+        self.assertTrue(dhandler.has_error())
+
+        with patch('opendp_apps.dataverses.dataverse_session.DataverseSession.get',
+                   return_value=MockDownloadResponse(self.content)) as mock_get:
+            dhandler2 = DataverseDownloadHandler(self.dfi)
+
+        self.check_downloaded_file(dhandler2)
+        self.assertNotIn('Range', mock_get.call_args.kwargs['headers'])
+
+    def test_50_http_error(self):
+        """(50) An HTTP error ends the download"""
+        msgt(self.test_50_http_error.__doc__)
+
+        with patch('opendp_apps.dataverses.dataverse_session.DataverseSession.get',
+                   return_value=MockDownloadResponse(b'', status_code=403)) as mock_get:
+            dhandler = DataverseDownloadHandler(self.dfi)
+
+        self.assertTrue(dhandler.has_error())
+        self.assertIn('HTTP status code "403"', dhandler.get_err_msg())
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertFalse(self.dfi.source_file)
+        self.assertFalse(isfile(dhandler.get_partial_filepath()))
+
+    def test_60_profile_during_download(self):
+        """(60) The file is profiled while it's downloaded, not read again afterwards"""
+        msgt(self.test_60_profile_during_download.__doc__)
+
+        responses = [MockDownloadResponse(self.content, fail_after=CHUNK_SIZE),
+                     self.range_response(CHUNK_SIZE)]
+        with patch('opendp_apps.dataverses.dataverse_session.DataverseSession.get',
+                   side_effect=responses):
+            with patch('opendp_apps.profiler.profile_runner.CsvReader') as mock_csv_reader:
+                dp_util = DownloadAndProfileUtil(self.dfi.object_id)
+
+        self.assertFalse(dp_util.has_error())
+        self.assertFalse(mock_csv_reader.called)
+        self.assertEqual(dp_util.data_profile, dp_util.streamed_data_profile)
+        self.assertEqual(dp_util.data_profile['dataset']['variableCount'], 19)
+
+        # The profile is saved
+        dfi = DataverseFileInfo.objects.get(pk=self.dfi.pk)
+        self.assertEqual(dfi.depositor_setup_info.data_profile, json.loads(json.dumps(dp_util.data_profile)))
+        self.dfi = dfi
+
+    def test_70_unexpected_content_range(self):
+        """(70) A resumed response for the wrong bytes or file size starts the download over"""
+        msgt(self.test_70_unexpected_content_range.__doc__)
+
+        stream_writer = Mock()
+        responses = [MockDownloadResponse(self.content, fail_after=CHUNK_SIZE),
+                     # Starts at the wrong byte
+                     self.range_response(0),
+                     MockDownloadResponse(self.content, fail_after=CHUNK_SIZE),
+                     # A different file size
+                     self.range_response(CHUNK_SIZE, total=len(self.content) + 10),
+                     MockDownloadResponse(self.content)]
+        with patch('opendp_apps.dataverses.dataverse_session.DataverseSession.get',
+                   side_effect=responses) as mock_get:
+            dhandler = DataverseDownloadHandler(self.dfi, stream_writer=stream_writer)
+
+        self.check_downloaded_file(dhandler)
+        range_headers = [call.kwargs['headers'].get('Range') for call in mock_get.call_args_list]
+        self.assertEqual(range_headers, [None, f'bytes={CHUNK_SIZE}-', None, f'bytes={CHUNK_SIZE}-', None])
+        self.assertEqual(stream_writer.reset.call_count, 2)
+
+        # After the last reset, the stream_writer received the file once
+        writer_calls = stream_writer.mock_calls
+        last_reset = max(idx for idx, call in enumerate(writer_calls) if call[0] == 'reset')
+        self.assertEqual(b''.join(call.args[0] for call in writer_calls[last_reset + 1:]), self.content)
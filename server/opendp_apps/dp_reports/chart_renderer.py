@@ -0,0 +1,206 @@
+"""
+Render the histogram charts used in the PDF report
+
+The charts are rendered as PNG images before the PDF document is assembled.
+Rendering with matplotlib is the slowest part of building the PDF, so with
+settings.PDF_CHART_NUM_WORKERS > 1 the charts are rendered in separate processes.
+
+- Charts are drawn with matplotlib's object-oriented API on Agg canvases. The
+  figures aren't registered with pyplot, so nothing is left open in long-running
+  workers. Cleared figures are kept in a small per-process pool and re-used.
+- Rendered charts are cached by a hash of the histogram's categories, values, and
+  variable name, so re-creating the PDF for a release re-uses the charts.
+"""
+import hashlib
+import io
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.cache import caches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from opendp_apps.analysis import static_vals as astatic
+from opendp_apps.dp_reports import static_vals as pdf_static
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+# Cleared figures, ready to be re-used in this process
+FIGURE_POOL = []
+
+
+def get_figure() -> Figure:
+    """Return a cleared Figure with an Agg canvas, from the pool if available"""
+    if FIGURE_POOL:
+        return FIGURE_POOL.pop()
+
+    fig = Figure(figsize=pdf_static.CHART_FIGURE_SIZE, tight_layout=True)
+    FigureCanvasAgg(fig)
+
+    return fig
+
+
+def release_figure(fig: Figure):
+    """Clear the Figure and return it to the pool"""
+    fig.clear()
+    if len(FIGURE_POOL) < pdf_static.CHART_FIGURE_POOL_MAX_SIZE:
+        FIGURE_POOL.append(fig)
+
+
+def get_histogram_bins_vals(stat_info: dict) -> tuple:
+    """
+    Return the histogram (bins, values)
+      - The bins are set to string format. e.g. the last value is "uncategorized"
+        and errors occur if numerics/strings are mixed
+    """
+    hist_bins = [str(x) for x in stat_info['result']['value']['categories']]
+    hist_vals = stat_info['result']['value']['values']
+
+    return hist_bins, hist_vals
+
+
+def has_negative_values(stat_info: dict) -> bool:
+    """Does the histogram have values < 0?"""
+    _hist_bins, hist_vals = get_histogram_bins_vals(stat_info)
+
+    return min(hist_vals) < 0
+
+
+def get_chart_cache_key(stat_info: dict) -> str:
+    """Cache key based on the histogram categories, values, and variable name"""
+    hist_bins, hist_vals = get_histogram_bins_vals(stat_info)
+    chart_info = json.dumps([pdf_static.CHART_RENDERER_VERSION, hist_bins, hist_vals, stat_info['variable']],
+                            default=str)
+
+    return f'{pdf_static.CHART_CACHE_KEY_PREFIX}:{hashlib.sha256(chart_info.encode()).hexdigest()}'
+
+
+def get_cached_charts(cache_keys: list) -> dict:
+    """Return {cache key: PNG bytes} for the charts found in the cache"""
+    try:
+        return caches[pdf_static.CHART_CACHE].get_many(cache_keys)
+    except Exception as ex_obj:
+        logger.error(f'chart_renderer.get_cached_charts: {ex_obj}')
+        return {}
+
+
+def set_cached_charts(charts: dict):
+    """Save {cache key: PNG bytes} to the cache"""
+    try:
+        caches[pdf_static.CHART_CACHE].set_many(charts, settings.PDF_CHART_CACHE_TIMEOUT)
+    except Exception as ex_obj:
+        logger.error(f'chart_renderer.set_cached_charts: {ex_obj}')
+
+
+def render_histogram_chart(stat_info: dict) -> bytes:
+    """
+    Create a bar plot from histogram data and return it as PNG bytes
+    ref: https://matplotlib.org/stable/api/_as_gen/matplotlib.axes.Axes.bar.html#matplotlib.axes.Axes.bar
+    """
+    assert stat_info['statistic'] == astatic.DP_HISTOGRAM, \
+        f"This method should only be used for Histograms. Not statistic: \"{stat_info['statistic']}\""
+
+    var_name = stat_info['variable']
+    hist_bins, hist_vals = get_histogram_bins_vals(stat_info)
+
+    fig = get_figure()
+    try:
+        ax = fig.add_subplot()
+
+        # -------------------------------------
+        # Set the bar colors
+        # -------------------------------------
+        bar_container_obj = ax.bar(x=hist_bins,
+                                   height=hist_vals,
+                                   color="#6395e3",
+                                   edgecolor="#333333",
+                                   )
+
+        # Set the "uncategorized" bin/bar to a different color
+        bar_container_obj.patches[-1].set_facecolor('#C5C5C5')
+
+        # -------------------------------------
+        # Check if the labels overlap
+        #   (very rough/naive!)
+        # -------------------------------------
+
+        # What's the longest bin label? (Not counting the last bin of "uncategorized")
+        max_bin_length = max([len(x) for x in hist_bins[:-1]])
+
+        # Rotate the labels so they don't overlap
+        if len(hist_vals) > 10 and max_bin_length > 2:
+            ax.tick_params(axis='x', labelrotation=90)
+            for tick_label in ax.get_xticklabels():
+                tick_label.set_horizontalalignment('right')
+
+        # -------------------------------------
+        # Add title and x/y labels
+        # -------------------------------------
+        ax.set_title(f'DP Histogram of "{var_name}"')
+        ax.set_xlabel(var_name)
+        ax.set_ylabel('Count')
+
+        # -------------------------------------
+        # Add a threshold line if there are
+        #  values < 0 (also naive)
+        # -------------------------------------
+        if min(hist_vals) < 0:
+            # horizontal line indicating the threshold
+            ax.axhline(0, color='black', linewidth=0.8, linestyle='--')
+
+            # If there are negative values--except the last "uncategorized value", change the color
+            for idx, patch in enumerate(bar_container_obj.patches[:-1]):
+                if hist_vals[idx] < 0:
+                    patch.set_facecolor('#f4d493')
+
+        png_bytes = io.BytesIO()
+        fig.savefig(png_bytes, format='png')
+    finally:
+        release_figure(fig)
+
+    return png_bytes.getvalue()
+
+
+def render_histogram_charts(statistics: list, num_workers: int = 1) -> list:
+    """
+    Render a chart for each histogram in the list of release statistics.
+    Charts in the cache aren't rendered again.
+    Returns a list in the same order as "statistics": PNG bytes for histograms, None otherwise
+
+    :param num_workers: number of processes used to render the charts.
+                1 renders the charts in the current process
+    """
+    cache_keys = {idx: get_chart_cache_key(stat_info)
+                  for idx, stat_info in enumerate(statistics)
+                  if stat_info['statistic'] == astatic.DP_HISTOGRAM}
+
+    cached_charts = get_cached_charts(list(cache_keys.values()))
+    charts = [cached_charts.get(cache_keys[idx]) if idx in cache_keys else None
+              for idx in range(len(statistics))]
+
+    indices_to_render = [idx for idx in cache_keys if charts[idx] is None]
+    if not indices_to_render:
+        return charts
+
+    rendered = None
+    num_workers = min(num_workers, len(indices_to_render))
+    if num_workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                rendered = list(executor.map(render_histogram_chart,
+                                             [statistics[idx] for idx in indices_to_render]))
+        except (AssertionError, OSError, BrokenProcessPool) as ex_obj:
+            # e.g. daemonic processes may not start child processes
+            logger.warning(f'Parallel chart rendering failed, rendering in one process. ({ex_obj})')
+
+    if rendered is None:
+        rendered = [render_histogram_chart(statistics[idx]) for idx in indices_to_render]
+
+    for idx, png_bytes in zip(indices_to_render, rendered):
+        charts[idx] = png_bytes
+    set_cached_charts({cache_keys[idx]: charts[idx] for idx in indices_to_render})
+
+    return charts
@@ -0,0 +1,80 @@
+"""
+Time the creation of PDF reports in a new process: the first PDF vs. later PDFs
+
+Example:
+    python manage.py benchmark_pdf_report --num-pdfs 5
+    python manage.py benchmark_pdf_report --num-pdfs 5 --preload
+"""
+import io
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from opendp_apps.dp_reports import static_vals as pdf_static
+
+
+class Command(BaseCommand):
+    help = "Time the creation of PDF reports, using the sample release, and compare the first PDF to later PDFs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--num-pdfs', type=int, default=5,
+                            help='Number of PDFs to create')
+        parser.add_argument('--preload', action='store_true',
+                            help='Preload the PDF assets first, as the Celery worker does')
+        parser.add_argument('--use-chart-cache', action='store_true',
+                            help='Re-use the charts cached by earlier PDFs. By default, each PDF renders its charts')
+
+    def handle(self, *args, **options):
+        """Create the PDFs and show the timings"""
+        num_pdfs = options['num_pdfs']
+        if num_pdfs < 1:
+            self.stdout.write(self.style.ERROR('--num-pdfs must be at least 1'))
+            return
+
+        if options['preload']:
+            # Import here so that the timing includes the module loading
+            from opendp_apps.dp_reports.pdf_assets import preload_pdf_assets
+            start_time = time.perf_counter()
+            timings = preload_pdf_assets()
+            self.stdout.write(f'Preload: {time.perf_counter() - start_time:.3f}s')
+            for step_name, seconds in timings.items():
+                self.stdout.write(f'  - {step_name}: {seconds:.3f}s')
+
+        # The chart cache may share a Redis db with Celery, channels, etc.
+        #   Use a cache in this process so that clearing it only removes the benchmark's charts
+        chart_cache = caches[pdf_static.CHART_CACHE]
+        caches[pdf_static.CHART_CACHE] = LocMemCache(f'benchmark_{pdf_static.CHART_CACHE}', {'TIMEOUT': None})
+        try:
+            pdf_timings = self.create_pdfs(num_pdfs, options['use_chart_cache'])
+        finally:
+            caches[pdf_static.CHART_CACHE] = chart_cache
+
+        if pdf_timings and num_pdfs > 1:
+            later_avg = sum(pdf_timings[1:]) / (num_pdfs - 1)
+            self.stdout.write(self.style.SUCCESS(f'First PDF: {pdf_timings[0]:.3f}s;'
+                                                 f' PDFs 2-{num_pdfs} average: {later_avg:.3f}s'))
+
+    def create_pdfs(self, num_pdfs: int, use_chart_cache: bool) -> list:
+        """Create the PDFs and return the seconds for each one. Returns None if a PDF fails"""
+        pdf_timings = []
+        for pdf_num in range(1, num_pdfs + 1):
+            if not use_chart_cache:
+                caches[pdf_static.CHART_CACHE].clear()
+
+            start_time = time.perf_counter()
+
+            from opendp_apps.dp_reports.pdf_report_maker import PDFReportMaker
+            from borb.pdf.pdf import PDF
+
+            report_maker = PDFReportMaker()
+            if report_maker.has_error():
+                self.stdout.write(self.style.ERROR(report_maker.get_err_msg()))
+                return None
+            PDF.dumps(io.BytesIO(), report_maker.pdf_doc)
+
+            pdf_timings.append(time.perf_counter() - start_time)
+            self.stdout.write(f'PDF {pdf_num}: {pdf_timings[-1]:.3f}s')
+
+        return pdf_timings
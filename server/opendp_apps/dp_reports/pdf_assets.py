@@ -0,0 +1,94 @@
+"""
+Load the fonts, images, and templates used by the PDF report once per process
+
+Without preloading, the first PDF made by each worker process pays for parsing
+the TrueType fonts, reading the header logo, compiling the text templates, and
+matplotlib's font setup. preload_pdf_assets() is called by the Celery
+"worker_init" signal of workers consuming the settings.PDF_RENDER_QUEUE
+(see dp_reports/tasks.py). That runs in the main worker
+process before the pool processes are forked, so the loaded assets are shared
+with every pool process and only read from there.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.template.loader import get_template
+from PIL import Image as PILImage
+
+from opendp_apps.dp_reports import font_util
+from opendp_apps.dp_reports import static_vals as pdf_static
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+# Templates used by PDFReportMaker
+PDF_TEMPLATE_NAMES = ['pdf_report/10_title.txt',
+                      'pdf_report/20_data_source_desc.txt',
+                      'pdf_report/30_opendp_lib_desc.txt',
+                      'pdf_report/intro_text.txt']
+
+LOADED_IMAGES = {}
+
+
+def get_logo_image() -> PILImage.Image:
+    """
+    Return the DP Creator logo used in the page header.
+    The image is read once per process; each call returns a copy as borb
+    attaches the image to the PDF document it is used in.
+    """
+    if not LOADED_IMAGES.get(pdf_static.DPCREATOR_LOGO_PATH):
+        logo_image = PILImage.open(pdf_static.DPCREATOR_LOGO_PATH)
+        logo_image.load()
+        LOADED_IMAGES[pdf_static.DPCREATOR_LOGO_PATH] = logo_image
+
+    return LOADED_IMAGES[pdf_static.DPCREATOR_LOGO_PATH].copy()
+
+
+def preload_pdf_assets() -> dict:
+    """
+    Load the PDF fonts, logo, templates, and the modules used to make PDFs and charts.
+    Returns the seconds spent on each step, e.g. {'fonts': 0.31, 'logo': 0.01, ...}
+      - A step that fails is logged and left out. It's loaded again when a PDF is made
+    """
+    timings = {}
+
+    def timed_step(step_name, step_func):
+        start_time = time.perf_counter()
+        try:
+            step_func()
+        except Exception as ex_obj:
+            # Don't stop the worker from starting
+            logger.error(f'preload_pdf_assets: Failed to preload "{step_name}". ({ex_obj})')
+            return
+        timings[step_name] = time.perf_counter() - start_time
+
+    def load_fonts():
+        for font_name in font_util.FONT_INFO:
+            font_util.get_custom_font(font_name)
+
+    def load_templates():
+        # With the cached template loader, compiled templates are kept for the process
+        for template_name in PDF_TEMPLATE_NAMES:
+            get_template(template_name)
+
+    def load_report_modules():
+        # Builds the preset text paragraphs, pdf_preset_text.py, and imports borb
+        from opendp_apps.dp_reports import pdf_report_maker  # noqa: F401
+
+    def load_chart_renderer():
+        # matplotlib sets up its fonts the first time text is drawn
+        from opendp_apps.dp_reports import chart_renderer
+        fig = chart_renderer.get_figure()
+        fig.add_subplot().set_title('preload')
+        fig.canvas.draw()
+        chart_renderer.release_figure(fig)
+
+    timed_step('fonts', load_fonts)
+    timed_step('logo', get_logo_image)
+    timed_step('templates', load_templates)
+    timed_step('report_modules', load_report_modules)
+    timed_step('chart_renderer', load_chart_renderer)
+
+    logger.info(f'PDF assets preloaded: {", ".join(f"{k}: {v:.3f}s" for k, v in timings.items())}')
+
+    return timings
@@ -25,7 +25,6 @@ from borb.pdf.canvas.layout.annotation.link_annotation import (
 )
 from borb.pdf.canvas.layout.annotation.remote_go_to_annotation import RemoteGoToAnnotation
 from borb.pdf.canvas.layout.image.image import Image
-from borb.pdf.canvas.layout.image.chart import Chart
 from borb.pdf.canvas.layout.page_layout.multi_column_layout import SingleColumnLayout
 from borb.pdf.canvas.layout.page_layout.page_layout import PageLayout
 
@@ -42,12 +41,17 @@ from borb.pdf.canvas.layout.table.flexible_column_width_table import FlexibleCol
 from borb.pdf.canvas.layout.table.table import Table
 from borb.pdf.canvas.color.color import HexColor
 
-import matplotlib.pyplot as MatPlotLibPlot
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image as PILImage
+
 from opendp_apps.analysis import static_vals as astatic
 
 from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
 
 from opendp_apps.dataset.models import DatasetInfo
+from opendp_apps.dp_reports import chart_renderer
+from opendp_apps.dp_reports import pdf_assets
 from opendp_apps.dp_reports import pdf_preset_text
 from opendp_apps.dp_reports import pdf_utils as putil
 from opendp_apps.dp_reports import static_vals as pdf_static
@@ -285,8 +289,10 @@ class PDFReportMaker(BasicErrCheck):
 
     def add_statistics_pages(self):
         """Add a page for each DP statistic"""
+        histogram_charts = chart_renderer.render_histogram_charts(self.release_dict['statistics'],
+                                                                  settings.PDF_CHART_NUM_WORKERS)
         stat_cnt = 0
-        for stat_info in self.release_dict['statistics']:
+        for stat_info, chart_png in zip(self.release_dict['statistics'], histogram_charts):
             # Put each statistic on a new page
             self.start_new_page()
 
@@ -320,7 +326,7 @@ class PDFReportMaker(BasicErrCheck):
                                                           padding_left=Decimal(10)))
 
                 # show histogram
-                self.add_histogram_plot(stat_info, var_name)
+                self.add_histogram_plot(stat_info, var_name, chart_png)
 
                 # on a new page, show the metadata parameters
                 self.start_new_page()  # new page
@@ -339,90 +345,24 @@ class PDFReportMaker(BasicErrCheck):
                 # parameter info
                 self.add_parameter_info(stat_info, stat_type_formatted)
 
-    def add_histogram_plot(self, stat_info: dict, var_name: str):
+    def add_histogram_plot(self, stat_info: dict, var_name: str, chart_png: bytes):
         """
-        Create a plot from histogram data and add it to the layout
-        ref: https://matplotlib.org/stable/api/_as_gen/matplotlib.axes.Axes.bar.html#matplotlib.axes.Axes.bar
+        Add a histogram chart, rendered by chart_renderer.render_histogram_charts(), to the layout
         """
         if self.has_error():
             return
         assert stat_info['statistic'] == astatic.DP_HISTOGRAM, \
             f"This method should only be used for Histograms. Not statistic: \"{stat_info['statistic']}\""
 
-        # -------------------------------------
-        # Get the x/y data!
-        # -------------------------------------
-        hist_bins = stat_info['result']['value']['categories']
-        hist_vals = stat_info['result']['value']['values']
-
-        # -------------------------------------
-        # Set the bins to string format.
-        #  e.g. the last value is "uncategorized" and errors occur if numerics/strings are mixed
-        # -------------------------------------
-        hist_bins = [str(x) for x in hist_bins]
-
-        # -------------------------------------
-        # Make a bar lot
-        # -------------------------------------
-        fig = MatPlotLibPlot.figure(tight_layout=True, figsize=[8, 6])
-        ax = fig.add_subplot()
-
-        # -------------------------------------
-        # Check if the labels overlap
-        #   (very rough/naive!)
-        # -------------------------------------
-
-        # What's the longest bin label? (Not counting the last bin of "uncategorized")
-        max_bin_length = max([len(x) for x in hist_bins[:-1]])
-
-        # Rotate the labels so they don't overlap
-        if len(hist_vals) > 10 and max_bin_length > 2:
-            MatPlotLibPlot.xticks(rotation=90, ha='right')
-
-        # -------------------------------------
-        # Set the bar colors
-        # -------------------------------------
-        bar_container_obj = ax.bar(x=hist_bins,
-                                   height=hist_vals,
-                                   color="#6395e3",
-                                   edgecolor="#333333",
-                                   )
-
-        # Set the "uncategorized" bin/bar to a different color
-        bar_container_obj.patches[-1].set_facecolor('#C5C5C5')
-
-        # -------------------------------------
-        # Add title and x/y labels
-        # -------------------------------------
-        ax.set_title(f'DP Histogram of "{var_name}"')
-        ax.set_xlabel(var_name)
-        ax.set_ylabel('Count')
-
-        # -------------------------------------
-        # Add a threshold line if there are
-        #  values < 0 (also naive)
-        # -------------------------------------
-        # horizontal line indicating the threshold
-        has_negative_values = False
-        if min(hist_vals) < 0:
-            has_negative_values = True
-            ax.axhline(0, color='black', linewidth=0.8, linestyle='--')
-            # ax.plot([0., 4.5], [0, 0], "k--")
-
-            # If there are negative values--except the last "uncategorized value", change the color
-            for idx, patch in enumerate(bar_container_obj.patches[:-1]):
-                if hist_vals[idx] < 0:
-                    patch.set_facecolor('#f4d493')
-
         # -------------------------------------
         # Add the chart to the layout
         # -------------------------------------
-        self.add_to_layout(Chart(MatPlotLibPlot.gcf(),
+        self.add_to_layout(Image(PILImage.open(io.BytesIO(chart_png)),
                                  width=Decimal(450),
                                  height=Decimal(256)))
 
         # If applicable, add negative value note
-        if has_negative_values:
+        if chart_renderer.has_negative_values(stat_info):
             text_chunks = [
                 putil.txt_bld('Negative values.'),
                 putil.txt_reg(f' The histogram contains negative values. For more information on how to use '),
@@ -1063,14 +1003,14 @@ class PDFReportMaker(BasicErrCheck):
         hist_vals = {'bins': list(range(1, 13)),
                      'vals': [random.randint(1, 100) for _x in range(1, 13)]}
         logger.debug('hist_vals', hist_vals)
-        fig = MatPlotLibPlot.figure()
+        fig = Figure()
+        FigureCanvasAgg(fig)
         ax = fig.add_subplot()
         ax.bar(x=hist_vals['bins'], height=hist_vals['vals'])
         ax.set_xlabel('Month')
         ax.set_ylabel('# Thunderstorms')
 
-        # return the current figure
-        return MatPlotLibPlot.gcf()
+        return fig
 
     def add_header_border_logo(self, page: Page) -> None:
         """
@@ -1116,7 +1056,7 @@ class PDFReportMaker(BasicErrCheck):
                                              Decimal(logo_width),
                                              Decimal(logo_height))
             logo_img_obj = Image(
-                pdf_static.DPCREATOR_LOGO_PATH,
+                pdf_assets.get_logo_image(),
                 width=Decimal(logo_width),
                 height=Decimal(logo_height),
             )
@@ -9,3 +9,10 @@ PYPI_OPENDP_URL = 'https://pypi.org/project/opendp/'
 
 TOC_L1_LINK_OFFSET = Decimal(40)
 TOC_L2_LINK_OFFSET = Decimal(60)
+
+# Histogram charts, see chart_renderer.py
+CHART_FIGURE_SIZE = (8, 6)  # inches
+CHART_FIGURE_POOL_MAX_SIZE = 4  # cleared figures kept for re-use, per process
+CHART_CACHE = 'pdf_charts'
+CHART_CACHE_KEY_PREFIX = 'pdf_chart'
+CHART_RENDERER_VERSION = 1  # increase when the chart style changes, so cached charts aren't used
@@ -1,21 +1,53 @@
 """
 Run the PDF report maker async
+  - Routed to the settings.PDF_RENDER_QUEUE via settings.CELERY_TASK_ROUTES
+  - PDF assets are preloaded when a worker for that queue starts, see pdf_assets.py
 """
 import logging
 
+from celery.signals import worker_init
 from django.conf import settings
 
 from opendp_apps.analysis.models import ReleaseInfo
+from opendp_apps.analysis.release_email_util import ReleaseEmailUtil
+from opendp_apps.dp_reports import pdf_assets
 from opendp_apps.dp_reports.pdf_report_maker import PDFReportMaker
 from opendp_project.celery import celery_app
 
 logger = logging.getLogger(settings.DEFAULT_LOGGER)
 
 
+def is_pdf_render_worker(worker) -> bool:
+    """Does the Celery worker consume from the settings.PDF_RENDER_QUEUE?"""
+    try:
+        return settings.PDF_RENDER_QUEUE in worker.app.amqp.queues.consume_from
+    except AttributeError:
+        return False
+
+
+@worker_init.connect
+def preload_pdf_assets_on_worker_init(sender=None, **kwargs):
+    """
+    Load the PDF assets in the main worker process, before the pool processes are forked
+      - Only for workers which make the PDFs, e.g. started with "-Q pdf_render"
+    """
+    if settings.PDF_PRELOAD_ASSETS and is_pdf_render_worker(sender):
+        pdf_assets.preload_pdf_assets()
+
+
+def set_pdf_status(release_info: ReleaseInfo, pdf_status: str):
+    """Update ReleaseInfo.pdf_status"""
+    release_info.pdf_status = pdf_status
+    release_info.save(update_fields=['pdf_status', 'updated'])
+
+
 @celery_app.task(ignore_result=True)
-def run_pdf_report_maker(release_info_object_id, websocket_id=None, **kwargs):
+def run_pdf_report_maker(release_info_object_id, websocket_id=None, send_release_email=False, **kwargs):
     """
     Create a PDF file and save it to the ReleaseInfo object
+      - ReleaseInfo.pdf_status is updated as the PDF is created
+      - If "send_release_email" is True, the release email is sent after the PDF is
+        created, whether or not that worked, so the email can include the PDF
     """
     try:
         release_info = ReleaseInfo.objects.get(object_id=release_info_object_id)
@@ -24,16 +56,37 @@ def run_pdf_report_maker(release_info_object_id, websocket_id=None, **kwargs):
         return {'success': False,
                 'message': f'ReleaseInfo object not found. {release_info_object_id}'}
 
+    set_pdf_status(release_info, ReleaseInfo.PDFStatus.PDF_IN_PROGRESS)
+
     # -------------------------------
     # Create the release PDF
     # -------------------------------
-    report_maker = PDFReportMaker(release_info.dp_release)
-    if report_maker.has_error():
-        logger.error(report_maker.get_err_msg())
-        return {'success': False,
-                'message': report_maker.get_err_msg()}
+    try:
+        report_maker = PDFReportMaker(release_info.dp_release, release_info.object_id)
+        if not report_maker.has_error():
+            report_maker.save_pdf_to_release_obj(release_info)
+    except Exception as ex_obj:
+        # The release is already usable without the PDF
+        logger.exception(f'PDF creation failed. ReleaseInfo: {release_info_object_id}')
+        result = {'success': False,
+                  'message': f'PDF creation failed. {ex_obj}'}
+    else:
+        if report_maker.has_error():
+            logger.error(report_maker.get_err_msg())
+            result = {'success': False,
+                      'message': report_maker.get_err_msg()}
+        else:
+            logger.info('PDF created and saved to the ReleaseInfo object')
+            result = {'success': True,
+                      'message': 'PDF created and saved to the ReleaseInfo object'}
+
+    set_pdf_status(release_info, ReleaseInfo.PDFStatus.PDF_COMPLETE if result['success']
+                   else ReleaseInfo.PDFStatus.PDF_FAILED)
+
+    if send_release_email:
+        # On error, continue the process
+        email_util = ReleaseEmailUtil(release_info)
+        if email_util.has_error():
+            logger.error(f'run_pdf_report_maker: {email_util.get_err_msg()}')
 
-    report_maker.save_pdf_to_release_obj(release_info)
-    logger.info('PDF created and saved to the ReleaseInfo object')
-    return {'success': True,
-            'message': f'PDF created and saved to the ReleaseInfo object'}
+    return result
@@ -0,0 +1,84 @@
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from opendp_apps.dp_reports import font_util
+from opendp_apps.dp_reports import pdf_assets
+from opendp_apps.dp_reports import static_vals as pdf_static
+from opendp_apps.dp_reports.tasks import preload_pdf_assets_on_worker_init
+from opendp_apps.model_helpers.msg_util import msgt
+
+
+class TestPDFAssets(TestCase):
+    """Test preloading the PDF fonts, logo, and templates"""
+
+    def test_10_preload(self):
+        """(10) The fonts, logo, and templates are loaded"""
+        msgt(self.test_10_preload.__doc__)
+
+        timings = pdf_assets.preload_pdf_assets()
+        self.assertEqual(list(timings.keys()),
+                         ['fonts', 'logo', 'templates', 'report_modules', 'chart_renderer'])
+
+        for font_name in font_util.FONT_INFO:
+            self.assertIn(font_name, font_util.LOADED_FONTS)
+
+        # Each use of the logo gets a copy of the loaded image
+        logo1 = pdf_assets.get_logo_image()
+        logo2 = pdf_assets.get_logo_image()
+        self.assertIsNot(logo1, logo2)
+        self.assertEqual(logo1.size, logo2.size)
+
+    @staticmethod
+    def get_worker(queue_names: list) -> Mock:
+        """Mock Celery worker which consumes from the queues"""
+        worker = Mock()
+        worker.app.amqp.queues.consume_from = {queue_name: Mock() for queue_name in queue_names}
+        return worker
+
+    @override_settings(PDF_RENDER_QUEUE='pdf_render')
+    def test_20_worker_init(self):
+        """(20) The worker_init signal preloads the assets for PDF workers, unless turned off"""
+        msgt(self.test_20_worker_init.__doc__)
+
+        pdf_worker = self.get_worker(['pdf_render'])
+        with patch.object(pdf_assets, 'preload_pdf_assets') as mock_preload:
+            with override_settings(PDF_PRELOAD_ASSETS=True):
+                preload_pdf_assets_on_worker_init(sender=pdf_worker)
+            self.assertEqual(mock_preload.call_count, 1)
+
+            with override_settings(PDF_PRELOAD_ASSETS=False):
+                preload_pdf_assets_on_worker_init(sender=pdf_worker)
+            self.assertEqual(mock_preload.call_count, 1)
+
+            # Workers which don't make PDFs
+            with override_settings(PDF_PRELOAD_ASSETS=True):
+                preload_pdf_assets_on_worker_init(sender=self.get_worker(['celery']))
+                preload_pdf_assets_on_worker_init(sender=None)
+            self.assertEqual(mock_preload.call_count, 1)
+
+    def test_30_preload_step_fails(self):
+        """(30) A failed step, e.g. the chart setup, is skipped and the others are loaded"""
+        msgt(self.test_30_preload_step_fails.__doc__)
+
+        with patch('opendp_apps.dp_reports.chart_renderer.get_figure', side_effect=TypeError('bad figure')):
+            timings = pdf_assets.preload_pdf_assets()
+        self.assertEqual(list(timings.keys()),
+                         ['fonts', 'logo', 'templates', 'report_modules'])
+
+    def test_40_benchmark_keeps_chart_cache(self):
+        """(40) The benchmark command doesn't clear the shared chart cache"""
+        msgt(self.test_40_benchmark_keeps_chart_cache.__doc__)
+
+        chart_cache = caches[pdf_static.CHART_CACHE]
+        chart_cache.set('other_key', 'other_value')
+
+        stdout = StringIO()
+        call_command('benchmark_pdf_report', '--num-pdfs', '2', stdout=stdout)
+        self.assertIn('First PDF', stdout.getvalue())
+
+        self.assertIs(caches[pdf_static.CHART_CACHE], chart_cache)
+        self.assertEqual(chart_cache.get('other_key'), 'other_value')
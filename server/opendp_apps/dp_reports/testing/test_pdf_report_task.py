@@ -0,0 +1,157 @@
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from opendp_apps.analysis import static_vals as astatic
+from opendp_apps.analysis.models import AnalysisPlan, ReleaseInfo
+from opendp_apps.analysis.testing.base_stat_spec_test import StatSpecTestCase
+from opendp_apps.analysis.validate_release_util import ValidateReleaseUtil
+from opendp_apps.dp_reports import chart_renderer
+from opendp_apps.dp_reports import static_vals as pdf_static
+from opendp_apps.dp_reports.pdf_report_maker import PDFReportMaker
+from opendp_apps.dp_reports.tasks import run_pdf_report_maker
+from opendp_apps.model_helpers.msg_util import msgt
+
+
+class TestPDFReportTask(StatSpecTestCase):
+    """Test creating the release PDF with the run_pdf_report_maker task"""
+
+    def setUp(self):
+        super().setUp()
+        caches[pdf_static.CHART_CACHE].clear()
+
+        self.client = APIClient()
+        self.client.force_login(self.user_obj)
+
+        self.analysis_plan = self.retrieve_new_plan()
+        self.analysis_plan.variable_info['EyeHeight']['min'] = -8
+        self.analysis_plan.variable_info['EyeHeight']['max'] = 5
+        self.analysis_plan.dp_statistics = [
+            {"statistic": astatic.DP_MEAN,
+             "variable": "EyeHeight",
+             "epsilon": 0.25,
+             "delta": 0,
+             "cl": astatic.CL_95,
+             "error": "",
+             "missing_values_handling": astatic.MISSING_VAL_INSERT_FIXED,
+             "handle_as_fixed": False,
+             "fixed_value": "1",
+             "locked": False,
+             "label": "EyeHeight"},
+            {"statistic": astatic.DP_HISTOGRAM,
+             "variable": "Subject",
+             "epsilon": 0.25,
+             "delta": 0,
+             "cl": astatic.CL_95,
+             "error": "",
+             "missing_values_handling": astatic.MISSING_VAL_INSERT_FIXED,
+             "handle_as_fixed": False,
+             "fixed_value": "ac",
+             "locked": False,
+             "label": "Subject"},
+        ]
+        self.analysis_plan.save()
+
+    def run_release(self) -> ReleaseInfo:
+        """Compute the release and return the ReleaseInfo"""
+        release_util = ValidateReleaseUtil.compute_mode(self.user_obj, self.analysis_plan.object_id)
+        self.assertFalse(release_util.has_error())
+
+        return ReleaseInfo.objects.get(object_id=release_util.get_new_release_info_object().object_id)
+
+    def test_10_charts_rendered_in_parallel(self):
+        """(10) Charts rendered in separate processes match charts rendered in one process"""
+        msgt(self.test_10_charts_rendered_in_parallel.__doc__)
+
+        statistics = PDFReportMaker.get_test_release()['statistics']
+        hist_stat = [x for x in statistics if x['statistic'] == astatic.DP_HISTOGRAM][0]
+        statistics = statistics + [dict(hist_stat, variable='Another histogram')]
+
+        charts = chart_renderer.render_histogram_charts(statistics, num_workers=1)
+        caches[pdf_static.CHART_CACHE].clear()
+        parallel_charts = chart_renderer.render_histogram_charts(statistics, num_workers=2)
+
+        self.assertEqual(len(charts), len(statistics))
+        for stat_info, chart_png, parallel_chart_png in zip(statistics, charts, parallel_charts):
+            if stat_info['statistic'] == astatic.DP_HISTOGRAM:
+                self.assertTrue(chart_png.startswith(b'\x89PNG'))
+                self.assertEqual(chart_png, parallel_chart_png)
+            else:
+                self.assertIsNone(chart_png)
+                self.assertIsNone(parallel_chart_png)
+
+    def test_15_charts_cached(self):
+        """(15) Charts are cached by categories, values, and variable name. Figures are re-used"""
+        msgt(self.test_15_charts_cached.__doc__)
+
+        statistics = PDFReportMaker.get_test_release()['statistics']
+        hist_stat = [x for x in statistics if x['statistic'] == astatic.DP_HISTOGRAM][0]
+
+        with patch('opendp_apps.dp_reports.chart_renderer.render_histogram_chart',
+                   wraps=chart_renderer.render_histogram_chart) as mock_render:
+            charts = chart_renderer.render_histogram_charts(statistics)
+            self.assertEqual(mock_render.call_count, 1)
+
+            # Same release, the chart isn't rendered again
+            self.assertEqual(chart_renderer.render_histogram_charts(statistics), charts)
+            self.assertEqual(mock_render.call_count, 1)
+
+            # New variable name, a new chart
+            renamed_stat = dict(hist_stat, variable='Renamed')
+            chart_renderer.render_histogram_charts([renamed_stat])
+            self.assertEqual(mock_render.call_count, 2)
+
+        # The figures are cleared and kept for re-use
+        self.assertTrue(0 < len(chart_renderer.FIGURE_POOL) <= pdf_static.CHART_FIGURE_POOL_MAX_SIZE)
+        self.assertTrue(all(not fig.axes for fig in chart_renderer.FIGURE_POOL))
+
+    @override_settings(SKIP_PDF_CREATION_FOR_TESTS=False, SKIP_EMAIL_RELEASE_FOR_TESTS=True)
+    def test_20_pdf_created_by_task(self):
+        """(20) The release PDF is created by the task and the status is updated"""
+        msgt(self.test_20_pdf_created_by_task.__doc__)
+
+        with patch('opendp_apps.analysis.validate_release_util.run_pdf_report_maker.delay') as mock_delay:
+            release_info = self.run_release()
+
+        # The release is usable before the PDF is created
+        self.assertEqual(mock_delay.call_args.args[0], str(release_info.object_id))
+        self.assertEqual(release_info.pdf_status, ReleaseInfo.PDFStatus.PDF_PENDING)
+        self.assertTrue(release_info.dp_release_json_file)
+        self.assertFalse(release_info.dp_release_pdf_file)
+        self.assertEqual(AnalysisPlan.objects.get(object_id=self.analysis_plan.object_id).release_info,
+                         release_info)
+
+        result = run_pdf_report_maker(str(release_info.object_id))
+        self.assertTrue(result['success'])
+
+        release_info.refresh_from_db()
+        self.assertEqual(release_info.pdf_status, ReleaseInfo.PDFStatus.PDF_COMPLETE)
+        self.assertTrue(release_info.dp_release_pdf_file)
+
+        response = self.client.get(f'{self.API_RELEASE_PREFIX}{release_info.object_id}/pdf-status/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['pdf_status'], ReleaseInfo.PDFStatus.PDF_COMPLETE)
+        self.assertIsNotNone(response.json()['data']['download_pdf_url'])
+
+    @override_settings(SKIP_PDF_CREATION_FOR_TESTS=True)
+    def test_30_pdf_failed(self):
+        """(30) A PDF error sets the failed status"""
+        msgt(self.test_30_pdf_failed.__doc__)
+
+        release_info = self.run_release()
+        self.assertEqual(release_info.pdf_status, ReleaseInfo.PDFStatus.PDF_NOT_CREATED)
+
+        with patch('opendp_apps.dp_reports.tasks.PDFReportMaker',
+                   side_effect=AssertionError('The PDF does not fit')):
+            result = run_pdf_report_maker(str(release_info.object_id))
+        self.assertFalse(result['success'])
+
+        release_info.refresh_from_db()
+        self.assertEqual(release_info.pdf_status, ReleaseInfo.PDFStatus.PDF_FAILED)
+        self.assertFalse(release_info.dp_release_pdf_file)
+
+        response = self.client.get(f'{self.API_RELEASE_PREFIX}{release_info.object_id}/pdf-status/')
+        self.assertEqual(response.json()['data']['pdf_status'], ReleaseInfo.PDFStatus.PDF_FAILED)
+        self.assertIsNone(response.json()['data']['download_pdf_url'])
@@ -14,3 +14,16 @@ class TimestampedModelWithUUID(models.Model):
 
     class Meta:
         abstract = True
+
+
+class LargeJSONQuerySet(models.QuerySet):
+    """
+    QuerySet for a model with large JSONFields, listed in the model's "LARGE_JSON_FIELDS"
+    """
+
+    def without_large_json(self):
+        """
+        Defer the large JSON fields, e.g. when only the status or ids are needed.
+        A deferred field is loaded, with another query, if it is accessed
+        """
+        return self.defer(*self.model.LARGE_JSON_FIELDS)
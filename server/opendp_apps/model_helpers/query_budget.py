@@ -0,0 +1,36 @@
+"""
+Test helper: fail if a listing API runs more than a fixed number of queries
+
+The number of queries shouldn't grow with the number of results, e.g. one
+query per row to get a related object. Each listing is requested with
+several page sizes and each request must stay within the same budget.
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+
+class QueryBudgetTestMixin:
+    """For a TestCase with a logged-in self.client"""
+
+    def assertListingQueryBudget(self, url, max_queries, page_sizes=(1, 5, 25), **params):
+        """
+        Request the listing at each page size and check the number of queries.
+        Returns the listing with the largest page size
+        :param url: e.g. '/api/dataset-info/'
+        :param max_queries: budget for one request, including the session/user lookups
+        :param params: other query parameters, e.g. pagination='cursor'
+        """
+        response = None
+        for page_size in page_sizes:
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get(url, dict(params, page_size=page_size))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            num_queries = len(captured.captured_queries)
+            sql_list = '\n'.join(f'  {idx}. {x["sql"]}' for idx, x in enumerate(captured.captured_queries, 1))
+            self.assertLessEqual(num_queries, max_queries,
+                                 (f'{url} with page_size={page_size}: {num_queries} queries,'
+                                  f' the budget is {max_queries}\n{sql_list}'))
+
+        return response.json()
@@ -0,0 +1,185 @@
+"""
+Profile a data file that is read in chunks
+
+Produces the same data profile as the VariableInfoHandler but only
+one chunk of the file is in memory at a time. Each column keeps a
+small running summary--dtype, a few distinct values, row count--which
+is merged as each chunk is read.
+
+For large chunks, the columns of each chunk may be summarized in separate
+processes, see ColumnSlicePool.
+"""
+import logging
+from collections import OrderedDict
+
+import pandas as pd
+from django.conf import settings
+
+from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
+from opendp_apps.profiler.column_type_inference import \
+    (ColumnSlicePool, get_var_type, get_whole_number_columns)
+from opendp_apps.profiler.static_vals import \
+    (KEY_NUM_WORKERS,
+     KEY_SAVE_ROW_COUNT,
+     PROFILER_DISTINCT_VALUE_LIMIT,
+     VAR_TYPE_BOOLEAN,
+     VAR_TYPE_CATEGORICAL)
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+
+class ColumnSummary:
+    """Running summary of a single column"""
+
+    def __init__(self, col_name, sort_order: int):
+        self.name = col_name
+        self.sort_order = sort_order
+
+        self.dtype_kind = None  # numpy dtype kind, e.g. 'i', 'f', 'O'
+        self.distinct_values = set()  # up to PROFILER_DISTINCT_VALUE_LIMIT values; NaN is stored as None
+        self.row_count = 0
+
+        # Used to check for integer columns with missing values, read as floats
+        self.has_null = False
+        self.has_value = False
+        self.all_whole_numbers = True
+
+    @staticmethod
+    def merge_dtype_kinds(kind1, kind2):
+        """
+        Combine the dtypes of two chunks the way pandas would for the full column
+            - int + float -> float
+            - anything else that doesn't match -> object
+        """
+        if kind1 is None:
+            return kind2
+        if kind1 == kind2:
+            return kind1
+        if kind1 in 'iuf' and kind2 in 'iuf':
+            return 'f'
+        return 'O'
+
+    def is_distinct_limit_reached(self) -> bool:
+        return len(self.distinct_values) >= PROFILER_DISTINCT_VALUE_LIMIT
+
+    def add_chunk(self, column: pd.Series):
+        """Merge a chunk of the column into the summary"""
+        self.row_count += column.shape[0]
+        self.dtype_kind = self.merge_dtype_kinds(self.dtype_kind, column.dtype.kind)
+
+        is_null = column.isna()
+        self.has_null = self.has_null or bool(is_null.any())
+        self.has_value = self.has_value or not bool(is_null.all())
+        if self.all_whole_numbers and column.dtype.kind == 'f':
+            self.all_whole_numbers = bool(get_whole_number_columns(column.to_frame()).iloc[0])
+
+        if self.is_distinct_limit_reached():
+            return
+
+        for val in column.unique():
+            self.distinct_values.add(None if pd.isna(val) else val)
+            if self.is_distinct_limit_reached():
+                return
+
+    def merge(self, other):
+        """Merge the summary of the same column from another chunk"""
+        self.row_count += other.row_count
+        self.dtype_kind = self.merge_dtype_kinds(self.dtype_kind, other.dtype_kind)
+
+        self.has_null = self.has_null or other.has_null
+        self.has_value = self.has_value or other.has_value
+        self.all_whole_numbers = self.all_whole_numbers and other.all_whole_numbers
+
+        for val in other.distinct_values:
+            if self.is_distinct_limit_reached():
+                return
+            self.distinct_values.add(val)
+
+    def get_column_info(self) -> OrderedDict:
+        """Return the variable info in the same format as the VariableInfoHandler"""
+        column_info = OrderedDict({
+            "name": self.name,
+            "sort_order": self.sort_order,
+            "label": ""
+        })
+
+        is_integer_valued = self.all_whole_numbers and self.has_null and self.has_value
+        var_type = get_var_type(len(self.distinct_values), self.dtype_kind, is_integer_valued)
+        if var_type in (VAR_TYPE_BOOLEAN, VAR_TYPE_CATEGORICAL):
+            column_info['categories'] = []
+        column_info['type'] = var_type
+
+        return column_info
+
+
+def summarize_chunk_columns(chunk_df: pd.DataFrame) -> list:
+    """Summarize each column of a chunk (or a slice of its columns). Used by the worker processes"""
+    column_summaries = []
+    for sort_order, col_name in enumerate(chunk_df.columns):
+        col_summary = ColumnSummary(col_name, sort_order)
+        col_summary.add_chunk(chunk_df.iloc[:, sort_order])
+        column_summaries.append(col_summary)
+
+    return column_summaries
+
+
+class ChunkedVariableInfoHandler(BasicErrCheck):
+
+    def __init__(self, dataframe_chunks, **kwargs):
+        """
+        Given an iterable of dataframes, create a variable profile dictionary
+        :param dataframe_chunks: e.g. CsvReader(...).read_in_chunks(memory_limit)
+        """
+        self.dataframe_chunks = dataframe_chunks
+        self.num_variables = None
+        self.num_chunks = 0
+        self.data_profile = None
+
+        self.save_num_rows = kwargs.get(KEY_SAVE_ROW_COUNT, True)
+        self.num_workers = kwargs.get(KEY_NUM_WORKERS, settings.PROFILER_NUM_WORKERS)
+
+    def run_profile_process(self):
+        """
+        Read the chunks and build the data profile dictionary.
+        See VariableInfoHandler.run_profile_process for the format.
+        """
+        column_summaries = None
+        with ColumnSlicePool(self.num_workers) as column_pool:
+            for chunk_df in self.dataframe_chunks:
+                self.num_chunks += 1
+                if column_summaries is None:
+                    column_summaries = [ColumnSummary(col_name, sort_order)
+                                        for sort_order, col_name in enumerate(chunk_df.columns)]
+
+                logger.info(f'profiling chunk {self.num_chunks}: {chunk_df.shape[0]} rows')
+                if len(column_pool.get_column_slices(chunk_df)) > 1:
+                    # Summarize slices of the columns in the worker processes
+                    chunk_summaries = [col_summary
+                                       for slice_summaries in column_pool.map(summarize_chunk_columns, chunk_df)
+                                       for col_summary in slice_summaries]
+                    for col_summary, chunk_summary in zip(column_summaries, chunk_summaries):
+                        col_summary.merge(chunk_summary)
+                else:
+                    for col_summary in column_summaries:
+                        col_summary.add_chunk(chunk_df[col_summary.name])
+
+        if column_summaries is None:
+            self.add_err_msg('The file did not contain any data to profile.')
+            return None
+
+        self.num_variables = len(column_summaries)
+
+        profile_dict = {'dataset': {}}
+        if self.save_num_rows is True:
+            profile_dict['dataset']['rowCount'] = int(column_summaries[0].row_count) if column_summaries else 0
+        else:
+            profile_dict['dataset']['rowCount'] = None
+
+        profile_dict['dataset']['variableCount'] = int(self.num_variables)
+        profile_dict['dataset']['variableOrder'] = [(x.sort_order, x.name) for x in column_summaries]
+        profile_dict['variables'] = {}
+        for col_summary in column_summaries:
+            profile_dict['variables'][col_summary.name] = col_summary.get_column_info()
+
+        self.data_profile = profile_dict
+        return profile_dict
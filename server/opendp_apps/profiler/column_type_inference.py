@@ -0,0 +1,245 @@
+"""
+Infer the variable types for all of the columns in a dataframe
+
+- The dtype and integer-valued float (null-aware) checks are
+  computed for the whole frame at once rather than column by column
+- The Boolean check only needs to know if there are exactly 2 distinct
+  values so counting stops once a 3rd value is found
+- Time spent on each column is recorded to show which columns
+  dominate profiling time
+- For large files, the columns may be split into contiguous slices which
+  are classified in separate processes, see ColumnSlicePool
+"""
+import logging
+import time
+from collections import OrderedDict
+
+import billiard
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from opendp_apps.profiler.static_vals import \
+    (PROFILER_DISTINCT_VALUE_LIMIT,
+     PROFILER_PARALLEL_MIN_CELLS,
+     VAR_TYPE_BOOLEAN,
+     VAR_TYPE_CATEGORICAL,
+     VAR_TYPE_FLOAT,
+     VAR_TYPE_INTEGER,
+     VAR_TYPE_NUMERICAL)
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+# Rows in the first block checked for distinct values. Each block after is 4x larger
+DISTINCT_VALUE_FIRST_BLOCK = 1024
+
+# Floats beyond this can't be reliably checked for integer values
+MAX_EXACT_FLOAT_INT = 2 ** 53
+
+
+def get_var_type(num_distinct: int, dtype_kind: str, is_integer_valued: bool = False) -> str:
+    """
+    Return the variable type
+    :param num_distinct: number of distinct values (NaN counts as a value), may stop at 3
+    :param dtype_kind: numpy dtype kind, e.g. 'i', 'f', 'O'
+    :param is_integer_valued: for floats, the non-null values are all whole numbers
+                and the column has missing values
+    """
+    if num_distinct == 2:
+        return VAR_TYPE_BOOLEAN
+    elif dtype_kind == 'O':
+        return VAR_TYPE_CATEGORICAL
+    elif dtype_kind in ('i', 'u'):
+        return VAR_TYPE_INTEGER
+    elif dtype_kind == 'f':
+        if is_integer_valued:
+            return VAR_TYPE_INTEGER
+        return VAR_TYPE_FLOAT
+    return VAR_TYPE_NUMERICAL
+
+
+def count_distinct_values(values, limit: int = PROFILER_DISTINCT_VALUE_LIMIT) -> int:
+    """
+    Count the distinct values in an array, stopping once "limit" is reached.
+    NaN/None count as a single value.
+    """
+    distinct_values = set()
+    num_rows = len(values)
+    start_idx = 0
+    block_size = DISTINCT_VALUE_FIRST_BLOCK
+    while start_idx < num_rows:
+        for val in pd.unique(values[start_idx:start_idx + block_size]):
+            distinct_values.add(None if pd.isna(val) else val)
+            if len(distinct_values) >= limit:
+                return len(distinct_values)
+        start_idx += block_size
+        block_size *= 4
+
+    return len(distinct_values)
+
+
+def get_whole_number_columns(float_df: pd.DataFrame) -> pd.Series:
+    """
+    For a dataframe of float columns, return a boolean Series indicating
+    which columns only hold whole numbers, ignoring missing values
+    """
+    is_whole = (float_df.mod(1) == 0) & (float_df.abs() < MAX_EXACT_FLOAT_INT)
+
+    return (is_whole | float_df.isna()).all()
+
+
+def get_integer_valued_columns(float_df: pd.DataFrame) -> pd.Series:
+    """
+    For a dataframe of float columns, return a boolean Series indicating
+    which columns hold whole numbers plus missing values.
+    (pandas reads an integer column with missing values as a float)
+    """
+    is_null = float_df.isna()
+
+    return get_whole_number_columns(float_df) & is_null.any() & (~is_null).any()
+
+
+def infer_column_types(dataframe: pd.DataFrame) -> tuple:
+    """
+    Classify the columns of a dataframe slice. Used by the worker processes.
+    Returns (var_types, column_timings)
+    """
+    type_inference = ColumnTypeInference(dataframe)
+
+    return type_inference.var_types, type_inference.column_timings
+
+
+class ColumnSlicePool:
+    """
+    Worker processes which each receive a contiguous slice of a dataframe's columns
+
+    - The pool is a billiard pool. billiard is installed with Celery and, unlike
+      multiprocessing/concurrent.futures, allows a daemonic process--e.g. a Celery
+      prefork worker running "run_profile_by_filefield"--to start child processes
+    - The processes are started on the first .map() that splits the columns and
+      are reused until .close(), e.g. for each chunk of a file read in chunks
+    - If the pool can't be used, the columns are processed in the current process
+    """
+
+    def __init__(self, num_workers: int = 1):
+        """
+        :param num_workers: maximum number of processes. Each process receives at least
+                    PROFILER_PARALLEL_MIN_CELLS values
+        """
+        self.num_workers = num_workers
+        self.pool = None
+        self.pool_failed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_column_slices(self, dataframe: pd.DataFrame) -> list:
+        """
+        Split the column positions into contiguous slices, one per worker.
+        Returns [(start, end), ...]; a single slice if the columns aren't split
+        """
+        num_rows, num_columns = dataframe.shape
+        num_slices = max(1, min(self.num_workers,
+                                num_columns,
+                                (num_rows * num_columns) // PROFILER_PARALLEL_MIN_CELLS))
+        if self.pool_failed:
+            num_slices = 1
+
+        return [(int(positions[0]), int(positions[-1]) + 1)
+                for positions in np.array_split(np.arange(num_columns), num_slices)
+                if len(positions) > 0]
+
+    def map(self, func, dataframe: pd.DataFrame) -> list:
+        """
+        Call func(column slice) for each slice of the dataframe's columns.
+        Returns the results in column order
+        """
+        column_slices = self.get_column_slices(dataframe)
+        if len(column_slices) > 1:
+            df_slices = [dataframe.iloc[:, start:end] for start, end in column_slices]
+            try:
+                if self.pool is None:
+                    self.pool = billiard.Pool(processes=self.num_workers)
+                # One job per slice: with pool.map(), a worker may wait ~30 seconds
+                #   at exit for a billiard message count that isn't updated
+                async_results = [self.pool.apply_async(func, (df_slice,)) for df_slice in df_slices]
+                return [x.get() for x in async_results]
+            except (AssertionError, OSError) as ex_obj:
+                logger.warning(f'Parallel profiling failed, profiling in one process. ({ex_obj})')
+                self.pool_failed = True
+                self.close()
+
+        return [func(dataframe)]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+
+class ColumnTypeInference:
+    """Infer the variable type of every column in a dataframe"""
+
+    def __init__(self, dataframe: pd.DataFrame, num_workers: int = 1):
+        """
+        :param dataframe: the data to classify
+        :param num_workers: number of processes to use, see ColumnSlicePool
+        """
+        self.df = dataframe
+        self.num_workers = num_workers
+        self.num_slices = 1  # number of column slices classified in separate processes
+
+        self.var_types = OrderedDict()  # column name -> variable type
+        self.column_timings = OrderedDict()  # column name -> seconds
+        self.frame_timing = None  # seconds for the checks that cover all columns. Parallel: total seconds
+
+        self.run_inference()
+
+    def run_inference(self):
+        """Classify all of the columns"""
+        if self.num_workers <= 1:
+            self.run_inference_on_frame()
+            return
+
+        start_time = time.perf_counter()
+        with ColumnSlicePool(self.num_workers) as column_pool:
+            results = column_pool.map(infer_column_types, self.df)
+
+        self.num_slices = len(results)
+        for var_types, column_timings in results:
+            self.var_types.update(var_types)
+            self.column_timings.update(column_timings)
+
+        self.frame_timing = time.perf_counter() - start_time
+
+    def run_inference_on_frame(self):
+        """Classify all of the columns in the current process"""
+        start_time = time.perf_counter()
+
+        dtype_kinds = [dtype.kind for dtype in self.df.dtypes]
+
+        float_positions = [idx for idx, kind in enumerate(dtype_kinds) if kind == 'f']
+        integer_valued = {}
+        if float_positions:
+            is_int_valued = get_integer_valued_columns(self.df.iloc[:, float_positions])
+            integer_valued = dict(zip(float_positions, is_int_valued.tolist()))
+
+        self.frame_timing = time.perf_counter() - start_time
+
+        for col_idx, col_name in enumerate(self.df.columns):
+            col_start_time = time.perf_counter()
+
+            num_distinct = count_distinct_values(self.df.iloc[:, col_idx].values)
+            self.var_types[col_name] = get_var_type(num_distinct,
+                                                    dtype_kinds[col_idx],
+                                                    integer_valued.get(col_idx, False))
+
+            self.column_timings[col_name] = time.perf_counter() - col_start_time
+
+    def get_slowest_columns(self, num_columns: int = 5) -> list:
+        """Return [(column name, seconds), ...] for the slowest columns"""
+        return sorted(self.column_timings.items(), key=lambda x: x[1], reverse=True)[:num_columns]
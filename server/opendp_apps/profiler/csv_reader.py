@@ -41,16 +41,119 @@ class CsvReader:
             if self.column_limit < 1:
                 raise ColumnLimitInvalid(f'{pstatic.ERR_MSG_COLUMN_LIMIT} Found: "{self.column_limit}"')
 
+    def set_delimiter(self):
+        """
+        Detect the delimiter using the first line of the file
+        """
+        sniffer = csv.Sniffer()
+        with open(self.filepath, mode='r', encoding='utf-8') as infile:
+            dialect = sniffer.sniff(infile.readline())
+            self.delimiter = dialect.delimiter
+
+    def get_usecols(self):
+        """
+        When there's a column limit, only parse the first N columns
+        :return: list of column positions or None for all columns
+        """
+        if self.column_limit is None:
+            return None
+
+        with open(self.filepath, mode='r', encoding='utf-8') as infile:
+            num_columns = len(next(csv.reader([infile.readline()], delimiter=self.delimiter)))
+
+        return list(range(min(num_columns, self.column_limit)))
+
+    def get_chunk_size(self, memory_limit: int, usecols=None) -> int:
+        """
+        Estimate the number of rows per chunk that fit within the memory limit
+        :param memory_limit: approximate number of bytes for each chunk
+        :return: int, rows per chunk
+        """
+        sample_df = pd.read_csv(self.filepath, delimiter=self.delimiter, usecols=usecols,
+                                nrows=pstatic.PROFILER_CHUNK_SAMPLE_ROWS)
+
+        return CsvReader.get_chunk_size_for_sample(sample_df, memory_limit)
+
+    @staticmethod
+    def get_chunk_size_for_sample(sample_df: pd.DataFrame, memory_limit: int) -> int:
+        """
+        Estimate the number of rows per chunk using the first rows of the file
+        :param sample_df: the first PROFILER_CHUNK_SAMPLE_ROWS rows
+        :param memory_limit: approximate number of bytes for each chunk
+        :return: int, rows per chunk
+        """
+        if sample_df.shape[0] == 0:
+            return pstatic.PROFILER_CHUNK_SAMPLE_ROWS
+
+        bytes_per_row = sample_df.memory_usage(index=True, deep=True).sum() / sample_df.shape[0]
+
+        # Allow room for the parser's own buffers
+        bytes_per_row = bytes_per_row * pstatic.PROFILER_CHUNK_MEMORY_OVERHEAD
+
+        return max(1, int(memory_limit / bytes_per_row))
+
+    def read_in_chunks(self, memory_limit: int, usecols=None):
+        """
+        Read the file as a series of dataframes, each one using
+        approximately "memory_limit" bytes
+
+        Exceptions are raised rather than returned as the caller
+        is iterating over the chunks.
+
+        :param memory_limit: approximate number of bytes for each chunk
+        :param usecols: optional column positions to read. Defaults to the column limit
+        :return: generator of pd.DataFrame objects
+        """
+        try:
+            self.set_delimiter()
+        except csv.Error as ex:
+            if self.delimiter is None:
+                raise DelimiterNotFoundException()
+            raise ex
+
+        if usecols is None:
+            usecols = self.get_usecols()
+        chunk_size = self.get_chunk_size(memory_limit, usecols=usecols)
+
+        with pd.read_csv(self.filepath, delimiter=self.delimiter, usecols=usecols,
+                         chunksize=chunk_size) as reader:
+            for chunk_df in reader:
+                yield chunk_df
+
+    def read_columns(self, columns: list, nrows=None):
+        """
+        Read only the named columns, e.g. to detect their types using the first rows
+        Exceptions are raised, e.g. a ValueError if a column isn't in the file
+        :param columns: column names, returned in the order of the file
+        :param nrows: number of rows to read, None for all rows
+        :return: pd.DataFrame
+        """
+        try:
+            self.set_delimiter()
+        except csv.Error as ex:
+            if self.delimiter is None:
+                raise DelimiterNotFoundException()
+            raise ex
+
+        return pd.read_csv(self.filepath, delimiter=self.delimiter, usecols=columns, nrows=nrows)
+
+    def get_column_positions(self, columns: list) -> dict:
+        """
+        Return the position of each named column in the file, e.g. {'age': 3, 'income': 7}
+        Call after read_columns(), which sets the delimiter
+        """
+        with open(self.filepath, mode='r', encoding='utf-8-sig') as infile:
+            header = next(csv.reader([infile.readline()], delimiter=self.delimiter))
+
+        return {col_name: header.index(col_name) for col_name in columns}
+
     def read(self):
         """
         Build the dataframe
         :return: pd.DataFrame
         """
-        sniffer = csv.Sniffer()
         try:
-            with open(self.filepath, mode='r', encoding='utf-8') as infile:
-                dialect = sniffer.sniff(infile.readline())
-                self.delimiter = dialect.delimiter
+            self.set_delimiter()
             df = pd.read_csv(self.filepath, delimiter=self.delimiter)
             if self.column_limit:
                 return df[df.columns[:self.column_limit]]
@@ -19,12 +19,15 @@ class DatasetInfoUpdater:
         self.dataset_info.depositor_setup_info.set_user_step(step)
         self.dataset_info.depositor_setup_info.save()
 
-    def save_data_profile(self, data_profile):
+    def save_data_profile(self, data_profile, row_count=None):
         """
         Add a new associated data profile
         :param data_profile:
+        :param row_count: number of data rows, saved even if the profile doesn't include it.
+                    For internal use, it isn't a public dataset size
         :return:
         """
+        self.dataset_info.row_count = row_count
 
         # Save the profile to DatasetInfo.depositor_setup_info
         #
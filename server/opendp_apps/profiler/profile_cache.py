@@ -0,0 +1,91 @@
+"""
+Cache data profiles in Redis, keyed by the SHA-256 hash of the source file
+
+The same file handed off again from Dataverse, or uploaded again by a user,
+gets its profile from the cache instead of being profiled again.
+- Keys include the PROFILER_VERSION so a profiler change never returns
+  an out-of-date profile
+- Entries expire after settings.PROFILE_CACHE_TIMEOUT seconds. Each cache hit
+  resets the expiration, so the least recently used entries expire first
+- The cache is optional: if Redis is unavailable, the file is profiled as usual
+"""
+import json
+import logging
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from opendp_apps.dataset.redis import RedisClient
+from opendp_apps.profiler import static_vals as pstatic
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+
+def get_redis_client() -> RedisClient:
+    """Return the client used by the ProfileCache"""
+    return RedisClient()
+
+
+class ProfileCache:
+    """Get/save a data profile using the source file's hash"""
+
+    def __init__(self, file_hash: str, max_num_features=None, save_row_count=True, sample_rows=None):
+        """
+        :param file_hash: SHA-256 hex digest of the source file
+        :param max_num_features: the profile only includes the first n columns, None for all columns
+        :param save_row_count: whether the profile includes the row count
+        :param sample_rows: for a profile made with a sample of the rows, the number of rows sampled
+        """
+        self.file_hash = file_hash
+        self.max_num_features = max_num_features
+        self.save_row_count = save_row_count
+        self.sample_rows = sample_rows
+
+        self.redis_client = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.PROFILE_CACHE_ENABLED
+
+    def get_cache_key(self) -> str:
+        """Profiles differ by column limit, row count setting, and sample size, so these are part of the key"""
+        num_features = self.max_num_features if self.max_num_features else 'all'
+        cache_key = (f'{pstatic.PROFILE_CACHE_KEY_PREFIX}:v{pstatic.PROFILER_VERSION}:{self.file_hash}'
+                     f':cols_{num_features}:rows_{int(bool(self.save_row_count))}')
+        if self.sample_rows:
+            cache_key = f'{cache_key}:sample_{self.sample_rows}'
+        return cache_key
+
+    def get_client(self) -> RedisClient:
+        if self.redis_client is None:
+            self.redis_client = get_redis_client()
+        return self.redis_client
+
+    def get_profile(self):
+        """Return the cached data profile as a dict or None"""
+        if not self.is_enabled() or not self.file_hash:
+            return None
+
+        cache_key = self.get_cache_key()
+        try:
+            cached_profile = self.get_client().get(cache_key)
+            if cached_profile is None:
+                return None
+            self.get_client().expire(cache_key, settings.PROFILE_CACHE_TIMEOUT)
+            return json.loads(cached_profile)
+        except (RedisError, json.JSONDecodeError) as ex_obj:
+            logger.error(f'Failed to retrieve the cached profile {cache_key}: {ex_obj}')
+            return None
+
+    def save_profile(self, data_profile: dict) -> bool:
+        """Save the data profile to the cache. Return True if successful"""
+        if not self.is_enabled() or not self.file_hash:
+            return False
+
+        cache_key = self.get_cache_key()
+        try:
+            self.get_client().set(cache_key, json.dumps(data_profile), ex=settings.PROFILE_CACHE_TIMEOUT)
+            return True
+        except (RedisError, TypeError) as ex_obj:
+            logger.error(f'Failed to cache the profile {cache_key}: {ex_obj}')
+            return False
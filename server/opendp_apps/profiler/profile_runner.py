@@ -12,9 +12,14 @@ from opendp_apps.dataset import static_vals as dstatic
 from opendp_apps.dataset.models import DatasetInfo
 from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
 from opendp_apps.profiler import static_vals as pstatic
+from opendp_apps.profiler.chunked_variable_info import ChunkedVariableInfoHandler
 from opendp_apps.profiler.csv_reader import CsvReader
 from opendp_apps.profiler.dataset_info_updater import DatasetInfoUpdater
+from opendp_apps.profiler.profile_cache import ProfileCache
+from opendp_apps.profiler.row_counter import count_csv_rows
+from opendp_apps.profiler.sampled_variable_info import SampledVariableInfoHandler
 from opendp_apps.profiler.variable_info import VariableInfoHandler
+from opendp_apps.utils.file_hash import get_filepath_sha256
 
 logger = logging.getLogger(settings.DEFAULT_LOGGER)
 
@@ -43,6 +48,22 @@ class ProfileRunner(BasicErrCheck):
         # Set to False depending on an answer to question about whether number of row may be made public
         self.save_row_count = kwargs.get(pstatic.KEY_SAVE_ROW_COUNT, True)
 
+        # Read the file in chunks to limit memory use. If None, decided by the file size
+        self.profile_in_chunks = kwargs.get(pstatic.KEY_PROFILE_IN_CHUNKS)
+
+        # Profile made while the file was downloaded. If set, the file isn't read again
+        self.streamed_data_profile = kwargs.get(pstatic.KEY_STREAMED_DATA_PROFILE)
+
+        # Profile with a random sample of the rows. If None, decided by the file size
+        self.profile_by_sample = kwargs.get(pstatic.KEY_PROFILE_BY_SAMPLE)
+        self.sample_rows = kwargs.get(pstatic.KEY_SAMPLE_ROWS) or settings.PROFILER_SAMPLE_ROWS
+        # Processes used for type inference, see column_type_inference.ColumnSlicePool
+        self.num_workers = kwargs.get(pstatic.KEY_NUM_WORKERS, settings.PROFILER_NUM_WORKERS)
+
+        # Optional list of column names. If set, only these columns are profiled and
+        #   the profile isn't saved to the DatasetInfo, see run_column_probe()
+        self.profile_columns = kwargs.get(pstatic.KEY_PROFILE_COLUMNS)
+
         # ------------------------------
         # To be set/calculated
         # ------------------------------
@@ -53,9 +74,14 @@ class ProfileRunner(BasicErrCheck):
         self.ds_pointer_for_pandas = None
 
         self.dataframe = None
+        self.dataframe_chunks = None  # used if self.profile_in_chunks is True
         # self.num_original_features = None
         self.num_variables = None
         self.data_profile = None  # Data profile information
+        self.row_count = None  # Number of data rows, set even if the profile doesn't include it
+
+        self.profile_cache = None
+        self.profile_from_cache = False  # True if the profile was retrieved from the ProfileCache
 
         # Set to 'True' for a file available via a filepath
         # self.dataset_is_filepath = kwargs.get(pstatic.KEY_DATASET_IS_FILEPATH, False)
@@ -71,7 +97,8 @@ class ProfileRunner(BasicErrCheck):
     def add_err_msg(self, err_msg):
         """Add an error message and update the DepositorSetupInfo status"""
         super().add_err_msg(err_msg)
-        self.set_depositor_info_status(DepositorSetupInfo.DepositorSteps.STEP_9300_PROFILING_FAILED)
+        if not self.profile_columns:
+            self.set_depositor_info_status(DepositorSetupInfo.DepositorSteps.STEP_9300_PROFILING_FAILED)
 
     def set_depositor_info_status(self, new_step: DepositorSetupInfo.DepositorSteps) -> bool:
         """Update the status on the DepositorSetupInfo object.
@@ -142,6 +169,13 @@ class ProfileRunner(BasicErrCheck):
         if self.has_error():
             return
 
+        # (0) Are only a few columns needed? Then skip the full read.
+        #   The DatasetInfo profile, if any, isn't used or changed
+        #
+        if self.profile_columns:
+            self.run_column_probe()
+            return
+
         # (1) Does the profile already exist? Yes, then stop here
         #
         logger.info('(1) Does the profile already exist?')
@@ -155,6 +189,22 @@ class ProfileRunner(BasicErrCheck):
 
         logger.info('No profile. Go make one')
 
+        # (1b) Has the same file already been profiled?
+        #
+        if self.run_profile_cache_check():
+            logger.info('Profile retrieved from the cache. All done.')
+            return
+
+        # (1c) Was the file profiled while it was downloaded?
+        #
+        if self.streamed_data_profile:
+            self.data_profile = self.streamed_data_profile
+            self.num_variables = self.data_profile['dataset']['variableCount']
+            self.profile_cache.save_profile(self.data_profile)
+            self.save_profile_to_dataset_info()
+            logger.info('Profile made while the file was downloaded. All done.')
+            return
+
         # (2) Open the dataframe
         #
         logger.info('(2) Read the data')
@@ -165,7 +215,17 @@ class ProfileRunner(BasicErrCheck):
                 self.add_err_msg(user_msg)
                 logger.info(f'Failed to open file {user_msg}')
                 return
-            self.dataframe = CsvReader(self.ds_pointer_for_pandas, column_limit=self.max_num_features).read()
+            if self.profile_in_chunks is None:
+                self.profile_in_chunks = file_stats.st_size > settings.PROFILER_CHUNKED_READ_MIN_FILE_SIZE
+
+            csv_reader = CsvReader(self.ds_pointer_for_pandas, column_limit=self.max_num_features)
+            if self.profile_by_sample:
+                logger.info('(2a) The file is read while profiling a sample of the rows')
+            elif self.profile_in_chunks:
+                logger.info('(2a) Read the data in chunks')
+                self.dataframe_chunks = csv_reader.read_in_chunks(settings.PROFILER_CHUNK_MEMORY_LIMIT)
+            else:
+                self.dataframe = csv_reader.read()
         except UnicodeDecodeError as ex_obj:
             user_msg = f'Failed to open file due to UnicodeDecodeError. ({ex_obj})'
             self.add_err_msg(user_msg)
@@ -189,14 +249,33 @@ class ProfileRunner(BasicErrCheck):
         try:
             logger.info('(2b) It\'s running!')
             # Run the profile
-            params = {pstatic.KEY_SAVE_ROW_COUNT: self.save_row_count}
-            variable_info_handler = VariableInfoHandler(self.dataframe, **params)
+            params = {pstatic.KEY_SAVE_ROW_COUNT: self.save_row_count,
+                      pstatic.KEY_NUM_WORKERS: self.num_workers}
+            if self.profile_by_sample:
+                params[pstatic.KEY_SAMPLE_ROWS] = self.sample_rows
+                variable_info_handler = SampledVariableInfoHandler(self.ds_pointer_for_pandas,
+                                                                   self.max_num_features, **params)
+            elif self.profile_in_chunks:
+                variable_info_handler = ChunkedVariableInfoHandler(self.dataframe_chunks, **params)
+            else:
+                variable_info_handler = VariableInfoHandler(self.dataframe, **params)
             variable_info_handler.run_profile_process()
 
+            if variable_info_handler.has_error():
+                self.add_err_msg(variable_info_handler.get_err_msg())
+                logger.info(f'(2c) !Profile failed!: {variable_info_handler.get_err_msg()}')
+                return
+
             # Get profiler values
             self.data_profile = variable_info_handler.data_profile
             self.num_variables = variable_info_handler.num_variables
 
+        except UnicodeDecodeError as ex_obj:
+            # Chunked reading: the file is only decoded once profiling starts
+            user_msg = f'Failed to open file due to UnicodeDecodeError. ({ex_obj})'
+            self.add_err_msg(user_msg)
+            logger.info(f'(2c) !Profile failed!: {user_msg}')
+            return
         except Exception as ex:
             # Profiling failed: add error message
             user_msg = f'Profile runner error. {ex}'
@@ -206,8 +285,142 @@ class ProfileRunner(BasicErrCheck):
 
         # Profiling success: update DatasetInfo profile and user_step
         logger.info(f'(3) Profile complete!')
+        self.profile_cache.save_profile(self.data_profile)
+        self.save_profile_to_dataset_info()
+
+    def run_column_probe(self):
+        """
+        Profile only the self.profile_columns:
+          - The rows are counted by scanning the file for newlines, without parsing it
+          - The column types are detected using the first settings.PROFILER_TYPE_PROBE_ROWS rows
+          - The "variableOrder" and "sort_order" are the columns' positions in the file
+        The profile doesn't include the other columns, so it isn't cached or saved to
+        the DatasetInfo, and the DepositorSetupInfo step isn't changed
+        """
+        logger.info(f'(2) Probe the columns: {self.profile_columns}')
+        try:
+            if os.stat(self.ds_pointer_for_pandas).st_size < 5:
+                self.add_err_msg(f'File is empty: {self.ds_pointer_for_pandas}')
+                return
+
+            self.row_count = count_csv_rows(self.ds_pointer_for_pandas)
+
+            csv_reader = CsvReader(self.ds_pointer_for_pandas)
+            probe_df = csv_reader.read_columns(self.profile_columns, nrows=settings.PROFILER_TYPE_PROBE_ROWS)
+            column_positions = csv_reader.get_column_positions(list(probe_df.columns))
+        except UnicodeDecodeError as ex_obj:
+            user_msg = f'Failed to open file due to UnicodeDecodeError. ({ex_obj})'
+            self.add_err_msg(user_msg)
+            logger.info(f'Failed to open file {user_msg}')
+            return
+        except Exception as ex:
+            user_msg = f'File reading error. {ex}'
+            self.add_err_msg(user_msg)
+            logger.info(f'Failed to open file {user_msg}')
+            return
+
+        try:
+            # The probe rows aren't the row count, it's set below
+            variable_info_handler = VariableInfoHandler(probe_df, **{pstatic.KEY_SAVE_ROW_COUNT: False})
+            variable_info_handler.run_profile_process()
+        except Exception as ex:
+            user_msg = f'Profile runner error. {ex}'
+            self.add_err_msg(user_msg)
+            logger.info(f'(2c) !Profile failed!: {user_msg}')
+            return
+
+        if variable_info_handler.has_error():
+            self.add_err_msg(variable_info_handler.get_err_msg())
+            return
+
+        self.data_profile = variable_info_handler.data_profile
+        if self.save_row_count:
+            self.data_profile['dataset']['rowCount'] = self.row_count
+        self.num_variables = variable_info_handler.num_variables
+
+        # Use the positions in the file, not in the probed columns
+        self.data_profile['dataset']['variableOrder'] = [(column_positions[col_name], col_name)
+                                                         for _idx, col_name in
+                                                         self.data_profile['dataset']['variableOrder']]
+        for col_name, column_info in self.data_profile['variables'].items():
+            column_info['sort_order'] = column_positions[col_name]
+
+        logger.info(f'(3) Column profile complete!')
+
+    def run_profile_cache_check(self) -> bool:
+        """
+        Look for a cached profile of the same file. If found, use it and return True
+        """
+        file_hash = self.get_file_hash() if ProfileCache.is_enabled() else None
+
+        # Sampled profiles are cached separately from full profiles
+        if self.profile_by_sample is None:
+            self.profile_by_sample = os.path.getsize(self.ds_pointer_for_pandas) > \
+                                     settings.PROFILER_SAMPLED_READ_MIN_FILE_SIZE
+
+        self.profile_cache = ProfileCache(file_hash,
+                                          max_num_features=self.max_num_features,
+                                          save_row_count=self.save_row_count,
+                                          sample_rows=self.sample_rows if self.profile_by_sample else None)
+        cached_profile = self.profile_cache.get_profile()
+        if not cached_profile:
+            return False
+
+        self.data_profile = cached_profile
+        self.num_variables = cached_profile['dataset']['variableCount']
+        self.profile_from_cache = True
+        self.save_profile_to_dataset_info()
+
+        return True
+
+    def get_file_hash(self):
+        """
+        Return the SHA-256 hash of the file. Use the hash saved on the DatasetInfo
+        object, if available. Otherwise calculate it and save it to the DatasetInfo.
+        """
+        if self.dataset_info and self.dataset_info.source_file_hash:
+            return self.dataset_info.source_file_hash
+
+        try:
+            file_hash = get_filepath_sha256(self.ds_pointer_for_pandas)
+        except OSError as ex_obj:
+            logger.info(f'Failed to hash the file: {ex_obj}')
+            return None
+
         if self.dataset_info:
-            self.dataset_info_updater.save_data_profile(variable_info_handler.data_profile)
-            if self.dataset_info.depositor_setup_info.user_step < \
+            self.dataset_info.source_file_hash = file_hash
+            self.dataset_info.save()
+
+        return file_hash
+
+    def get_row_count(self):
+        """
+        Return the number of data rows. If the profile doesn't include the rowCount,
+        e.g. the row count may not be published, the rows are counted without parsing the file
+        """
+        if self.row_count is None:
+            self.row_count = self.data_profile['dataset'].get('rowCount')
+        if self.row_count is None:
+            self.row_count = count_csv_rows(self.ds_pointer_for_pandas)
+
+        return self.row_count
+
+    def save_profile_to_dataset_info(self):
+        """
+        If a DatasetInfo object is specified, save the profile and update the user_step.
+        The row count is saved to the DatasetInfo for internal use. It isn't published
+        if the profile's rowCount is None
+        """
+        if not self.dataset_info:
+            return
+
+        try:
+            row_count = self.get_row_count()
+        except (OSError, ValueError) as ex_obj:
+            logger.error(f'ProfileRunner.save_profile_to_dataset_info: Failed to count the rows. ({ex_obj})')
+            row_count = None
+
+        self.dataset_info_updater.save_data_profile(self.data_profile, row_count=row_count)
+        if self.dataset_info.depositor_setup_info.user_step < \
                 DepositorSetupInfo.DepositorSteps.STEP_0400_PROFILING_COMPLETE:
-                self.set_depositor_info_status(DepositorSetupInfo.DepositorSteps.STEP_0400_PROFILING_COMPLETE)
\ No newline at end of file
+            self.set_depositor_info_status(DepositorSetupInfo.DepositorSteps.STEP_0400_PROFILING_COMPLETE)
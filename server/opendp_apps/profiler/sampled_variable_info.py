@@ -0,0 +1,215 @@
+"""
+Profile a large data file using a random sample of its rows
+
+- One pass over the file's bytes counts the rows and draws a reservoir sample
+  of the rows, without parsing the file. See row_counter.py
+- Only the sampled rows are parsed, and their variable types are inferred
+- A sample can't show whether a column with 1 or 2 distinct values is Boolean.
+  These columns, and only these columns, are read in full to get their exact types
+- The profile lists the variables whose type came from the sample, see "sampledVariables"
+"""
+import io
+import logging
+import mmap
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
+from opendp_apps.profiler.chunked_variable_info import ColumnSummary
+from opendp_apps.profiler.column_type_inference import ColumnTypeInference, count_distinct_values
+from opendp_apps.profiler.csv_reader import CsvReader
+from opendp_apps.profiler.row_counter import RowCounter
+from opendp_apps.profiler.static_vals import \
+    (KEY_NUM_WORKERS,
+     KEY_SAVE_ROW_COUNT,
+     KEY_SAMPLE_ROWS,
+     PROFILER_DISTINCT_VALUE_LIMIT,
+     PROFILER_ROW_COUNT_BLOCK_SIZE,
+     PROFILER_SAMPLE_SEED,
+     VAR_TYPE_BOOLEAN,
+     VAR_TYPE_CATEGORICAL)
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+
+class RowSampler(RowCounter):
+    """Count the rows and draw a reservoir sample of the data rows' byte positions"""
+
+    def __init__(self, sample_size: int, seed=PROFILER_SAMPLE_SEED, quote_char='"'):
+        """
+        :param sample_size: number of data rows to sample
+        :param seed: the same file always gives the same sample
+        """
+        super().__init__(quote_char=quote_char)
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+
+        self.header_row = None  # (start, end) of the header row
+        self.num_data_rows = 0
+        self.sample_starts = np.zeros(sample_size, dtype=np.int64)
+        self.sample_ends = np.zeros(sample_size, dtype=np.int64)
+
+    def add_rows(self, row_starts: np.ndarray, row_ends: np.ndarray):
+        """
+        Reservoir sampling ("Algorithm R"): the first rows fill the sample, after that
+        the n-th data row replaces a random sampled row with probability sample_size / n
+        """
+        if self.header_row is None:
+            self.header_row = (int(row_starts[0]), int(row_ends[0]))
+            row_starts, row_ends = row_starts[1:], row_ends[1:]
+            if row_starts.size == 0:
+                return
+
+        # 0-based data row numbers
+        row_numbers = np.arange(self.num_data_rows, self.num_data_rows + row_starts.size)
+        self.num_data_rows += row_starts.size
+
+        slots = np.where(row_numbers < self.sample_size,
+                         row_numbers,
+                         self.rng.integers(0, row_numbers + 1))
+        is_kept = slots < self.sample_size
+        slots, row_starts, row_ends = slots[is_kept], row_starts[is_kept], row_ends[is_kept]
+
+        # If a slot is replaced more than once in the block, the last row is kept
+        _unique_slots, reversed_positions = np.unique(slots[::-1], return_index=True)
+        last_positions = slots.size - 1 - reversed_positions
+
+        self.sample_starts[slots[last_positions]] = row_starts[last_positions]
+        self.sample_ends[slots[last_positions]] = row_ends[last_positions]
+
+    def get_sample_bytes(self, mapped_file) -> bytes:
+        """Return the header row and the sampled rows, in file order. Call after .finish()"""
+        num_sampled = min(self.sample_size, self.num_data_rows)
+        file_order = np.argsort(self.sample_starts[:num_sampled])
+
+        rows = [mapped_file[self.header_row[0]:self.header_row[1]]]
+        rows += [mapped_file[self.sample_starts[idx]:self.sample_ends[idx]] for idx in file_order]
+
+        # The last row of the file may not end with a newline
+        return b''.join(row if row.endswith(b'\n') else row + b'\n' for row in rows)
+
+
+class SampledVariableInfoHandler(BasicErrCheck):
+
+    def __init__(self, filepath, column_limit=None, **kwargs):
+        """
+        Given a path to a delimited file, create a variable profile dictionary
+        using a sample of its rows
+        :param filepath: e.g. .csv or .tab file
+        :param column_limit: profile the first N columns, None for all columns
+        """
+        self.filepath = filepath
+        self.column_limit = column_limit
+        self.num_variables = None
+        self.num_rows = None
+        self.data_profile = None
+
+        self.sampled_variables = None  # variable type from the sample
+        self.exact_variables = None  # ambiguous in the sample, so read in full
+
+        self.save_num_rows = kwargs.get(KEY_SAVE_ROW_COUNT, True)
+        self.num_workers = kwargs.get(KEY_NUM_WORKERS, settings.PROFILER_NUM_WORKERS)
+        self.sample_size = kwargs.get(KEY_SAMPLE_ROWS, settings.PROFILER_SAMPLE_ROWS)
+
+    def read_sample(self, csv_reader: CsvReader):
+        """Count the rows and return the sampled rows as a dataframe. Returns None for an empty file"""
+        row_sampler = RowSampler(self.sample_size)
+
+        with open(self.filepath, mode='rb') as infile:
+            with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                for start_pos in range(0, len(mapped_file), PROFILER_ROW_COUNT_BLOCK_SIZE):
+                    row_sampler.add_block(mapped_file[start_pos:start_pos + PROFILER_ROW_COUNT_BLOCK_SIZE])
+                row_sampler.finish()
+
+                if row_sampler.header_row is None:
+                    return None
+                sample_bytes = row_sampler.get_sample_bytes(mapped_file)
+
+        self.num_rows = row_sampler.get_row_count()
+
+        return pd.read_csv(io.BytesIO(sample_bytes), delimiter=csv_reader.delimiter,
+                           usecols=csv_reader.get_usecols())
+
+    def get_exact_var_types(self, csv_reader: CsvReader, column_positions: list) -> dict:
+        """Read the columns in full and return their variable types"""
+        column_summaries = None
+        for chunk_df in csv_reader.read_in_chunks(settings.PROFILER_CHUNK_MEMORY_LIMIT,
+                                                  usecols=column_positions):
+            if column_summaries is None:
+                column_summaries = [ColumnSummary(col_name, sort_order)
+                                    for sort_order, col_name in zip(column_positions, chunk_df.columns)]
+            for chunk_idx, col_summary in enumerate(column_summaries):
+                col_summary.add_chunk(chunk_df.iloc[:, chunk_idx])
+
+        return {x.name: x.get_column_info()['type'] for x in column_summaries or []}
+
+    def run_profile_process(self):
+        """
+        Build the data profile dictionary.
+        See VariableInfoHandler.run_profile_process for the format. The "dataset" section
+        also has "sampledVariables": the variables whose type came from the sample
+        """
+        # The CsvReader raises the exceptions for unreadable files, as with chunked reading
+        csv_reader = CsvReader(self.filepath, column_limit=self.column_limit)
+        csv_reader.set_delimiter()
+
+        # (1) Count the rows and infer the types using the sample
+        #
+        sample_df = self.read_sample(csv_reader)
+        if sample_df is None:
+            self.add_err_msg('The file did not contain any data to profile.')
+            return None
+
+        type_inference = ColumnTypeInference(sample_df, num_workers=self.num_workers)
+        var_types = dict(type_inference.var_types)
+
+        # (2) If the sample isn't the whole file, read the ambiguous columns in full
+        #
+        ambiguous_positions = []
+        if self.num_rows > sample_df.shape[0]:
+            ambiguous_positions = [idx for idx in range(sample_df.shape[1])
+                                   if count_distinct_values(sample_df.iloc[:, idx].values)
+                                   < PROFILER_DISTINCT_VALUE_LIMIT]
+        if ambiguous_positions:
+            var_types.update(self.get_exact_var_types(csv_reader, ambiguous_positions))
+
+        self.exact_variables = [sample_df.columns[idx] for idx in ambiguous_positions]
+        if self.num_rows > sample_df.shape[0]:
+            self.sampled_variables = [x for x in sample_df.columns if x not in self.exact_variables]
+        else:
+            self.sampled_variables = []
+        logger.info(f'profiled {self.num_rows} rows using a sample of {sample_df.shape[0]} rows.'
+                    f' Columns read in full: {self.exact_variables}')
+
+        # (3) Build the profile
+        #
+        self.num_variables = sample_df.shape[1]
+
+        profile_dict = {'dataset': {}}
+        if self.save_num_rows is True:
+            profile_dict['dataset']['rowCount'] = int(self.num_rows)
+        else:
+            profile_dict['dataset']['rowCount'] = None
+
+        profile_dict['dataset']['variableCount'] = int(self.num_variables)
+        profile_dict['dataset']['variableOrder'] = [(i, x) for i, x in enumerate(sample_df.columns)]
+        profile_dict['dataset']['sampledVariables'] = self.sampled_variables
+        profile_dict['variables'] = {}
+
+        for sort_order, col_name in enumerate(sample_df.columns):
+            column_info = OrderedDict({
+                "name": col_name,
+                "sort_order": sort_order,
+                "label": ""
+            })
+            var_type = var_types[col_name]
+            if var_type in (VAR_TYPE_BOOLEAN, VAR_TYPE_CATEGORICAL):
+                column_info['categories'] = []
+            column_info['type'] = var_type
+            profile_dict['variables'][col_name] = column_info
+
+        self.data_profile = profile_dict
+        return profile_dict
@@ -3,6 +3,39 @@ KEY_DATASET_OBJECT_ID = 'dataset_object_id'
 KEY_SAVE_ROW_COUNT = 'save_row_count'
 KEY_DATASET_IS_DJANGO_FILEFIELD = 'dataset_is_django_filefield'
 KEY_DATASET_IS_FILEPATH = 'dataset_is_filepath'
+# True/False to force/skip chunked reading. If not set, the file size decides
+KEY_PROFILE_IN_CHUNKS = 'profile_in_chunks'
+# Number of processes used to infer column types. If not set, uses settings.PROFILER_NUM_WORKERS
+KEY_NUM_WORKERS = 'num_workers'
+# Profile made while the file was downloaded, see stream_profiler.py. Used instead of reading the file
+KEY_STREAMED_DATA_PROFILE = 'streamed_data_profile'
+# Names of the only columns to profile. Their types are probed with the first rows of the file
+#   and the rows are counted without parsing the file, see row_counter.py
+KEY_PROFILE_COLUMNS = 'profile_columns'
+# True/False to force/skip profiling with a sample of the rows. If not set, the file size decides
+KEY_PROFILE_BY_SAMPLE = 'profile_by_sample'
+# Number of rows sampled. If not set, uses settings.PROFILER_SAMPLE_ROWS
+KEY_SAMPLE_ROWS = 'sample_rows'
+
+# Chunked reading: rows read to estimate memory per row
+PROFILER_CHUNK_SAMPLE_ROWS = 1000
+# Chunked reading: multiplier for the parser's buffers, etc.
+PROFILER_CHUNK_MEMORY_OVERHEAD = 2
+# Chunked reading: stop tracking distinct values past this number
+PROFILER_DISTINCT_VALUE_LIMIT = 3
+# Streamed profiling: downloaded chunks waiting to be profiled. Writes wait when the queue is full
+PROFILER_STREAM_QUEUE_SIZE = 8
+# Row counting: bytes scanned at a time
+PROFILER_ROW_COUNT_BLOCK_SIZE = 16 * 1024 * 1024
+# Sampled profiling: seed for the random sample, so the same file gives the same profile
+PROFILER_SAMPLE_SEED = 1
+# Parallel profiling: minimum number of values (rows x columns) sent to each worker process
+PROFILER_PARALLEL_MIN_CELLS = 1_000_000
+
+# Part of the profile cache key. Increase it when a change to the
+# profiler would change the profile created for the same file
+PROFILER_VERSION = 1
+PROFILE_CACHE_KEY_PREFIX = 'data_profile'
 
 VAR_TYPE_BOOLEAN = 'Boolean'
 VAR_TYPE_CATEGORICAL = 'Categorical'
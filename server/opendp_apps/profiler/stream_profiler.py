@@ -0,0 +1,194 @@
+"""
+Profile a delimited file while its bytes arrive, e.g. during a Dataverse download
+
+The downloader calls .write(chunk) for each chunk written to disk. A background
+thread reads the chunks as a file object, parses them with pandas in chunks of
+rows, and runs the ChunkedVariableInfoHandler. When the last chunk is written,
+.finish() waits for the remaining rows to be profiled.
+
+Usage:
+    stream_profiler = StreamProfiler(max_num_features=20)
+    stream_profiler.start()
+    for chunk in response.iter_content(...):
+        stream_profiler.write(chunk)
+    if stream_profiler.finish():
+        data_profile = stream_profiler.data_profile
+"""
+import csv
+import io
+import logging
+import queue
+import threading
+
+import pandas as pd
+from django.conf import settings
+
+from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
+from opendp_apps.profiler import static_vals as pstatic
+from opendp_apps.profiler.chunked_variable_info import ChunkedVariableInfoHandler
+from opendp_apps.profiler.csv_reader import CsvReader
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+
+class ByteQueueReader(io.RawIOBase):
+    """Read-only file object over byte chunks put on a queue. None marks the end of the bytes"""
+
+    def __init__(self, byte_queue: queue.Queue):
+        self.byte_queue = byte_queue
+        self.pending = b''  # bytes received but not yet read
+        self.offset = 0  # position of the next byte to read within "pending"
+        self.at_end = False
+
+    def readable(self):
+        return True
+
+    def fill(self) -> bool:
+        """Wait for the next chunk and add it to the pending bytes. Returns False at the end of the bytes"""
+        if self.at_end:
+            return False
+
+        chunk = self.byte_queue.get()
+        if chunk is None:
+            self.at_end = True
+            return False
+
+        self.pending = self.pending[self.offset:] + chunk
+        self.offset = 0
+        return True
+
+    def peek_lines(self, num_lines: int) -> bytes:
+        """Return the first "num_lines" lines, without reading them"""
+        while self.pending.count(b'\n', self.offset) < num_lines and self.fill():
+            pass
+
+        end_pos = self.offset
+        for _ in range(num_lines):
+            end_pos = self.pending.find(b'\n', end_pos) + 1
+            if end_pos == 0:
+                return self.pending[self.offset:]
+
+        return self.pending[self.offset:end_pos]
+
+    def readinto(self, buffer):
+        while self.offset >= len(self.pending):
+            if not self.fill():
+                return 0
+
+        num_bytes = min(len(buffer), len(self.pending) - self.offset)
+        buffer[:num_bytes] = self.pending[self.offset:self.offset + num_bytes]
+        self.offset += num_bytes
+
+        return num_bytes
+
+    def drain(self):
+        """Discard the remaining chunks, so that writers aren't left waiting on a full queue"""
+        while self.fill():
+            self.pending = b''
+
+
+class StreamProfiler(BasicErrCheck):
+    """Profile a delimited file, in a background thread, as its bytes are written"""
+
+    def __init__(self, max_num_features=None, **kwargs):
+        """
+        :param max_num_features int or None - number of columns to profile, use None for all columns
+        """
+        self.max_num_features = max_num_features
+        self.save_row_count = kwargs.get(pstatic.KEY_SAVE_ROW_COUNT, True)
+
+        self.byte_queue = queue.Queue(maxsize=pstatic.PROFILER_STREAM_QUEUE_SIZE)
+        self.stream_reader = ByteQueueReader(self.byte_queue)
+        self.profile_thread = None
+        self.is_closed = False  # True after .finish() or .cancel()
+
+        self.data_profile = None
+        self.num_variables = None
+
+    def start(self):
+        """Start the profile thread"""
+        self.profile_thread = threading.Thread(target=self.run_profile, daemon=True)
+        self.profile_thread.start()
+
+    def write(self, chunk: bytes):
+        """Add the next chunk of the file. Waits if the profile thread is behind"""
+        if self.is_closed or self.has_error():
+            return
+        self.byte_queue.put(chunk)
+
+    def reset(self):
+        """The bytes are starting over, e.g. a download that couldn't be resumed. Stop profiling"""
+        self.cancel('The file download started over.')
+
+    def cancel(self, user_msg='The stream profile was cancelled.'):
+        """Stop profiling, e.g. the download failed"""
+        if self.is_closed:
+            return
+        self.add_err_msg(user_msg)
+        self.close()
+
+    def finish(self) -> bool:
+        """All bytes have been written. Wait for the profile and return True if it succeeded"""
+        self.close()
+        return not self.has_error() and self.data_profile is not None
+
+    def close(self):
+        """Mark the end of the bytes and wait for the profile thread"""
+        if self.is_closed:
+            return
+        self.is_closed = True
+        self.byte_queue.put(None)
+        if self.profile_thread:
+            self.profile_thread.join()
+
+    def run_profile(self):
+        """Profile the bytes as they arrive. Run in the profile thread"""
+        try:
+            self.profile_stream()
+        except UnicodeDecodeError as ex_obj:
+            self.add_profile_err_msg(f'Failed to read the file due to UnicodeDecodeError. ({ex_obj})')
+        except Exception as ex_obj:
+            self.add_profile_err_msg(f'Stream profile error. {ex_obj}')
+        finally:
+            self.stream_reader.drain()
+
+        if self.has_error():
+            logger.info(f'Stream profile failed: {self.get_err_msg()}')
+
+    def add_profile_err_msg(self, user_msg):
+        """Add an error from the profile thread. After a cancel, keep the cancel message"""
+        if not self.has_error():
+            self.add_err_msg(user_msg)
+
+    def profile_stream(self):
+        """Read the header and sample rows, then profile the file in chunks of rows"""
+        sample_bytes = self.stream_reader.peek_lines(pstatic.PROFILER_CHUNK_SAMPLE_ROWS + 1)
+        if len(sample_bytes) < 5:
+            self.add_profile_err_msg('The file is empty.')
+            return
+
+        # Detect the delimiter using the first line, as with the CsvReader
+        header_line = sample_bytes.split(b'\n', 1)[0].decode('utf-8')
+        delimiter = csv.Sniffer().sniff(header_line).delimiter
+
+        usecols = None
+        if self.max_num_features is not None:
+            num_columns = len(next(csv.reader([header_line], delimiter=delimiter)))
+            usecols = list(range(min(num_columns, self.max_num_features)))
+
+        sample_df = pd.read_csv(io.BytesIO(sample_bytes), delimiter=delimiter, usecols=usecols,
+                                nrows=pstatic.PROFILER_CHUNK_SAMPLE_ROWS)
+        chunk_size = CsvReader.get_chunk_size_for_sample(sample_df, settings.PROFILER_CHUNK_MEMORY_LIMIT)
+
+        with pd.read_csv(io.BufferedReader(self.stream_reader), delimiter=delimiter, usecols=usecols,
+                         chunksize=chunk_size) as reader:
+            variable_info_handler = ChunkedVariableInfoHandler(
+                reader, **{pstatic.KEY_SAVE_ROW_COUNT: self.save_row_count})
+            variable_info_handler.run_profile_process()
+
+        if variable_info_handler.has_error():
+            self.add_profile_err_msg(variable_info_handler.get_err_msg())
+            return
+
+        self.data_profile = variable_info_handler.data_profile
+        self.num_variables = variable_info_handler.num_variables
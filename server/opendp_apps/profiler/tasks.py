@@ -1,6 +1,7 @@
 from django.core.exceptions import ValidationError as DjangoValidationError
 
 from opendp_apps.dataset import static_vals as dstatic
+from opendp_apps.dataset.columnar_cache import ColumnarCache
 from opendp_apps.dataset.models import DatasetInfo
 from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
 from opendp_apps.profiler import static_vals as pstatic
@@ -43,9 +44,21 @@ def run_profile_by_filefield(dataset_info_object_id, max_num_features=None, **kw
 
     params = {pstatic.KEY_DATASET_IS_DJANGO_FILEFIELD: True,
               pstatic.KEY_DATASET_OBJECT_ID: dataset_info_object_id,
-              pstatic.KEY_SAVE_ROW_COUNT: kwargs.get(pstatic.KEY_SAVE_ROW_COUNT, True)
+              pstatic.KEY_SAVE_ROW_COUNT: kwargs.get(pstatic.KEY_SAVE_ROW_COUNT, True),
+              pstatic.KEY_PROFILE_IN_CHUNKS: kwargs.get(pstatic.KEY_PROFILE_IN_CHUNKS),
+              pstatic.KEY_STREAMED_DATA_PROFILE: kwargs.get(pstatic.KEY_STREAMED_DATA_PROFILE),
+              pstatic.KEY_PROFILE_COLUMNS: kwargs.get(pstatic.KEY_PROFILE_COLUMNS),
+              pstatic.KEY_PROFILE_BY_SAMPLE: kwargs.get(pstatic.KEY_PROFILE_BY_SAMPLE),
+              pstatic.KEY_SAMPLE_ROWS: kwargs.get(pstatic.KEY_SAMPLE_ROWS),
               }
 
     prunner = ProfileRunner(filefield, max_num_features, **params)
 
+    # Split the file into columns for computing releases. Failures are logged,
+    #   the release will read the source file instead. (Not for a profile of selected columns)
+    if not prunner.has_error() and not prunner.profile_columns and ColumnarCache.is_enabled():
+        columnar_cache = ColumnarCache(ds_info)
+        if not columnar_cache.is_current():
+            columnar_cache.build()
+
     return prunner
@@ -0,0 +1,146 @@
+from os.path import abspath, dirname, isfile, join
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.test import TestCase, override_settings
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from opendp_apps.dataset.models import DatasetInfo, UploadFileInfo
+from opendp_apps.model_helpers.msg_util import msgt
+from opendp_apps.profiler import static_vals as pstatic
+from opendp_apps.profiler import tasks as profiler_tasks
+from opendp_apps.profiler.profile_cache import ProfileCache
+from opendp_apps.utils.file_hash import get_filepath_sha256
+
+CURRENT_DIR = dirname(abspath(__file__))
+TEST_DATA_DIR = join(CURRENT_DIR, 'test_files')
+
+
+class LocalRedisClient:
+    """Stand-in for the RedisClient that keeps values in a dict"""
+
+    def __init__(self):
+        self.values = {}
+        self.expirations = {}
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode()
+        self.expirations[key] = ex
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def expire(self, key, seconds):
+        self.expirations[key] = seconds
+        return key in self.values
+
+
+class UnavailableRedisClient:
+    """Stand-in for the RedisClient when the Redis server is down"""
+
+    def set(self, key, value, ex=None):
+        raise RedisConnectionError('Connection refused')
+
+    def get(self, key):
+        raise RedisConnectionError('Connection refused')
+
+    def expire(self, key, seconds):
+        raise RedisConnectionError('Connection refused')
+
+
+@override_settings(PROFILE_CACHE_ENABLED=True)
+class ProfileCacheTest(TestCase):
+    """Test retrieving profiles from the ProfileCache"""
+
+    def setUp(self):
+        """Create a user and the file to profile"""
+        self.user = get_user_model().objects.create(username='dp_depositor',
+                                                    email='test_depositor@opendp.org')
+
+        self.filename = 'fearonLaitin.csv'
+        self.filepath = join(TEST_DATA_DIR, self.filename)
+        self.assertTrue(isfile(self.filepath))
+
+        self.redis_client = LocalRedisClient()
+
+    def get_upload_file_info(self) -> UploadFileInfo:
+        """Create an UploadFileInfo with the test file"""
+        upload_file_info = UploadFileInfo.objects.create(name='Fearon Laitin', creator=self.user)
+        with open(self.filepath, 'rb') as file_obj:
+            upload_file_info.source_file.save(self.filename, File(file_obj))
+
+        return upload_file_info
+
+    def test_10_profile_retrieved_from_cache(self):
+        """(10) The same file, in a new DatasetInfo, gets its profile from the cache"""
+        msgt(self.test_10_profile_retrieved_from_cache.__doc__)
+
+        with patch('opendp_apps.profiler.profile_cache.get_redis_client', return_value=self.redis_client):
+            dsi1 = self.get_upload_file_info()
+            profiler1 = profiler_tasks.run_profile_by_filefield(dsi1.object_id, settings.PROFILER_COLUMN_LIMIT)
+            self.assertFalse(profiler1.has_error())
+            self.assertFalse(profiler1.profile_from_cache)
+            self.assertEqual(len(self.redis_client.values), 1)
+
+            # The hash is saved with the DatasetInfo
+            dsi1 = DatasetInfo.objects.get(object_id=dsi1.object_id)
+            self.assertEqual(dsi1.source_file_hash, get_filepath_sha256(self.filepath))
+
+            dsi2 = self.get_upload_file_info()
+            profiler2 = profiler_tasks.run_profile_by_filefield(dsi2.object_id, settings.PROFILER_COLUMN_LIMIT)
+            self.assertFalse(profiler2.has_error())
+            self.assertTrue(profiler2.profile_from_cache)
+            self.assertEqual(profiler2.num_variables, settings.PROFILER_COLUMN_LIMIT)
+
+        # The cached profile is saved to the new DatasetInfo
+        dsi2 = DatasetInfo.objects.get(object_id=dsi2.object_id)
+        self.assertEqual(dsi2.depositor_setup_info.data_profile, dsi1.depositor_setup_info.data_profile)
+        self.assertEqual(dsi2.depositor_setup_info.user_step, dsi1.depositor_setup_info.user_step)
+
+        # Each cache hit resets the expiration time
+        cache_key = list(self.redis_client.values.keys())[0]
+        self.assertEqual(self.redis_client.expirations[cache_key], settings.PROFILE_CACHE_TIMEOUT)
+
+    def test_20_cache_key(self):
+        """(20) The cache key includes the profiler version and profile settings"""
+        msgt(self.test_20_cache_key.__doc__)
+
+        file_hash = get_filepath_sha256(self.filepath)
+        cache_key = ProfileCache(file_hash).get_cache_key()
+        self.assertIn(file_hash, cache_key)
+        self.assertIn(f'v{pstatic.PROFILER_VERSION}', cache_key)
+
+        self.assertNotEqual(cache_key, ProfileCache(file_hash, max_num_features=5).get_cache_key())
+        self.assertNotEqual(cache_key, ProfileCache(file_hash, save_row_count=False).get_cache_key())
+
+        with patch('opendp_apps.profiler.profile_cache.get_redis_client', return_value=self.redis_client):
+            profiler1 = profiler_tasks.run_profile_by_filepath(self.filepath, settings.PROFILER_COLUMN_LIMIT)
+            self.assertFalse(profiler1.profile_from_cache)
+
+            # Different row count setting, the file is profiled again
+            params = {pstatic.KEY_SAVE_ROW_COUNT: False}
+            profiler2 = profiler_tasks.run_profile_by_filepath(self.filepath, settings.PROFILER_COLUMN_LIMIT,
+                                                               **params)
+            self.assertFalse(profiler2.profile_from_cache)
+            self.assertIsNone(profiler2.data_profile['dataset']['rowCount'])
+
+            profiler3 = profiler_tasks.run_profile_by_filepath(self.filepath, settings.PROFILER_COLUMN_LIMIT,
+                                                               **params)
+            self.assertTrue(profiler3.profile_from_cache)
+            self.assertIsNone(profiler3.data_profile['dataset']['rowCount'])
+
+    def test_30_redis_unavailable(self):
+        """(30) If Redis is unavailable, the file is profiled as usual"""
+        msgt(self.test_30_redis_unavailable.__doc__)
+
+        with patch('opendp_apps.profiler.profile_cache.get_redis_client',
+                   return_value=UnavailableRedisClient()):
+            dsi = self.get_upload_file_info()
+            profiler = profiler_tasks.run_profile_by_filefield(dsi.object_id, settings.PROFILER_COLUMN_LIMIT)
+
+        self.assertFalse(profiler.has_error())
+        self.assertFalse(profiler.profile_from_cache)
+        self.assertEqual(profiler.num_variables, settings.PROFILER_COLUMN_LIMIT)
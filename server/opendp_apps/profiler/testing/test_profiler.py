@@ -8,7 +8,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files import File
 from django.core.serializers.json import DjangoJSONEncoder
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from opendp_apps.dataset import static_vals as dstatic
 from opendp_apps.dataset.models import DatasetInfo, UploadFileInfo
@@ -16,6 +16,7 @@ from opendp_apps.dataset.models import DepositorSetupInfo
 from opendp_apps.model_helpers.msg_util import msgt
 from opendp_apps.profiler import static_vals as pstatic
 from opendp_apps.profiler import tasks as profiler_tasks
+from opendp_apps.profiler.csv_reader import CsvReader
 from opendp_apps.profiler.profile_runner import ProfileRunner
 from opendp_apps.user.models import OpenDPUser
 from opendp_apps.utils.camel_to_snake import camel_to_snake
@@ -175,6 +176,42 @@ class ProfilerTest(TestCase):
         params = {pstatic.KEY_SAVE_ROW_COUNT: False}
         self.profile_good_file('teacher_climate_survey_lwd.csv', 132, 1500, **params)
 
+    @override_settings(PROFILER_CHUNK_MEMORY_LIMIT=50_000)
+    def test_007_profile_in_chunks(self):
+        """(07) Profiling in chunks gives the same result as reading the whole file"""
+        msgt(self.test_007_profile_in_chunks.__doc__)
+
+        for filename in ['gking-crisis.tab', 'teacher_climate_survey_lwd.csv', 'fearonLaitin.csv']:
+            filepath = join(TEST_DATA_DIR, filename)
+            self.assertTrue(isfile(filepath))
+
+            profiler = profiler_tasks.run_profile_by_filepath(filepath, settings.PROFILER_COLUMN_LIMIT,
+                                                              **{pstatic.KEY_PROFILE_IN_CHUNKS: False})
+            self.assertFalse(profiler.has_error())
+
+            chunked_profiler = profiler_tasks.run_profile_by_filepath(filepath, settings.PROFILER_COLUMN_LIMIT,
+                                                                      **{pstatic.KEY_PROFILE_IN_CHUNKS: True})
+            self.assertFalse(chunked_profiler.has_error())
+
+            print(f'-- {filename}: profile matches with chunked reading')
+            self.assertEqual(json.loads(json.dumps(profiler.data_profile)),
+                             json.loads(json.dumps(chunked_profiler.data_profile)))
+            self.assertEqual(profiler.num_variables, chunked_profiler.num_variables)
+
+    def test_008_chunk_size_within_memory_limit(self):
+        """(08) The chunk size is based on the memory limit"""
+        msgt(self.test_008_chunk_size_within_memory_limit.__doc__)
+
+        filepath = join(TEST_DATA_DIR, 'teacher_climate_survey_lwd.csv')
+        csv_reader = CsvReader(filepath, column_limit=10)
+
+        chunks = list(csv_reader.read_in_chunks(100_000))
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual(sum([chunk_df.shape[0] for chunk_df in chunks]), 1500)
+        for chunk_df in chunks:
+            self.assertEqual(chunk_df.shape[1], 10)
+            self.assertTrue(chunk_df.memory_usage(index=True, deep=True).sum() < 100_000)
+
     def test_010_profile_good_file(self):
         """(10) Profile file directory"""
         msgt(self.test_010_profile_good_file.__doc__)
@@ -494,3 +531,41 @@ class ProfilerTest(TestCase):
         self.assertTrue(profile_resp.json()['message'].find('The DatasetInfo source file is not available') > -1)
         
 
+    def test_130_probe_columns_via_api(self):
+        """(130) Profile selected columns via API, the DatasetInfo isn't changed"""
+        msgt(self.test_130_probe_columns_via_api.__doc__)
+
+        user_step = UploadFileInfo.objects.get(object_id=self.test_file_info.object_id).depositor_setup_info.user_step
+
+        probe_url = '/api/profile/probe-columns/'
+        payload = dict(object_id=str(self.test_file_info.object_id),
+                       columns=['sex', 'optimism'])
+
+        profile_resp = self.client.post(probe_url,
+                                        data=payload,
+                                        content_type='application/json')
+        self.assertEqual(profile_resp.status_code, HTTPStatus.OK)
+
+        resp_json = profile_resp.json()
+        self.assertEqual(resp_json['data']['dataset']['rowCount'], 7000)
+        self.assertEqual(resp_json['data']['dataset']['variableOrder'], [[0, 'sex'], [7, 'optimism']])
+
+        dsi = UploadFileInfo.objects.get(object_id=self.test_file_info.object_id)
+        self.assertIsNone(dsi.depositor_setup_info.data_profile)
+        self.assertEqual(dsi.depositor_setup_info.user_step, user_step)
+
+        # No columns
+        payload['columns'] = []
+        profile_resp = self.client.post(probe_url,
+                                        data=payload,
+                                        content_type='application/json')
+        self.assertEqual(profile_resp.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertTrue(profile_resp.json()['message'].startswith('"columns" error'))
+
+        # A column that isn't in the file
+        payload['columns'] = ['sex', 'not-a-column']
+        profile_resp = self.client.post(probe_url,
+                                        data=payload,
+                                        content_type='application/json')
+        self.assertEqual(profile_resp.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertIn('not-a-column', profile_resp.json()['message'])
@@ -0,0 +1,148 @@
+import tempfile
+from os.path import abspath, dirname, isfile, join
+
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.test import TestCase
+
+from opendp_apps.dataset.models import DatasetInfo, UploadFileInfo
+from opendp_apps.model_helpers.msg_util import msgt
+from opendp_apps.profiler import static_vals as pstatic
+from opendp_apps.profiler import tasks as profiler_tasks
+from opendp_apps.profiler.csv_reader import CsvReader
+from opendp_apps.profiler.row_counter import count_csv_rows
+
+CURRENT_DIR = dirname(abspath(__file__))
+TEST_DATA_DIR = join(CURRENT_DIR, 'test_files')
+
+
+class RowCounterTest(TestCase):
+    """Test counting rows without parsing the file, and profiling selected columns"""
+
+    def count_with_pandas(self, filepath):
+        csv_reader = CsvReader(filepath)
+        csv_reader.set_delimiter()
+        return pd.read_csv(filepath, delimiter=csv_reader.delimiter).shape[0]
+
+    def test_10_count_test_files(self):
+        """(10) The row count matches pandas, including when rows span blocks"""
+        msgt(self.test_10_count_test_files.__doc__)
+
+        for filename in ['gking-crisis.tab', 'teacher_climate_survey_lwd.csv', 'fearonLaitin.csv']:
+            filepath = join(TEST_DATA_DIR, filename)
+            self.assertTrue(isfile(filepath))
+
+            num_rows = self.count_with_pandas(filepath)
+            print(f'-- {filename}: {num_rows} rows')
+            self.assertEqual(count_csv_rows(filepath), num_rows)
+            self.assertEqual(count_csv_rows(filepath, block_size=7), num_rows)
+
+        self.assertEqual(count_csv_rows(join(TEST_DATA_DIR, 'empty_file.csv')), 0)
+
+    def test_20_quotes_and_blank_lines(self):
+        """(20) Newlines within quotes, blank lines, "\\r\\n" and a missing final newline"""
+        msgt(self.test_20_quotes_and_blank_lines.__doc__)
+
+        file_contents = [
+            b'name,comment\n"Ann","line one\nline two"\nBob,ok\n',
+            b'name,comment\r\n\r\nAnn,"say ""hi""\r\nthen go"\r\n\r\nBob,ok\r\n\r\n',
+            b'name,comment\nAnn,ok\n\n\nBob,"no final newline"',
+            b'name,comment\n',
+        ]
+        for content in file_contents:
+            with tempfile.NamedTemporaryFile(suffix='.csv') as temp_file:
+                temp_file.write(content)
+                temp_file.flush()
+
+                num_rows = pd.read_csv(temp_file.name).shape[0]
+                for block_size in [1, 2, 3, 5, pstatic.PROFILER_ROW_COUNT_BLOCK_SIZE]:
+                    self.assertEqual(count_csv_rows(temp_file.name, block_size=block_size), num_rows,
+                                     f'block_size {block_size}: {content}')
+
+    def test_30_profile_columns(self):
+        """(30) Profile selected columns using the first rows and the row count"""
+        msgt(self.test_30_profile_columns.__doc__)
+
+        filepath = join(TEST_DATA_DIR, 'teacher_climate_survey_lwd.csv')
+        full_profiler = profiler_tasks.run_profile_by_filepath(filepath, settings.PROFILER_COLUMN_LIMIT)
+        self.assertFalse(full_profiler.has_error())
+
+        profile_columns = ['hssample', 'surveymode', 'subject', 'q1_globalwarm', 'q3_iceages_lesson']
+        profiler = profiler_tasks.run_profile_by_filepath(
+            filepath, settings.PROFILER_COLUMN_LIMIT, **{pstatic.KEY_PROFILE_COLUMNS: profile_columns})
+        self.assertFalse(profiler.has_error())
+
+        data_profile = profiler.data_profile
+        self.assertEqual(data_profile['dataset']['rowCount'], 1500)
+        self.assertEqual(data_profile['dataset']['variableCount'], len(profile_columns))
+        self.assertEqual([x[1] for x in data_profile['dataset']['variableOrder']], profile_columns)
+        # The positions are those in the file
+        full_positions = dict((x[1], x[0]) for x in full_profiler.data_profile['dataset']['variableOrder'])
+        self.assertEqual([x[0] for x in data_profile['dataset']['variableOrder']],
+                         [full_positions[col_name] for col_name in profile_columns])
+        for col_name in profile_columns:
+            self.assertEqual(data_profile['variables'][col_name]['sort_order'], full_positions[col_name])
+        # The file has fewer rows than settings.PROFILER_TYPE_PROBE_ROWS, so the types match
+        for col_name in profile_columns:
+            self.assertEqual(data_profile['variables'][col_name]['type'],
+                             full_profiler.data_profile['variables'][col_name]['type'])
+
+        # The row count isn't saved, but is available to the ProfileRunner
+        profiler = profiler_tasks.run_profile_by_filepath(
+            filepath, None, **{pstatic.KEY_PROFILE_COLUMNS: profile_columns,
+                               pstatic.KEY_SAVE_ROW_COUNT: False})
+        self.assertFalse(profiler.has_error())
+        self.assertIsNone(profiler.data_profile['dataset']['rowCount'])
+        self.assertEqual(profiler.row_count, 1500)
+
+        # A column that isn't in the file
+        profiler = profiler_tasks.run_profile_by_filepath(
+            filepath, None, **{pstatic.KEY_PROFILE_COLUMNS: ['subject', 'not-a-column']})
+        self.assertTrue(profiler.has_error())
+        self.assertIn('not-a-column', profiler.get_err_msg())
+
+    def test_40_dataset_info(self):
+        """(40) The row count is saved to the DatasetInfo, not published. A column probe doesn't change the DatasetInfo"""
+        msgt(self.test_40_dataset_info.__doc__)
+
+        filename = 'teacher_climate_survey_lwd.csv'
+        user = get_user_model().objects.create(username='dp_depositor', email='test_depositor@opendp.org')
+        dsi = UploadFileInfo.objects.create(name='Teacher survey', creator=user)
+        with open(join(TEST_DATA_DIR, filename), 'rb') as file_obj:
+            dsi.source_file.save(filename, File(file_obj))
+
+        # The row count isn't in the profile but is saved with the DatasetInfo
+        profiler = profiler_tasks.run_profile_by_filefield(dsi.object_id, None,
+                                                           **{pstatic.KEY_SAVE_ROW_COUNT: False})
+        self.assertFalse(profiler.has_error())
+
+        dsi = DatasetInfo.objects.get(object_id=dsi.object_id)
+        self.assertIsNone(dsi.depositor_setup_info.data_profile['dataset']['rowCount'])
+        self.assertEqual(dsi.row_count, 1500)
+
+        # The saved row count isn't a public dataset size
+        self.assertFalse(dsi.get_dataset_size().success)
+        self.assertIsNone(dsi.depositor_setup_info.dataset_size)
+
+        data_profile = dsi.depositor_setup_info.data_profile
+        user_step = dsi.depositor_setup_info.user_step
+
+        # The probe returns the columns' profile only, in file order
+        profiler = profiler_tasks.run_profile_by_filefield(
+            dsi.object_id, **{pstatic.KEY_PROFILE_COLUMNS: ['q3_iceages_lesson', 'subject']})
+        self.assertFalse(profiler.has_error())
+        self.assertEqual(list(profiler.data_profile['variables'].keys()), ['subject', 'q3_iceages_lesson'])
+
+        dsi = DatasetInfo.objects.get(object_id=dsi.object_id)
+        self.assertEqual(dsi.depositor_setup_info.data_profile, data_profile)
+        self.assertEqual(dsi.depositor_setup_info.user_step, user_step)
+
+        # A failed probe doesn't change the step
+        profiler = profiler_tasks.run_profile_by_filefield(
+            dsi.object_id, **{pstatic.KEY_PROFILE_COLUMNS: ['not-a-column']})
+        self.assertTrue(profiler.has_error())
+
+        dsi = DatasetInfo.objects.get(object_id=dsi.object_id)
+        self.assertEqual(dsi.depositor_setup_info.user_step, user_step)
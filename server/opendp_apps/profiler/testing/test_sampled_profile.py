@@ -0,0 +1,123 @@
+import io
+import json
+import mmap
+import tempfile
+from os.path import abspath, dirname, isfile, join
+
+import pandas as pd
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from opendp_apps.model_helpers.msg_util import msgt
+from opendp_apps.profiler import static_vals as pstatic
+from opendp_apps.profiler import tasks as profiler_tasks
+from opendp_apps.profiler.sampled_variable_info import RowSampler, SampledVariableInfoHandler
+
+CURRENT_DIR = dirname(abspath(__file__))
+TEST_DATA_DIR = join(CURRENT_DIR, 'test_files')
+
+
+class SampledProfileTest(TestCase):
+    """Test profiling with a random sample of the rows"""
+
+    def test_10_row_sampler(self):
+        """(10) The reservoir sample is spread over the file and returned in file order"""
+        msgt(self.test_10_row_sampler.__doc__)
+
+        content = b'row_num,comment\n' + b''.join(f'{x},"line\n{x}"\n'.encode() for x in range(10_000))
+        with tempfile.NamedTemporaryFile(suffix='.csv') as temp_file:
+            temp_file.write(content)
+            temp_file.flush()
+
+            row_sampler = RowSampler(1000)
+            with mmap.mmap(temp_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                for start_pos in range(0, len(mapped_file), 4096):
+                    row_sampler.add_block(mapped_file[start_pos:start_pos + 4096])
+                row_sampler.finish()
+                sample_bytes = row_sampler.get_sample_bytes(mapped_file)
+
+        self.assertEqual(row_sampler.get_row_count(), 10_000)
+
+        sample_df = pd.read_csv(io.BytesIO(sample_bytes))
+        row_nums = sample_df['row_num'].tolist()
+        self.assertEqual(len(row_nums), 1000)
+        self.assertEqual(row_nums, sorted(set(row_nums)))
+        self.assertTrue((sample_df['comment'] == 'line\n' + sample_df['row_num'].astype(str)).all())
+
+        # Rows from across the file, not only the first 1,000
+        self.assertLess(min(row_nums), 1000)
+        self.assertGreater(max(row_nums), 9000)
+        self.assertGreater(sum(1 for x in row_nums if x >= 5000), 350)
+
+    def test_20_whole_file_sample(self):
+        """(20) If the sample holds every row, the profile matches the full profile"""
+        msgt(self.test_20_whole_file_sample.__doc__)
+
+        for filename in ['gking-crisis.tab', 'teacher_climate_survey_lwd.csv', 'fearonLaitin.csv']:
+            filepath = join(TEST_DATA_DIR, filename)
+            self.assertTrue(isfile(filepath))
+
+            profiler = profiler_tasks.run_profile_by_filepath(filepath, settings.PROFILER_COLUMN_LIMIT,
+                                                              **{pstatic.KEY_PROFILE_IN_CHUNKS: False})
+            self.assertFalse(profiler.has_error())
+
+            handler = SampledVariableInfoHandler(filepath, settings.PROFILER_COLUMN_LIMIT)
+            handler.run_profile_process()
+            self.assertFalse(handler.has_error())
+
+            print(f'-- {filename}: profile matches')
+            sampled_profile = json.loads(json.dumps(handler.data_profile))
+            self.assertEqual(sampled_profile['dataset'].pop('sampledVariables'), [])
+            self.assertEqual(json.loads(json.dumps(profiler.data_profile)), sampled_profile)
+
+    def test_30_ambiguous_columns_read_in_full(self):
+        """(30) With a small sample, columns with 1 or 2 distinct values get their exact type"""
+        msgt(self.test_30_ambiguous_columns_read_in_full.__doc__)
+
+        filepath = join(TEST_DATA_DIR, 'teacher_climate_survey_lwd.csv')
+        profiler = profiler_tasks.run_profile_by_filepath(filepath, None,
+                                                          **{pstatic.KEY_PROFILE_IN_CHUNKS: False})
+        self.assertFalse(profiler.has_error())
+
+        handler = SampledVariableInfoHandler(filepath, None, **{pstatic.KEY_SAMPLE_ROWS: 20})
+        handler.run_profile_process()
+        self.assertFalse(handler.has_error())
+
+        data_profile = handler.data_profile
+        self.assertEqual(data_profile['dataset']['rowCount'], 1500)
+        self.assertEqual(data_profile['dataset']['variableOrder'],
+                         profiler.data_profile['dataset']['variableOrder'])
+
+        # Every column is either sampled or read in full
+        self.assertTrue(len(handler.exact_variables) > 0)
+        self.assertEqual(set(handler.exact_variables) | set(data_profile['dataset']['sampledVariables']),
+                         set(data_profile['variables'].keys()))
+        self.assertFalse(set(handler.exact_variables) & set(data_profile['dataset']['sampledVariables']))
+
+        for col_name in handler.exact_variables:
+            self.assertEqual(data_profile['variables'][col_name]['type'],
+                             profiler.data_profile['variables'][col_name]['type'])
+
+        # The same sample each time
+        handler2 = SampledVariableInfoHandler(filepath, None, **{pstatic.KEY_SAMPLE_ROWS: 20})
+        handler2.run_profile_process()
+        self.assertEqual(handler2.data_profile, data_profile)
+
+    @override_settings(PROFILER_SAMPLED_READ_MIN_FILE_SIZE=1000,
+                       PROFILER_SAMPLE_ROWS=100)
+    def test_40_profile_runner(self):
+        """(40) Files above the size limit are profiled using a sample"""
+        msgt(self.test_40_profile_runner.__doc__)
+
+        filepath = join(TEST_DATA_DIR, 'fearonLaitin.csv')
+        profiler = profiler_tasks.run_profile_by_filepath(filepath, settings.PROFILER_COLUMN_LIMIT)
+        self.assertFalse(profiler.has_error())
+        self.assertTrue(profiler.profile_by_sample)
+        self.assertIn('sampledVariables', profiler.data_profile['dataset'])
+        self.assertIn(':sample_100', profiler.profile_cache.get_cache_key())
+
+        profiler = profiler_tasks.run_profile_by_filepath(filepath, settings.PROFILER_COLUMN_LIMIT,
+                                                          **{pstatic.KEY_PROFILE_BY_SAMPLE: False})
+        self.assertFalse(profiler.has_error())
+        self.assertNotIn('sampledVariables', profiler.data_profile['dataset'])
+        self.assertNotIn(':sample_', profiler.profile_cache.get_cache_key())
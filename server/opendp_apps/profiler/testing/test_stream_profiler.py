@@ -0,0 +1,85 @@
+import json
+from os.path import abspath, dirname, isfile, join
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from opendp_apps.model_helpers.msg_util import msgt
+from opendp_apps.profiler import static_vals as pstatic
+from opendp_apps.profiler import tasks as profiler_tasks
+from opendp_apps.profiler.stream_profiler import StreamProfiler
+
+CURRENT_DIR = dirname(abspath(__file__))
+TEST_DATA_DIR = join(CURRENT_DIR, 'test_files')
+
+
+class StreamProfilerTest(TestCase):
+    """Test profiling a file as its bytes arrive"""
+
+    def stream_file(self, filepath, chunk_size, max_num_features=None) -> StreamProfiler:
+        """Write the file to a StreamProfiler, as a download would"""
+        stream_profiler = StreamProfiler(max_num_features=max_num_features)
+        stream_profiler.start()
+        with open(filepath, 'rb') as infile:
+            for chunk in iter(lambda: infile.read(chunk_size), b''):
+                stream_profiler.write(chunk)
+        stream_profiler.finish()
+
+        return stream_profiler
+
+    @override_settings(PROFILER_CHUNK_MEMORY_LIMIT=50_000)
+    def test_10_stream_profile_matches(self):
+        """(10) Profiling the bytes as they arrive gives the same result as reading the file"""
+        msgt(self.test_10_stream_profile_matches.__doc__)
+
+        for filename in ['gking-crisis.tab', 'teacher_climate_survey_lwd.csv', 'fearonLaitin.csv']:
+            filepath = join(TEST_DATA_DIR, filename)
+            self.assertTrue(isfile(filepath))
+
+            profiler = profiler_tasks.run_profile_by_filepath(filepath, settings.PROFILER_COLUMN_LIMIT,
+                                                              **{pstatic.KEY_PROFILE_IN_CHUNKS: False})
+            self.assertFalse(profiler.has_error())
+
+            # Small chunks split the lines, and the header, across chunks
+            stream_profiler = self.stream_file(filepath, 1000, settings.PROFILER_COLUMN_LIMIT)
+            self.assertFalse(stream_profiler.has_error())
+
+            print(f'-- {filename}: profile matches with streamed reading')
+            self.assertEqual(json.loads(json.dumps(profiler.data_profile)),
+                             json.loads(json.dumps(stream_profiler.data_profile)))
+            self.assertEqual(profiler.num_variables, stream_profiler.num_variables)
+
+    def test_20_cancel(self):
+        """(20) A cancelled or restarted stream has no profile"""
+        msgt(self.test_20_cancel.__doc__)
+
+        filepath = join(TEST_DATA_DIR, 'teacher_climate_survey_lwd.csv')
+        with open(filepath, 'rb') as infile:
+            content = infile.read()
+
+        # More chunks than the queue holds, so the profile thread is still reading
+        stream_profiler = StreamProfiler()
+        stream_profiler.start()
+        for start in range(0, len(content) // 2, 100):
+            stream_profiler.write(content[start:start + 100])
+        stream_profiler.reset()
+
+        self.assertTrue(stream_profiler.has_error())
+        self.assertIn('started over', stream_profiler.get_err_msg())
+        self.assertFalse(stream_profiler.profile_thread.is_alive())
+
+        # Writes after the cancel are ignored
+        stream_profiler.write(content)
+        self.assertFalse(stream_profiler.finish())
+
+    def test_30_bad_files(self):
+        """(30) Empty and non-delimited files"""
+        msgt(self.test_30_bad_files.__doc__)
+
+        stream_profiler = self.stream_file(join(TEST_DATA_DIR, 'empty_file.csv'), 1000)
+        self.assertTrue(stream_profiler.has_error())
+        self.assertIn('empty', stream_profiler.get_err_msg())
+
+        stream_profiler = self.stream_file(join(TEST_DATA_DIR, 'image_file.png'), 1000)
+        self.assertTrue(stream_profiler.has_error())
+        self.assertIsNone(stream_profiler.data_profile)
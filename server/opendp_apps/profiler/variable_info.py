@@ -7,14 +7,13 @@ from collections import OrderedDict
 from django.conf import settings
 
 from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
+from opendp_apps.profiler.column_type_inference import ColumnTypeInference
 from opendp_apps.profiler.csv_reader import CsvReader
 from opendp_apps.profiler.static_vals import \
-    (KEY_SAVE_ROW_COUNT,
+    (KEY_NUM_WORKERS,
+     KEY_SAVE_ROW_COUNT,
      VAR_TYPE_BOOLEAN,
-     VAR_TYPE_CATEGORICAL,
-     VAR_TYPE_FLOAT,
-     VAR_TYPE_INTEGER,
-     VAR_TYPE_NUMERICAL)
+     VAR_TYPE_CATEGORICAL)
 
 logger = logging.getLogger(settings.DEFAULT_LOGGER)
 
@@ -29,8 +28,10 @@ class VariableInfoHandler(BasicErrCheck):
         self.df = dataframe
         self.num_variables = None
         self.data_profile = None
+        self.column_timings = None  # column name -> seconds spent inferring the type
 
         self.save_num_rows = kwargs.get(KEY_SAVE_ROW_COUNT, True)
+        self.num_workers = kwargs.get(KEY_NUM_WORKERS, settings.PROFILER_NUM_WORKERS)
 
     def run_profile_process(self):
         """
@@ -63,37 +64,22 @@ class VariableInfoHandler(BasicErrCheck):
         profile_dict['dataset']['variableOrder'] = variable_order
         profile_dict['variables'] = {}
 
-        sort_order = -1
-        for col_name in self.df.columns:
-            sort_order += 1
-            logger.info(f'profiling column {sort_order}: {col_name}')
-            column = self.df[col_name]
+        # Classify all of the columns at once
+        type_inference = ColumnTypeInference(self.df, num_workers=self.num_workers)
+        self.column_timings = type_inference.column_timings
+        logger.info(f'profiled {self.num_variables} columns. Slowest columns (seconds):'
+                    f' {type_inference.get_slowest_columns()}')
+
+        for sort_order, col_name in enumerate(self.df.columns):
             column_info = OrderedDict({
                 "name": col_name,
                 "sort_order": sort_order,
                 "label": ""
             })
-            # category_limit = 5
-            # Use type checking to filter out numpy Nan
-            # Comment out categories for now
-            #unique_vals = column.unique()
-
-            if column.unique().shape[0] == 2:
+            var_type = type_inference.var_types[col_name]
+            if var_type in (VAR_TYPE_BOOLEAN, VAR_TYPE_CATEGORICAL):
                 column_info['categories'] = []
-                column_info['type'] = VAR_TYPE_BOOLEAN
-            elif str(column.dtypes) == 'object':
-                column_info['categories'] = []  # list([x for x in column.unique() if type(x) == str])[:category_limit]
-                column_info['type'] = VAR_TYPE_CATEGORICAL
-            elif hasattr(column.dtypes, 'categories'):
-                column_info[
-                    'categories'] = []  # list([x for x in column.dtypes.categories if type(x) == str])[:category_limit]
-                column_info['type'] = VAR_TYPE_CATEGORICAL
-            elif 'int' in str(column.dtype):
-                column_info['type'] = VAR_TYPE_INTEGER
-            elif 'float' in str(column.dtype):
-                column_info['type'] = VAR_TYPE_FLOAT
-            elif str(column.dtypes) != 'object':
-                column_info['type'] = VAR_TYPE_NUMERICAL
+            column_info['type'] = var_type
             profile_dict['variables'][col_name] = column_info
 
         self.data_profile = profile_dict
@@ -0,0 +1,30 @@
+"""
+Validate the stored ReleaseInfo.dp_release documents against a published schema
+"""
+from django.core.management.base import BaseCommand
+
+from opendp_apps.analysis.models import ReleaseInfo
+from opendp_apps.release_schemas.schema_validator import validate_releases
+
+
+class Command(BaseCommand):
+    help = "Validate stored releases against a published schema version, by default the latest"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema-version',
+            dest='schema_version',
+            help='ReleaseInfoSchema version, e.g. 0.2.0'
+        )
+
+    def handle(self, *args, **options):
+        """Report the releases which don't match the schema"""
+        validate_resp = validate_releases(ReleaseInfo.objects.all(), options['schema_version'])
+        if not validate_resp.success:
+            self.stdout.write(self.style.ERROR(validate_resp.message))
+            return
+
+        for object_id, err_msg in validate_resp.data.items():
+            self.stdout.write(self.style.WARNING(f'>> ReleaseInfo {object_id}: {err_msg}'))
+
+        self.stdout.write(self.style.SUCCESS(f'>> Releases not matching the schema: {len(validate_resp.data)}'))
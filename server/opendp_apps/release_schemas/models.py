@@ -3,10 +3,13 @@ import logging
 
 from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.safestring import mark_safe
 
 from opendp_apps.model_helpers.models import TimestampedModelWithUUID
 from opendp_apps.release_schemas import static_vals as rstatic
+from opendp_apps.release_schemas.validator_registry import ValidatorRegistry
 from opendp_apps.release_schemas.validators import \
     (validate_semantic_version_number,
      validate_json_schema,
@@ -85,3 +88,11 @@ class ReleaseInfoSchema(TimestampedModelWithUUID):
             return f'Version {self.version}'
         return self.schema.get('title', f'Version {self.version}')
 
+
+# ----------------------------------------------------------------------
+# Drop the compiled validator when a schema is changed or removed
+# ----------------------------------------------------------------------
+@receiver(post_save, sender=ReleaseInfoSchema)
+@receiver(post_delete, sender=ReleaseInfoSchema)
+def clear_release_schema_validator(sender, instance, *args, **kwargs):
+    ValidatorRegistry.clear_version(instance.version)
@@ -1,6 +1,9 @@
 import jsonschema
-from jsonschema.exceptions import ValidationError as JsonSchemaValidationError
+
 from opendp_apps.model_helpers.basic_err_check import BasicErrCheck
+from opendp_apps.model_helpers.basic_response import ok_resp, err_resp, BasicResponse
+from opendp_apps.release_schemas.models import ReleaseInfoSchema
+from opendp_apps.release_schemas.validator_registry import ValidatorRegistry
 
 
 class SchemaValidator(BasicErrCheck):
@@ -9,6 +12,7 @@ class SchemaValidator(BasicErrCheck):
     def __init__(self, schema_dict, release_info):
         self.schema_dict = schema_dict
         self.release_info = release_info
+        self.validator = None  # compiled once per schema, see validator_registry.py
 
         self.run_precheck()
         self.validate_schema()
@@ -20,7 +24,7 @@ class SchemaValidator(BasicErrCheck):
             return
 
         try:
-            jsonschema.Validator.check_schema(self.schema_dict)
+            self.validator = ValidatorRegistry.get_validator(self.schema_dict)
         except jsonschema.exceptions.SchemaError as err_obj:
             self.add_err_msg(f'Error in schema: {err_obj.message}')
             return
@@ -41,10 +45,46 @@ class SchemaValidator(BasicErrCheck):
         if self.has_error():
             return
 
-        try:
-            jsonschema.validate(instance=self.release_info,
-                                schema=self.schema_dict)
-        except JsonSchemaValidationError as err_obj:
-            # import pdb; pdb.set_trace()
-            self.add_err_msg(err_obj.message)
+        err_msg = self.validator.get_error(self.release_info)
+        if err_msg is not None:
+            self.add_err_msg(err_msg)
             return
+
+
+def get_release_schema(version=None) -> BasicResponse:
+    """Return the published ReleaseInfoSchema for a version, or the latest version"""
+    release_schemas = ReleaseInfoSchema.objects.filter(is_published=True)
+    if version is not None:
+        release_schemas = release_schemas.filter(version=version)
+
+    release_schema = release_schemas.first()
+    if release_schema is None:
+        return err_resp(f'A published schema was not found (version: {version or "latest"})')
+
+    return ok_resp(release_schema)
+
+
+def validate_releases(release_infos, version=None) -> BasicResponse:
+    """
+    Validate the dp_release of many ReleaseInfo objects against one schema,
+    e.g. to check stored releases against a new schema version.
+    On success, the data is {ReleaseInfo.object_id: error message} for the invalid releases
+    :param release_infos: ReleaseInfo queryset
+    :param version: ReleaseInfoSchema version, defaults to the latest published version
+    """
+    schema_resp = get_release_schema(version)
+    if not schema_resp.success:
+        return schema_resp
+
+    try:
+        validator = ValidatorRegistry.get_schema_validator(schema_resp.data)
+    except jsonschema.exceptions.SchemaError as err_obj:
+        return err_resp(f'Error in schema: {err_obj.message}')
+
+    invalid_releases = {}
+    for object_id, dp_release in release_infos.values_list('object_id', 'dp_release').iterator():
+        err_msg = validator.get_error(dp_release)
+        if err_msg is not None:
+            invalid_releases[object_id] = err_msg
+
+    return ok_resp(invalid_releases)
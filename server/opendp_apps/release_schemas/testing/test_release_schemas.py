@@ -5,6 +5,7 @@ from django.test import TestCase
 from rest_framework import status
 
 from opendp_apps.model_helpers.msg_util import msgt
+from opendp_apps.release_schemas.models import ReleaseInfoSchema
 
 CURRENT_DIR = dirname(abspath(__file__))
 TEST_DATA_DIR = join(dirname(dirname(dirname(CURRENT_DIR))), 'test_data')
@@ -70,3 +71,24 @@ class ReleaseSchemasTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.check_basic_schema_fields(response.json(), self.VERSION_0_2_0)
+
+    def test_040_conditional_get(self):
+        """(40) Schema responses have an ETag; a matching If-None-Match gets a 304"""
+        msgt(self.test_040_conditional_get.__doc__)
+
+        for schema_url in [f'{self.API_SCHEMA_PREFIX}latest/',
+                           f'{self.API_SCHEMA_PREFIX}{self.VERSION_0_2_0}/']:
+            response = self.client.get(schema_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn('max-age', response['Cache-Control'])
+            etag = response['ETag']
+
+            response = self.client.get(schema_url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response['ETag'], etag)
+
+        # Saving the schema changes the ETag
+        ReleaseInfoSchema.objects.get(version=self.VERSION_0_2_0).save()
+        response = self.client.get(f'{self.API_SCHEMA_PREFIX}latest/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.check_basic_schema_fields(response.json(), self.VERSION_0_2_0)
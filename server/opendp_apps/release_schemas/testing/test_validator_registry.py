@@ -0,0 +1,101 @@
+import copy
+import json
+from io import StringIO
+from os.path import abspath, dirname, join
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from opendp_apps.analysis.models import ReleaseInfo
+from opendp_apps.dataset.models import DatasetInfo
+from opendp_apps.model_helpers.msg_util import msgt
+from opendp_apps.release_schemas.models import ReleaseInfoSchema
+from opendp_apps.release_schemas.schema_validator import SchemaValidator, validate_releases
+from opendp_apps.release_schemas.validator_registry import CompiledSchemaValidator, ValidatorRegistry
+
+CURRENT_DIR = dirname(abspath(__file__))
+SCHEMA_EXAMPLES_DIR = join(CURRENT_DIR, 'schema_examples')
+
+
+class ValidatorRegistryTest(TestCase):
+    fixtures = ['schema_fixture_v0-2-0.json',
+                'test_analysis_002.json']
+
+    VERSION_0_2_0 = '0.2.0'
+
+    def setUp(self):
+        ValidatorRegistry.clear()
+
+        self.release_schema = ReleaseInfoSchema.objects.get(version=self.VERSION_0_2_0)
+        with open(join(SCHEMA_EXAMPLES_DIR, 'release_v0.2.0_test_01.json'), 'r') as in_file:
+            self.release_dict = json.load(in_file)
+
+        self.bad_release_dict = copy.deepcopy(self.release_dict)
+        del self.bad_release_dict['created']
+
+    def test_010_schema_compiled_once(self):
+        """(10) SchemaValidator compiles a schema once and reuses it"""
+        msgt(self.test_010_schema_compiled_once.__doc__)
+
+        with mock.patch('opendp_apps.release_schemas.validator_registry.CompiledSchemaValidator',
+                        wraps=CompiledSchemaValidator) as mock_compile:
+            validator = SchemaValidator(self.release_schema.schema, self.release_dict)
+            self.assertFalse(validator.has_error())
+
+            validator = SchemaValidator(copy.deepcopy(self.release_schema.schema), self.bad_release_dict)
+            self.assertTrue(validator.has_error())
+            self.assertEqual(validator.get_err_msg(), "'created' is a required property")
+
+            self.assertEqual(mock_compile.call_count, 1)
+
+    def test_020_invalid_schema(self):
+        """(20) An invalid schema is reported as before"""
+        msgt(self.test_020_invalid_schema.__doc__)
+
+        with open(join(SCHEMA_EXAMPLES_DIR, '01_invalid_schema.json'), 'r') as in_file:
+            schema_dict = json.load(in_file)
+
+        validator = SchemaValidator(schema_dict, self.release_dict)
+        self.assertTrue(validator.has_error())
+        self.assertTrue(validator.get_err_msg().startswith('Error in schema:'))
+
+    def test_030_cleared_on_save(self):
+        """(30) Saving a ReleaseInfoSchema drops its compiled validator"""
+        msgt(self.test_030_cleared_on_save.__doc__)
+
+        validator = ValidatorRegistry.get_schema_validator(self.release_schema)
+        self.assertIs(ValidatorRegistry.get_schema_validator(self.release_schema), validator)
+        self.assertEqual(validator.get_error(self.bad_release_dict), "'created' is a required property")
+
+        # Make "created" optional
+        self.release_schema.schema['required'].remove('created')
+        self.release_schema.save()
+
+        new_validator = ValidatorRegistry.get_schema_validator(self.release_schema)
+        self.assertIsNot(new_validator, validator)
+        self.assertIsNone(new_validator.get_error(self.bad_release_dict))
+
+    def test_040_validate_releases(self):
+        """(40) Validate many stored releases in one call"""
+        msgt(self.test_040_validate_releases.__doc__)
+
+        dataset_info = DatasetInfo.objects.get(id=2)
+        good_release = ReleaseInfo.objects.create(dataset=dataset_info, epsilon_used=0.1,
+                                                  dp_release=self.release_dict)
+        bad_release = ReleaseInfo.objects.create(dataset=dataset_info, epsilon_used=0.1,
+                                                 dp_release=self.bad_release_dict)
+
+        validate_resp = validate_releases(ReleaseInfo.objects.filter(dataset=dataset_info))
+        self.assertTrue(validate_resp.success)
+        self.assertEqual(validate_resp.data, {bad_release.object_id: "'created' is a required property"})
+        self.assertNotIn(good_release.object_id, validate_resp.data)
+
+        validate_resp = validate_releases(ReleaseInfo.objects.all(), version='9.9.9')
+        self.assertFalse(validate_resp.success)
+        self.assertIn('9.9.9', validate_resp.message)
+
+        out = StringIO()
+        call_command('validate_stored_releases', stdout=out)
+        self.assertIn(str(bad_release.object_id), out.getvalue())
+        self.assertNotIn(str(good_release.object_id), out.getvalue())
@@ -0,0 +1,106 @@
+"""
+Compiled JSON schema validators, built once per schema and reused
+
+- Checking and compiling a schema takes much longer than validating a release against it,
+  so each ReleaseInfoSchema version is compiled once per process and kept in a registry
+- If "fastjsonschema" is installed, schemas for the drafts it supports are compiled
+  to Python code. Otherwise, and for newer drafts, a jsonschema Validator is used
+- A ReleaseInfoSchema's validator is dropped when the schema is saved or deleted
+"""
+import hashlib
+import json
+import logging
+import threading
+
+import jsonschema
+from django.conf import settings
+from jsonschema.exceptions import best_match
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+# "$schema" drafts which fastjsonschema can compile
+FAST_JSON_SCHEMA_DRAFTS = ('draft-04', 'draft-06', 'draft-07')
+
+
+class CompiledSchemaValidator:
+    """A JSON schema, checked and compiled once"""
+
+    def __init__(self, schema_dict: dict):
+        """
+        :param schema_dict: JSON schema. Raises jsonschema.exceptions.SchemaError if it isn't valid
+        """
+        validator_class = jsonschema.validators.validator_for(schema_dict)
+        validator_class.check_schema(schema_dict)
+
+        self.validator = validator_class(schema_dict)
+        self.fast_validate = None
+
+        schema_link = schema_dict.get('$schema', '')
+        if fastjsonschema is not None and any(x in schema_link for x in FAST_JSON_SCHEMA_DRAFTS):
+            try:
+                self.fast_validate = fastjsonschema.compile(schema_dict)
+            except fastjsonschema.JsonSchemaDefinitionException as err_obj:
+                logger.warning(f'fastjsonschema could not compile the schema: {err_obj}')
+
+    def get_error(self, instance):
+        """Return the validation error message, or None if the instance is valid"""
+        if self.fast_validate is not None:
+            try:
+                self.fast_validate(instance)
+                return None
+            except fastjsonschema.JsonSchemaValueException as err_obj:
+                return err_obj.message
+
+        # Same error as jsonschema.validate(...)
+        err_obj = best_match(self.validator.iter_errors(instance))
+        if err_obj is None:
+            return None
+        return err_obj.message
+
+
+class ValidatorRegistry:
+    """Compiled validators, by ReleaseInfoSchema version or by schema content"""
+
+    _validators = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_validator(cls, schema_dict: dict) -> CompiledSchemaValidator:
+        """Return the compiled validator for a schema dict"""
+        schema_hash = hashlib.sha256(json.dumps(schema_dict, sort_keys=True).encode()).hexdigest()
+        return cls._get_or_compile(('hash', schema_hash), schema_dict)
+
+    @classmethod
+    def get_schema_validator(cls, release_schema) -> CompiledSchemaValidator:
+        """Return the compiled validator for a ReleaseInfoSchema object"""
+        # "updated" is part of the key for other processes, where the post_save signal isn't received
+        return cls._get_or_compile(('version', release_schema.version, release_schema.updated),
+                                   release_schema.schema)
+
+    @classmethod
+    def _get_or_compile(cls, cache_key, schema_dict):
+        validator = cls._validators.get(cache_key)
+        if validator is not None:
+            return validator
+
+        validator = CompiledSchemaValidator(schema_dict)
+        with cls._lock:
+            cls._validators[cache_key] = validator
+        return validator
+
+    @classmethod
+    def clear_version(cls, version):
+        """Drop the validators for a ReleaseInfoSchema version"""
+        with cls._lock:
+            for cache_key in [x for x in cls._validators if x[0] == 'version' and x[1] == version]:
+                del cls._validators[cache_key]
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._validators.clear()
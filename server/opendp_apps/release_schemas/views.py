@@ -1,6 +1,7 @@
 import logging
 
 from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -30,6 +31,26 @@ class ReleaseSchemaView(viewsets.ModelViewSet):
         """
         return ReleaseInfoSchema.objects.filter(is_published=True)
 
+    @staticmethod
+    def get_schema_response(request, release_schema):
+        """
+        Return the schema, or a 304 if the client has this version of it.
+        The ETag changes when the schema is saved
+        """
+        etag = f'"{release_schema.object_id}-{release_schema.updated.timestamp()}"'
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            serializer = ReleaseSchemaSerializer(release_schema)  # serialize the data
+            response = Response(serializer.data, status=status.HTTP_200_OK)
+
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.RELEASE_SCHEMA_MAX_AGE)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve the JSON schema for a given version"""
+        return self.get_schema_response(request, self.get_object())
 
     @action(detail=False, methods=['GET'], url_path='latest')
     def latest(self, request):
@@ -39,9 +60,7 @@ class ReleaseSchemaView(viewsets.ModelViewSet):
         """
         release_schema = ReleaseInfoSchema.objects.filter(is_published=True).first()
         if release_schema is not None:
-            serializer = ReleaseSchemaSerializer(release_schema)  # serialize the data
-            logger.info(f"AnalysisPlan created: {serializer.data}")
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return self.get_schema_response(request, release_schema)
 
         return Response(get_json_error('A published schema was not found'),
                         status=status.HTTP_404_NOT_FOUND)
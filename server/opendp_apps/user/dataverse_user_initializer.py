@@ -336,7 +336,8 @@ class DataverseUserInitializer(BasicErrCheck):
         file_schema_resp = DataverseManifestParams.get_file_specific_schema_info(
             schema_org_content,
             self.dv_handoff.fileId,
-            self.dv_handoff.filePid)
+            self.dv_handoff.filePid,
+            file_index=schema_org_resp.get_file_index())
 
         if not file_schema_resp.success:
             self.add_err_msg(file_schema_resp.message)
@@ -0,0 +1,32 @@
+import hashlib
+
+# Bytes read at a time when hashing a file
+FILE_HASH_CHUNK_SIZE = 64 * 1024
+
+
+def get_sha256_hasher():
+    """Return a new SHA-256 hash object. Call .update(chunk) as the file is streamed"""
+    return hashlib.sha256()
+
+
+def get_file_sha256(file_obj) -> str:
+    """
+    Return the SHA-256 hex digest of an open file or Django File object.
+    The file is read in chunks and rewound when finished.
+    """
+    hasher = get_sha256_hasher()
+    if hasattr(file_obj, 'chunks'):
+        for chunk in file_obj.chunks(chunk_size=FILE_HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+    else:
+        for chunk in iter(lambda: file_obj.read(FILE_HASH_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+
+    file_obj.seek(0)
+    return hasher.hexdigest()
+
+
+def get_filepath_sha256(filepath: str) -> str:
+    """Return the SHA-256 hex digest of the file at the filepath"""
+    with open(filepath, 'rb') as file_obj:
+        return get_file_sha256(file_obj)
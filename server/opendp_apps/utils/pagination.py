@@ -0,0 +1,46 @@
+"""
+Pagination for the listing APIs, e.g. /api/dataset-info/ and /api/analysis-plan-list-view/
+
+- By default, pages are numbered and the response includes the total "count"
+- With "?pagination=cursor", the listing uses cursor pagination: the response has
+  "next"/"previous" links but no "count", and later pages are as fast as the first.
+  The other query parameters are kept in the links
+- "?page_size=N" sets the number of results, up to LISTING_MAX_PAGE_SIZE
+"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+PAGINATION_QUERY_PARAM = 'pagination'
+PAGINATION_CURSOR = 'cursor'
+
+LISTING_MAX_PAGE_SIZE = 100
+
+
+class ListingPageNumberPagination(PageNumberPagination):
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    page_size_query_param = 'page_size'
+    max_page_size = LISTING_MAX_PAGE_SIZE
+
+
+class ListingCursorPagination(CursorPagination):
+    """Newest first. "id" breaks ties between objects with the same "created" time"""
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    page_size_query_param = 'page_size'
+    max_page_size = LISTING_MAX_PAGE_SIZE
+    ordering = ('-created', '-id')
+
+
+class ListingPaginationMixin:
+    """
+    For a ViewSet: page numbers by default, cursor pagination with "?pagination=cursor"
+    """
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            if request is not None and request.query_params.get(PAGINATION_QUERY_PARAM) == PAGINATION_CURSOR:
+                self._paginator = ListingCursorPagination()
+            else:
+                self._paginator = ListingPageNumberPagination()
+        return self._paginator
@@ -113,6 +113,44 @@ if REDIS_PASSWORD:
 else:
     REDIS_URL = f'redis://{REDIS_HOST}:{REDIS_PORT}'
 
+# -----------------------------------------------
+# Caches
+#  - "validation": statistic validation results, by AnalysisPlan
+#  - "pdf_charts": rendered histogram charts for the PDF reports
+#  - "dataverse_metadata": Dataverse dataset exports, e.g. schema.org JSON-LD
+#  - "release_claims": AnalysisPlans with a release being computed
+# -----------------------------------------------
+VALIDATION_STATE_TIMEOUT = int(os.environ.get('VALIDATION_STATE_TIMEOUT', 60 * 60))  # seconds
+PDF_CHART_CACHE_TIMEOUT = int(os.environ.get('PDF_CHART_CACHE_TIMEOUT', 7 * 24 * 60 * 60))  # seconds
+DATAVERSE_METADATA_CACHE_ENABLED = bool(strtobool(os.environ.get('DATAVERSE_METADATA_CACHE_ENABLED', 'True')))
+DATAVERSE_METADATA_CACHE_TIMEOUT = int(os.environ.get('DATAVERSE_METADATA_CACHE_TIMEOUT', 24 * 60 * 60))  # seconds
+RELEASE_CLAIM_TIMEOUT = int(os.environ.get('RELEASE_CLAIM_TIMEOUT', 60 * 60))  # seconds
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'validation': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'TIMEOUT': VALIDATION_STATE_TIMEOUT,
+    },
+    'pdf_charts': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'TIMEOUT': PDF_CHART_CACHE_TIMEOUT,
+    },
+    'dataverse_metadata': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'TIMEOUT': DATAVERSE_METADATA_CACHE_TIMEOUT,
+    },
+    'release_claims': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'TIMEOUT': RELEASE_CLAIM_TIMEOUT,
+    },
+}
+
 # -----------------------------------------------
 # ASGI, Channels settings
 # -----------------------------------------------
@@ -234,6 +272,32 @@ def RELEASE_FILE_STORAGE():
     """May be overwritten in other settings file"""
     return FileSystemStorage(location=RELEASE_FILE_STORAGE_ROOT)
 
+# (3a) Release file downloads. Release files don't change once created
+#   - Browsers may keep a downloaded file for this many seconds
+RELEASE_DOWNLOAD_MAX_AGE = int(os.environ.get('RELEASE_DOWNLOAD_MAX_AGE', 365 * 24 * 60 * 60))
+#   - Optional hand-off to the web server, which then sends the file:
+#       "X-Accel-Redirect" (nginx) or "X-Sendfile" (Apache). Blank: Django sends the file
+RELEASE_DOWNLOAD_SENDFILE_HEADER = os.environ.get('RELEASE_DOWNLOAD_SENDFILE_HEADER', '')
+assert RELEASE_DOWNLOAD_SENDFILE_HEADER in ('', 'X-Accel-Redirect', 'X-Sendfile'), \
+    'RELEASE_DOWNLOAD_SENDFILE_HEADER must be blank, "X-Accel-Redirect" or "X-Sendfile"'
+#   - nginx "internal" location mapped to RELEASE_FILE_STORAGE_ROOT, used with X-Accel-Redirect
+RELEASE_DOWNLOAD_ACCEL_REDIRECT_PREFIX = os.environ.get('RELEASE_DOWNLOAD_ACCEL_REDIRECT_PREFIX',
+                                                        '/protected-release-files/')
+#   - Published release schemas may be kept for this many seconds
+RELEASE_SCHEMA_MAX_AGE = int(os.environ.get('RELEASE_SCHEMA_MAX_AGE', 60 * 60))
+
+# (4) Source files split into columns, used to compute releases.
+#   See opendp_apps/dataset/columnar_cache.py
+#
+COLUMNAR_CACHE_ENABLED = bool(strtobool(os.environ.get('COLUMNAR_CACHE_ENABLED', 'True')))
+#   - Default: next to the uploaded files, e.g. on the same volume
+COLUMNAR_CACHE_ROOT = os.getenv('COLUMNAR_CACHE_ROOT',
+                                os.path.join(os.path.dirname(os.path.normpath(UPLOADED_FILE_STORAGE_ROOT)),
+                                             'columnar_cache'))
+# Rows split at a time when building the cache
+COLUMNAR_CACHE_CHUNK_ROWS = int(os.environ.get('COLUMNAR_CACHE_CHUNK_ROWS', 100000))
+assert COLUMNAR_CACHE_CHUNK_ROWS >= 1, 'COLUMNAR_CACHE_CHUNK_ROWS must be at least 1'
+
 # -------------------------------------
 AUTHENTICATION_BACKENDS = (
     'django.contrib.auth.backends.ModelBackend',
@@ -311,6 +375,71 @@ OLD_PASSWORD_FIELD_ENABLED = 'true'
 PROFILER_COLUMN_LIMIT = int(os.environ.get('PROFILER_COLUMN_LIMIT', 20))
 assert PROFILER_COLUMN_LIMIT >= 1, 'PROFILER_COLUMN_LIMIT must be at least 1'
 
+# Files larger than this (in bytes) are read in chunks when profiling
+PROFILER_CHUNKED_READ_MIN_FILE_SIZE = int(os.environ.get('PROFILER_CHUNKED_READ_MIN_FILE_SIZE',
+                                                         DATA_UPLOAD_MAX_MEMORY_SIZE))
+# Approximate memory (in bytes) used by each chunk
+PROFILER_CHUNK_MEMORY_LIMIT = int(os.environ.get('PROFILER_CHUNK_MEMORY_LIMIT', 64 * 1024 * 1024))
+assert PROFILER_CHUNK_MEMORY_LIMIT >= 1024 * 1024, 'PROFILER_CHUNK_MEMORY_LIMIT must be at least 1 MB'
+# Processes used to infer column types for large files, including within a Celery worker.
+#   1 profiles the columns in the current process
+PROFILER_NUM_WORKERS = int(os.environ.get('PROFILER_NUM_WORKERS', min(4, os.cpu_count() or 1)))
+assert PROFILER_NUM_WORKERS >= 1, 'PROFILER_NUM_WORKERS must be at least 1'
+# Profile Dataverse files while they are downloaded, instead of reading the file afterwards
+PROFILER_STREAM_DOWNLOADS = bool(strtobool(os.environ.get('PROFILER_STREAM_DOWNLOADS', 'True')))
+# Profiling selected columns only: the first rows used to detect their types
+PROFILER_TYPE_PROBE_ROWS = int(os.environ.get('PROFILER_TYPE_PROBE_ROWS', 100_000))
+assert PROFILER_TYPE_PROBE_ROWS >= 1, 'PROFILER_TYPE_PROBE_ROWS must be at least 1'
+# Files larger than this (in bytes) are profiled using a random sample of PROFILER_SAMPLE_ROWS rows.
+#   Columns with 1 or 2 distinct values in the sample are read in full
+PROFILER_SAMPLED_READ_MIN_FILE_SIZE = int(os.environ.get('PROFILER_SAMPLED_READ_MIN_FILE_SIZE',
+                                                         2 * 1024 * 1024 * 1024))
+PROFILER_SAMPLE_ROWS = int(os.environ.get('PROFILER_SAMPLE_ROWS', 100_000))
+assert PROFILER_SAMPLE_ROWS >= 1, 'PROFILER_SAMPLE_ROWS must be at least 1'
+
+# Data profiles are cached in Redis, keyed by the source file's SHA-256 hash.
+# Entries expire after PROFILE_CACHE_TIMEOUT seconds without a cache hit
+PROFILE_CACHE_ENABLED = bool(strtobool(os.environ.get('PROFILE_CACHE_ENABLED', 'True')))
+PROFILE_CACHE_TIMEOUT = int(os.environ.get('PROFILE_CACHE_TIMEOUT', 7 * 24 * 60 * 60))  # 7 days
+assert PROFILE_CACHE_TIMEOUT > 0, 'PROFILE_CACHE_TIMEOUT must be greater than 0'
+
+# ---------------------------
+# Dataverse API calls
+#   - see opendp_apps/dataverses/dataverse_session.py
+# ---------------------------
+# Kept-alive connections per Dataverse host, in each process
+DATAVERSE_HTTP_POOL_MAXSIZE = int(os.environ.get('DATAVERSE_HTTP_POOL_MAXSIZE', 10))
+assert DATAVERSE_HTTP_POOL_MAXSIZE >= 1, 'DATAVERSE_HTTP_POOL_MAXSIZE must be at least 1'
+# Seconds to wait for a connection or a response
+DATAVERSE_HTTP_TIMEOUT = float(os.environ.get('DATAVERSE_HTTP_TIMEOUT', 30))
+assert DATAVERSE_HTTP_TIMEOUT > 0, 'DATAVERSE_HTTP_TIMEOUT must be greater than 0'
+# Retries for failed connections and 502/503/504 responses, GET requests only.
+#   Waits between retries: backoff * (2 ** retry number)
+DATAVERSE_HTTP_MAX_RETRIES = int(os.environ.get('DATAVERSE_HTTP_MAX_RETRIES', 3))
+assert DATAVERSE_HTTP_MAX_RETRIES >= 0, 'DATAVERSE_HTTP_MAX_RETRIES must be 0 or more'
+DATAVERSE_HTTP_RETRY_BACKOFF = float(os.environ.get('DATAVERSE_HTTP_RETRY_BACKOFF', 0.5))
+assert DATAVERSE_HTTP_RETRY_BACKOFF >= 0, 'DATAVERSE_HTTP_RETRY_BACKOFF must be 0 or more'
+# Seconds to wait for each concurrent API call, including retries.
+#   - see opendp_apps/dataverses/dataverse_api_calls.py
+DATAVERSE_API_CALL_TIMEOUT = float(os.environ.get('DATAVERSE_API_CALL_TIMEOUT', 90))
+assert DATAVERSE_API_CALL_TIMEOUT > 0, 'DATAVERSE_API_CALL_TIMEOUT must be greater than 0'
+
+# ---------------------------
+# Dataverse file download
+# ---------------------------
+# Bytes read from the Dataverse response and written to storage at a time
+DATAVERSE_DOWNLOAD_CHUNK_SIZE = int(os.environ.get('DATAVERSE_DOWNLOAD_CHUNK_SIZE', 8 * 1024 * 1024))
+assert DATAVERSE_DOWNLOAD_CHUNK_SIZE >= 64 * 1024, 'DATAVERSE_DOWNLOAD_CHUNK_SIZE must be at least 64 KB'
+# After a dropped connection, the download resumes from the last byte received (HTTP Range request)
+DATAVERSE_DOWNLOAD_MAX_RETRIES = int(os.environ.get('DATAVERSE_DOWNLOAD_MAX_RETRIES', 5))
+assert DATAVERSE_DOWNLOAD_MAX_RETRIES >= 0, 'DATAVERSE_DOWNLOAD_MAX_RETRIES must be 0 or more'
+# Seconds to wait before a retry, multiplied by the retry number
+DATAVERSE_DOWNLOAD_RETRY_WAIT = float(os.environ.get('DATAVERSE_DOWNLOAD_RETRY_WAIT', 2))
+assert DATAVERSE_DOWNLOAD_RETRY_WAIT >= 0, 'DATAVERSE_DOWNLOAD_RETRY_WAIT must be 0 or more'
+# Seconds to wait for the connection or for the next bytes of the response
+DATAVERSE_DOWNLOAD_TIMEOUT = float(os.environ.get('DATAVERSE_DOWNLOAD_TIMEOUT', 60))
+assert DATAVERSE_DOWNLOAD_TIMEOUT > 0, 'DATAVERSE_DOWNLOAD_TIMEOUT must be greater than 0'
+
 # ---------------------------
 # Epsilon Parameters
 # ---------------------------
@@ -334,6 +463,19 @@ CELERY_TASK_TIME_LIMIT = 30 * 60
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
 
+# PDF reports are created on their own queue so they don't hold up profiling
+# or releases. Run a worker for it, e.g. "celery -A opendp_project worker -Q pdf_render"
+PDF_RENDER_QUEUE = os.environ.get('PDF_RENDER_QUEUE', 'pdf_render')
+CELERY_TASK_ROUTES = {
+    'opendp_apps.dp_reports.tasks.run_pdf_report_maker': {'queue': PDF_RENDER_QUEUE},
+}
+
+# Processes used to render the histogram charts in a PDF report. 1 renders the charts in the current process
+PDF_CHART_NUM_WORKERS = int(os.environ.get('PDF_CHART_NUM_WORKERS', 1))
+assert PDF_CHART_NUM_WORKERS >= 1, 'PDF_CHART_NUM_WORKERS must be at least 1'
+# Load the PDF fonts, logo, and templates when a Celery worker starts, see dp_reports/pdf_assets.py
+PDF_PRELOAD_ASSETS = bool(strtobool(os.environ.get('PDF_PRELOAD_ASSETS', 'True')))
+
 # ------------------------------------------------------
 # Application name for deposit use
 # ------------------------------------------------------
@@ -15,6 +15,39 @@ DATABASES = {
 
 DEFAULT_LOGGER = 'console'
 
+# Tests profile their files each time. Cache tests turn this on with a local client
+PROFILE_CACHE_ENABLED = False
+COLUMNAR_CACHE_ENABLED = False
+
+CACHES['validation'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'validation',
+}
+CACHES['pdf_charts'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'pdf_charts',
+}
+CACHES['dataverse_metadata'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'dataverse_metadata',
+}
+CACHES['release_claims'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'release_claims',
+}
+
+# Run Celery tasks, e.g. releases, in the test process. Task results and
+# websocket messages are kept in memory
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_STORE_EAGER_RESULT = True
+CELERY_RESULT_BACKEND = 'cache+memory://'
+
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    },
+}
+
 # DEV ONLY - For cypress management commands
 
 # (1) This app includes the "clear_test_data" management command